@@ -0,0 +1,52 @@
+"""Add review_jobs table for the durable review job queue.
+
+Revision ID: 20261016_0002
+Revises: 20250107_0001
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0002"
+down_revision: str | None = "20250107_0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create review_jobs table."""
+    op.create_table(
+        "review_jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+        ),
+        sa.Column("job_type", sa.String(length=50), nullable=False),
+        sa.Column("event_key", sa.String(length=100), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, default="queued"),
+        sa.Column("run_after", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, default=0),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, default=3),
+        sa.Column("locked_by", sa.String(length=255), nullable=True),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    with op.batch_alter_table("review_jobs", schema=None) as batch_op:
+        batch_op.create_index("ix_review_jobs_status", ["status"], unique=False)
+        batch_op.create_index("ix_review_jobs_run_after", ["run_after"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop review_jobs table."""
+    op.drop_table("review_jobs")
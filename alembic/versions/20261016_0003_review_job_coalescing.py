@@ -0,0 +1,34 @@
+"""Add coalesce_key to review_jobs for superseding repeated pull request reviews.
+
+Revision ID: 20261016_0003
+Revises: 20261016_0002
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0003"
+down_revision: str | None = "20261016_0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add coalesce_key column and index to review_jobs."""
+    with op.batch_alter_table("review_jobs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("coalesce_key", sa.String(length=255), nullable=True))
+        batch_op.create_index("ix_review_jobs_coalesce_key", ["coalesce_key"], unique=False)
+
+
+def downgrade() -> None:
+    """Remove coalesce_key column from review_jobs."""
+    with op.batch_alter_table("review_jobs", schema=None) as batch_op:
+        batch_op.drop_index("ix_review_jobs_coalesce_key")
+        batch_op.drop_column("coalesce_key")
@@ -0,0 +1,59 @@
+"""Add review_cache_entries table and cache_hit column on review_records.
+
+Revision ID: 20261016_0004
+Revises: 20261016_0003
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0004"
+down_revision: str | None = "20261016_0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create review_cache_entries table and add review_records.cache_hit."""
+    op.create_table(
+        "review_cache_entries",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+        ),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("review_feedback", sa.Text(), nullable=False),
+        sa.Column("llm_provider", sa.String(length=50), nullable=True),
+        sa.Column("llm_model", sa.String(length=100), nullable=True),
+        sa.Column(
+            "last_accessed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("hit_count", sa.Integer(), nullable=False, default=0),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("cache_key"),
+    )
+
+    with op.batch_alter_table("review_cache_entries", schema=None) as batch_op:
+        batch_op.create_index("ix_review_cache_entries_created_at", ["created_at"], unique=False)
+        batch_op.create_index("ix_review_cache_entries_last_accessed_at", ["last_accessed_at"], unique=False)
+
+    with op.batch_alter_table("review_records", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("cache_hit", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop review_cache_entries table and review_records.cache_hit."""
+    with op.batch_alter_table("review_records", schema=None) as batch_op:
+        batch_op.drop_column("cache_hit")
+
+    op.drop_table("review_cache_entries")
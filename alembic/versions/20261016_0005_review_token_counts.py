@@ -0,0 +1,34 @@
+"""Add prompt_tokens and completion_tokens to review_records.
+
+Revision ID: 20261016_0005
+Revises: 20261016_0004
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0005"
+down_revision: str | None = "20261016_0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add token count columns to review_records."""
+    with op.batch_alter_table("review_records", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("prompt_tokens", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("completion_tokens", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove token count columns from review_records."""
+    with op.batch_alter_table("review_records", schema=None) as batch_op:
+        batch_op.drop_column("completion_tokens")
+        batch_op.drop_column("prompt_tokens")
@@ -0,0 +1,36 @@
+"""Add streaming metrics (time to first token, tokens/sec, partial output) to review_records.
+
+Revision ID: 20261016_0006
+Revises: 20261016_0005
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0006"
+down_revision: str | None = "20261016_0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add streaming metric columns to review_records."""
+    with op.batch_alter_table("review_records", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("time_to_first_token_ms", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("tokens_per_second", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("partial_output", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove streaming metric columns from review_records."""
+    with op.batch_alter_table("review_records", schema=None) as batch_op:
+        batch_op.drop_column("partial_output")
+        batch_op.drop_column("tokens_per_second")
+        batch_op.drop_column("time_to_first_token_ms")
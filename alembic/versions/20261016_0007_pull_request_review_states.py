@@ -0,0 +1,43 @@
+"""Add pull_request_review_states table for incremental pull request reviews.
+
+Revision ID: 20261016_0007
+Revises: 20261016_0006
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0007"
+down_revision: str | None = "20261016_0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create pull_request_review_states table."""
+    op.create_table(
+        "pull_request_review_states",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+        ),
+        sa.Column("project_key", sa.String(length=255), nullable=False),
+        sa.Column("repo_slug", sa.String(length=255), nullable=False),
+        sa.Column("pr_id", sa.Integer(), nullable=False),
+        sa.Column("last_reviewed_commit", sa.String(length=255), nullable=False),
+        sa.Column("last_review_feedback", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("project_key", "repo_slug", "pr_id", name="uq_pull_request_review_states_pr"),
+    )
+
+
+def downgrade() -> None:
+    """Drop pull_request_review_states table."""
+    op.drop_table("pull_request_review_states")
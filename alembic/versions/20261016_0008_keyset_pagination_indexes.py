@@ -0,0 +1,42 @@
+"""Add (created_at, id) indexes for keyset pagination of reviews and failure logs.
+
+Revision ID: 20261016_0008
+Revises: 20261016_0007
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0008"
+down_revision: str | None = "20261016_0007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create keyset pagination indexes."""
+    with op.batch_alter_table("review_records", schema=None) as batch_op:
+        batch_op.create_index("ix_review_records_created_at_id", ["created_at", "id"], unique=False)
+        batch_op.create_index(
+            "ix_review_records_project_repo_created_at_id",
+            ["project_key", "repo_slug", "created_at", "id"],
+            unique=False,
+        )
+
+    with op.batch_alter_table("review_failure_logs", schema=None) as batch_op:
+        batch_op.create_index("ix_review_failure_logs_created_at_id", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop keyset pagination indexes."""
+    with op.batch_alter_table("review_failure_logs", schema=None) as batch_op:
+        batch_op.drop_index("ix_review_failure_logs_created_at_id")
+
+    with op.batch_alter_table("review_records", schema=None) as batch_op:
+        batch_op.drop_index("ix_review_records_project_repo_created_at_id")
+        batch_op.drop_index("ix_review_records_created_at_id")
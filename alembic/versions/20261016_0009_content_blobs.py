@@ -0,0 +1,109 @@
+"""Add content_blobs table for compressed, deduplicated review and failure bodies.
+
+Revision ID: 20261016_0009
+Revises: 20261016_0008
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+import zlib
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0009"
+down_revision: str | None = "20261016_0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (table, inline column, blob hash column)
+BLOB_COLUMNS = (
+    ("review_records", "diff_content", "diff_blob_hash"),
+    ("review_records", "review_feedback", "review_blob_hash"),
+    ("review_failure_logs", "request_payload", "payload_blob_hash"),
+)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """Decompress a blob; a copy of the codecs in db/compression.py as of this revision."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Reading zstd-compressed content needs the 'zstandard' package")
+        return bytes(zstandard.ZstdDecompressor().decompress(data))
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return data
+
+
+def upgrade() -> None:
+    """Create content_blobs and let review and failure bodies reference a blob instead of being stored inline."""
+    op.create_table(
+        "content_blobs",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+        ),
+        sa.Column("codec", sa.String(length=10), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+
+    with op.batch_alter_table("review_records", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("diff_blob_hash", sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column("review_blob_hash", sa.String(length=64), nullable=True))
+        batch_op.alter_column("diff_content", existing_type=sa.Text(), nullable=True)
+        batch_op.alter_column("review_feedback", existing_type=sa.Text(), nullable=True)
+        batch_op.create_foreign_key(
+            "fk_review_records_diff_blob", "content_blobs", ["diff_blob_hash"], ["content_hash"]
+        )
+        batch_op.create_foreign_key(
+            "fk_review_records_review_blob", "content_blobs", ["review_blob_hash"], ["content_hash"]
+        )
+
+    with op.batch_alter_table("review_failure_logs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("payload_blob_hash", sa.String(length=64), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_review_failure_logs_payload_blob", "content_blobs", ["payload_blob_hash"], ["content_hash"]
+        )
+
+
+def downgrade() -> None:
+    """Copy blob bodies back inline, then drop the blob references and content_blobs."""
+    connection = op.get_bind()
+    blobs = sa.table(
+        "content_blobs", sa.column("content_hash"), sa.column("codec"), sa.column("data", sa.LargeBinary())
+    )
+    for table_name, inline_column, hash_column in BLOB_COLUMNS:
+        table = sa.table(table_name, sa.column("id"), sa.column(inline_column), sa.column(hash_column))
+        rows = connection.execute(
+            sa.select(table.c.id, blobs.c.codec, blobs.c.data).join(blobs, blobs.c.content_hash == table.c[hash_column])
+        )
+        for row_id, codec, data in rows.all():
+            # Request payload blobs hold the payload's JSON text, which is also how the JSON column stores it
+            text = decompress(data, codec).decode("utf-8")
+            connection.execute(sa.update(table).where(table.c.id == row_id).values({inline_column: text}))
+
+    with op.batch_alter_table("review_failure_logs", schema=None) as batch_op:
+        batch_op.drop_constraint("fk_review_failure_logs_payload_blob", type_="foreignkey")
+        batch_op.drop_column("payload_blob_hash")
+
+    with op.batch_alter_table("review_records", schema=None) as batch_op:
+        batch_op.drop_constraint("fk_review_records_review_blob", type_="foreignkey")
+        batch_op.drop_constraint("fk_review_records_diff_blob", type_="foreignkey")
+        batch_op.alter_column("review_feedback", existing_type=sa.Text(), nullable=False)
+        batch_op.alter_column("diff_content", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column("review_blob_hash")
+        batch_op.drop_column("diff_blob_hash")
+
+    op.drop_table("content_blobs")
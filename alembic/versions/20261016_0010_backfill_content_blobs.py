@@ -0,0 +1,106 @@
+"""Move review and failure bodies stored before content blobs existed into content_blobs.
+
+Revision ID: 20261016_0010
+Revises: 20261016_0009
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_0010"
+down_revision: str | None = "20261016_0009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (table, inline column, blob hash column, whether the inline column is JSON)
+BLOB_COLUMNS = (
+    ("review_records", "diff_content", "diff_blob_hash", False),
+    ("review_records", "review_feedback", "review_blob_hash", False),
+    ("review_failure_logs", "request_payload", "payload_blob_hash", True),
+)
+
+# Rows read and rewritten per query, so large tables are not loaded at once
+BATCH_SIZE = 500
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 of the uncompressed bytes; a copy of db/compression.py as of this revision."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def compress(data: bytes, level: int) -> tuple[str, bytes]:
+    """Compress with zlib, or keep the bytes as they are if that does not make them smaller."""
+    compressed = zlib.compress(data, level)
+    if len(compressed) >= len(data):
+        return "none", data
+    return "zlib", compressed
+
+
+def upgrade() -> None:
+    """Store existing bodies of at least CONTENT_BLOB_MIN_BYTES as zlib-compressed content blobs."""
+    if os.getenv("CONTENT_BLOBS_ENABLED", "true").lower() != "true":
+        return
+    min_bytes = int(os.getenv("CONTENT_BLOB_MIN_BYTES", "512"))
+    level = int(os.getenv("CONTENT_BLOB_COMPRESSION_LEVEL", "6"))
+
+    connection = op.get_bind()
+    blobs = sa.table(
+        "content_blobs",
+        sa.column("content_hash"),
+        sa.column("codec"),
+        sa.column("size"),
+        sa.column("data", sa.LargeBinary()),
+    )
+    stored = set(connection.execute(sa.select(blobs.c.content_hash)).scalars())
+
+    for table_name, inline_column, hash_column, is_json in BLOB_COLUMNS:
+        table = sa.table(
+            table_name,
+            sa.column("id"),
+            sa.column(inline_column, sa.JSON() if is_json else sa.Text()),
+            sa.column(hash_column),
+        )
+        last_id = 0
+        while True:
+            rows = connection.execute(
+                sa.select(table.c.id, table.c[inline_column])
+                .where(table.c.id > last_id, table.c[hash_column].is_(None))
+                .order_by(table.c.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            for row_id, value in rows:
+                if value is None:
+                    continue
+                # Request payloads are stored as their JSON text, as the repository does
+                data = (json.dumps(value) if is_json else value).encode("utf-8")
+                if len(data) < min_bytes:
+                    continue
+                digest = content_hash(data)
+                if digest not in stored:
+                    codec, compressed = compress(data, level)
+                    connection.execute(
+                        sa.insert(blobs).values(content_hash=digest, codec=codec, size=len(data), data=compressed)
+                    )
+                    stored.add(digest)
+                connection.execute(
+                    sa.update(table).where(table.c.id == row_id).values({inline_column: sa.null(), hash_column: digest})
+                )
+
+
+def downgrade() -> None:
+    """Nothing to undo: bodies stay in content blobs, which 20261016_0009's downgrade copies back inline."""
@@ -27,8 +27,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ai_code_reviewer.api.core.config import Config
 from ai_code_reviewer.api.db.database import close_db, engine, init_db
-from ai_code_reviewer.api.db.models import Base, ReviewFailureLog, ReviewRecord
-from ai_code_reviewer.api.db.repository import FailureLogRepository, ReviewRepository
+from ai_code_reviewer.api.db.models import Base, ContentBlob, ReviewFailureLog, ReviewRecord
+from ai_code_reviewer.api.db.repository import ContentBlobRepository, FailureLogRepository, ReviewRepository
 
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
@@ -78,6 +78,7 @@ async def clean_database():
         async with AsyncSession(engine) as session:
             await session.execute(delete(ReviewFailureLog))
             await session.execute(delete(ReviewRecord))
+            await session.execute(delete(ContentBlob))
             await session.commit()
         logger.info("✅ All records deleted")
         await show_stats()
@@ -86,6 +87,18 @@ async def clean_database():
         raise
 
 
+async def prune_blobs():
+    """Delete content blobs no longer referenced by any review record or failure log."""
+    try:
+        async with AsyncSession(engine) as session:
+            deleted = await ContentBlobRepository(session).delete_unreferenced()
+            await session.commit()
+        logger.info(f"✅ Deleted {deleted} unreferenced content blob(s)")
+    except Exception as e:
+        logger.error(f"❌ Error pruning content blobs: {e}")
+        raise
+
+
 async def show_stats():
     """Show database statistics."""
     try:
@@ -96,6 +109,7 @@ async def show_stats():
             total_reviews = await review_repo.count_total_reviews()
             total_failures = await failure_repo.count_total_failures(unresolved_only=False)
             unresolved_failures = await failure_repo.count_total_failures(unresolved_only=True)
+            blob_stats = await ContentBlobRepository(session).get_stats()
 
             logger.info("\n" + "=" * 60)
             logger.info("📊 Database Statistics")
@@ -104,6 +118,10 @@ async def show_stats():
             logger.info(f"Total failure logs: {total_failures}")
             logger.info(f"  - Unresolved: {unresolved_failures}")
             logger.info(f"  - Resolved: {total_failures - unresolved_failures}")
+            logger.info(
+                f"Content blobs: {blob_stats['blobs']} "
+                f"({blob_stats['content_bytes']} bytes stored as {blob_stats['stored_bytes']} bytes)"
+            )
 
             if total_reviews > 0:
                 # Get latest reviews
@@ -414,6 +432,9 @@ Examples:
   # Show statistics
   python scripts/db_helper.py stats
 
+  # Delete content blobs left behind by deleted records
+  python scripts/db_helper.py prune-blobs
+
   # Seed test data
   python scripts/db_helper.py seed
 
@@ -454,6 +475,9 @@ Examples:
     # Stats command
     subparsers.add_parser("stats", help="Show database statistics")
 
+    # Prune blobs command
+    subparsers.add_parser("prune-blobs", help="Delete content blobs no longer referenced by any record")
+
     # Seed command
     subparsers.add_parser("seed", help="Seed database with test data")
 
@@ -500,6 +524,8 @@ Examples:
             await clean_database()
         elif args.command == "stats":
             await show_stats()
+        elif args.command == "prune-blobs":
+            await prune_blobs()
         elif args.command == "seed":
             await seed_test_data()
         elif args.command == "list":
@@ -7,7 +7,10 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from ai_code_reviewer.api.clients.email_client import get_email_client
+from ai_code_reviewer.api.core.email_digest import get_email_digest
 from ai_code_reviewer.api.db.database import close_db, init_db
+from ai_code_reviewer.api.dependencies import get_bitbucket_client, get_job_queue, get_llm_client
 from ai_code_reviewer.api.routes import failures, health, manual, reviews, webhook
 from alembic import command
 from alembic.config import Config
@@ -48,8 +51,33 @@ async def lifespan(app: FastAPI):
     logger.info("Initializing database...")
     await init_db()
     logger.info("Database initialized successfully")
+
+    logger.info("Opening HTTP connection pools...")
+    bitbucket_client = get_bitbucket_client()
+    llm_client = get_llm_client()
+    await bitbucket_client.start()
+    await llm_client.start()
+
+    logger.info("Starting email delivery workers...")
+    email_client = get_email_client()
+    await email_client.start()
+
+    logger.info("Starting review job workers...")
+    job_queue = get_job_queue()
+    await job_queue.start()
     yield
     # Shutdown
+    logger.info("Stopping review job workers...")
+    await job_queue.stop()
+
+    logger.info("Flushing queued emails...")
+    await get_email_digest().flush_all()
+    await email_client.aclose()
+
+    logger.info("Closing HTTP connection pools...")
+    await bitbucket_client.aclose()
+    await llm_client.aclose()
+
     logger.info("Closing database connections...")
     await close_db()
     logger.info("Database connections closed")
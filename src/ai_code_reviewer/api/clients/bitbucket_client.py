@@ -3,11 +3,17 @@ from typing import Any
 
 import httpx
 
+from ai_code_reviewer.api.clients.http_pool import create_pooled_client, get_pool_stats
+from ai_code_reviewer.api.clients.retry import RetryPolicy, call_with_retry, is_retryable, raise_for_transient_status
 from ai_code_reviewer.api.core.config import Config
+from ai_code_reviewer.api.core.diff_parser import FILE_HEADER_PREFIX
+from ai_code_reviewer.api.core.diff_size_guard import DiffFileStats, DiffSizeGuard
 
 
 logger = logging.getLogger(__name__)
 
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
 
 class BitbucketClient:
     """Client for interacting with Bitbucket Enterprise Server API"""
@@ -20,50 +26,148 @@ class BitbucketClient:
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
+        self._http_client: httpx.AsyncClient | None = None
+        self.retry_policy = RetryPolicy(
+            max_attempts=Config.BITBUCKET_RETRY_MAX_ATTEMPTS,
+            base_delay=Config.BITBUCKET_RETRY_BASE_DELAY,
+            max_delay=Config.BITBUCKET_RETRY_MAX_DELAY,
+            deadline=Config.BITBUCKET_RETRY_DEADLINE,
+        )
+
+    async def start(self) -> None:
+        """Open the shared connection pool used for all Bitbucket API requests"""
+        if self._http_client is None:
+            # nosec B501: SSL verification disabled for enterprise Bitbucket with self-signed certs
+            # This is acceptable in internal enterprise networks. For production, configure proper CA certs.
+            self._http_client = create_pooled_client(
+                max_connections=Config.BITBUCKET_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.BITBUCKET_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=Config.BITBUCKET_KEEPALIVE_EXPIRY,
+                verify=False,  # nosec B501
+                timeout=30.0,
+            )
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, opening the pool lazily if the app lifespan has not"""
+        if self._http_client is None:
+            await self.start()
+        assert self._http_client is not None
+        return self._http_client
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Get connection pool statistics for health reporting"""
+        stats = get_pool_stats(self._http_client)
+        stats.update(
+            {
+                "max_connections": Config.BITBUCKET_MAX_CONNECTIONS,
+                "max_keepalive_connections": Config.BITBUCKET_MAX_KEEPALIVE_CONNECTIONS,
+                "keepalive_expiry": Config.BITBUCKET_KEEPALIVE_EXPIRY,
+            }
+        )
+        return stats
+
+    async def _send_request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transient failures (non-idempotent requests only if they were not processed)"""
+        client = await self._get_http_client()
+
+        async def send() -> httpx.Response:
+            response = await client.request(method=method, url=url, headers=self.headers, **kwargs)
+            raise_for_transient_status(response, "Bitbucket API error")
+            return response
+
+        return await call_with_retry(
+            send, self.retry_policy, f"Bitbucket {method} {url}", idempotent=method.upper() in IDEMPOTENT_METHODS
+        )
 
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> dict[Any, Any] | None:
         """Make HTTP request to Bitbucket API"""
         url = f"{self.base_url}/rest/api/1.0{endpoint}"
 
         try:
-            # nosec B501: SSL verification disabled for enterprise Bitbucket with self-signed certs
-            # This is acceptable in internal enterprise networks. For production, configure proper CA certs.
-            async with httpx.AsyncClient(verify=False, timeout=30.0) as client:  # nosec B501
-                response = await client.request(method=method, url=url, headers=self.headers, **kwargs)
+            response = await self._send_request(method, url, **kwargs)
 
-                if response.status_code == 200:
-                    return response.json() if response.content else {}
-                elif response.status_code == 204:
-                    return {}
-                else:
-                    logger.error(f"Bitbucket API error: {response.status_code} - {response.text}")
-                    return None
+            if response.status_code == 200:
+                return response.json() if response.content else {}
+            elif response.status_code == 204:
+                return {}
+            else:
+                logger.error(f"Bitbucket API error: {response.status_code} - {response.text}")
+                return None
 
         except Exception as e:
             logger.error(f"Error making request to {url}: {str(e)}")
             return None
 
-    async def _make_request_text(self, method: str, endpoint: str, **kwargs) -> str | None:
-        """Make HTTP request to Bitbucket API and return text response"""
-        url = f"{self.base_url}/rest/api/1.0{endpoint}"
+    async def _stream_diff_text(self, endpoint: str, **kwargs) -> str | None:
+        """
+        Stream a diff from the Bitbucket API without buffering more than BITBUCKET_DIFF_MAX_BYTES.
 
-        try:
-            # nosec B501: SSL verification disabled for enterprise Bitbucket with self-signed certs
-            # This is acceptable in internal enterprise networks. For production, configure proper CA certs.
-            async with httpx.AsyncClient(verify=False, timeout=30.0) as client:  # nosec B501
-                response = await client.request(method=method, url=url, headers=self.headers, **kwargs)
+        Files whose diff exceeds BITBUCKET_DIFF_MAX_FILE_BYTES are kept as headers only, and the
+        download is aborted (and the diff marked as truncated) once the byte cap is reached.
+        Returns None if Bitbucket has no diff for the request (e.g. 404).
 
-                if response.status_code == 200:
-                    result: str = response.text
-                    return result
-                else:
+        Raises:
+            The last transient error (network failure, timeout or 5xx) once retries are exhausted, so
+            callers can tell an unavailable Bitbucket from a missing diff
+        """
+        url = f"{self.base_url}/rest/api/1.0{endpoint}"
+        client = await self._get_http_client()
+
+        async def fetch() -> str | None:
+            guard = DiffSizeGuard(Config.BITBUCKET_DIFF_MAX_BYTES, Config.BITBUCKET_DIFF_MAX_FILE_BYTES)
+            async with client.stream("GET", url, headers=self.headers, **kwargs) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise_for_transient_status(response, "Bitbucket API error")
                     logger.error(f"Bitbucket API error: {response.status_code} - {response.text}")
                     return None
 
+                pending = ""
+                async for text in response.aiter_text():
+                    *lines, pending = (pending + text).split("\n")
+                    if not all(guard.add_line(line) for line in lines):
+                        break
+                    if guard.max_bytes and len(pending) > guard.max_bytes:
+                        guard.truncated = True  # A single line larger than the whole limit
+                        break
+                else:
+                    if pending:
+                        guard.add_line(pending)
+
+            self._log_diff_stats(url, guard)
+            return guard.build()
+
+        try:
+            return await call_with_retry(fetch, self.retry_policy, f"Bitbucket GET {url}")
         except Exception as e:
             logger.error(f"Error making request to {url}: {str(e)}")
+            if is_retryable(e):
+                raise
             return None
 
+    @staticmethod
+    def _log_diff_stats(url: str, guard: DiffSizeGuard) -> None:
+        """Log per-file accounting for a streamed diff that hit a size limit"""
+
+        def describe(files: list[DiffFileStats]) -> str:
+            return ", ".join(f"{stats.header.removeprefix(FILE_HEADER_PREFIX)} ({stats.size} bytes)" for stats in files)
+
+        skipped = [stats for stats in guard.files if stats.skipped]
+        if skipped:
+            logger.warning(f"Omitted {len(skipped)} oversized file diff(s) from {url}: {describe(skipped)}")
+        if guard.truncated:
+            details = describe(sorted(guard.files, key=lambda stats: stats.size, reverse=True)[:3])
+            logger.warning(
+                f"Diff from {url} exceeded {guard.max_bytes} bytes after {len(guard.files)} file(s), "
+                f"download aborted; largest files: {details}"
+            )
+
     async def test_connection(self) -> dict[str, Any]:
         """Test connection to Bitbucket server"""
         try:
@@ -80,14 +184,14 @@ class BitbucketClient:
             return {"status": "error", "error": str(e)}
 
     async def get_pull_request_diff(self, project_key: str, repo_slug: str, pr_id: int) -> str | None:
-        """Get diff for a pull request"""
+        """Get diff for a pull request; raises if Bitbucket is unavailable (see _stream_diff_text)"""
         endpoint = f"/projects/{project_key}/repos/{repo_slug}/pull-requests/{pr_id}/diff"
 
         try:
             # Get diff with context
             params = {"contextLines": 3, "whitespace": "ignore-all"}
 
-            diff_text = await self._make_request_text("GET", endpoint, params=params)
+            diff_text = await self._stream_diff_text(endpoint, params=params)
 
             if diff_text:
                 logger.info(f"Retrieved diff for PR {pr_id} ({len(diff_text)} characters)")
@@ -98,17 +202,19 @@ class BitbucketClient:
 
         except Exception as e:
             logger.error(f"Error getting PR diff: {str(e)}")
+            if is_retryable(e):
+                raise
             return None
 
     async def get_commit_diff(self, project_key: str, repo_slug: str, commit_id: str) -> str | None:
-        """Get diff for a specific commit"""
+        """Get diff for a specific commit; raises if Bitbucket is unavailable (see _stream_diff_text)"""
         endpoint = f"/projects/{project_key}/repos/{repo_slug}/commits/{commit_id}/diff"
 
         try:
             # Get diff with context
             params = {"contextLines": 3, "whitespace": "ignore-all"}
 
-            diff_text = await self._make_request_text("GET", endpoint, params=params)
+            diff_text = await self._stream_diff_text(endpoint, params=params)
 
             if diff_text:
                 logger.info(f"Retrieved diff for commit {commit_id} ({len(diff_text)} characters)")
@@ -119,6 +225,30 @@ class BitbucketClient:
 
         except Exception as e:
             logger.error(f"Error getting commit diff: {str(e)}")
+            if is_retryable(e):
+                raise
+            return None
+
+    async def get_compare_diff(self, project_key: str, repo_slug: str, from_commit: str, to_commit: str) -> str | None:
+        """Get the diff of changes reachable from from_commit but not from to_commit (e.g. new PR commits)"""
+        endpoint = f"/projects/{project_key}/repos/{repo_slug}/compare/diff"
+
+        try:
+            params = {"from": from_commit, "to": to_commit, "contextLines": 3, "whitespace": "ignore-all"}
+
+            diff_text = await self._stream_diff_text(endpoint, params=params)
+
+            if diff_text:
+                logger.info(f"Retrieved diff from {to_commit[:8]} to {from_commit[:8]} ({len(diff_text)} characters)")
+                return diff_text
+            else:
+                logger.warning(f"No diff found from {to_commit[:8]} to {from_commit[:8]}")
+                return None
+
+        except Exception as e:
+            logger.error(f"Error getting compare diff: {str(e)}")
+            if is_retryable(e):
+                raise
             return None
 
     async def post_pull_request_comment(self, project_key: str, repo_slug: str, pr_id: int, comment: str) -> bool:
@@ -1,69 +1,234 @@
 """
 PURPOSE:
-    This script is used to send an email using Logic App
+    This module is used to send an email using Logic App
 
 LOGIC:
     It sends an email using a Logic App HTTP trigger in Azure.
-    The function constructs a JSON payload with the email data
-    and sends a POST request to the Logic App URL.
+    Messages are placed on an in-memory outbound queue and delivered by
+    background workers over a pooled async HTTP client, so a slow Logic App
+    endpoint never blocks webhook intake or review processing.
 
 INPUTS:
-    It takes four parameters:
-        to (recipient's email), subject, mailbody, and content_bytes (attachment).
+    Each message has four fields:
+        to (recipient's email), cc, subject, and mailbody.
 
 OUTPUTS:
-    If the request is successful, it logs a success message;
-    otherwise, it logs an error message and raises an exception.
+    Successful deliveries log a success message; failed deliveries are
+    retried for transient errors and otherwise logged as errors and reported
+    to the sender's on_failure callback.
 """
 
-import json
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
 
-import requests
+import httpx
 
+from ai_code_reviewer.api.clients.http_pool import create_pooled_client, get_pool_stats
+from ai_code_reviewer.api.clients.retry import RetryPolicy, call_with_retry, raise_for_transient_status
 from ai_code_reviewer.api.core.config import Config
 
 
 logger = logging.getLogger(__name__)
 
+# Awaited with the error when a queued email could not be delivered
+DeliveryFailureCallback = Callable[[Exception], Awaitable[None]]
 
-def send_mail(to, cc, subject, mailbody):
+
+@dataclass(frozen=True)
+class EmailMessage:
+    """An outbound email"""
+
+    to: str
+    cc: str
+    subject: str
+    mailbody: str
+    on_failure: DeliveryFailureCallback | None = field(default=None, compare=False)
+
+
+class EmailClient:
     """
-    This method sends an email to the recipient using Logic App HTTP trigger.
+    Sends email through the Logic App HTTP trigger.
     Logic App HTTP trigger is not safeguarded now with any tokens or keys.
     Also the Logic App logged in using 'pandiarajans@test.com',
     and so the from address is constant now.
     """
 
-    url = Config.LOGIC_APP_EMAIL_URL
-    from_email = Config.LOGIC_APP_FROM_EMAIL
-    email_optout = Config.EMAIL_OPTOUT
-
-    if email_optout:
+    def __init__(self, worker_count: int | None = None, max_queue_size: int | None = None):
+        self.worker_count = worker_count if worker_count is not None else Config.EMAIL_WORKER_COUNT
+        self.max_queue_size = max_queue_size if max_queue_size is not None else Config.EMAIL_QUEUE_MAX_SIZE
+        self.retry_policy = RetryPolicy(max_attempts=Config.EMAIL_RETRY_MAX_ATTEMPTS, base_delay=1.0, max_delay=30.0)
+        self._http_client: httpx.AsyncClient | None = None
+        self._queue: asyncio.Queue[EmailMessage] | None = None
+        self._workers: list[asyncio.Task] = []
+        self.sent_count = 0
+        self.failed_count = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the delivery workers have been started"""
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """Open the connection pool and start the delivery workers"""
+        if self._http_client is None:
+            self._http_client = create_pooled_client(
+                max_connections=max(self.worker_count, 1),
+                max_keepalive_connections=max(self.worker_count, 1),
+                keepalive_expiry=30.0,
+                timeout=Config.EMAIL_SEND_TIMEOUT,
+            )
+        if not self._workers:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            for index in range(max(self.worker_count, 1)):
+                self._workers.append(asyncio.create_task(self._worker_loop(), name=f"email-worker-{index}"))
+            logger.info(f"Started {len(self._workers)} email delivery worker(s)")
+
+    async def aclose(self) -> None:
+        """
+        Deliver queued emails (up to EMAIL_SHUTDOWN_TIMEOUT), then stop the workers and close the pool.
+
+        Emails still queued after the timeout are reported as failed.
+        """
+        if self._queue is not None and self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=Config.EMAIL_SHUTDOWN_TIMEOUT)
+            except TimeoutError:
+                logger.error(f"Shutting down with {self._queue.qsize()} undelivered email(s)")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                message = self._queue.get_nowait()
+                self.failed_count += 1
+                await self._report_failure(message, RuntimeError("Shut down before the email was delivered"))
+        self._queue = None
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def stats(self) -> dict[str, Any]:
+        """Get outbound queue and connection pool statistics for health reporting"""
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_size": self.max_queue_size,
+            "workers": len(self._workers),
+            "sent": self.sent_count,
+            "failed": self.failed_count,
+            "pool": get_pool_stats(self._http_client),
+        }
+
+    async def queue_mail(
+        self, to: str, cc: str, subject: str, mailbody: str, on_failure: DeliveryFailureCallback | None = None
+    ) -> bool:
+        """
+        Queue an email for background delivery without waiting for the Logic App.
+
+        on_failure is awaited with the error if the email is queued but cannot be delivered.
+
+        Returns:
+            True if the email was queued (or skipped because of EMAIL_OPTOUT), False if the queue is full
+
+        Raises:
+            ValueError: If LOGIC_APP_EMAIL_URL is not configured
+        """
+        if Config.EMAIL_OPTOUT:
+            self._log_optout(to, subject, mailbody)
+            return True
+        if not Config.LOGIC_APP_EMAIL_URL:
+            logger.error("LOGIC_APP_EMAIL_URL is not configured. Cannot send email.")
+            raise ValueError("LOGIC_APP_EMAIL_URL is required for email functionality")
+
+        await self.start()
+        assert self._queue is not None
+        try:
+            self._queue.put_nowait(
+                EmailMessage(to=to, cc=cc, subject=subject, mailbody=mailbody, on_failure=on_failure)
+            )
+        except asyncio.QueueFull:
+            logger.error(f"Email queue is full ({self.max_queue_size}), dropping email to: {to}")
+            self.failed_count += 1
+            return False
+        logger.info(f"Queued email to {to} ({self._queue.qsize()} pending)")
+        return True
+
+    async def _deliver(self, message: EmailMessage) -> None:
+        """POST one email to the Logic App, retrying transient failures"""
+        if self._http_client is None:
+            await self.start()
+        assert self._http_client is not None
+        client = self._http_client
+        url = Config.LOGIC_APP_EMAIL_URL or ""
+
+        email_data = {
+            "to": message.to,
+            "cc": message.cc,
+            "from": Config.LOGIC_APP_FROM_EMAIL,
+            "subject": message.subject,
+            "mailbody": message.mailbody,
+        }
+
+        async def post() -> None:
+            response = await client.post(url, json=email_data)
+            raise_for_transient_status(response, "Logic App error")
+            response.raise_for_status()
+
+        try:
+            await call_with_retry(post, self.retry_policy, f"Email to {message.to}", idempotent=False)
+        except httpx.HTTPStatusError as http_err:
+            logger.error(f"HTTP error occurred: {http_err}")
+            raise
+        except Exception as err:
+            logger.error(f"Error sending email: {err}")
+            raise
+
+        logger.info(f"Email sent successfully to {message.to}")
+
+    async def _worker_loop(self) -> None:
+        """Deliver queued emails until cancelled; a failed email is reported to its sender and dropped"""
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            message = await queue.get()
+            try:
+                await self._deliver(message)
+                self.sent_count += 1
+            except Exception as e:
+                self.failed_count += 1
+                await self._report_failure(message, e)
+            finally:
+                queue.task_done()
+
+    @staticmethod
+    async def _report_failure(message: EmailMessage, error: Exception) -> None:
+        """Run the message's on_failure callback; an error in the callback is only logged"""
+        if message.on_failure is None:
+            return
+        try:
+            await message.on_failure(error)
+        except Exception as e:
+            logger.error(f"Error reporting undelivered email to {message.to}: {str(e)}")
+
+    @staticmethod
+    def _log_optout(to: str, subject: str, mailbody: str) -> None:
         logger.warning(
             f"Email sending is disabled via EMAIL_OPTOUT env var. "
             f"Skipping sending email to: {to} \n "
             f"with subject: {subject} \n "
             f"and mailbody: {mailbody} \n Cancelled"
         )
-        return
-
-    if not url:
-        logger.error("LOGIC_APP_EMAIL_URL is not configured. Cannot send email.")
-        raise ValueError("LOGIC_APP_EMAIL_URL is required for email functionality")
 
-    email_header = {"Content-Type": "application/json"}
 
-    email_data = {"to": f"{to}", "cc": f"{cc}", "from": from_email, "subject": f"{subject}", "mailbody": f"{mailbody}"}
+_email_client: EmailClient | None = None
 
-    try:
-        response = requests.post(url, headers=email_header, data=json.dumps(email_data), timeout=30)
-        response.raise_for_status()
-    except requests.exceptions.HTTPError as http_err:
-        logger.error(f"HTTP error occurred: {http_err}")
-        raise
-    except Exception as err:
-        logger.error(f"Error sending email: {err}")
-        raise
 
-    logger.info(f"Email sent successfully to {to}")
+def get_email_client() -> EmailClient:
+    """Get or create the shared email client instance"""
+    global _email_client
+    if _email_client is None:
+        _email_client = EmailClient()
+    return _email_client
@@ -0,0 +1,88 @@
+"""Shared construction of long-lived, pooled httpx clients for outbound API calls."""
+
+import logging
+from typing import Any
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """Return True if the optional 'h2' package required for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_pooled_client(
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry: float,
+    http2: bool = False,
+    **kwargs: Any,
+) -> httpx.AsyncClient:
+    """
+    Create an AsyncClient that keeps connections alive and reuses them across requests.
+
+    Args:
+        max_connections: Maximum number of concurrent connections in the pool
+        max_keepalive_connections: Maximum number of idle connections kept open
+        keepalive_expiry: Seconds an idle connection is kept before being closed
+        http2: Enable HTTP/2 (falls back to HTTP/1.1 if 'h2' is not installed)
+        **kwargs: Additional keyword arguments passed to httpx.AsyncClient (timeout, verify, ...)
+
+    Returns:
+        A configured httpx.AsyncClient; the caller owns it and must close it with aclose()
+    """
+    if http2 and not http2_available():
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+    logger.info(
+        f"Creating pooled HTTP client (max_connections={max_connections}, "
+        f"max_keepalive={max_keepalive_connections}, keepalive_expiry={keepalive_expiry}s, http2={http2})"
+    )
+    return httpx.AsyncClient(limits=limits, http2=http2, **kwargs)
+
+
+def get_pool_stats(client: httpx.AsyncClient | None) -> dict[str, Any]:
+    """
+    Return a snapshot of connection pool usage for health reporting.
+
+    httpx does not expose pool statistics publicly, so the underlying httpcore pool is
+    inspected defensively; missing internals simply produce fewer fields.
+
+    Args:
+        client: The pooled client to inspect, or None if it has not been opened yet
+
+    Returns:
+        Dictionary with the pool state and connection counts
+    """
+    if client is None or client.is_closed:
+        return {"status": "closed"}
+
+    stats: dict[str, Any] = {"status": "open"}
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return stats
+
+    try:
+        idle = sum(1 for connection in connections if connection.is_idle())
+        stats["connections"] = len(connections)
+        stats["idle_connections"] = idle
+        stats["active_connections"] = len(connections) - idle
+    except Exception as e:
+        logger.debug(f"Unable to read connection pool statistics: {e}")
+
+    return stats
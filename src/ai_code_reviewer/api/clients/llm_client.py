@@ -1,14 +1,34 @@
+import asyncio
+import json
 import logging
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import httpx
 
+from ai_code_reviewer.api.clients.http_pool import create_pooled_client, get_pool_stats
+from ai_code_reviewer.api.clients.rate_limiter import LLMRateLimiter
+from ai_code_reviewer.api.clients.retry import RetryPolicy, call_with_retry, is_retryable, raise_for_transient_status
 from ai_code_reviewer.api.core.config import Config
+from ai_code_reviewer.api.core.diff_chunker import split_diff_into_chunks
+from ai_code_reviewer.api.core.diff_filter import DiffFileFilter
+from ai_code_reviewer.api.core.diff_parser import BINARY_PREFIX, ParsedDiff, parse_diff
 from ai_code_reviewer.api.core.guidelines_loader import GuidelinesLoader
+from ai_code_reviewer.api.core.review_cache import ReviewCache
+from ai_code_reviewer.api.core.review_metrics import LLMRequestStats, ReviewMetrics
+from ai_code_reviewer.api.core.token_budget import PromptBudget, TokenCounter, get_token_counter
 
 
 logger = logging.getLogger(__name__)
 
+NO_ISSUES_REVIEW = "No issues found."
+SKIPPED_FILES_REVIEW = (
+    "Only changes in {filetypes} files were detected. As a result, these modifications are not subject to code "
+    "review; however, please ensure they are error-free and adhere to your project's standards."
+)
+PARTIAL_REVIEW_NOTICE = "> ⚠️ The LLM stopped responding before the review was complete; this review may be partial."
+
 
 class LLMClient:
     """Client for interacting with various LLM providers"""
@@ -19,6 +39,72 @@ class LLMClient:
         self.endpoint = Config.LLM_ENDPOINT
         self.model = Config.LLM_MODEL
         self.ollama_host = Config.OLLAMA_HOST
+        self._http_client: httpx.AsyncClient | None = None
+        self.review_cache: ReviewCache | None = ReviewCache() if Config.REVIEW_CACHE_ENABLED else None
+        self.file_filter: DiffFileFilter | None = DiffFileFilter() if Config.REVIEW_FILE_FILTER_ENABLED else None
+        self.prompt_budget = PromptBudget.for_model(self.model)
+        self.streaming = Config.LLM_STREAMING
+        # Shared by every review in the process so concurrent reviews stay within provider limits
+        self.rate_limiter = LLMRateLimiter(
+            max_concurrent=Config.LLM_MAX_CONCURRENT_REQUESTS,
+            requests_per_minute=Config.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=Config.LLM_TOKENS_PER_MINUTE,
+        )
+        self.retry_policy = RetryPolicy(
+            max_attempts=Config.LLM_RETRY_MAX_ATTEMPTS,
+            base_delay=Config.LLM_RETRY_BASE_DELAY,
+            max_delay=Config.LLM_RETRY_MAX_DELAY,
+            deadline=Config.LLM_RETRY_DEADLINE,
+        )
+
+    @property
+    def token_counter(self) -> TokenCounter:
+        """Token counter for the configured model (resolved on first use)"""
+        return get_token_counter(self.model)
+
+    async def start(self) -> None:
+        """Open the shared connection pool used for all LLM requests"""
+        if self._http_client is None:
+            self._http_client = create_pooled_client(
+                max_connections=Config.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=Config.LLM_KEEPALIVE_EXPIRY,
+                http2=Config.LLM_HTTP2,
+                timeout=60.0,
+            )
+        if Config.GUIDELINES_ENABLED and Config.GUIDELINES_RETRIEVAL_ENABLED:
+            try:
+                await asyncio.to_thread(
+                    lambda: GuidelinesLoader.get_retriever(GuidelinesLoader.load_guidelines(Config.GUIDELINES_FILE))
+                )
+            except Exception as e:
+                logger.error(f"Error indexing coding guidelines: {e}")
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, opening the pool lazily if the app lifespan has not"""
+        if self._http_client is None:
+            await self.start()
+        assert self._http_client is not None
+        return self._http_client
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Get connection pool statistics for health reporting"""
+        stats = get_pool_stats(self._http_client)
+        stats.update(
+            {
+                "max_connections": Config.LLM_MAX_CONNECTIONS,
+                "max_keepalive_connections": Config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                "keepalive_expiry": Config.LLM_KEEPALIVE_EXPIRY,
+                "http2": Config.LLM_HTTP2,
+            }
+        )
+        return stats
 
     async def test_connection(self) -> dict[str, Any]:
         """Test connection to the configured LLM provider"""
@@ -39,13 +125,13 @@ class LLMClient:
 
             payload = {"model": self.model, "messages": [{"role": "user", "content": "Hello"}], "max_tokens": 5}
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(self.endpoint, headers=headers, json=payload)
+            client = await self._get_http_client()
+            response = await client.post(self.endpoint, headers=headers, json=payload, timeout=10.0)
 
-                if response.status_code == 200:
-                    return {"status": "connected", "provider": "openai", "model": self.model}
-                else:
-                    return {"status": "failed", "error": f"HTTP {response.status_code}: {response.text}"}
+            if response.status_code == 200:
+                return {"status": "connected", "provider": "openai", "model": self.model}
+            else:
+                return {"status": "failed", "error": f"HTTP {response.status_code}: {response.text}"}
 
         except Exception as e:
             return {"status": "error", "error": str(e)}
@@ -54,116 +140,317 @@ class LLMClient:
         """Test Ollama API connection"""
         try:
             # Test if Ollama is running
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.ollama_host}/api/tags")
-
-                if response.status_code == 200:
-                    models = response.json().get("models", [])
-                    model_names = [model["name"] for model in models]
-
-                    if self.model in model_names:
-                        return {
-                            "status": "connected",
-                            "provider": "ollama",
-                            "model": self.model,
-                            "available_models": model_names,
-                        }
-                    else:
-                        return {
-                            "status": "model_not_found",
-                            "error": f"Model {self.model} not found",
-                            "available_models": model_names,
-                        }
+            client = await self._get_http_client()
+            response = await client.get(f"{self.ollama_host}/api/tags", timeout=10.0)
+
+            if response.status_code == 200:
+                models = response.json().get("models", [])
+                model_names = [model["name"] for model in models]
+
+                if self.model in model_names:
+                    return {
+                        "status": "connected",
+                        "provider": "ollama",
+                        "model": self.model,
+                        "available_models": model_names,
+                    }
                 else:
-                    return {"status": "failed", "error": f"HTTP {response.status_code}: {response.text}"}
+                    return {
+                        "status": "model_not_found",
+                        "error": f"Model {self.model} not found",
+                        "available_models": model_names,
+                    }
+            else:
+                return {"status": "failed", "error": f"HTTP {response.status_code}: {response.text}"}
 
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
-    async def get_code_review(self, diff_content: str) -> str | None:
-        """Get AI code review for the provided diff"""
+    async def get_code_review(
+        self,
+        diff_content: str,
+        metrics: ReviewMetrics | None = None,
+        previous_review: str | None = None,
+        parsed_diff: ParsedDiff | None = None,
+        project_key: str | None = None,
+    ) -> str | None:
+        """
+        Get AI code review for the provided diff, filling in metrics if provided.
+
+        previous_review is the feedback from an earlier review of the same pull request; when given, the
+        diff is treated as only the commits pushed since then and the earlier findings are added as context.
+        parsed_diff is diff_content already parsed by the caller, so the diff is parsed only once.
+        project_key selects the project's own guidelines file, if GUIDELINES_PROJECT_DIR has one.
+        Returns None if the review failed for a reason retrying will not fix (e.g. a 4xx response).
+
+        Raises:
+            The last transient provider error (network failure, timeout or 5xx) once retries are exhausted
+        """
+        metrics = metrics if metrics is not None else ReviewMetrics()
         try:
+            parsed = parsed_diff if parsed_diff is not None else parse_diff(diff_content)
+
+            # Leave out generated, vendored, binary, lockfile and formatting-only changes; if nothing is left,
+            # answer without an LLM call
+            if self.file_filter is not None:
+                filtered = self.file_filter.filter(diff_content, parsed)
+                if filtered.formatting_only:
+                    logger.info("Only whitespace, rename or mode changes found, skipping LLM review")
+                    return NO_ISSUES_REVIEW
+                if filtered.nothing_to_review:
+                    filetypes = ", ".join(sorted(parsed.extensions())) or "generated or binary"
+                    logger.info(f"Only non-source files changed ({filetypes}), skipping LLM review")
+                    return SKIPPED_FILES_REVIEW.format(filetypes=filetypes)
+                diff_content, parsed = filtered.diff_content, filtered.parsed
+
             # Extract file extensions from diff to check for non-source files
-            file_extensions = self._extract_file_extensions_from_diff(diff_content)
+            file_extensions = self._extract_file_extensions_from_diff(parsed)
 
             # Load coding guidelines if enabled
             guidelines_section = ""
+            guidelines_hash = ""
             if Config.GUIDELINES_ENABLED:
                 try:
-                    guidelines_content = GuidelinesLoader.load_guidelines(Config.GUIDELINES_FILE)
                     # Detect programming language from diff to extract relevant guidelines
-                    detected_language = self._detect_language_from_diff(diff_content)
+                    detected_language = self._detect_language_from_diff(parsed)
 
                     if detected_language:
                         logger.info(f"Detected language: {detected_language}, extracting relevant guidelines")
-                        guidelines_section = f"""### 📋 **Coding Guidelines**
-
-The following coding guidelines MUST be followed. Pay special attention to "Rules (Must Comply)" sections:
-
-{GuidelinesLoader.extract_language_guidelines(guidelines_content, detected_language)}"""
                     else:
                         logger.info("No specific language detected, including general principles only")
-                        guidelines_section = f"""### 📋 **Coding Guidelines**
-
-The following general coding principles MUST be followed:
-
-{GuidelinesLoader.extract_language_guidelines(guidelines_content, None)}"""
+                    # Checking the file for changes (and reloading it) reads the disk, so keep it off the event loop
+                    guidelines_section, guidelines_hash = await asyncio.to_thread(
+                        self._load_guidelines_section, project_key, detected_language, parsed
+                    )
 
                     logger.info(f"Guidelines section prepared ({len(guidelines_section)} chars)")
                 except Exception as e:
                     logger.error(f"Error loading guidelines: {e}, proceeding without guidelines")
                     guidelines_section = ""
+                    guidelines_hash = ""
             else:
                 logger.info("Coding guidelines are disabled (GUIDELINES_ENABLED=false)")
 
-            # Prepare the prompt with guidelines
-            prompt = Config.REVIEW_PROMPT_TEMPLATE.format(
-                diff_content=diff_content, guidelines_section=guidelines_section
-            )
+            # Give an incremental review the earlier findings, so it neither repeats nor loses them
+            review_context = ""
+            if previous_review:
+                review_context = Config.REVIEW_INCREMENTAL_CONTEXT_TEMPLATE.format(
+                    previous_review=self.token_counter.truncate(
+                        previous_review, Config.REVIEW_PREVIOUS_FINDINGS_MAX_TOKENS
+                    )
+                )
 
-            # Replace <filetypes> placeholder with actual file extensions
-            # This ensures the LLM response shows actual file types instead of the placeholder
-            if file_extensions and "<filetypes>" in prompt:
-                filetypes_str = ", ".join(sorted(file_extensions))
-                prompt = prompt.replace("<filetypes>", filetypes_str)
-                logger.info(f"Replaced <filetypes> placeholder with: {filetypes_str}")
-
-            # Truncate if too long (to avoid token limits)
-            max_chars = 80000  # Increased limit to accommodate guidelines (adjust based on your model's context window)
-            if len(prompt) > max_chars:
-                logger.warning(f"Prompt too long ({len(prompt)} chars), truncating to {max_chars}")
-                # Calculate how much space we have for diff after guidelines
-                available_chars = max_chars - len(guidelines_section) - 2000  # Reserve 2000 chars for template
-                if available_chars < 5000:
-                    # If guidelines are too large, truncate them too
-                    logger.warning("Guidelines too large, truncating guidelines section")
-                    guidelines_section = guidelines_section[:15000] + "\n\n[... guidelines truncated ...]"
-                    available_chars = max_chars - len(guidelines_section) - 2000
-
-                truncated_diff = diff_content[:available_chars] + "\n\n[... diff truncated ...]"
-                prompt = Config.REVIEW_PROMPT_TEMPLATE.format(
-                    diff_content=truncated_diff, guidelines_section=guidelines_section
+            # Return the stored review if this exact change was already reviewed with the same inputs
+            cache_key = None
+            if self.review_cache is not None:
+                cache_key = ReviewCache.build_key(
+                    diff_content,
+                    guidelines_section + review_context,
+                    self.provider,
+                    self.model,
+                    Config.REVIEW_PROMPT_TEMPLATE,
+                    guidelines_hash=guidelines_hash,
                 )
+                cached_review = await self.review_cache.get(cache_key)
+                if cached_review is not None:
+                    metrics.cache_hit = True
+                    return cached_review
+
+            # Budget the prompt in tokens; diffs that do not fit are reviewed in chunks and merged
+            counter = self.token_counter
+            budget = self.prompt_budget
+            empty_prompt = Config.REVIEW_PROMPT_TEMPLATE.format(diff_content="", guidelines_section="")
+            template_tokens = counter.count(empty_prompt) + counter.count(review_context)
+            guidelines_tokens = counter.count(guidelines_section)
+            diff_tokens = counter.count(diff_content)
+            guidelines_allowed, diff_allowed = budget.allocate(template_tokens, guidelines_tokens, diff_tokens)
+            logger.info(
+                f"Prompt budget ({counter.name}): template={template_tokens}, guidelines={guidelines_tokens}, "
+                f"diff={diff_tokens}/{diff_allowed} tokens (prompt limit {budget.prompt_tokens})"
+            )
 
-                # Replace <filetypes> placeholder again after re-formatting
-                if file_extensions and "<filetypes>" in prompt:
-                    filetypes_str = ", ".join(sorted(file_extensions))
-                    prompt = prompt.replace("<filetypes>", filetypes_str)
+            if guidelines_allowed < guidelines_tokens:
+                logger.warning(f"Guidelines too large, truncating guidelines section to {guidelines_allowed} tokens")
+                guidelines_section = (
+                    counter.truncate(guidelines_section, max(guidelines_allowed - 10, 0))
+                    + "\n\n[... guidelines truncated ...]"
+                )
 
-            if self.provider == "openai":
-                return await self._get_openai_review(prompt)
-            elif self.provider == "local_ollama":
-                return await self._get_ollama_review(prompt)
+            complete = True
+            if diff_tokens <= diff_allowed:
+                prompt = self._build_review_prompt(diff_content, guidelines_section, file_extensions, review_context)
+                review = await self._request_review(prompt, metrics)
             else:
-                logger.error(f"Unknown LLM provider: {self.provider}")
-                return None
+                logger.warning(f"Diff too long ({diff_tokens} > {diff_allowed} tokens), reviewing in chunks")
+                review, complete = await self._get_chunked_review(
+                    diff_content, guidelines_section, diff_allowed, metrics, review_context, parsed
+                )
+
+            # Partial output from a stalled stream, or a chunked review with failed or unmerged parts, is
+            # returned but never cached
+            cacheable = complete and not metrics.partial_output
+            if review and cacheable and cache_key is not None and self.review_cache is not None:
+                await self.review_cache.put(cache_key, review, self.provider, self.model)
+            return review
 
         except Exception as e:
             logger.error(f"Error getting code review: {str(e)}")
+            if is_retryable(e):
+                raise
+            return None
+
+    @staticmethod
+    def _load_guidelines_section(project_key: str | None, language: str | None, parsed: ParsedDiff) -> tuple[str, str]:
+        """Get the guidelines prompt section for a diff and the content hash of its file (blocking)"""
+        guidelines_file = GuidelinesLoader.guidelines_file_for(project_key)
+        if Config.GUIDELINES_RETRIEVAL_ENABLED:
+            section = GuidelinesLoader.select_guidelines_section(
+                guidelines_file, language, parsed, Config.GUIDELINES_RETRIEVAL_TOP_K
+            )
+        else:
+            section = GuidelinesLoader.render_guidelines_section(guidelines_file, language)
+        return section, GuidelinesLoader.content_hash(guidelines_file)
+
+    def _build_review_prompt(
+        self, diff_content: str, guidelines_section: str, file_extensions: set[str], review_context: str = ""
+    ) -> str:
+        """Fill the review prompt template for a diff, followed by any review context"""
+        prompt = Config.REVIEW_PROMPT_TEMPLATE.format(diff_content=diff_content, guidelines_section=guidelines_section)
+        if review_context:
+            prompt = f"{prompt}\n\n{review_context}"
+
+        # Replace <filetypes> placeholder with actual file extensions
+        # This ensures the LLM response shows actual file types instead of the placeholder
+        if file_extensions and "<filetypes>" in prompt:
+            filetypes_str = ", ".join(sorted(file_extensions))
+            prompt = prompt.replace("<filetypes>", filetypes_str)
+            logger.info(f"Replaced <filetypes> placeholder with: {filetypes_str}")
+
+        return prompt
+
+    async def _request_review(self, prompt: str, metrics: ReviewMetrics | None = None) -> str | None:
+        """Send a prompt to the configured provider, adding its token counts and timings to metrics"""
+        if self.provider == "openai":
+            get_review = self._get_openai_review
+        elif self.provider == "local_ollama":
+            get_review = self._get_ollama_review
+        else:
+            logger.error(f"Unknown LLM provider: {self.provider}")
             return None
 
-    async def _get_openai_review(self, prompt: str) -> str | None:
-        """Get code review from OpenAI API"""
+        stats = LLMRequestStats()
+        prompt_tokens = self.token_counter.count(prompt)
+        review = await get_review(prompt, stats, prompt_tokens + Config.LLM_MAX_OUTPUT_TOKENS)
+
+        if metrics is not None:
+            metrics.record_request(
+                stats,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=self.token_counter.count(review) if review else 0,
+            )
+        return review
+
+    async def _get_chunked_review(
+        self,
+        diff_content: str,
+        guidelines_section: str,
+        diff_tokens: int,
+        metrics: ReviewMetrics | None = None,
+        review_context: str = "",
+        parsed: ParsedDiff | None = None,
+    ) -> tuple[str | None, bool]:
+        """
+        Review a diff that is too large for one prompt: review file/hunk chunks concurrently, then merge.
+
+        Returns:
+            The review, and whether it is complete (every chunk was reviewed and the LLM merged them)
+
+        Raises:
+            A transient provider error if no chunk could be reviewed because of one
+        """
+        # Leave headroom for the <filetypes> expansion and for token counts not adding up exactly across joins
+        chunk_tokens = max(int(diff_tokens * 0.95) - 20, 1)
+        chunks = split_diff_into_chunks(diff_content, chunk_tokens, self.token_counter.count, parsed=parsed)
+        semaphore = asyncio.Semaphore(max(Config.REVIEW_CHUNK_CONCURRENCY, 1))
+
+        async def review_chunk(chunk: str) -> str | None:
+            async with semaphore:
+                prompt = self._build_review_prompt(
+                    chunk,
+                    guidelines_section,
+                    self._extract_file_extensions_from_diff(parse_diff(chunk)),
+                    review_context,
+                )
+                return await self._request_review(prompt, metrics)
+
+        results = await asyncio.gather(*(review_chunk(chunk) for chunk in chunks), return_exceptions=True)
+
+        partial_reviews: list[tuple[int, str]] = []
+        for index, result in enumerate(results, start=1):
+            if isinstance(result, BaseException) or not result:
+                logger.error(f"Review of diff chunk {index}/{len(chunks)} failed: {result}")
+                continue
+            partial_reviews.append((index, result))
+
+        if not partial_reviews:
+            for result in results:
+                if isinstance(result, Exception) and is_retryable(result):
+                    raise result
+            return None, False
+        if len(chunks) == 1:
+            return partial_reviews[0][1], True
+        return await self._merge_chunk_reviews(partial_reviews, len(chunks), metrics)
+
+    async def _merge_chunk_reviews(
+        self, partial_reviews: list[tuple[int, str]], chunk_count: int, metrics: ReviewMetrics | None = None
+    ) -> tuple[str, bool]:
+        """
+        Merge per-chunk reviews into one structured report, concatenating them if the LLM merge fails.
+
+        Returns:
+            The merged review, and whether it is complete (no chunk missing and no concatenation fallback)
+        """
+        sections = "\n\n".join(
+            f"### Partial review {index} of {chunk_count}\n\n{review}" for index, review in partial_reviews
+        )
+
+        merged: str | None
+        complete = len(partial_reviews) == chunk_count
+        if all(review.strip() == NO_ISSUES_REVIEW for _, review in partial_reviews):
+            merged = NO_ISSUES_REVIEW
+        else:
+            merged = None
+            merge_prompt = Config.REVIEW_MERGE_PROMPT_TEMPLATE.format(chunk_count=chunk_count, partial_reviews=sections)
+            if self.prompt_budget.fits(self.token_counter.count(merge_prompt)):
+                try:
+                    merged = await self._request_review(merge_prompt, metrics)
+                except Exception as e:
+                    logger.error(f"Error merging chunk reviews: {str(e)}")
+            if not merged:
+                logger.warning("Could not merge chunk reviews with the LLM, concatenating partial reviews")
+                merged = f"# 🤖 AI Code Review\n\n{sections}"
+                complete = False
+
+        missing = chunk_count - len(partial_reviews)
+        if missing:
+            merged += f"\n\n> ⚠️ {missing} of {chunk_count} parts of this diff could not be reviewed."
+
+        logger.info(f"Merged {len(partial_reviews)} chunk review(s) into one review ({len(merged)} characters)")
+        return merged, complete
+
+    def _rate_limited[T](self, operation: Callable[[], Awaitable[T]], tokens: int) -> Callable[[], Awaitable[T]]:
+        """Wrap one request attempt so every attempt, including retries, waits for its own rate limiter slot"""
+
+        async def attempt() -> T:
+            async with self.rate_limiter.acquire(tokens):
+                return await operation()
+
+        return attempt
+
+    async def _get_openai_review(
+        self, prompt: str, stats: LLMRequestStats | None = None, reserved_tokens: int = 0
+    ) -> str | None:
+        """Get code review from OpenAI API, raising transient errors once retries are exhausted"""
         try:
             headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
 
@@ -176,60 +463,212 @@ The following general coding principles MUST be followed:
                     },
                     {"role": "user", "content": prompt},
                 ],
-                "max_tokens": 2000,
+                "max_tokens": Config.LLM_MAX_OUTPUT_TOKENS,
                 "temperature": 0.1,
             }
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(self.endpoint, headers=headers, json=payload)
+            if self.streaming:
+                payload["stream"] = True
+                return await call_with_retry(
+                    self._rate_limited(
+                        lambda: self._stream_review(
+                            "OpenAI", self.endpoint, payload, self._parse_openai_stream_line, stats, headers=headers
+                        ),
+                        reserved_tokens,
+                    ),
+                    self.retry_policy,
+                    "OpenAI review",
+                )
+
+            async def send() -> str | None:
+                started = time.monotonic()
+                client = await self._get_http_client()
+                response = await client.post(self.endpoint, headers=headers, json=payload, timeout=60.0)
+                self.rate_limiter.observe_response(response.status_code, response.headers)
 
                 if response.status_code == 200:
                     result = response.json()
                     review = result["choices"][0]["message"]["content"].strip()
+                    if stats is not None:
+                        stats.generation_seconds = time.monotonic() - started
                     logger.info(f"Received OpenAI review ({len(review)} characters)")
                     return str(review)
-                else:
-                    logger.error(f"OpenAI API error: {response.status_code} - {response.text}")
-                    return None
+                raise_for_transient_status(response, "OpenAI API error")
+                logger.error(f"OpenAI API error: {response.status_code} - {response.text}")
+                return None
+
+            return await call_with_retry(self._rate_limited(send, reserved_tokens), self.retry_policy, "OpenAI review")
 
         except Exception as e:
             logger.error(f"Error calling OpenAI API: {str(e)}")
+            if is_retryable(e):
+                raise
             return None
 
-    async def _get_ollama_review(self, prompt: str) -> str | None:
-        """Get code review from Ollama API"""
+    async def _get_ollama_review(
+        self, prompt: str, stats: LLMRequestStats | None = None, reserved_tokens: int = 0
+    ) -> str | None:
+        """Get code review from Ollama API, raising transient errors once retries are exhausted"""
         try:
             payload = {
                 "model": self.model,
                 "prompt": prompt,
-                "stream": False,
-                "options": {"temperature": 0.1, "top_p": 0.9, "num_predict": 2000},
+                "stream": self.streaming,
+                "options": {
+                    "temperature": 0.1,
+                    "top_p": 0.9,
+                    "num_predict": Config.LLM_MAX_OUTPUT_TOKENS,
+                    # Ollama silently truncates prompts longer than its (small) default context
+                    "num_ctx": self.prompt_budget.context_tokens,
+                },
             }
 
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(f"{self.ollama_host}/api/generate", json=payload)
+            if self.streaming:
+                return await call_with_retry(
+                    self._rate_limited(
+                        lambda: self._stream_review(
+                            "Ollama", f"{self.ollama_host}/api/generate", payload, self._parse_ollama_stream_line, stats
+                        ),
+                        reserved_tokens,
+                    ),
+                    self.retry_policy,
+                    "Ollama review",
+                )
+
+            async def send() -> str | None:
+                started = time.monotonic()
+                client = await self._get_http_client()
+                response = await client.post(f"{self.ollama_host}/api/generate", json=payload, timeout=120.0)
 
                 if response.status_code == 200:
                     result = response.json()
                     review = result.get("response", "").strip()
+                    if stats is not None:
+                        stats.generation_seconds = time.monotonic() - started
                     logger.info(f"Received Ollama review ({len(review)} characters)")
                     return str(review)
-                else:
-                    logger.error(f"Ollama API error: {response.status_code} - {response.text}")
-                    return None
+                raise_for_transient_status(response, "Ollama API error")
+                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                return None
+
+            return await call_with_retry(self._rate_limited(send, reserved_tokens), self.retry_policy, "Ollama review")
 
         except Exception as e:
             logger.error(f"Error calling Ollama API: {str(e)}")
+            if is_retryable(e):
+                raise
             return None
 
-    def _clean_diff_for_review(self, diff_content: str) -> str:
+    async def _stream_review(
+        self,
+        provider_name: str,
+        url: str,
+        payload: dict[str, Any],
+        parse_line: Callable[[str], tuple[str | None, bool]],
+        stats: LLMRequestStats | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> str | None:
+        """
+        Stream a review and return the collected text.
+
+        Instead of a total timeout, the stream is abandoned when no token arrives for
+        LLM_STREAM_IDLE_TIMEOUT seconds (LLM_FIRST_TOKEN_TIMEOUT before the first token, which
+        covers model loading and prompt processing). Text received before a stall or a dropped
+        connection is returned with a notice if LLM_STREAM_KEEP_PARTIAL is enabled.
+        """
+        stats = stats if stats is not None else LLMRequestStats()
+        stats.streamed = True
+        stats.completed = False  # Set once the provider's end-of-stream marker arrives
+        parts: list[str] = []
+        first_token_at: float | None = None
+        started = time.monotonic()
+
+        client = await self._get_http_client()
+        # The read timeout is only a backstop; idle detection below switches to the shorter timeout
+        timeout = httpx.Timeout(10.0, read=max(Config.LLM_FIRST_TOKEN_TIMEOUT, Config.LLM_STREAM_IDLE_TIMEOUT))
+        try:
+            async with client.stream("POST", url, json=payload, headers=headers, timeout=timeout) as response:
+                self.rate_limiter.observe_response(response.status_code, response.headers)
+                if response.status_code != 200:
+                    await response.aread()
+                    raise_for_transient_status(response, f"{provider_name} API error")
+                    logger.error(f"{provider_name} API error: {response.status_code} - {response.text}")
+                    return None
+
+                lines = response.aiter_lines()
+                while True:
+                    idle_timeout = Config.LLM_STREAM_IDLE_TIMEOUT if parts else Config.LLM_FIRST_TOKEN_TIMEOUT
+                    try:
+                        line = await asyncio.wait_for(anext(lines), timeout=idle_timeout)
+                    except StopAsyncIteration:
+                        break
+                    except TimeoutError:
+                        logger.warning(f"{provider_name} stream idle for {idle_timeout}s, abandoning request")
+                        break
+
+                    text, done = parse_line(line)
+                    if text:
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
+                            stats.first_token_seconds = first_token_at - started
+                        parts.append(text)
+                    if done:
+                        stats.completed = True
+                        break
+        except httpx.HTTPError as e:
+            if not parts:
+                raise
+            logger.warning(f"{provider_name} stream failed after {len(parts)} chunk(s): {str(e)}")
+        finally:
+            stats.generation_seconds = time.monotonic() - (first_token_at or started)
+
+        review = "".join(parts).strip()
+        if stats.completed:
+            logger.info(
+                f"Received {provider_name} review ({len(review)} characters, "
+                f"first token after {stats.first_token_seconds or 0:.2f}s)"
+            )
+            return review
+
+        # Without a completion marker the response was cut short
+        if not review or not Config.LLM_STREAM_KEEP_PARTIAL:
+            logger.error(f"{provider_name} stream ended before the review was complete")
+            return None
+        logger.warning(f"Keeping partial {provider_name} review ({len(review)} characters)")
+        return f"{review}\n\n{PARTIAL_REVIEW_NOTICE}"
+
+    @staticmethod
+    def _parse_openai_stream_line(line: str) -> tuple[str | None, bool]:
+        """Parse one server-sent event line from the OpenAI streaming API into (text, done)"""
+        if not line.startswith("data:"):
+            return None, False
+        data = line[len("data:") :].strip()
+        if data == "[DONE]":
+            return None, True
+        event = json.loads(data)
+        choices = event.get("choices") or []
+        if not choices:
+            return None, False
+        return choices[0].get("delta", {}).get("content"), False
+
+    @staticmethod
+    def _parse_ollama_stream_line(line: str) -> tuple[str | None, bool]:
+        """Parse one NDJSON line from the Ollama streaming API into (text, done)"""
+        if not line.strip():
+            return None, False
+        event = json.loads(line)
+        if "error" in event:
+            raise ValueError(f"Ollama stream error: {event['error']}")
+        return event.get("response"), bool(event.get("done"))
+
+    def _clean_diff_for_review(self, diff_content: str | ParsedDiff) -> str:
         """Clean and prepare diff content for review"""
-        lines = diff_content.split("\n")
+        parsed = diff_content if isinstance(diff_content, ParsedDiff) else parse_diff(diff_content)
         cleaned_lines = []
 
-        for line in lines:
+        for line in parsed.lines:
             # Skip binary file indicators
-            if line.startswith("Binary files") or "differ" in line:
+            if line.startswith(BINARY_PREFIX):
                 continue
 
             # Skip very long lines that might be minified code
@@ -268,56 +707,36 @@ Provide a concise summary review:"""
             logger.error(f"Error getting summary review: {str(e)}")
             return None
 
-    def _extract_file_extensions_from_diff(self, diff_content: str) -> set[str]:
+    def _extract_file_extensions_from_diff(self, parsed: ParsedDiff) -> set[str]:
         """
         Extract all unique file extensions from the diff content.
 
         Args:
-            diff_content: The git diff content
+            parsed: The parsed git diff
 
         Returns:
             A set of unique file extensions (e.g., {".py", ".cs", ".xml"})
         """
-        import re
-
-        # Extract file paths from diff headers (diff --git a/path b/path or +++ b/path)
-        file_pattern = r"(?:diff --git a/.*? b/|^\+\+\+ b/)(.+?)(?:\s|$)"
-        files = re.findall(file_pattern, diff_content, re.MULTILINE)
-
-        if not files:
+        if not parsed.files:
             logger.debug("No files found in diff")
-            return set()
-
-        # Extract unique file extensions
-        extensions = set()
-        for file_path in files:
-            if "." in file_path:
-                ext = "." + file_path.rsplit(".", 1)[1].lower()
-                extensions.add(ext)
+        return parsed.extensions()
 
-        return extensions
-
-    def _detect_language_from_diff(self, diff_content: str) -> str | None:
+    def _detect_language_from_diff(self, parsed: ParsedDiff) -> str | None:
         """
         Detect the primary programming language from the diff content.
 
         Analyzes file extensions in the diff to determine the dominant language.
 
         Args:
-            diff_content: The git diff content
+            parsed: The parsed git diff
 
         Returns:
             The detected language name (e.g., "Python", "C#", "JavaScript/TypeScript")
             or None if no clear language is detected
         """
-        import re
         from collections import Counter
 
-        # Extract file paths from diff headers (diff --git a/path b/path or +++ b/path)
-        file_pattern = r"(?:diff --git a/.*? b/|^\+\+\+ b/)(.+?)(?:\s|$)"
-        files = re.findall(file_pattern, diff_content, re.MULTILINE)
-
-        if not files:
+        if not parsed.files:
             logger.debug("No files found in diff")
             return None
 
@@ -343,12 +762,10 @@ Provide a concise summary review:"""
 
         # Count occurrences of each language
         language_counter: Counter[str] = Counter()
-        for file_path in files:
-            # Get file extension
-            if "." in file_path:
-                ext = "." + file_path.rsplit(".", 1)[1].lower()
-                if ext in extension_map:
-                    language_counter[extension_map[ext]] += 1
+        for diff_file in parsed.files:
+            ext = diff_file.extension
+            if ext is not None and ext in extension_map:
+                language_counter[extension_map[ext]] += 1
 
         if not language_counter:
             logger.debug("No recognized file extensions found in diff")
@@ -0,0 +1,181 @@
+"""Process-wide scheduler that keeps LLM requests within concurrency and provider rate limits."""
+
+import asyncio
+import logging
+import re
+import time
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class _TokenBucket:
+    """Bucket that refills continuously up to a per-minute capacity."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.refill_rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be taken (requests larger than the bucket wait for a full bucket)."""
+        needed = min(amount, self.capacity) - self.available
+        return max(needed / self.refill_rate, 0.0)
+
+    def take(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """
+    Get how long the provider asked us to back off, in seconds.
+
+    Understands Retry-After (seconds or HTTP date), retry-after-ms and the OpenAI
+    x-ratelimit-reset-* headers (e.g. '1s', '6m0s', '250ms') when the matching remaining count is 0.
+    """
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except (TypeError, ValueError):
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except (TypeError, ValueError):
+            try:
+                return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+
+    delays = []
+    for limit in ("requests", "tokens"):
+        if headers.get(f"x-ratelimit-remaining-{limit}") == "0":
+            reset = _parse_duration(headers.get(f"x-ratelimit-reset-{limit}", ""))
+            if reset is not None:
+                delays.append(reset)
+    return max(delays) if delays else None
+
+
+def _parse_duration(value: str) -> float | None:
+    """Parse a Go-style duration such as '6m0s' or '250ms' into seconds."""
+    parts = _DURATION_PATTERN.findall(value.strip())
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class LLMRateLimiter:
+    """
+    Admits LLM requests in arrival order while respecting a concurrency cap, requests per minute
+    and tokens per minute, and pauses all requests when the provider signals a rate limit.
+
+    Callers queue on a FIFO lock; only the caller at the head waits for capacity, so a large
+    request is never starved by a stream of small ones. A limit of 0 disables that limit.
+    """
+
+    def __init__(self, max_concurrent: int, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.max_concurrent = max(max_concurrent, 1)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_bucket = _TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._token_bucket = _TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._in_flight = 0
+        self._waiting = 0
+        self._paused_until = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue_lock = asyncio.Lock()
+        self._slot_freed = asyncio.Event()
+
+    def _bind_loop(self) -> None:
+        """Recreate the asyncio primitives if used from a new event loop (e.g. between test runs)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue_lock = asyncio.Lock()
+            self._slot_freed = asyncio.Event()
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 0) -> AsyncIterator[None]:
+        """Wait for a slot for a request of roughly this many tokens (prompt plus expected output)"""
+        self._bind_loop()
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            async with self._queue_lock:
+                await self._wait_for_capacity(tokens)
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - started
+        if waited >= 1:
+            logger.info(f"LLM request waited {waited:.1f}s for the rate limiter")
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._slot_freed.set()
+
+    async def _wait_for_capacity(self, tokens: int) -> None:
+        """Block the head of the queue until every limit admits the request, then reserve it"""
+        while True:
+            if self._in_flight >= self.max_concurrent:
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+                continue
+
+            now = time.monotonic()
+            delay = max(self._paused_until - now, 0.0)
+            for bucket, amount in ((self._request_bucket, 1), (self._token_bucket, tokens)):
+                if bucket is not None:
+                    bucket.refill(now)
+                    delay = max(delay, bucket.wait_time(amount))
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            for bucket, amount in ((self._request_bucket, 1), (self._token_bucket, tokens)):
+                if bucket is not None:
+                    bucket.take(amount)
+            self._in_flight += 1
+            return
+
+    def pause(self, seconds: float) -> None:
+        """Hold back new requests for this long (extends, never shortens, an existing pause)"""
+        until = time.monotonic() + seconds
+        if until > self._paused_until:
+            logger.warning(f"LLM provider rate limit reached, pausing new requests for {seconds:.1f}s")
+            self._paused_until = until
+
+    def observe_response(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Honor rate-limit signals from a provider response"""
+        delay = parse_retry_after(headers)
+        if delay is None and status_code == 429:
+            delay = 1.0
+        if delay:
+            self.pause(delay)
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of limiter usage for health reporting"""
+        return {
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "max_concurrent": self.max_concurrent,
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "paused_for_seconds": round(max(self._paused_until - time.monotonic(), 0.0), 1),
+        }
@@ -0,0 +1,132 @@
+"""Retry policy shared by the LLM and Bitbucket clients: error classification, capped backoff with jitter."""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import httpx
+
+from ai_code_reviewer.api.clients.rate_limiter import parse_retry_after
+
+
+logger = logging.getLogger(__name__)
+
+# Statuses that signal a temporary condition on the server side
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Statuses that guarantee the request was not processed, so even non-idempotent requests may be resent
+NOT_PROCESSED_STATUS_CODES = frozenset({425, 429})
+
+# Failures that happen before the request reaches the server
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Failures that may happen after the server received the request
+TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+class RetryableError(Exception):
+    """An HTTP response with a transient error status"""
+
+    def __init__(self, message: str, status_code: int, retry_after: float | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def raise_for_transient_status(response: httpx.Response, message: str) -> None:
+    """Raise RetryableError if the response has a status worth retrying"""
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        raise RetryableError(
+            f"{message}: {response.status_code} - {response.text}",
+            status_code=response.status_code,
+            retry_after=parse_retry_after(response.headers),
+        )
+
+
+def is_retryable(error: BaseException, idempotent: bool = True) -> bool:
+    """
+    Decide whether a failed attempt may be retried.
+
+    Idempotent requests are retried on any transient status or network error. Other requests
+    (e.g. posting a comment) are only retried when the server cannot have processed them.
+    """
+    if isinstance(error, RetryableError):
+        return idempotent or error.status_code in NOT_PROCESSED_STATUS_CODES
+    if isinstance(error, NOT_SENT_ERRORS):
+        return True
+    return idempotent and isinstance(error, TRANSIENT_ERRORS)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Capped exponential backoff with full jitter and an overall deadline."""
+
+    max_attempts: int = 3
+    base_delay: float = 1.0  # Seconds before the first retry (upper bound of the jitter window)
+    max_delay: float = 30.0  # Cap on a single backoff
+    deadline: float = 0.0  # Total seconds across all attempts and backoffs (0 = no deadline)
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait after the given failed attempt (1-based), honoring a server hint"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))  # noqa: S311
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+@dataclass
+class RetryTracker:
+    """Counts retries made while processing one review, for failure logging"""
+
+    retries: int = 0
+
+
+_retry_tracker: ContextVar[RetryTracker | None] = ContextVar("retry_tracker", default=None)
+
+
+def begin_retry_tracking() -> RetryTracker:
+    """Start counting retries for the review processed in the current task"""
+    tracker = RetryTracker()
+    _retry_tracker.set(tracker)
+    return tracker
+
+
+def current_retry_count() -> int:
+    """Retries made so far for the review processed in the current task"""
+    tracker = _retry_tracker.get()
+    return tracker.retries if tracker is not None else 0
+
+
+async def call_with_retry[T](
+    operation: Callable[[], Awaitable[T]], policy: RetryPolicy, description: str, idempotent: bool = True
+) -> T:
+    """
+    Run an async operation, retrying transient failures according to policy.
+
+    Raises:
+        The last error once it is not retryable, attempts are exhausted or the deadline would be passed
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return await operation()
+        except Exception as e:
+            if attempt >= policy.max_attempts or not is_retryable(e, idempotent):
+                raise
+            delay = policy.backoff(attempt, getattr(e, "retry_after", None))
+            if policy.deadline > 0 and time.monotonic() - started + delay > policy.deadline:
+                logger.warning(f"{description} failed, retry deadline of {policy.deadline}s reached: {str(e)}")
+                raise
+            logger.warning(
+                f"{description} failed (attempt {attempt}/{policy.max_attempts}), retrying in {delay:.1f}s: {str(e)}"
+            )
+            tracker = _retry_tracker.get()
+            if tracker is not None:
+                tracker.retries += 1
+            await asyncio.sleep(delay)
@@ -15,10 +15,37 @@ class Config:
     BITBUCKET_URL = os.getenv("BITBUCKET_URL", "https://your-bitbucket-server.com")
     BITBUCKET_TOKEN = os.getenv("BITBUCKET_TOKEN")  # This should be set as an environment variable
 
+    # Bitbucket HTTP connection pool (shared client opened in the app lifespan)
+    # All requests go to BITBUCKET_URL, so the pool limits are effectively per-host limits
+    BITBUCKET_MAX_CONNECTIONS = int(os.getenv("BITBUCKET_MAX_CONNECTIONS", "20"))
+    BITBUCKET_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("BITBUCKET_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    BITBUCKET_KEEPALIVE_EXPIRY = float(os.getenv("BITBUCKET_KEEPALIVE_EXPIRY", "30"))  # Seconds
+
+    # Bitbucket retries for transient errors (capped exponential backoff with jitter)
+    BITBUCKET_RETRY_MAX_ATTEMPTS = int(os.getenv("BITBUCKET_RETRY_MAX_ATTEMPTS", "3"))
+    BITBUCKET_RETRY_BASE_DELAY = float(os.getenv("BITBUCKET_RETRY_BASE_DELAY", "0.5"))  # Seconds
+    BITBUCKET_RETRY_MAX_DELAY = float(os.getenv("BITBUCKET_RETRY_MAX_DELAY", "10"))  # Seconds
+    BITBUCKET_RETRY_DEADLINE = float(os.getenv("BITBUCKET_RETRY_DEADLINE", "60"))  # Seconds, 0 = none
+
+    # Diffs are streamed; the download stops at BITBUCKET_DIFF_MAX_BYTES (0 = no limit) and the changes of
+    # any single file larger than BITBUCKET_DIFF_MAX_FILE_BYTES (e.g. vendored code) are left out
+    BITBUCKET_DIFF_MAX_BYTES = int(os.getenv("BITBUCKET_DIFF_MAX_BYTES", str(10 * 1024 * 1024)))
+    BITBUCKET_DIFF_MAX_FILE_BYTES = int(os.getenv("BITBUCKET_DIFF_MAX_FILE_BYTES", str(1024 * 1024)))
+
     LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")  # 'openai', 'local_ollama'
     LLM_API_KEY = os.getenv("LLM_API_KEY")  # Required for OpenAI
     LLM_ENDPOINT = os.getenv("LLM_ENDPOINT", "https://api.openai.com/v1/chat/completions")  # For OpenAI or local Ollama
     LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o")  # 'gpt-4o', 'llama3', 'qwen-coder'
+    # Context window in tokens; 0 looks it up from LLM_MODEL (see core/token_budget.py)
+    LLM_CONTEXT_TOKENS = int(os.getenv("LLM_CONTEXT_TOKENS", "0"))
+    LLM_MAX_OUTPUT_TOKENS = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "2000"))  # Reserved for the review response
+
+    # Stream LLM responses; a stalled stream is detected by the gap between tokens, not a total timeout
+    LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() == "true"
+    LLM_FIRST_TOKEN_TIMEOUT = float(os.getenv("LLM_FIRST_TOKEN_TIMEOUT", "120"))  # Seconds, includes model loading
+    LLM_STREAM_IDLE_TIMEOUT = float(os.getenv("LLM_STREAM_IDLE_TIMEOUT", "30"))  # Max seconds between tokens
+    # Keep the text received before a stream stalled (marked as partial) instead of failing the review
+    LLM_STREAM_KEEP_PARTIAL = os.getenv("LLM_STREAM_KEEP_PARTIAL", "true").lower() == "true"
 
     WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")  # Secret for Bitbucket webhooks
 
@@ -27,9 +54,57 @@ class Config:
     LOGIC_APP_FROM_EMAIL = os.getenv("LOGIC_APP_FROM_EMAIL", "pandiarajans@test.com")
     EMAIL_OPTOUT = os.getenv("EMAIL_OPTOUT", "true").lower() == "true"  # Default to true for testing
 
+    # Outbound email queue (emails are delivered by background workers)
+    EMAIL_WORKER_COUNT = int(os.getenv("EMAIL_WORKER_COUNT", "2"))
+    EMAIL_QUEUE_MAX_SIZE = int(os.getenv("EMAIL_QUEUE_MAX_SIZE", "1000"))
+    EMAIL_SEND_TIMEOUT = float(os.getenv("EMAIL_SEND_TIMEOUT", "30"))  # Seconds per delivery attempt
+    EMAIL_RETRY_MAX_ATTEMPTS = int(os.getenv("EMAIL_RETRY_MAX_ATTEMPTS", "3"))
+    EMAIL_SHUTDOWN_TIMEOUT = float(os.getenv("EMAIL_SHUTDOWN_TIMEOUT", "10"))  # Seconds to flush queue on shutdown
+
+    # Digest mode: combine reviews for the same recipients into one email per window
+    EMAIL_DIGEST_ENABLED = os.getenv("EMAIL_DIGEST_ENABLED", "false").lower() == "true"
+    EMAIL_DIGEST_WINDOW_SECONDS = float(os.getenv("EMAIL_DIGEST_WINDOW_SECONDS", "300"))
+    EMAIL_DIGEST_MAX_REVIEWS = int(os.getenv("EMAIL_DIGEST_MAX_REVIEWS", "20"))  # Send early at this many reviews
+
     # Paths for local LLM (if using Ollama)
     OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 
+    # LLM HTTP connection pool (shared client opened in the app lifespan)
+    LLM_HTTP2 = os.getenv("LLM_HTTP2", "false").lower() == "true"  # Requires the optional 'h2' package
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))  # Seconds
+
+    # Process-wide LLM request scheduling (0 disables the per-minute limits)
+    LLM_MAX_CONCURRENT_REQUESTS = int(os.getenv("LLM_MAX_CONCURRENT_REQUESTS", "4"))
+    LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+    LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))  # Prompt plus max output tokens
+
+    # LLM retries for transient errors (capped exponential backoff with jitter)
+    LLM_RETRY_MAX_ATTEMPTS = int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "3"))
+    LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "2"))  # Seconds
+    LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "30"))  # Seconds
+    LLM_RETRY_DEADLINE = float(os.getenv("LLM_RETRY_DEADLINE", "300"))  # Seconds, 0 = none
+
+    # Files left out of the diff before prompting (a diff of only such files gets no LLM call).
+    # Extensions and glob patterns are comma-separated; a pattern without "/" also matches in subdirectories.
+    REVIEW_FILE_FILTER_ENABLED = os.getenv("REVIEW_FILE_FILTER_ENABLED", "true").lower() == "true"
+    REVIEW_SKIP_EXTENSIONS = os.getenv(
+        "REVIEW_SKIP_EXTENSIONS",
+        ".ini,.xml,.json,.res,.resx,.xcf,.pdf,.docx,.exe,.dll,.xlsx,.png,.jpg,.jpeg,.gif,.ico,.svg,.lock,.map",
+    )
+    REVIEW_SKIP_PATTERNS = os.getenv(
+        "REVIEW_SKIP_PATTERNS",
+        "package-lock.json,yarn.lock,pnpm-lock.yaml,poetry.lock,Pipfile.lock,Cargo.lock,composer.lock,Gemfile.lock,"
+        "go.sum,packages.lock.json,uv.lock,vendor/*,node_modules/*,third_party/*,*.min.js,*.min.css,*.designer.cs,"
+        "*.g.cs,*.g.i.cs,*.generated.*,*_pb2.py,*_pb2_grpc.py,*.pb.go",
+    )
+    REVIEW_ATTRIBUTES_FILE = os.getenv("REVIEW_ATTRIBUTES_FILE")  # Optional .gitattributes-style file
+    REVIEW_MINIFIED_LINE_LENGTH = int(os.getenv("REVIEW_MINIFIED_LINE_LENGTH", "1000"))  # 0 = no minified check
+    # Drop whitespace-only hunks, and answer diffs of only renames/moves, mode and whitespace changes with
+    # "No issues found." without an LLM call
+    REVIEW_SKIP_FORMATTING_CHANGES = os.getenv("REVIEW_SKIP_FORMATTING_CHANGES", "true").lower() == "true"
+
     # Review instructions for the AI
     REVIEW_PROMPT_TEMPLATE = """You are an expert AI code reviewer specializing in software design, performance, and security.
 You will receive a "git diff" containing changes that may span one or more files.
@@ -117,6 +192,46 @@ Here is the diff for your analysis:
 
 Please provide your complete review following the rules and structure above."""
 
+    # Large diffs are split on file/hunk boundaries and reviewed in parallel chunks, then merged
+    # Optional per-request prompt cap in tokens below the model's context window (0 = use the full window)
+    REVIEW_MAX_PROMPT_TOKENS = int(os.getenv("REVIEW_MAX_PROMPT_TOKENS", "0"))
+    REVIEW_CHUNK_CONCURRENCY = int(os.getenv("REVIEW_CHUNK_CONCURRENCY", "3"))  # Chunk reviews in flight per diff
+
+    # Instructions for merging per-chunk reviews of a large diff into one report
+    REVIEW_MERGE_PROMPT_TEMPLATE = """You are an expert AI code reviewer.
+A large "git diff" was split into {chunk_count} parts and each part was reviewed separately.
+Merge the partial reviews below into ONE code review for the whole change.
+
+- Use exactly the same markdown structure as the partial reviews (# 🤖 AI Code Review, Review Summary, Recommended Changes, Potential Issues Found, Recommended Best Practices).
+- Keep every concrete finding, including file names and guideline rule references; remove duplicates.
+- Write a single Review Summary covering the whole change and its overall risk level.
+- If a section has no findings in any part, use the standard "no findings" wording from the partial reviews.
+- If no part found any problem at all, respond only with: "No issues found."
+
+{partial_reviews}
+
+Please provide the merged review now."""
+
+    # Pull request updates are reviewed incrementally: only the commits pushed since the last review,
+    # with the previous findings as context (falls back to the full diff when there is no earlier review)
+    INCREMENTAL_PR_REVIEW_ENABLED = os.getenv("INCREMENTAL_PR_REVIEW_ENABLED", "true").lower() == "true"
+    REVIEW_PREVIOUS_FINDINGS_MAX_TOKENS = int(os.getenv("REVIEW_PREVIOUS_FINDINGS_MAX_TOKENS", "1500"))
+
+    # Appended to the review prompt for incremental pull request reviews
+    REVIEW_INCREMENTAL_CONTEXT_TEMPLATE = """### 🔁 Incremental Review
+This pull request was reviewed before. The diff above contains ONLY the commits pushed since that review,
+not the whole pull request.
+
+- Review only the changes in this diff.
+- Do not repeat previous findings that these changes do not touch.
+- If a change fixes a previous finding, say so in the Review Summary; if it makes one worse, report it again.
+- Under Recommended Changes, briefly list previous findings that are still unresolved.
+
+Previous review findings:
+---
+{previous_review}
+---"""
+
     # Server configuration
     # nosec B104: Binding to 0.0.0.0 is required for Docker containers to accept external connections
     # This is standard practice for containerized applications
@@ -131,6 +246,29 @@ Please provide your complete review following the rules and structure above."""
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./ai_code_reviewer.db")
     DATABASE_ECHO = os.getenv("DATABASE_ECHO", "false").lower() == "true"  # Enable SQL query logging
 
+    # Review job queue configuration
+    REVIEW_WORKER_COUNT = int(os.getenv("REVIEW_WORKER_COUNT", "2"))  # Concurrent review workers per process
+    REVIEW_JOB_POLL_INTERVAL = float(os.getenv("REVIEW_JOB_POLL_INTERVAL", "5"))  # Seconds between idle polls
+    REVIEW_JOB_MAX_ATTEMPTS = int(os.getenv("REVIEW_JOB_MAX_ATTEMPTS", "3"))
+    REVIEW_JOB_RETRY_DELAY = float(os.getenv("REVIEW_JOB_RETRY_DELAY", "30"))  # Seconds, multiplied by attempt
+    REVIEW_JOB_STALE_SECONDS = int(os.getenv("REVIEW_JOB_STALE_SECONDS", "1800"))  # Re-queue abandoned jobs
+    COMMIT_REVIEW_CONCURRENCY = int(os.getenv("COMMIT_REVIEW_CONCURRENCY", "4"))  # Changes reviewed at once per push
+    # Quiet window for pull request reviews: a newer event for the same PR within this window replaces the
+    # queued review, and a review already running in this process is cancelled in favour of the newer one
+    PR_REVIEW_DEBOUNCE_SECONDS = float(os.getenv("PR_REVIEW_DEBOUNCE_SECONDS", "30"))
+
+    # Review cache configuration (identical diffs reuse the stored review instead of calling the LLM)
+    REVIEW_CACHE_ENABLED = os.getenv("REVIEW_CACHE_ENABLED", "true").lower() == "true"
+    REVIEW_CACHE_TTL_SECONDS = int(os.getenv("REVIEW_CACHE_TTL_SECONDS", "604800"))  # 7 days
+    REVIEW_CACHE_MAX_ENTRIES = int(os.getenv("REVIEW_CACHE_MAX_ENTRIES", "5000"))  # LRU eviction above this
+
+    # Content blobs: review diffs, review text and failure payloads larger than CONTENT_BLOB_MIN_BYTES are
+    # compressed and stored once per distinct content; smaller ones stay inline in their row
+    CONTENT_BLOBS_ENABLED = os.getenv("CONTENT_BLOBS_ENABLED", "true").lower() == "true"
+    CONTENT_BLOB_MIN_BYTES = int(os.getenv("CONTENT_BLOB_MIN_BYTES", "512"))
+    CONTENT_BLOB_COMPRESSION = os.getenv("CONTENT_BLOB_COMPRESSION", "zlib").lower()  # "zlib", "zstd" or "none"
+    CONTENT_BLOB_COMPRESSION_LEVEL = int(os.getenv("CONTENT_BLOB_COMPRESSION_LEVEL", "6"))
+
     # Coding guidelines configuration
     GUIDELINES_FILE = os.getenv(
         "GUIDELINES_FILE",
@@ -141,6 +279,13 @@ Please provide your complete review following the rules and structure above."""
         ),
     )
     GUIDELINES_ENABLED = os.getenv("GUIDELINES_ENABLED", "true").lower() == "true"
+    # Optional directory of per-project guidelines: <dir>/<PROJECT_KEY>.md replaces GUIDELINES_FILE for that project
+    GUIDELINES_PROJECT_DIR = os.getenv("GUIDELINES_PROJECT_DIR")
+    # A cached guidelines file is re-read once its mtime or size changes, checked at most this often
+    GUIDELINES_RELOAD_CHECK_SECONDS = float(os.getenv("GUIDELINES_RELOAD_CHECK_SECONDS", "5"))
+    # Only send the guideline rules most relevant to the diff (BM25 over the rules of the language and shared sections)
+    GUIDELINES_RETRIEVAL_ENABLED = os.getenv("GUIDELINES_RETRIEVAL_ENABLED", "true").lower() == "true"
+    GUIDELINES_RETRIEVAL_TOP_K = int(os.getenv("GUIDELINES_RETRIEVAL_TOP_K", "8"))
 
     @classmethod
     def validate_config(cls):
@@ -0,0 +1,131 @@
+"""Split large unified diffs into prompt-sized chunks on file and hunk boundaries."""
+
+import logging
+from collections.abc import Callable
+
+from ai_code_reviewer.api.core.diff_parser import FILE_HEADER_PREFIX, HUNK_HEADER_PREFIX, ParsedDiff, parse_diff
+
+
+logger = logging.getLogger(__name__)
+
+SizeFunction = Callable[[str], int]
+
+
+def split_diff_by_file(diff_content: str | ParsedDiff) -> list[str]:
+    """
+    Split a multi-file diff into one section per file.
+
+    Args:
+        diff_content: The git diff content, or the already parsed diff
+
+    Returns:
+        List of per-file diff sections (any preamble before the first file is kept as its own section)
+    """
+    parsed = diff_content if isinstance(diff_content, ParsedDiff) else parse_diff(diff_content)
+    sections = [parsed.preamble()] + [parsed.file_text(diff_file) for diff_file in parsed.files]
+    return [section for section in sections if section.strip()]
+
+
+def _split_file_section(section: str, max_size: int, size_of: SizeFunction) -> list[str]:
+    """
+    Split one file's diff into pieces of at most max_size, cutting between hunks.
+
+    Every piece repeats the file header so the reviewer always knows which file it is reading.
+    A single hunk larger than max_size is cut between lines as a last resort.
+    """
+    lines = section.split("\n")
+    header_end = 0
+    if lines[0].startswith(FILE_HEADER_PREFIX):
+        header_end = next((i for i, line in enumerate(lines) if line.startswith(HUNK_HEADER_PREFIX)), 1)
+    header = "\n".join(lines[:header_end])
+    body_budget = max(max_size - size_of(header) - 1, 1)
+
+    hunks: list[list[str]] = []
+    for line in lines[header_end:]:
+        if line.startswith(HUNK_HEADER_PREFIX) or not hunks:
+            hunks.append([])
+        hunks[-1].append(line)
+
+    pieces: list[str] = []
+    current: list[str] = []
+    current_size = 0
+    for hunk in hunks:
+        hunk_text = "\n".join(hunk)
+        hunk_size = size_of(hunk_text)
+        if hunk_size > body_budget:
+            # Oversized hunk: flush what we have, then cut the hunk itself between lines
+            if current:
+                pieces.append("\n".join(current))
+                current, current_size = [], 0
+            for line in hunk:
+                for segment in _split_line(line, body_budget, size_of):
+                    segment_size = size_of(segment)
+                    if current and current_size + segment_size + 1 > body_budget:
+                        pieces.append("\n".join(current))
+                        current, current_size = [], 0
+                    current.append(segment)
+                    current_size += segment_size + 1
+            continue
+
+        if current and current_size + hunk_size + 1 > body_budget:
+            pieces.append("\n".join(current))
+            current, current_size = [], 0
+        current.extend(hunk)
+        current_size += hunk_size + 1
+
+    if current:
+        pieces.append("\n".join(current))
+
+    return [f"{header}\n{piece}" if header else piece for piece in pieces] or [header]
+
+
+def _split_line(line: str, max_size: int, size_of: SizeFunction) -> list[str]:
+    """Cut a single line longer than max_size (e.g. minified code) into segments that fit."""
+    line_size = size_of(line)
+    if line_size <= max_size:
+        return [line]
+    # Sizes may not be proportional to characters (tokens), so aim slightly below the budget
+    step = max(int(len(line) * max_size / line_size * 0.9), 1)
+    return [line[start : start + step] for start in range(0, len(line), step)]
+
+
+def split_diff_into_chunks(
+    diff_content: str, max_size: int, size_of: SizeFunction = len, parsed: ParsedDiff | None = None
+) -> list[str]:
+    """
+    Pack a diff into chunks of at most roughly max_size, keeping files whole where possible.
+
+    Whole files are packed together in diff order; a file that does not fit on its own is split
+    between hunks with its header repeated on each piece.
+
+    Args:
+        diff_content: The git diff content
+        max_size: Target maximum size of each chunk, in the units returned by size_of
+        size_of: Measures a piece of text (characters by default, or a token counter)
+        parsed: The diff already parsed by parse_diff, to avoid parsing it again
+
+    Returns:
+        List of diff chunks covering the whole input
+    """
+    if size_of(diff_content) <= max_size:
+        return [diff_content]
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_size = 0
+    for section in split_diff_by_file(parsed if parsed is not None else diff_content):
+        section_size = size_of(section)
+        pieces = [section] if section_size <= max_size else _split_file_section(section, max_size, size_of)
+        for piece in pieces:
+            piece_size = section_size if piece is section else size_of(piece)
+            if current and current_size + piece_size + 1 > max_size:
+                chunks.append("\n".join(current))
+                current, current_size = [], 0
+            current.append(piece)
+            current_size += piece_size + 1
+
+    if current:
+        chunks.append("\n".join(current))
+
+    logger.info(f"Split diff of {len(diff_content)} chars into {len(chunks)} chunk(s) of up to {max_size} units")
+    return chunks
@@ -0,0 +1,277 @@
+"""Drop generated, vendored, binary and lockfile changes from a diff before it is sent for review."""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+
+from ai_code_reviewer.api.core.config import Config
+from ai_code_reviewer.api.core.diff_parser import DiffFile, DiffHunk, ParsedDiff, parse_diff
+
+
+logger = logging.getLogger(__name__)
+
+# .gitattributes attributes that mark a path as not worth reviewing
+SKIP_ATTRIBUTES = ("linguist-generated", "linguist-vendored", "binary", "-diff")
+
+# Markers that code generators put at the top of the files they write
+GENERATED_MARKERS = (
+    "@generated",
+    "<auto-generated",
+    "code generated by",
+    "autogenerated by",
+    "generated by the protocol buffer compiler",
+)
+GENERATED_MARKER_LINES = 5
+
+# Asset, generated and lockfile names where a single long added line is enough to count as minified;
+# any other file is only minified when most of the lines in its hunks are that long
+MINIFIED_ASSET_SUFFIXES = (".min.js", ".map", ".css", ".lock")
+LOCKFILE_NAMES = frozenset(
+    {"package-lock.json", "npm-shrinkwrap.json", "pnpm-lock.yaml", "packages.lock.json", "composer.lock", "go.sum"}
+)
+
+# Skip reasons for changes that cannot affect behaviour; a diff of only these is answered "No issues found."
+FORMATTING_REASONS = frozenset({"whitespace only", "rename only", "mode change only"})
+
+# Files where indentation is syntax, so only whitespace after the indentation may change
+INDENTATION_SENSITIVE_EXTENSIONS = frozenset({".py", ".pyi", ".yaml", ".yml", ".coffee", ".haml", ".pug", ".sass"})
+
+# Files where tabs and spaces mean different things (Makefile recipes, TSV columns), so no whitespace change is skipped
+TAB_SENSITIVE_NAMES = frozenset({"makefile", "gnumakefile"})
+TAB_SENSITIVE_EXTENSIONS = frozenset({".mk", ".mak", ".make", ".tsv"})
+
+# Single-line string literals; whitespace inside them is content, not formatting
+STRING_LITERAL_PATTERN = re.compile(r""""(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|`(?:[^`\\\n]|\\.)*`""")
+
+
+def _indented_tokens(text: str) -> tuple[str, list[str]]:
+    """A line's indentation and its whitespace-separated tokens"""
+    return text[: len(text) - len(text.lstrip())], text.split()
+
+
+def _string_literals(lines: list[str]) -> list[str]:
+    """The string literals in some lines of code, in order"""
+    return [literal for line in lines for literal in STRING_LITERAL_PATTERN.findall(line)]
+
+
+def _is_tab_sensitive(diff_file: DiffFile) -> bool:
+    """True if a file's tabs cannot be swapped for spaces, such as a Makefile's recipe lines"""
+    name = (diff_file.path or "").rsplit("/", 1)[-1].lower()
+    return name in TAB_SENSITIVE_NAMES or diff_file.extension in TAB_SENSITIVE_EXTENSIONS
+
+
+def _split_setting(value: str) -> list[str]:
+    """Split a comma-separated setting into its non-empty items"""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def load_attribute_patterns(path: str | None) -> list[str]:
+    """
+    Read the path patterns marked generated, vendored or binary from a .gitattributes-style file.
+
+    A line such as "src/generated/** linguist-generated=true" or "*.png binary" adds its pattern;
+    attributes set to false (linguist-generated=false, -linguist-generated) are ignored.
+    """
+    if not path:
+        return []
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except OSError as e:
+        logger.error(f"Error reading review attributes file {path}: {e}")
+        return []
+
+    patterns = []
+    for line in lines:
+        parts = line.split("#", 1)[0].split()
+        if len(parts) < 2:
+            continue
+        for attribute in parts[1:]:
+            name, _, value = attribute.partition("=")
+            if name in SKIP_ATTRIBUTES and value != "false":
+                patterns.append(parts[0].replace("**", "*"))
+                break
+    return patterns
+
+
+@dataclass
+class FilteredDiff:
+    """The part of a diff that should be reviewed, and the files that were left out"""
+
+    diff_content: str
+    parsed: ParsedDiff
+    skipped: list[tuple[str, str]] = field(default_factory=list)  # (path, reason)
+
+    @property
+    def nothing_to_review(self) -> bool:
+        """True if the diff had files and all of them were left out"""
+        return bool(self.skipped) and not self.parsed.files
+
+    @property
+    def formatting_only(self) -> bool:
+        """True if nothing is left to review and every left-out file only changed whitespace, name or mode"""
+        return self.nothing_to_review and all(reason in FORMATTING_REASONS for _, reason in self.skipped)
+
+
+class DiffFileFilter:
+    """
+    Decides which files of a diff are not worth an LLM review.
+
+    A file is skipped when it is binary, has a non-source extension, matches a skip pattern (lockfiles,
+    vendored and generated paths, or patterns from a .gitattributes-style file), starts with a
+    code-generator marker, or is minified (an asset or lockfile adding a very long line, or any other
+    file whose hunks are mostly very long lines). With skip_formatting,
+    hunks that only change whitespace are removed, and files that are only renamed, moved, have
+    their mode changed or only change whitespace are skipped.
+    """
+
+    def __init__(
+        self,
+        skip_extensions: list[str] | None = None,
+        skip_patterns: list[str] | None = None,
+        minified_line_length: int | None = None,
+        skip_formatting: bool | None = None,
+    ):
+        extensions = skip_extensions if skip_extensions is not None else _split_setting(Config.REVIEW_SKIP_EXTENSIONS)
+        self.skip_extensions = {ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in extensions}
+        self.skip_patterns = (
+            skip_patterns
+            if skip_patterns is not None
+            else _split_setting(Config.REVIEW_SKIP_PATTERNS) + load_attribute_patterns(Config.REVIEW_ATTRIBUTES_FILE)
+        )
+        self.minified_line_length = (
+            minified_line_length if minified_line_length is not None else Config.REVIEW_MINIFIED_LINE_LENGTH
+        )
+        self.skip_formatting = skip_formatting if skip_formatting is not None else Config.REVIEW_SKIP_FORMATTING_CHANGES
+
+    def skip_reason(self, parsed: ParsedDiff, diff_file: DiffFile) -> str | None:
+        """Get why a file should not be reviewed, or None if it should"""
+        if diff_file.binary:
+            return "binary"
+        path = diff_file.path or ""
+        if diff_file.extension in self.skip_extensions:
+            return "non-source"
+        for pattern in self.skip_patterns:
+            if fnmatch(path, pattern) or fnmatch(path, f"*/{pattern}"):
+                return "generated/vendored"
+
+        added = [
+            line[1:]
+            for hunk in diff_file.hunks
+            for line in parsed.lines[hunk.first_line + 1 : hunk.end_line]
+            if line.startswith("+")
+        ]
+        if diff_file.hunks and diff_file.hunks[0].new_start <= 1:
+            head = "\n".join(added[:GENERATED_MARKER_LINES]).lower()
+            if any(marker in head for marker in GENERATED_MARKERS):
+                return "generated"
+        if (
+            self.minified_line_length
+            and any(len(line) >= self.minified_line_length for line in added)
+            and (self._is_minified_asset(path) or self._looks_minified(parsed, diff_file))
+        ):
+            return "minified"
+
+        if self.skip_formatting:
+            if not diff_file.hunks:
+                if diff_file.old_path is not None:
+                    return "rename only"
+                if diff_file.mode_changed:
+                    return "mode change only"
+            elif all(self._is_whitespace_only(parsed, diff_file, hunk) for hunk in diff_file.hunks):
+                return "whitespace only"
+        return None
+
+    @staticmethod
+    def _is_minified_asset(path: str) -> bool:
+        """True if a path names a stylesheet, source map, minified bundle or lockfile"""
+        name = path.rsplit("/", 1)[-1].lower()
+        return name in LOCKFILE_NAMES or name.endswith(MINIFIED_ASSET_SUFFIXES)
+
+    def _looks_minified(self, parsed: ParsedDiff, diff_file: DiffFile) -> bool:
+        """
+        True if at least half of the non-blank lines in a file's hunks are minified-length.
+
+        Context lines count too, so one long line added to a hand-written file is still reviewed,
+        while a new or edited bundle, whose every line is long, is not.
+        """
+        lines = [
+            line[1:]
+            for hunk in diff_file.hunks
+            for line in parsed.lines[hunk.first_line + 1 : hunk.end_line]
+            if line.startswith(("+", "-", " ")) and line[1:].strip()
+        ]
+        long_lines = sum(len(line) >= self.minified_line_length for line in lines)
+        return long_lines * 2 >= len(lines)
+
+    @staticmethod
+    def _is_whitespace_only(parsed: ParsedDiff, diff_file: DiffFile, hunk: DiffHunk) -> bool:
+        """
+        True if the removed and added lines of a hunk differ only in whitespace.
+
+        The lines must split into the same tokens, so whitespace may only change where it already
+        separated tokens (line breaks, indentation, runs of spaces), and string literals must be
+        unchanged. Indentation must also be unchanged in files where it is syntax (Python, YAML, ...),
+        and Makefiles and other tab-sensitive files are never whitespace-only.
+        """
+        if not hunk.added and not hunk.removed:
+            return False
+        if _is_tab_sensitive(diff_file):
+            return False
+        keep_indent = diff_file.extension in INDENTATION_SENSITIVE_EXTENSIONS
+        removed: list[str] = []
+        added: list[str] = []
+        for line in parsed.lines[hunk.first_line + 1 : hunk.end_line]:
+            if line.startswith(("-", "+")) and line[1:].strip():
+                (removed if line[0] == "-" else added).append(line[1:])
+
+        if keep_indent:
+            same_tokens = [_indented_tokens(text) for text in removed] == [_indented_tokens(text) for text in added]
+        else:
+            same_tokens = [token for text in removed for token in text.split()] == [
+                token for text in added for token in text.split()
+            ]
+        return same_tokens and _string_literals(removed) == _string_literals(added)
+
+    def _without_whitespace_hunks(self, parsed: ParsedDiff, diff_file: DiffFile) -> str | None:
+        """A file's diff text without its whitespace-only hunks, or None if it has none"""
+        if not self.skip_formatting:
+            return None
+        hunks = [hunk for hunk in diff_file.hunks if not self._is_whitespace_only(parsed, diff_file, hunk)]
+        if len(hunks) == len(diff_file.hunks):
+            return None
+        lines = parsed.lines[diff_file.first_line : diff_file.hunks[0].first_line]
+        for hunk in hunks:
+            lines.extend(parsed.lines[hunk.first_line : hunk.end_line])
+        return "\n".join(lines)
+
+    def filter(self, diff_content: str, parsed: ParsedDiff) -> FilteredDiff:
+        """Remove the files that should not be reviewed from a diff and its parsed model"""
+        kept: list[DiffFile] = []
+        skipped: list[tuple[str, str]] = []
+        for diff_file in parsed.files:
+            reason = self.skip_reason(parsed, diff_file)
+            if reason is None:
+                kept.append(diff_file)
+            else:
+                skipped.append((diff_file.path or "<unknown>", reason))
+
+        stripped = [self._without_whitespace_hunks(parsed, diff_file) for diff_file in kept]
+        if not skipped and all(text is None for text in stripped):
+            return FilteredDiff(diff_content=diff_content, parsed=parsed)
+
+        sections = [parsed.preamble()] + [
+            text if text is not None else parsed.file_text(diff_file)
+            for text, diff_file in zip(stripped, kept, strict=True)
+        ]
+        filtered_text = "\n".join(section for section in sections if section.strip()) if kept else ""
+        if skipped:
+            logger.info(
+                f"Skipping {len(skipped)} of {len(parsed.files)} file(s) before review: "
+                + ", ".join(f"{path} ({reason})" for path, reason in skipped)
+            )
+        stripped_count = sum(text is not None for text in stripped)
+        if stripped_count:
+            logger.info(f"Removed whitespace-only hunks from {stripped_count} file(s) before review")
+        return FilteredDiff(diff_content=filtered_text, parsed=parse_diff(filtered_text), skipped=skipped)
@@ -0,0 +1,188 @@
+"""Parse a unified diff once into a compact file/hunk model shared by the review code paths."""
+
+import re
+
+
+FILE_HEADER_PREFIX = "diff --git "
+HUNK_HEADER_PREFIX = "@@"
+BINARY_PREFIX = "Binary files "
+
+_HUNK_RANGE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class DiffHunk:
+    """One hunk of a file diff; first_line/end_line index into ParsedDiff.lines (end exclusive)"""
+
+    __slots__ = ("old_start", "old_count", "new_start", "new_count", "first_line", "end_line", "added", "removed")
+
+    def __init__(self, old_start: int, old_count: int, new_start: int, new_count: int, first_line: int):
+        self.old_start = old_start
+        self.old_count = old_count
+        self.new_start = new_start
+        self.new_count = new_count
+        self.first_line = first_line
+        self.end_line = first_line + 1
+        self.added = 0
+        self.removed = 0
+
+
+class DiffFile:
+    """The diff of one file; first_line/end_line index into ParsedDiff.lines (end exclusive)"""
+
+    __slots__ = ("path", "old_path", "first_line", "end_line", "hunks", "added", "removed", "binary", "mode_changed")
+
+    def __init__(self, path: str | None, first_line: int):
+        self.path = path
+        self.old_path: str | None = None  # Set for renames and copies
+        self.first_line = first_line
+        self.end_line = first_line + 1
+        self.hunks: list[DiffHunk] = []
+        self.added = 0
+        self.removed = 0
+        self.binary = False
+        self.mode_changed = False
+
+    @property
+    def extension(self) -> str | None:
+        """Lower-cased file extension including the dot (e.g. ".py"), or None"""
+        if not self.path:
+            return None
+        name = self.path.rsplit("/", 1)[-1]
+        if "." not in name:
+            return None
+        return "." + name.rsplit(".", 1)[1].lower()
+
+
+class ParsedDiff:
+    """A unified diff split into lines, with the files and hunks found in a single pass"""
+
+    __slots__ = ("lines", "files", "added", "removed")
+
+    def __init__(self, lines: list[str], files: list[DiffFile]):
+        self.lines = lines
+        self.files = files
+        self.added = sum(diff_file.added for diff_file in files)
+        self.removed = sum(diff_file.removed for diff_file in files)
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the diff, not counting a trailing newline"""
+        return len(self.lines) - 1 if self.lines and self.lines[-1] == "" else len(self.lines)
+
+    def extensions(self) -> set[str]:
+        """Unique file extensions of the changed files (e.g. {".py", ".cs"})"""
+        return {diff_file.extension for diff_file in self.files if diff_file.extension}
+
+    def file_text(self, diff_file: DiffFile) -> str:
+        """The text of one file's diff, header included"""
+        return "\n".join(self.lines[diff_file.first_line : diff_file.end_line])
+
+    def preamble(self) -> str:
+        """Any text before the first file (e.g. a commit message)"""
+        end = self.files[0].first_line if self.files else len(self.lines)
+        return "\n".join(self.lines[:end])
+
+
+def _header_path(line: str) -> str | None:
+    """Get the new path from a "diff --git a/old b/new" or "+++ b/new" line"""
+    if line.startswith(FILE_HEADER_PREFIX):
+        _, separator, path = line.rpartition(" b/")
+        return path.strip() if separator else None
+    path = line[4:].split("\t", 1)[0].strip()
+    if path == "/dev/null":
+        return None
+    return path[2:] if path.startswith(("a/", "b/")) else path
+
+
+def parse_diff(diff_content: str) -> ParsedDiff:
+    """
+    Parse a unified diff (git or plain) in one pass.
+
+    Files start at a "diff --git" line, or at a "---"/"+++" header pair outside a hunk. Hunk line
+    counts are tracked so that removed lines that happen to start with "--- " are not mistaken for
+    a new file header.
+
+    Args:
+        diff_content: The diff text
+
+    Returns:
+        The parsed diff; text that is not a diff parses as a preamble with no files
+    """
+    lines = diff_content.split("\n")
+    files: list[DiffFile] = []
+    current: DiffFile | None = None
+    hunk: DiffHunk | None = None
+    old_left = new_left = 0
+
+    for index, line in enumerate(lines):
+        in_hunk = hunk is not None and (old_left > 0 or new_left > 0)
+
+        if line.startswith(FILE_HEADER_PREFIX) or (
+            not in_hunk
+            and line.startswith("--- ")
+            and index + 1 < len(lines)
+            and lines[index + 1].startswith("+++ ")
+            and (current is None or current.hunks or current.binary)
+        ):
+            current = DiffFile(_header_path(line) if line.startswith(FILE_HEADER_PREFIX) else None, index)
+            files.append(current)
+            hunk = None
+            old_left = new_left = 0
+            continue
+
+        if current is None:
+            match = _HUNK_RANGE.match(line)
+            if not match:
+                continue  # Preamble
+            current = DiffFile(None, index)
+            files.append(current)
+
+        current.end_line = index + 1
+
+        if not in_hunk and not current.hunks and line.startswith("+++ "):
+            current.path = _header_path(line) or current.path
+            continue
+        if not in_hunk and line.startswith(BINARY_PREFIX):
+            current.binary = True
+            continue
+        if hunk is None and not current.hunks:
+            if line.startswith(("rename from ", "copy from ")):
+                current.old_path = line.split(" ", 2)[2]
+                continue
+            if line.startswith(("rename to ", "copy to ")):
+                current.path = line.split(" ", 2)[2]
+                continue
+            if line.startswith("new mode "):
+                current.mode_changed = True
+                continue
+
+        match = _HUNK_RANGE.match(line) if line.startswith(HUNK_HEADER_PREFIX) else None
+        if match:
+            old_start, old_count, new_start, new_count = match.groups()
+            hunk = DiffHunk(
+                int(old_start),
+                int(old_count) if old_count is not None else 1,
+                int(new_start),
+                int(new_count) if new_count is not None else 1,
+                index,
+            )
+            current.hunks.append(hunk)
+            old_left, new_left = hunk.old_count, hunk.new_count
+            continue
+
+        if hunk is None:
+            continue  # File header lines (index, mode, rename, ...)
+        hunk.end_line = index + 1
+        if line.startswith("+"):
+            hunk.added += 1
+            current.added += 1
+            new_left -= 1
+        elif line.startswith("-"):
+            hunk.removed += 1
+            current.removed += 1
+            old_left -= 1
+        elif line.startswith(" "):
+            old_left -= 1
+            new_left -= 1
+
+    return ParsedDiff(lines, files)
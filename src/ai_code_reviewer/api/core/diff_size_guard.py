@@ -0,0 +1,84 @@
+"""Bound the size of diffs streamed from Bitbucket, dropping oversized files and truncating at a byte limit."""
+
+from dataclasses import dataclass
+
+from ai_code_reviewer.api.core.diff_parser import FILE_HEADER_PREFIX, HUNK_HEADER_PREFIX
+
+
+@dataclass
+class DiffFileStats:
+    """Bytes received for one file of a streamed diff"""
+
+    header: str
+    size: int = 0
+    skipped: bool = False
+
+
+class DiffSizeGuard:
+    """
+    Build a diff from streamed lines without buffering more than a fixed number of bytes.
+
+    The body of a file larger than max_file_bytes (e.g. a vendored dependency or generated file)
+    is dropped and replaced by a one-line note, keeping its header so the reviewer knows it changed.
+    Once max_bytes have been received the guard reports that reading should stop and the diff is
+    marked as truncated. A limit of 0 disables that check.
+    """
+
+    def __init__(self, max_bytes: int, max_file_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.received_bytes = 0
+        self.truncated = False
+        self.files: list[DiffFileStats] = []
+        self._lines: list[str] = []
+        self._file_lines: list[str] = []
+        self._file_finished = True
+
+    def add_line(self, line: str) -> bool:
+        """Add one line of the diff (without its newline); returns False once reading should stop"""
+        line_bytes = len(line.encode("utf-8")) + 1
+        if self.max_bytes and self.received_bytes + line_bytes > self.max_bytes:
+            self.truncated = True
+            return False
+        self.received_bytes += line_bytes
+
+        if line.startswith(FILE_HEADER_PREFIX):
+            self._finish_file()
+            self.files.append(DiffFileStats(header=line))
+            self._file_finished = False
+        if not self.files:
+            self._lines.append(line)  # Preamble before the first file
+            return True
+
+        current = self.files[-1]
+        current.size += line_bytes
+        if current.skipped:
+            return True
+        if self.max_file_bytes and current.size > self.max_file_bytes:
+            # Keep the file header lines, drop the hunks received so far and ignore the rest
+            current.skipped = True
+            hunk_start = next(
+                (i for i, text in enumerate(self._file_lines) if text.startswith(HUNK_HEADER_PREFIX)),
+                len(self._file_lines),
+            )
+            self._file_lines = self._file_lines[:hunk_start]
+            return True
+        self._file_lines.append(line)
+        return True
+
+    def build(self) -> str:
+        """Get the diff received so far, with notes for omitted files and truncation"""
+        self._finish_file()
+        if self.truncated:
+            self._lines.append(f"[... diff truncated after {self.received_bytes} bytes ...]")
+        return "\n".join(self._lines)
+
+    def _finish_file(self) -> None:
+        """Move the current file's kept lines into the diff"""
+        if not self.files or self._file_finished:
+            return
+        self._lines.extend(self._file_lines)
+        self._file_lines = []
+        if self.files[-1].skipped:
+            self._lines.append(f"[... {self.files[-1].size} bytes of changes omitted: file diff too large ...]")
+        self._file_finished = True
@@ -0,0 +1,154 @@
+"""Buffer review emails per recipient list and send them as one digest email per window."""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from ai_code_reviewer.api.clients.email_client import DeliveryFailureCallback, EmailClient, get_email_client
+from ai_code_reviewer.api.core.config import Config
+from ai_code_reviewer.api.core.email_formatter import format_review_to_html
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DigestEntry:
+    """One review waiting to be sent"""
+
+    review_type: str
+    subject_id: str
+    review: str
+    on_failure: DeliveryFailureCallback | None = field(default=None, compare=False)
+
+
+class EmailDigest:
+    """
+    Collects reviews for the same recipients and sends them together.
+
+    The first review for a recipient list opens a window of EMAIL_DIGEST_WINDOW_SECONDS; every
+    review for the same recipients that arrives before it closes goes into the same email. A digest
+    is sent early once it holds EMAIL_DIGEST_MAX_REVIEWS reviews. A digest of one review is sent
+    exactly like a regular review email.
+    """
+
+    def __init__(
+        self,
+        email_client: EmailClient | None = None,
+        window_seconds: float | None = None,
+        max_reviews: int | None = None,
+    ):
+        self.email_client = email_client
+        self.window_seconds = window_seconds if window_seconds is not None else Config.EMAIL_DIGEST_WINDOW_SECONDS
+        self.max_reviews = max(max_reviews if max_reviews is not None else Config.EMAIL_DIGEST_MAX_REVIEWS, 1)
+        self._pending: dict[tuple[str, ...], list[DigestEntry]] = {}
+        self._timers: dict[tuple[str, ...], asyncio.Task] = {}
+
+    async def add(
+        self,
+        recipients: list[str],
+        review_type: str,
+        subject_id: str,
+        review: str,
+        on_failure: DeliveryFailureCallback | None = None,
+    ) -> bool:
+        """
+        Buffer a review for its recipients.
+
+        on_failure is awaited with the error if the digest holding the review cannot be queued or delivered.
+
+        Returns:
+            True if the review was buffered or its digest was queued, False if the digest could not be queued
+        """
+        key = tuple(sorted(recipients))
+        entries = self._pending.setdefault(key, [])
+        entries.append(
+            DigestEntry(review_type=review_type, subject_id=subject_id, review=review, on_failure=on_failure)
+        )
+        logger.info(f"Buffered review for {subject_id} in digest for {', '.join(key)} ({len(entries)} pending)")
+
+        if len(entries) >= self.max_reviews:
+            return await self.flush(key)
+        if key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_after_window(key), name="email-digest-timer")
+        return True
+
+    async def flush(self, key: tuple[str, ...]) -> bool:
+        """Send the pending digest for a recipient list now"""
+        timer = self._timers.pop(key, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        entries = self._pending.pop(key, [])
+        if not entries:
+            return True
+
+        async def report_failure(error: Exception) -> None:
+            for entry in entries:
+                if entry.on_failure is None:
+                    continue
+                try:
+                    await entry.on_failure(error)
+                except Exception as e:
+                    logger.error(f"Error reporting undelivered digest review for {entry.subject_id}: {str(e)}")
+
+        subject, html_body = self.build_email(entries)
+        client = self.email_client or get_email_client()
+        try:
+            queued = await client.queue_mail(
+                to=", ".join(key), cc="", subject=subject, mailbody=html_body, on_failure=report_failure
+            )
+        except Exception as e:
+            logger.error(f"Error sending email digest to {', '.join(key)}: {str(e)}")
+            await report_failure(e)
+            return False
+        if queued:
+            logger.info(f"Queued email digest of {len(entries)} review(s) to {', '.join(key)}")
+        else:
+            await report_failure(RuntimeError(f"Email queue is full, dropped digest to {', '.join(key)}"))
+        return queued
+
+    async def flush_all(self) -> None:
+        """Send every pending digest (used on shutdown)"""
+        for key in list(self._pending):
+            await self.flush(key)
+
+    def stats(self) -> dict[str, Any]:
+        """Get pending digest counts for health reporting"""
+        return {
+            "pending_digests": len(self._pending),
+            "pending_reviews": sum(len(entries) for entries in self._pending.values()),
+            "window_seconds": self.window_seconds,
+        }
+
+    async def _flush_after_window(self, key: tuple[str, ...]) -> None:
+        await asyncio.sleep(self.window_seconds)
+        await self.flush(key)
+
+    @staticmethod
+    def build_email(entries: list[DigestEntry]) -> tuple[str, str]:
+        """Build the subject and HTML body for a digest, with one section per commit or PR"""
+        if len(entries) == 1:
+            entry = entries[0]
+            subject = f"{entry.review_type} - {entry.subject_id}"
+            return subject, format_review_to_html(f"🤖 **{entry.review_type}**\n\n{entry.review}")
+
+        subject = f"AI Code Review Digest - {len(entries)} reviews"
+        contents = "\n".join(f"- {entry.subject_id}" for entry in entries)
+        sections = "\n\n---\n\n".join(
+            f"## {entry.review_type} - {entry.subject_id}\n\n{entry.review}" for entry in entries
+        )
+        return subject, format_review_to_html(
+            f"🤖 **AI Code Review Digest**\n\n{len(entries)} reviews:\n\n{contents}\n\n---\n\n{sections}"
+        )
+
+
+_email_digest: EmailDigest | None = None
+
+
+def get_email_digest() -> EmailDigest:
+    """Get or create the shared email digest buffer"""
+    global _email_digest
+    if _email_digest is None:
+        _email_digest = EmailDigest()
+    return _email_digest
@@ -1,17 +1,141 @@
 """Guidelines loader utility for loading coding guidelines from markdown files."""
 
+import hashlib
 import logging
+import re
+import threading
+import time
 from pathlib import Path
 
+from ai_code_reviewer.api.core.config import Config
+from ai_code_reviewer.api.core.diff_parser import ParsedDiff
+from ai_code_reviewer.api.core.guidelines_retrieval import GuidelinesRetriever, diff_query_terms
+
 
 logger = logging.getLogger(__name__)
 
+GENERAL_SECTION = "generalprinciples"
+
+# Sections whose rules are searched for every diff, in addition to the section of its language
+SHARED_SECTIONS = (GENERAL_SECTION, "cross-languagebestpractices")
+
+# Language names (as detected from diffs or passed by callers) mapped to the key of their "## " section
+LANGUAGE_ALIASES = {
+    "python": "python",
+    "csharp": "c#",
+    "c#": "c#",
+    ".net": "c#",
+    "c++": "c++",
+    "cpp": "c++",
+    "swift": "swift",
+    "swiftui": "swift",
+    "objective-c": "objective-c",
+    "objc": "objective-c",
+    "javascript": "javascript",
+    "typescript": "javascript",
+    "javascripttypescript": "javascript",
+    "js": "javascript",
+    "ts": "javascript",
+    "xaml": "xaml",
+    "wpf": "xaml",
+    "xamlwpf": "xaml",
+}
+
+# Intro lines for the rendered prompt section
+LANGUAGE_SECTION_INTRO = (
+    'The following coding guidelines MUST be followed. Pay special attention to "Rules (Must Comply)" sections:'
+)
+GENERAL_SECTION_INTRO = "The following general coding principles MUST be followed:"
+# Bitbucket project keys that may name a per-project guidelines file (no path separators or dots)
+_PROJECT_KEY = re.compile(r"^[A-Za-z0-9_~-]+$")
+
+RETRIEVED_SECTION_INTRO = (
+    "The following coding guidelines apply to this change and MUST be followed. "
+    'Pay special attention to "Rules (Must Comply)" sections:'
+)
+
+
+def _normalize(name: str) -> str:
+    """Normalize a language or heading name for lookups ("JavaScript/TypeScript" -> "javascripttypescript")"""
+    return name.lower().replace(" ", "").replace("/", "")
+
+
+def _section_key(heading: str) -> str:
+    """Key of a "## " section: its first name, without qualifiers ("C# (.NET/WPF)" -> "c#", "XAML/WPF" -> "xaml")"""
+    name = re.split(r"\s*\(|/|&", heading, maxsplit=1)[0]
+    return _normalize(name)
+
+
+def language_key(language: str) -> str | None:
+    """Key of the "## " section for a language name, or None if the language is unknown"""
+    return LANGUAGE_ALIASES.get(_normalize(language))
+
+
+class GuidelinesIndex:
+    """The "## " sections of a guidelines document, parsed once and looked up by language"""
+
+    __slots__ = ("sections",)
+
+    def __init__(self, guidelines: str):
+        self.sections: dict[str, str] = {}
+        lines = guidelines.split("\n")
+        in_code_block = False
+        start: int | None = None
+        for index, line in enumerate(lines):
+            if line.lstrip().startswith("```"):
+                in_code_block = not in_code_block
+            if in_code_block or not line.startswith("## "):
+                continue
+            if start is not None:
+                self._add_section(lines[start:index])
+            start = index
+        if start is not None:
+            self._add_section(lines[start:])
+
+    def _add_section(self, lines: list[str]) -> None:
+        # Drop the blank lines and "---" separators between this section and the next
+        end = len(lines)
+        while end > 1 and lines[end - 1].strip() in ("", "---"):
+            end -= 1
+        key = _section_key(lines[0][3:])
+        self.sections.setdefault(key, "\n".join(lines[:end]))
+
+    def section_for(self, language: str | None) -> str | None:
+        """Get the section for a language (general principles for None or unknown languages), if present"""
+        key = language_key(language) if language is not None else None
+        if language is not None and key is None:
+            logger.warning(f"Unknown language '{language}', using general principles only")
+        return self.sections.get(key or GENERAL_SECTION)
+
+
+class GuidelinesFile:
+    """A loaded guidelines file, with the stat values used to notice when it changes"""
+
+    __slots__ = ("content", "content_hash", "mtime_ns", "size", "checked_at")
+
+    def __init__(self, content: str, mtime_ns: int, size: int, checked_at: float):
+        self.content = content
+        self.content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.checked_at = checked_at
+
 
 class GuidelinesLoader:
-    """Loads and caches coding guidelines from markdown files."""
+    """
+    Loads and caches coding guidelines from markdown files.
 
-    _cached_guidelines: str | None = None
-    _cached_file_path: Path | None = None
+    Any number of files are cached at once (the default GUIDELINES_FILE and per-project files from
+    GUIDELINES_PROJECT_DIR). A cached file is re-checked at most every GUIDELINES_RELOAD_CHECK_SECONDS
+    and re-read only when its modification time or size changed, so edits take effect without a
+    restart. Parsed indexes and rendered sections are keyed by content, so they follow the reload.
+    """
+
+    _files: dict[Path, GuidelinesFile] = {}
+    _indexes: dict[str, GuidelinesIndex] = {}
+    _retrievers: dict[str, GuidelinesRetriever] = {}
+    _rendered_sections: dict[tuple[str, str | None], str] = {}
+    _lock = threading.Lock()
 
     @classmethod
     def load_guidelines(cls, file_path: str | Path) -> str:
@@ -28,44 +152,103 @@ class GuidelinesLoader:
             FileNotFoundError: If the guidelines file doesn't exist
             IOError: If there's an error reading the file
         """
-        file_path = Path(file_path)
-
-        # Return cached content if file path hasn't changed
-        if cls._cached_guidelines is not None and cls._cached_file_path == file_path:
-            logger.debug(f"Using cached guidelines from {file_path}")
-            return cls._cached_guidelines
+        return cls._load_file(Path(file_path)).content
 
-        # Validate file exists
-        if not file_path.exists():
-            raise FileNotFoundError(f"Guidelines file not found: {file_path}")
+    @classmethod
+    def content_hash(cls, file_path: str | Path) -> str:
+        """Get the SHA-256 of a guidelines file's current content"""
+        return cls._load_file(Path(file_path)).content_hash
 
-        if not file_path.is_file():
-            raise OSError(f"Guidelines path is not a file: {file_path}")
+    @classmethod
+    def _load_file(cls, file_path: Path) -> GuidelinesFile:
+        cached = cls._files.get(file_path)
+        now = time.monotonic()
+        if cached is not None and now - cached.checked_at < Config.GUIDELINES_RELOAD_CHECK_SECONDS:
+            return cached
 
-        # Read the file
-        try:
-            logger.info(f"Loading coding guidelines from {file_path}")
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
+        with cls._lock:
+            cached = cls._files.get(file_path)
+            try:
+                stat = file_path.stat()
+                if not file_path.is_file():
+                    raise OSError(f"Guidelines path is not a file: {file_path}")
+                if cached is not None and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+                    cached.checked_at = now
+                    logger.debug(f"Using cached guidelines from {file_path}")
+                    return cached
 
-            # Cache the content
-            cls._cached_guidelines = content
-            cls._cached_file_path = file_path
+                logger.info(f"Loading coding guidelines from {file_path}")
+                with open(file_path, encoding="utf-8") as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                if cached is not None:
+                    # Keep reviewing with the last good copy while the file is being replaced
+                    logger.warning(f"Error re-reading guidelines file {file_path}, using cached copy: {e}")
+                    cached.checked_at = now
+                    return cached
+                if isinstance(e, FileNotFoundError):
+                    raise FileNotFoundError(f"Guidelines file not found: {file_path}") from e
+                logger.error(f"Error reading guidelines file {file_path}: {e}")
+                raise OSError(f"Failed to read guidelines file: {e}") from e
 
+            loaded = GuidelinesFile(content, stat.st_mtime_ns, stat.st_size, now)
+            cls._files[file_path] = loaded
+            if cached is not None and cached.content_hash != loaded.content_hash:
+                logger.info(f"Guidelines file {file_path} changed, reloaded")
+                cls._forget(cached)
             logger.info(f"Successfully loaded {len(content)} characters of guidelines")
-            return content
+            return loaded
 
-        except Exception as e:
-            logger.error(f"Error reading guidelines file {file_path}: {e}")
-            raise OSError(f"Failed to read guidelines file: {e}") from e
+    @classmethod
+    def _forget(cls, old: GuidelinesFile) -> None:
+        """Drop the indexes and rendered sections of replaced content no other cached file still has"""
+        if any(loaded.content_hash == old.content_hash for loaded in cls._files.values()):
+            return
+        cls._indexes.pop(old.content, None)
+        cls._retrievers.pop(old.content, None)
+        for key in [key for key in cls._rendered_sections if key[0] == old.content_hash]:
+            cls._rendered_sections.pop(key, None)
+
+    @classmethod
+    def guidelines_file_for(cls, project_key: str | None = None) -> Path:
+        """
+        Get the guidelines file for a Bitbucket project.
+
+        This is <GUIDELINES_PROJECT_DIR>/<project_key>.md when that file exists, GUIDELINES_FILE otherwise.
+        """
+        if project_key and Config.GUIDELINES_PROJECT_DIR and _PROJECT_KEY.match(project_key):
+            override = Path(Config.GUIDELINES_PROJECT_DIR) / f"{project_key}.md"
+            if override.is_file():
+                return override
+        return Path(Config.GUIDELINES_FILE)
 
     @classmethod
     def clear_cache(cls) -> None:
         """Clear the cached guidelines (useful for testing or reloading)."""
-        cls._cached_guidelines = None
-        cls._cached_file_path = None
+        cls._files = {}
+        cls._indexes = {}
+        cls._retrievers = {}
+        cls._rendered_sections = {}
         logger.debug("Cleared guidelines cache")
 
+    @classmethod
+    def get_index(cls, guidelines: str) -> GuidelinesIndex:
+        """Get the section index of a guidelines document, parsing each document only once"""
+        index = cls._indexes.get(guidelines)
+        if index is None:
+            index = cls._indexes[guidelines] = GuidelinesIndex(guidelines)
+            logger.debug(f"Indexed {len(index.sections)} guidelines sections")
+        return index
+
+    @classmethod
+    def get_retriever(cls, guidelines: str) -> GuidelinesRetriever:
+        """Get the rule search index of a guidelines document, building it once per document"""
+        retriever = cls._retrievers.get(guidelines)
+        if retriever is None:
+            retriever = cls._retrievers[guidelines] = GuidelinesRetriever(cls.get_index(guidelines).sections)
+            logger.info(f"Indexed {len(retriever.rules)} coding guideline rules for retrieval")
+        return retriever
+
     @classmethod
     def extract_language_guidelines(cls, guidelines: str, language: str | None = None) -> str:
         """
@@ -77,60 +260,66 @@ class GuidelinesLoader:
                      If None, returns general principles only
 
         Returns:
-            Extracted guidelines section
+            Extracted guidelines section (the full document if the section is missing)
         """
-        if language is None:
-            # Extract only general principles
-            start_marker = "## General Principles"
-            end_marker = "## C# (.NET/WPF)"
-        else:
-            # Map common language names to section headers
-            language_sections = {
-                "python": "## Python",
-                "csharp": "## C# (.NET/WPF)",
-                "c#": "## C# (.NET/WPF)",
-                ".net": "## C# (.NET/WPF)",
-                "c++": "## C++",
-                "cpp": "## C++",
-                "swift": "## Swift & SwiftUI",
-                "swiftui": "## Swift & SwiftUI",
-                "objective-c": "## Objective-C",
-                "objc": "## Objective-C",
-                "javascript": "## JavaScript/TypeScript",
-                "typescript": "## JavaScript/TypeScript",
-                "js": "## JavaScript/TypeScript",
-                "ts": "## JavaScript/TypeScript",
-                "xaml": "## XAML/WPF",
-                "wpf": "## XAML/WPF",
-            }
-
-            # Normalize language name
-            lang_key = language.lower().replace(" ", "").replace("/", "")
-            start_marker_found = language_sections.get(lang_key)
-
-            if start_marker_found is None:
-                logger.warning(f"Unknown language '{language}', using general principles only")
-                return cls.extract_language_guidelines(guidelines, None)
-
-            # Use the found marker
-            start_marker = start_marker_found
-            # Find the next section marker
-            end_marker = "---"  # Section separator
-
-        # Extract the section
         try:
-            start_idx = guidelines.find(start_marker)
-            if start_idx == -1:
-                logger.warning(f"Could not find section '{start_marker}' in guidelines")
-                return guidelines  # Return full guidelines as fallback
-
-            # Find the end of the section (next section or end of document)
-            end_idx = guidelines.find(end_marker, start_idx + len(start_marker))
-            extracted = guidelines[start_idx:] if end_idx == -1 else guidelines[start_idx:end_idx]
-
-            logger.debug(f"Extracted {len(extracted)} characters for language '{language}'")
-            return extracted.strip()
-
+            extracted = cls.get_index(guidelines).section_for(language)
         except Exception as e:
             logger.error(f"Error extracting language guidelines: {e}")
             return guidelines  # Return full guidelines as fallback
+
+        if extracted is None:
+            logger.warning(f"Could not find guidelines section for '{language or 'General Principles'}'")
+            return guidelines  # Return full guidelines as fallback
+
+        logger.debug(f"Extracted {len(extracted)} characters for language '{language}'")
+        return extracted
+
+    @classmethod
+    def render_guidelines_section(cls, file_path: str | Path, language: str | None = None) -> str:
+        """
+        Get the coding guidelines prompt section for a language, rendered once per file and language.
+
+        Raises:
+            FileNotFoundError: If the guidelines file doesn't exist
+            IOError: If there's an error reading the file
+        """
+        loaded = cls._load_file(Path(file_path))
+        guidelines = loaded.content
+        key = (loaded.content_hash, language)
+        rendered = cls._rendered_sections.get(key)
+        if rendered is None:
+            intro = LANGUAGE_SECTION_INTRO if language else GENERAL_SECTION_INTRO
+            rendered = (
+                f"### 📋 **Coding Guidelines**\n\n{intro}\n\n{cls.extract_language_guidelines(guidelines, language)}"
+            )
+            cls._rendered_sections[key] = rendered
+        return rendered
+
+    @classmethod
+    def select_guidelines_section(
+        cls, file_path: str | Path, language: str | None, parsed: ParsedDiff, top_k: int
+    ) -> str:
+        """
+        Get a coding guidelines prompt section with only the rules relevant to a diff.
+
+        The rules of the language's section and the shared sections are ranked by BM25 against the
+        identifiers, APIs and file paths of the diff, and the top_k are kept. Falls back to the
+        whole language section (see render_guidelines_section) when no rule matches.
+
+        Raises:
+            FileNotFoundError: If the guidelines file doesn't exist
+            IOError: If there's an error reading the file
+        """
+        guidelines = cls.load_guidelines(file_path)
+        sections = set(SHARED_SECTIONS)
+        key = language_key(language) if language is not None else None
+        if key is not None:
+            sections.add(key)
+
+        rules = cls.get_retriever(guidelines).search(diff_query_terms(parsed), sections, top_k)
+        if not rules:
+            logger.info("No coding guideline rules match the diff, using the whole guidelines section")
+            return cls.render_guidelines_section(file_path, language)
+        logger.debug(f"Selected {len(rules)} coding guideline rules for the diff")
+        return f"### 📋 **Coding Guidelines**\n\n{RETRIEVED_SECTION_INTRO}\n\n{GuidelinesRetriever.render(rules)}"
@@ -0,0 +1,232 @@
+"""Select the coding guideline rules relevant to a diff with a local BM25 index."""
+
+import math
+import re
+from collections import Counter
+
+from ai_code_reviewer.api.core.diff_parser import ParsedDiff
+
+
+# Changed lines of a diff used to build the query; beyond this the query only gets noisier
+MAX_QUERY_LINES = 5000
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9]+")
+_WORD_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_NUMBERED_ITEM = re.compile(r"^\d+\.\s")
+
+STOPWORDS = frozenset(
+    [
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "by",
+        "for",
+        "from",
+        "has",
+        "have",
+        "in",
+        "is",
+        "it",
+        "its",
+        "of",
+        "on",
+        "or",
+        "that",
+        "the",
+        "this",
+        "to",
+        "use",
+        "used",
+        "using",
+        "was",
+        "were",
+        "will",
+        "with",
+        "all",
+        "any",
+        "can",
+        "do",
+        "not",
+        "no",
+        "only",
+        "when",
+        "where",
+        "which",
+        "who",
+        "how",
+        "than",
+        "then",
+        "there",
+        "these",
+        "those",
+        "should",
+        "must",
+        "may",
+        "also",
+        "into",
+        "over",
+        "under",
+        "via",
+        "your",
+        "you",
+    ]
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lower-cased search terms.
+
+    Identifiers are kept whole and also split into their camelCase/snake_case parts
+    ("ConfigureAwait" -> "configureawait", "configure", "await"), and a plural "s" is dropped so
+    "exceptions" matches "exception".
+    """
+    terms = []
+    for word in _WORD.findall(text):
+        parts = _WORD_PART.findall(word)
+        words = [word] if len(parts) == 1 else [word, *parts]
+        for term in words:
+            term = term.lower()
+            if len(term) > 4 and term.endswith("s") and not term.endswith("ss"):
+                term = term[:-1]
+            if len(term) > 1 and term not in STOPWORDS:
+                terms.append(term)
+    return terms
+
+
+def diff_query_terms(parsed: ParsedDiff) -> set[str]:
+    """Search terms for a diff: identifiers and APIs on its added/removed lines, plus its file paths and types"""
+    texts = [diff_file.path for diff_file in parsed.files if diff_file.path]
+    for diff_file in parsed.files:
+        for hunk in diff_file.hunks:
+            texts.extend(
+                line[1:] for line in parsed.lines[hunk.first_line + 1 : hunk.end_line] if line.startswith(("+", "-"))
+            )
+        if len(texts) >= MAX_QUERY_LINES:
+            break
+    return set(tokenize("\n".join(texts)))
+
+
+class GuidelineRule:
+    """One rule of a guidelines section: a numbered item, or a whole bullet-list subsection"""
+
+    __slots__ = ("section", "section_heading", "subsection_heading", "text")
+
+    def __init__(self, section: str, section_heading: str, subsection_heading: str, text: str):
+        self.section = section
+        self.section_heading = section_heading
+        self.subsection_heading = subsection_heading
+        self.text = text
+
+
+def split_rules(sections: dict[str, str]) -> list[GuidelineRule]:
+    """
+    Split the "## " sections of a guidelines document (keyed as in GuidelinesIndex) into rules.
+
+    Each numbered item of a "### " subsection (with its text and code examples) is a rule; a
+    subsection without numbered items ("Guidelines (Recommended)", "Things to Avoid") is one rule.
+    """
+    rules: list[GuidelineRule] = []
+    for key, section in sections.items():
+        lines = section.split("\n")
+        section_heading = lines[0]
+        subsection_heading = ""
+        current: list[str] = []
+        in_code_block = False
+        for line in lines[1:]:
+            if line.lstrip().startswith("```"):
+                in_code_block = not in_code_block
+            if not in_code_block and line.startswith("### "):
+                _finish_rule(rules, current, key, section_heading, subsection_heading)
+                subsection_heading = line
+                continue
+            if not in_code_block and _NUMBERED_ITEM.match(line):
+                _finish_rule(rules, current, key, section_heading, subsection_heading)
+            if line.strip() != "---":
+                current.append(line)
+        _finish_rule(rules, current, key, section_heading, subsection_heading)
+    return rules
+
+
+def _finish_rule(
+    rules: list[GuidelineRule], current: list[str], section: str, section_heading: str, subsection_heading: str
+) -> None:
+    """Add the lines collected so far as a rule (unless blank) and start collecting the next one"""
+    text = "\n".join(current).strip()
+    if text:
+        rules.append(GuidelineRule(section, section_heading, subsection_heading, text))
+    current.clear()
+
+
+class GuidelinesRetriever:
+    """
+    BM25 index over the rules of a guidelines document.
+
+    Built once per document; each search only scores the rules of the requested sections that
+    share a term with the query.
+    """
+
+    def __init__(self, sections: dict[str, str]):
+        self.rules = split_rules(sections)
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._lengths: list[int] = []
+        for rule_id, rule in enumerate(self.rules):
+            terms = Counter(tokenize(f"{rule.subsection_heading}\n{rule.text}"))
+            self._lengths.append(sum(terms.values()))
+            for term, count in terms.items():
+                self._postings.setdefault(term, []).append((rule_id, count))
+        self._average_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        rule_count = len(self.rules)
+        self._idf = {
+            term: math.log(1 + (rule_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def search(self, terms: set[str], sections: set[str], top_k: int) -> list[GuidelineRule]:
+        """
+        Get the top_k rules that best match the query terms, in document order.
+
+        Args:
+            terms: Query terms (see diff_query_terms)
+            sections: Keys of the sections to search
+            top_k: Maximum number of rules to return
+
+        Returns:
+            The matching rules; empty if no rule shares a term with the query
+        """
+        scores: dict[int, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            idf = self._idf[term]
+            for rule_id, count in postings:
+                if self.rules[rule_id].section not in sections:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[rule_id] / self._average_length)
+                scores[rule_id] = scores.get(rule_id, 0.0) + idf * count * (BM25_K1 + 1) / (count + norm)
+
+        best = sorted(scores, key=lambda rule_id: (-scores[rule_id], rule_id))[:top_k]
+        return [self.rules[rule_id] for rule_id in sorted(best)]
+
+    @staticmethod
+    def render(rules: list[GuidelineRule]) -> str:
+        """Render rules under their section and subsection headings"""
+        parts: list[str] = []
+        section_heading = subsection_heading = None
+        for rule in rules:
+            if rule.section_heading != section_heading:
+                section_heading, subsection_heading = rule.section_heading, None
+                parts.append(section_heading)
+            if rule.subsection_heading and rule.subsection_heading != subsection_heading:
+                subsection_heading = rule.subsection_heading
+                parts.append(subsection_heading)
+            parts.append(rule.text)
+        return "\n\n".join(parts)
@@ -0,0 +1,218 @@
+"""Durable review job queue backed by the database and drained by background workers."""
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+from collections.abc import Callable, Coroutine
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from ai_code_reviewer.api.clients.bitbucket_client import BitbucketClient
+from ai_code_reviewer.api.clients.llm_client import LLMClient
+from ai_code_reviewer.api.core.config import Config
+from ai_code_reviewer.api.core.review_engine import (
+    RetryableReviewError,
+    process_commit_review,
+    process_pull_request_review,
+)
+from ai_code_reviewer.api.db.database import get_db_session
+from ai_code_reviewer.api.db.repository import ReviewJobRepository
+
+
+logger = logging.getLogger(__name__)
+
+# Handlers log failures they cannot recover from and raise RetryableReviewError for those worth another attempt
+JobHandler = Callable[[BitbucketClient, LLMClient, dict[str, Any]], Coroutine[Any, Any, None]]
+
+
+class ReviewJobQueue:
+    """Enqueues review jobs in the database and runs a bounded pool of workers that drain them."""
+
+    HANDLERS: dict[str, JobHandler] = {
+        "pull_request": process_pull_request_review,
+        "commit": process_commit_review,
+    }
+
+    def __init__(
+        self,
+        bitbucket_client: BitbucketClient,
+        llm_client: LLMClient,
+        worker_count: int | None = None,
+        poll_interval: float | None = None,
+    ):
+        self.bitbucket_client = bitbucket_client
+        self.llm_client = llm_client
+        self.worker_count = worker_count if worker_count is not None else Config.REVIEW_WORKER_COUNT
+        self.poll_interval = poll_interval if poll_interval is not None else Config.REVIEW_JOB_POLL_INTERVAL
+        self.worker_prefix = f"{socket.gethostname()}-{os.getpid()}"
+        self._wakeup = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+        # Reviews running in this process, keyed by coalesce key: (job_id, task)
+        self._in_flight: dict[str, tuple[int, asyncio.Task]] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker pool has been started"""
+        return bool(self._workers)
+
+    @staticmethod
+    def coalesce_key_for(job_type: str, payload: dict[str, Any]) -> str | None:
+        """Get the key identifying jobs that supersede each other, or None if the job never coalesces"""
+        if job_type != "pull_request":
+            return None
+        try:
+            pull_request = payload["pullRequest"]
+            repository = pull_request["toRef"]["repository"]
+            return f"{repository['project']['key']}/{repository['slug']}/pull-requests/{pull_request['id']}"
+        except (KeyError, TypeError):
+            return None
+
+    async def enqueue(self, job_type: str, payload: dict[str, Any], event_key: str | None = None) -> int:
+        """Persist a review job and wake an idle worker. Returns the job ID."""
+        if job_type not in self.HANDLERS:
+            raise ValueError(f"Unknown review job type: {job_type}")
+
+        coalesce_key = self.coalesce_key_for(job_type, payload)
+        run_after = datetime.now(UTC)
+        if coalesce_key and Config.PR_REVIEW_DEBOUNCE_SECONDS > 0:
+            run_after += timedelta(seconds=Config.PR_REVIEW_DEBOUNCE_SECONDS)
+
+        async with get_db_session() as session:
+            repo = ReviewJobRepository(session)
+            job = await repo.enqueue_job(
+                job_type=job_type,
+                payload=payload,
+                event_key=event_key,
+                max_attempts=Config.REVIEW_JOB_MAX_ATTEMPTS,
+                run_after=run_after,
+                coalesce_key=coalesce_key,
+            )
+            job_id: int = job.id
+
+        if coalesce_key:
+            self._cancel_in_flight(coalesce_key)
+
+        self._wakeup.set()
+        return job_id
+
+    def _cancel_in_flight(self, coalesce_key: str) -> None:
+        """Cancel a review for the same key that is already running in this process"""
+        in_flight = self._in_flight.get(coalesce_key)
+        if in_flight is None:
+            return
+        job_id, task = in_flight
+        if not task.done():
+            logger.info(f"Cancelling in-flight review job {job_id} superseded by a newer event for {coalesce_key}")
+            task.cancel()
+
+    async def start(self) -> None:
+        """Recover jobs abandoned by a previous process and start the worker pool"""
+        if self._workers:
+            return
+
+        try:
+            async with get_db_session() as session:
+                await ReviewJobRepository(session).requeue_stale_jobs(Config.REVIEW_JOB_STALE_SECONDS)
+        except Exception as e:
+            logger.error(f"Error recovering stale review jobs: {str(e)}")
+
+        for index in range(self.worker_count):
+            worker_id = f"{self.worker_prefix}-{index}"
+            self._workers.append(asyncio.create_task(self._worker_loop(worker_id), name=f"review-worker-{index}"))
+        logger.info(f"Started {self.worker_count} review job worker(s)")
+
+    async def stop(self) -> None:
+        """Stop all workers; jobs that were running are released back to the queue"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Stopped review job workers")
+
+    async def _worker_loop(self, worker_id: str) -> None:
+        """Claim and run jobs until cancelled, sleeping until woken or the poll interval elapses"""
+        while True:
+            # Clear before claiming so an enqueue that races with an empty claim still wakes us
+            self._wakeup.clear()
+            try:
+                async with get_db_session() as session:
+                    job = await ReviewJobRepository(session).claim_next_job(worker_id)
+                    job_snapshot = (job.id, job.job_type, job.payload, job.attempts, job.coalesce_key) if job else None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker {worker_id} failed to claim a job: {str(e)}")
+                job_snapshot = None
+
+            if job_snapshot is None:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                continue
+
+            await self._run_job(worker_id, *job_snapshot)
+
+    async def _run_job(
+        self,
+        worker_id: str,
+        job_id: int,
+        job_type: str,
+        payload: dict,
+        attempts: int,
+        coalesce_key: str | None = None,
+    ) -> None:
+        """Run one claimed job and record its outcome"""
+        logger.info(f"Worker {worker_id} running {job_type} job {job_id} (attempt {attempts})")
+        handler = self.HANDLERS[job_type]
+
+        # Run the handler in its own task so a newer event can cancel it without stopping the worker
+        task = asyncio.create_task(handler(self.bitbucket_client, self.llm_client, payload))
+        if coalesce_key:
+            self._cancel_in_flight(coalesce_key)
+            self._in_flight[coalesce_key] = (job_id, task)
+
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            # Worker shutdown: stop the review and hand the job back to the queue
+            task.cancel()
+            try:
+                async with get_db_session() as session:
+                    await ReviewJobRepository(session).release_job(job_id)
+            except Exception as e:
+                logger.error(f"Error releasing review job {job_id}: {str(e)}")
+            raise
+        finally:
+            if coalesce_key and self._in_flight.get(coalesce_key, (None, None))[0] == job_id:
+                del self._in_flight[coalesce_key]
+
+        if task.cancelled():
+            try:
+                async with get_db_session() as session:
+                    await ReviewJobRepository(session).mark_job_superseded(job_id)
+            except Exception as e:
+                logger.error(f"Error marking review job {job_id} as superseded: {str(e)}")
+            return
+
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Review job {job_id} failed: {str(error)}")
+            retry_payload = error.retry_payload if isinstance(error, RetryableReviewError) else None
+            try:
+                async with get_db_session() as session:
+                    await ReviewJobRepository(session).mark_job_failed(
+                        job_id,
+                        str(error),
+                        retry_delay_seconds=Config.REVIEW_JOB_RETRY_DELAY * attempts,
+                        payload=retry_payload,
+                    )
+            except Exception as db_error:
+                logger.error(f"Error recording failure of review job {job_id}: {str(db_error)}")
+            return
+
+        try:
+            async with get_db_session() as session:
+                await ReviewJobRepository(session).mark_job_completed(job_id)
+        except Exception as e:
+            logger.error(f"Error marking review job {job_id} as completed: {str(e)}")
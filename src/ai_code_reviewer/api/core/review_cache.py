@@ -0,0 +1,89 @@
+"""Content-addressed cache of LLM reviews keyed by a hash of the normalized diff and review inputs."""
+
+import hashlib
+import logging
+from datetime import UTC, datetime, timedelta
+
+from ai_code_reviewer.api.core.config import Config
+from ai_code_reviewer.api.db.database import get_db_session
+from ai_code_reviewer.api.db.repository import ReviewCacheRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewCache:
+    """Database-backed review cache with TTL expiry and LRU eviction.
+
+    Cache failures are never fatal: a lookup error is treated as a miss and a store error is
+    logged, so the review pipeline keeps working if the cache table is unavailable.
+    """
+
+    def __init__(self, ttl_seconds: int | None = None, max_entries: int | None = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.REVIEW_CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else Config.REVIEW_CACHE_MAX_ENTRIES
+
+    @staticmethod
+    def normalize_diff(diff_content: str) -> str:
+        """
+        Normalize a diff so the same change produces the same text wherever it was pushed.
+
+        Drops 'index <sha>..<sha>' lines (they differ between otherwise identical commits),
+        normalizes line endings and strips trailing whitespace.
+        """
+        lines = []
+        for line in diff_content.replace("\r\n", "\n").split("\n"):
+            if line.startswith("index "):
+                continue
+            lines.append(line.rstrip())
+        return "\n".join(lines).strip()
+
+    @classmethod
+    def build_key(
+        cls,
+        diff_content: str,
+        guidelines_section: str,
+        provider: str,
+        model: str,
+        prompt_template: str,
+        guidelines_hash: str = "",
+    ) -> str:
+        """Build the SHA-256 cache key for a review request (guidelines_hash: content hash of the guidelines file)."""
+        digest = hashlib.sha256()
+        for part in (
+            cls.normalize_diff(diff_content),
+            guidelines_section,
+            provider,
+            model,
+            prompt_template,
+            guidelines_hash,
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def get(self, cache_key: str) -> str | None:
+        """Return the cached review for a key, or None on a miss."""
+        try:
+            async with get_db_session() as session:
+                repo = ReviewCacheRepository(session)
+                entry = await repo.get_entry(cache_key, datetime.now(UTC) - timedelta(seconds=self.ttl_seconds))
+                if entry is None:
+                    return None
+                review: str = entry.review_feedback
+            logger.info(f"Review cache hit for key {cache_key[:12]}")
+            return review
+        except Exception as e:
+            logger.warning(f"Review cache lookup failed, treating as miss: {str(e)}")
+            return None
+
+    async def put(self, cache_key: str, review: str, provider: str | None, model: str | None) -> None:
+        """Store a review and evict expired or least recently used entries."""
+        try:
+            async with get_db_session() as session:
+                repo = ReviewCacheRepository(session)
+                await repo.upsert_entry(cache_key, review, llm_provider=provider, llm_model=model)
+                await repo.evict_entries(datetime.now(UTC) - timedelta(seconds=self.ttl_seconds), self.max_entries)
+            logger.info(f"Stored review in cache with key {cache_key[:12]}")
+        except Exception as e:
+            logger.warning(f"Failed to store review in cache: {str(e)}")
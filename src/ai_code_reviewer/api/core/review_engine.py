@@ -1,21 +1,42 @@
 """Core review processing logic."""
 
+import asyncio
 import logging
 import traceback
+from dataclasses import dataclass, field
 from typing import Any
 
 from ai_code_reviewer.api.clients.bitbucket_client import BitbucketClient
-from ai_code_reviewer.api.clients.email_client import send_mail
+from ai_code_reviewer.api.clients.email_client import DeliveryFailureCallback, get_email_client
 from ai_code_reviewer.api.clients.llm_client import LLMClient
+from ai_code_reviewer.api.clients.retry import begin_retry_tracking, current_retry_count, is_retryable
 from ai_code_reviewer.api.core.config import Config
+from ai_code_reviewer.api.core.email_digest import get_email_digest
 from ai_code_reviewer.api.core.email_formatter import format_review_to_html
+from ai_code_reviewer.api.core.review_metrics import ReviewMetrics
 from ai_code_reviewer.api.db.database import get_db_session
-from ai_code_reviewer.api.db.repository import FailureLogRepository, ReviewRepository
+from ai_code_reviewer.api.db.repository import (
+    FailureLogRepository,
+    PullRequestReviewStateRepository,
+    ReviewRepository,
+)
 
 
 logger = logging.getLogger(__name__)
 
 
+class RetryableReviewError(Exception):
+    """
+    A review failed for a reason that may pass (Bitbucket or LLM unavailable); the job is run again later.
+
+    retry_payload, if set, replaces the job payload for the next attempt (e.g. only the commits that failed).
+    """
+
+    def __init__(self, message: str, retry_payload: dict[str, Any] | None = None):
+        super().__init__(message)
+        self.retry_payload = retry_payload
+
+
 async def log_review_failure(
     event_type: str,
     failure_stage: str,
@@ -28,9 +49,15 @@ async def log_review_failure(
     pr_id: int | None = None,
     author_name: str | None = None,
     author_email: str | None = None,
-    retry_count: int = 0,
+    retry_count: int | None = None,
 ) -> int | None:
-    """Log a review failure to database. Returns the failure log ID if successful, None otherwise."""
+    """
+    Log a review failure to database. Returns the failure log ID if successful, None otherwise.
+
+    retry_count defaults to the number of client retries made while processing the current review.
+    """
+    if retry_count is None:
+        retry_count = current_retry_count()
     try:
         async with get_db_session() as session:
             repo = FailureLogRepository(session)
@@ -72,6 +99,7 @@ async def save_review_to_database(
     author_email: str | None = None,
     email_recipients: list[str] | None = None,
     email_sent: bool = False,
+    review_metrics: ReviewMetrics | None = None,
 ) -> int | None:
     """Save review record to database. Returns the review record ID if successful, None otherwise."""
     try:
@@ -92,6 +120,12 @@ async def save_review_to_database(
                 email_sent=email_sent,
                 llm_provider=Config.LLM_PROVIDER,
                 llm_model=Config.LLM_MODEL,
+                cache_hit=review_metrics.cache_hit if review_metrics else None,
+                prompt_tokens=review_metrics.prompt_tokens if review_metrics else None,
+                completion_tokens=review_metrics.completion_tokens if review_metrics else None,
+                time_to_first_token_ms=review_metrics.time_to_first_token_ms if review_metrics else None,
+                tokens_per_second=review_metrics.tokens_per_second if review_metrics else None,
+                partial_output=review_metrics.partial_output if review_metrics else None,
             )
             record_id: int = record.id
             logger.info(f"Saved review record with ID: {record_id}")
@@ -101,6 +135,68 @@ async def save_review_to_database(
         return None
 
 
+async def update_review_email_sent(review_id: int, email_sent: bool) -> None:
+    """Correct the email status of a review saved while its email was being sent."""
+    try:
+        async with get_db_session() as session:
+            await ReviewRepository(session).set_email_sent(review_id, email_sent)
+    except Exception as e:
+        logger.error(f"Error updating email status of review {review_id}: {str(e)}")
+
+
+@dataclass
+class ReviewRecipients:
+    """Who a review email goes to, resolved from the commit or pull request metadata"""
+
+    emails: list[str] = field(default_factory=list)
+    author_name: str | None = None
+    subject_id: str = "Unknown"
+
+
+async def fetch_review_recipients(
+    bitbucket_client: BitbucketClient,
+    project_key: str,
+    repo_slug: str,
+    commit_id: str | None = None,
+    pr_id: int | None = None,
+) -> ReviewRecipients:
+    """Get the author (and reviewers, for PRs) of a commit or pull request from Bitbucket"""
+    recipients = ReviewRecipients()
+
+    if commit_id:
+        # Get commit info to extract author email
+        commit_info = await bitbucket_client.get_commit_info(project_key, repo_slug, commit_id)
+        if commit_info and commit_info.get("author"):
+            author_data = commit_info["author"]
+            author_email = author_data.get("emailAddress")
+            recipients.author_name = author_data.get("displayName") or author_data.get("name")
+            if author_email:
+                recipients.emails.append(author_email)
+            recipients.subject_id = f"Commit {commit_id[:8]} authored by {recipients.author_name}"
+
+    elif pr_id:
+        # Get PR info to extract author and reviewers emails
+        pr_info = await bitbucket_client.get_pull_request_info(project_key, repo_slug, pr_id)
+        if pr_info and pr_info.get("author") and pr_info["author"].get("user"):
+            user_data = pr_info["author"]["user"]
+            author_email = user_data.get("emailAddress")
+            recipients.author_name = user_data.get("displayName") or user_data.get("name")
+            if author_email:
+                recipients.emails.append(author_email)
+
+            # Extract reviewer emails
+            reviewers = pr_info.get("reviewers", [])
+            for reviewer in reviewers:
+                if reviewer.get("user"):
+                    reviewer_email = reviewer["user"].get("emailAddress")
+                    if reviewer_email and reviewer_email not in recipients.emails:
+                        recipients.emails.append(reviewer_email)
+
+            recipients.subject_id = f"Pull Request #{pr_id} authored by {recipients.author_name}"
+
+    return recipients
+
+
 async def send_review_email(
     bitbucket_client: BitbucketClient,
     project_key: str,
@@ -109,65 +205,52 @@ async def send_review_email(
     review_type: str = "AI Code Review",
     commit_id: str | None = None,
     pr_id: int | None = None,
+    recipients: ReviewRecipients | None = None,
+    on_failure: DeliveryFailureCallback | None = None,
 ) -> tuple[bool, list[str], str | None]:
-    """Send review email to author and reviewers (for PRs). Returns (success, recipient_emails, author_name) tuple."""
+    """
+    Send review email to author and reviewers (for PRs). Returns (success, recipient_emails, author_name) tuple.
+
+    Recipients are fetched from Bitbucket unless already resolved by the caller. Success means the email was
+    queued; on_failure is awaited with the error if it is not delivered after all.
+    """
+    subject_id = "Unknown"
     try:
-        recipient_emails = []
-        author_name = None
-        subject_id = "Unknown"
-
-        if commit_id:
-            # Get commit info to extract author email
-            commit_info = await bitbucket_client.get_commit_info(project_key, repo_slug, commit_id)
-            if commit_info and commit_info.get("author"):
-                author_data = commit_info["author"]
-                author_email = author_data.get("emailAddress")
-                author_name = author_data.get("displayName") or author_data.get("name")
-                if author_email:
-                    recipient_emails.append(author_email)
-                subject_id = f"Commit {commit_id[:8]} authored by {author_name}"
-
-        elif pr_id:
-            # Get PR info to extract author and reviewers emails
-            pr_info = await bitbucket_client.get_pull_request_info(project_key, repo_slug, pr_id)
-            if pr_info and pr_info.get("author") and pr_info["author"].get("user"):
-                user_data = pr_info["author"]["user"]
-                author_email = user_data.get("emailAddress")
-                author_name = user_data.get("displayName") or user_data.get("name")
-                if author_email:
-                    recipient_emails.append(author_email)
-
-                # Extract reviewer emails
-                reviewers = pr_info.get("reviewers", [])
-                for reviewer in reviewers:
-                    if reviewer.get("user"):
-                        reviewer_email = reviewer["user"].get("emailAddress")
-                        if reviewer_email and reviewer_email not in recipient_emails:
-                            recipient_emails.append(reviewer_email)
-
-                subject_id = f"Pull Request #{pr_id} authored by {author_name}"
+        if recipients is None:
+            recipients = await fetch_review_recipients(bitbucket_client, project_key, repo_slug, commit_id, pr_id)
+        recipient_emails = recipients.emails
+        author_name = recipients.author_name
+        subject_id = recipients.subject_id
 
         if not recipient_emails:
             logger.warning(f"Could not get recipient emails for {subject_id}, skipping email")
             return False, [], None
 
+        # In digest mode, reviews for the same recipients are combined into one email per window
+        if Config.EMAIL_DIGEST_ENABLED:
+            buffered = await get_email_digest().add(recipient_emails, review_type, subject_id, review, on_failure)
+            return buffered, recipient_emails, author_name
+
         # Create email subject
         subject = f"{review_type} - {subject_id}"
 
         # Format review as HTML
         html_body = format_review_to_html(f"🤖 **{review_type}**\n\n{review}")
 
-        # Send email to all recipients
+        # Queue email to all recipients; delivery happens in the background
         recipients_str = ", ".join(recipient_emails)
-        send_mail(
+        queued = await get_email_client().queue_mail(
             to=recipients_str,
             cc="",  # No CC for now
             subject=subject,
             mailbody=html_body,
+            on_failure=on_failure,
         )
+        if not queued:
+            return False, recipient_emails, author_name
 
         logger.info(
-            f"Sent {review_type.lower()} email for {subject_id} to {len(recipient_emails)} recipient(s): {recipients_str}"
+            f"Queued {review_type.lower()} email for {subject_id} to {len(recipient_emails)} recipient(s): {recipients_str}"
         )
         return True, recipient_emails, author_name
 
@@ -176,6 +259,234 @@ async def send_review_email(
         return False, [], None
 
 
+def _prefetch_recipients(
+    bitbucket_client: BitbucketClient,
+    project_key: str,
+    repo_slug: str,
+    commit_id: str | None = None,
+    pr_id: int | None = None,
+) -> asyncio.Task[ReviewRecipients]:
+    """Start resolving email recipients so the Bitbucket round trip overlaps the diff fetch and LLM call"""
+    return asyncio.create_task(fetch_review_recipients(bitbucket_client, project_key, repo_slug, commit_id, pr_id))
+
+
+async def _await_recipients(
+    task: asyncio.Task[ReviewRecipients],
+    bitbucket_client: BitbucketClient,
+    project_key: str,
+    repo_slug: str,
+    commit_id: str | None = None,
+    pr_id: int | None = None,
+) -> ReviewRecipients:
+    """Get prefetched recipients, fetching them again if the prefetch failed (no recipients if that fails too)"""
+    try:
+        return await task
+    except Exception as e:
+        logger.warning(f"Prefetching email recipients failed, retrying: {str(e)}")
+    try:
+        return await fetch_review_recipients(bitbucket_client, project_key, repo_slug, commit_id, pr_id)
+    except Exception as e:
+        logger.error(f"Error getting email recipients: {str(e)}")
+        return ReviewRecipients()
+
+
+async def _email_and_save_review(
+    bitbucket_client: BitbucketClient,
+    payload: dict[str, Any],
+    project_key: str,
+    repo_slug: str,
+    diff: str,
+    review: str,
+    metrics: ReviewMetrics,
+    recipients: ReviewRecipients,
+    is_manual: bool = False,
+    commit_id: str | None = None,
+    pr_id: int | None = None,
+) -> None:
+    """
+    Send the review email and save the review record concurrently; a failure in one does not stop the other.
+
+    The record is saved as emailed when there are recipients and corrected if the email is not queued, or
+    later if the queued email cannot be delivered.
+    """
+    event_type = "manual" if is_manual else "webhook"
+    event_key = "manual_review" if is_manual else payload.get("eventKey")
+    review_type = "AI Code Review (Manual)" if is_manual else "AI Code Review"
+    author_email = recipients.emails[0] if recipients.emails else None  # The author is always first
+    expect_email = bool(recipients.emails)
+
+    async def log_email_failure(error: Exception) -> None:
+        logger.error(f"Error sending review email: {str(error)}")
+        await log_review_failure(
+            event_type=event_type,
+            event_key=event_key,
+            failure_stage="email_send",
+            error=error,
+            request_payload=payload,
+            project_key=project_key,
+            repo_slug=repo_slug,
+            commit_id=commit_id,
+            pr_id=pr_id,
+            author_name=recipients.author_name,
+            author_email=author_email,
+        )
+
+    save_task = asyncio.create_task(
+        save_review_to_database(
+            review_type="manual" if is_manual else "auto",
+            trigger_type="pull_request" if pr_id is not None else "commit",
+            project_key=project_key,
+            repo_slug=repo_slug,
+            diff_content=diff,
+            review_feedback=review,
+            commit_id=commit_id,
+            pr_id=pr_id,
+            author_name=recipients.author_name,
+            author_email=author_email,
+            email_recipients=recipients.emails or None,
+            email_sent=expect_email,
+            review_metrics=metrics,
+        )
+    )
+
+    async def on_delivery_failed(error: Exception) -> None:
+        # Runs in the email worker once delivery has failed, usually long after the record was saved
+        await log_email_failure(error)
+        await asyncio.wait([save_task])
+        if not save_task.cancelled() and save_task.exception() is None:
+            review_id = save_task.result()
+            if review_id is not None:
+                await update_review_email_sent(review_id, False)
+
+    email_result, save_result = await asyncio.gather(
+        send_review_email(
+            bitbucket_client,
+            project_key,
+            repo_slug,
+            review,
+            review_type,
+            commit_id=commit_id,
+            pr_id=pr_id,
+            recipients=recipients,
+            on_failure=on_delivery_failed,
+        ),
+        save_task,
+        return_exceptions=True,
+    )
+
+    for result in (email_result, save_result):
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result  # Cancelled
+
+    email_sent = False
+    if isinstance(email_result, Exception):
+        await log_email_failure(email_result)
+    elif not isinstance(email_result, BaseException):
+        email_sent = email_result[0]
+
+    if isinstance(save_result, Exception):
+        logger.error(f"Error saving review to database: {str(save_result)}")
+        await log_review_failure(
+            event_type=event_type,
+            event_key=event_key,
+            failure_stage="database_save",
+            error=save_result,
+            request_payload=payload,
+            project_key=project_key,
+            repo_slug=repo_slug,
+            commit_id=commit_id,
+            pr_id=pr_id,
+            author_name=recipients.author_name,
+            author_email=author_email,
+        )
+    elif isinstance(save_result, int) and email_sent != expect_email:
+        await update_review_email_sent(save_result, email_sent)
+
+
+def _discard_task(task: asyncio.Task) -> None:
+    """Cancel a prefetch that is no longer needed, or consume its error if it already failed"""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()
+
+
+@dataclass
+class IncrementalDiff:
+    """The commits pushed to a pull request since its last review, with the findings given so far"""
+
+    diff: str
+    previous_commit: str
+    previous_review: str | None
+
+
+async def _fetch_incremental_pr_diff(
+    bitbucket_client: BitbucketClient,
+    project_key: str,
+    repo_slug: str,
+    pr_id: int,
+    head_commit: str,
+) -> IncrementalDiff | None:
+    """
+    Get the diff of the commits pushed to a pull request since its last review.
+
+    Returns None when the full pull request diff should be reviewed instead: no earlier review, the
+    same head, or no interdiff from the last reviewed commit (e.g. it was removed by a force push).
+    """
+    try:
+        async with get_db_session() as session:
+            state = await PullRequestReviewStateRepository(session).get_state(project_key, repo_slug, pr_id)
+            if state is None or state.last_reviewed_commit == head_commit:
+                return None
+            previous_commit = state.last_reviewed_commit
+            previous_review = state.last_review_feedback
+    except Exception as e:
+        logger.error(f"Error loading review state for PR {pr_id}, reviewing the full diff: {str(e)}")
+        return None
+
+    interdiff = await bitbucket_client.get_compare_diff(project_key, repo_slug, head_commit, previous_commit)
+    if not interdiff or not interdiff.strip():
+        logger.info(f"No incremental diff for PR {pr_id} since {previous_commit[:8]}, reviewing the full diff")
+        return None
+
+    logger.info(
+        f"Reviewing PR {pr_id} incrementally: {previous_commit[:8]}..{head_commit[:8]} ({len(interdiff)} characters)"
+    )
+    return IncrementalDiff(diff=interdiff, previous_commit=previous_commit, previous_review=previous_review)
+
+
+def _accumulate_review_feedback(
+    incremental: IncrementalDiff | None, head_commit: str, review_feedback: str
+) -> str | None:
+    """
+    Get the findings to store for the next incremental review.
+
+    A full review replaces the stored findings; an incremental review adds its findings to the earlier
+    ones, so findings from every update since the last full review are kept.
+    """
+    if incremental is None:
+        return review_feedback
+    if review_feedback.strip() == "No issues found.":
+        return incremental.previous_review
+    update = f"#### Commits {incremental.previous_commit[:8]}..{head_commit[:8]}\n\n{review_feedback}"
+    if not incremental.previous_review:
+        return update
+    return f"{incremental.previous_review}\n\n{update}"
+
+
+async def _save_pr_review_state(
+    project_key: str, repo_slug: str, pr_id: int, head_commit: str, review_feedback: str | None
+) -> None:
+    """Record the commit a pull request was reviewed at; failures only cost the next review its increment"""
+    try:
+        async with get_db_session() as session:
+            await PullRequestReviewStateRepository(session).upsert_state(
+                project_key, repo_slug, pr_id, head_commit, review_feedback
+            )
+    except Exception as e:
+        logger.error(f"Error saving review state for PR {pr_id}: {str(e)}")
+
+
 async def process_pull_request_review(
     bitbucket_client: BitbucketClient, llm_client: LLMClient, payload: dict[str, Any], is_manual: bool = False
 ):
@@ -187,6 +498,7 @@ async def process_pull_request_review(
     author_email = None
     event_type = "manual" if is_manual else "webhook"
     event_key = "manual_review" if is_manual else payload.get("eventKey")
+    begin_retry_tracking()
 
     try:
         # Validate payload structure
@@ -235,113 +547,129 @@ async def process_pull_request_review(
         project_key = repository["project"]["key"]
         repo_slug = repository["slug"]
         pr_id = pull_request["id"]
+        head_commit = pull_request.get("fromRef", {}).get("latestCommit")
 
         logger.info(f"Processing PR review for {project_key}/{repo_slug}/pull-requests/{pr_id}")
 
-        # Get pull request diff
+        # Resolve email recipients while the diff is fetched and reviewed
+        recipients_task = _prefetch_recipients(bitbucket_client, project_key, repo_slug, pr_id=pr_id)
         try:
-            diff = await bitbucket_client.get_pull_request_diff(project_key, repo_slug, pr_id)
-        except Exception as e:
-            logger.error(f"Error fetching PR diff: {str(e)}")
-            await log_review_failure(
-                event_type=event_type,
-                event_key=event_key,
-                failure_stage="bitbucket_fetch_diff",
-                error=e,
-                request_payload=payload,
-                project_key=project_key,
-                repo_slug=repo_slug,
-                pr_id=pr_id,
-            )
-            return
-
-        if not diff or len(diff.strip()) == 0:
-            logger.info(f"No diff found for PR {pr_id}, skipping review")
-            return
-
-        # Get AI review
-        try:
-            review = await llm_client.get_code_review(diff)
-        except Exception as e:
-            logger.error(f"Error getting LLM review: {str(e)}")
-            await log_review_failure(
-                event_type=event_type,
-                event_key=event_key,
-                failure_stage="llm_review",
-                error=e,
-                request_payload=payload,
-                project_key=project_key,
-                repo_slug=repo_slug,
-                pr_id=pr_id,
-            )
-            return
-
-        if review and review.strip() != "No issues found.":
-            # Comment out post_pull_request_comment for now
-            # await bitbucket_client.post_pull_request_comment(
-            #     project_key, repo_slug, pr_id, f"🤖 **AI Code Review**\n\n{review}"
-            # )
-
-            # Send review email
-            review_type = "AI Code Review (Manual)" if is_manual else "AI Code Review"
+            # Get pull request diff; a push to the source branch is reviewed as the new commits only, and the
+            # full diff is only downloaded when there is no interdiff from the last reviewed commit
+            incremental = None
+            diff: str | None
             try:
-                email_sent, recipient_emails, author_name = await send_review_email(
-                    bitbucket_client, project_key, repo_slug, review, review_type, pr_id=pr_id
-                )
-                # Get author email (first in recipient list, which is always the author)
-                author_email = recipient_emails[0] if recipient_emails else None
+                if Config.INCREMENTAL_PR_REVIEW_ENABLED and head_commit and event_key == "pr:from_ref_updated":
+                    incremental = await _fetch_incremental_pr_diff(
+                        bitbucket_client, project_key, repo_slug, pr_id, head_commit
+                    )
+                if incremental is not None:
+                    diff = incremental.diff
+                else:
+                    diff = await bitbucket_client.get_pull_request_diff(project_key, repo_slug, pr_id)
             except Exception as e:
-                logger.error(f"Error sending review email: {str(e)}")
+                logger.error(f"Error fetching PR diff: {str(e)}")
                 await log_review_failure(
                     event_type=event_type,
                     event_key=event_key,
-                    failure_stage="email_send",
+                    failure_stage="bitbucket_fetch_diff",
                     error=e,
                     request_payload=payload,
                     project_key=project_key,
                     repo_slug=repo_slug,
                     pr_id=pr_id,
-                    author_name=author_name,
-                    author_email=author_email,
                 )
-                # Continue to save review even if email fails
-                email_sent = False
-                recipient_emails = []
+                if is_retryable(e):
+                    raise RetryableReviewError(f"Error fetching diff of PR {pr_id}: {str(e)}") from e
+                return
+
+            if not diff or len(diff.strip()) == 0:
+                logger.info(f"No diff found for PR {pr_id}, skipping review")
+                return
 
-            # Save to database
+            # Get AI review
             try:
-                await save_review_to_database(
-                    review_type="manual" if is_manual else "auto",
-                    trigger_type="pull_request",
+                metrics = ReviewMetrics()
+                review = await llm_client.get_code_review(
+                    diff,
+                    metrics=metrics,
+                    previous_review=incremental.previous_review if incremental is not None else None,
                     project_key=project_key,
-                    repo_slug=repo_slug,
-                    diff_content=diff,
-                    review_feedback=review,
-                    pr_id=pr_id,
-                    author_name=author_name,
-                    author_email=author_email,
-                    email_recipients=recipient_emails if recipient_emails else None,
-                    email_sent=email_sent,
                 )
             except Exception as e:
-                logger.error(f"Error saving review to database: {str(e)}")
+                logger.error(f"Error getting LLM review: {str(e)}")
                 await log_review_failure(
                     event_type=event_type,
                     event_key=event_key,
-                    failure_stage="database_save",
+                    failure_stage="llm_review",
                     error=e,
                     request_payload=payload,
                     project_key=project_key,
                     repo_slug=repo_slug,
                     pr_id=pr_id,
-                    author_name=author_name,
-                    author_email=author_email,
+                )
+                if is_retryable(e):
+                    raise RetryableReviewError(f"Error getting LLM review of PR {pr_id}: {str(e)}") from e
+                return
+
+            if review is None:
+                # The LLM client raises transient errors, so no review means a failure retrying will not fix
+                no_review = RuntimeError(f"No review returned by the LLM for PR {pr_id}")
+                logger.error(str(no_review))
+                await log_review_failure(
+                    event_type=event_type,
+                    event_key=event_key,
+                    failure_stage="llm_review",
+                    error=no_review,
+                    request_payload=payload,
+                    project_key=project_key,
+                    repo_slug=repo_slug,
+                    pr_id=pr_id,
+                )
+                return
+
+            if review and head_commit:
+                await _save_pr_review_state(
+                    project_key,
+                    repo_slug,
+                    pr_id,
+                    head_commit,
+                    _accumulate_review_feedback(incremental, head_commit, review),
+                )
+
+            if review and review.strip() != "No issues found.":
+                # Comment out post_pull_request_comment for now
+                # await bitbucket_client.post_pull_request_comment(
+                #     project_key, repo_slug, pr_id, f"🤖 **AI Code Review**\n\n{review}"
+                # )
+
+                # Email and save the review in parallel
+                recipients = await _await_recipients(
+                    recipients_task, bitbucket_client, project_key, repo_slug, pr_id=pr_id
+                )
+                author_name = recipients.author_name
+                author_email = recipients.emails[0] if recipients.emails else None
+                await _email_and_save_review(
+                    bitbucket_client,
+                    payload,
+                    project_key,
+                    repo_slug,
+                    diff,
+                    review,
+                    metrics,
+                    recipients,
+                    is_manual=is_manual,
+                    pr_id=pr_id,
                 )
 
-            logger.info(f"Processed AI review for PR {pr_id}")
-        else:
-            logger.info(f"No issues found in PR {pr_id}, no email sent")
+                logger.info(f"Processed AI review for PR {pr_id}")
+            else:
+                logger.info(f"No issues found in PR {pr_id}, no email sent")
+        finally:
+            _discard_task(recipients_task)
 
+    except RetryableReviewError:
+        raise
     except Exception as e:
         logger.error(f"Error processing pull request review: {str(e)}")
         await log_review_failure(
@@ -361,12 +689,9 @@ async def process_pull_request_review(
 async def process_commit_review(
     bitbucket_client: BitbucketClient, llm_client: LLMClient, payload: dict[str, Any], is_manual: bool = False
 ):
-    """Process commit for AI review"""
+    """Process commit for AI review, reviewing the pushed changes concurrently"""
     project_key = None
     repo_slug = None
-    commit_id = None
-    author_name = None
-    author_email = None
     event_type = "manual" if is_manual else "webhook"
     event_key = "manual_review" if is_manual else payload.get("eventKey")
 
@@ -393,14 +718,75 @@ async def process_commit_review(
         project_key = repository["project"]["key"]
         repo_slug = repository["slug"]
 
+        commit_ids = []
         for change in changes:
             commit_id = change.get("toHash")
             if not commit_id:
                 logger.warning("Skipping change without commit ID")
                 continue
+            commit_ids.append(commit_id)
+
+        # Each change is reviewed in its own task so one failure never affects the others
+        semaphore = asyncio.Semaphore(max(Config.COMMIT_REVIEW_CONCURRENCY, 1))
+
+        async def review_change(commit_id: str) -> None:
+            async with semaphore:
+                await _process_commit_change(
+                    bitbucket_client, llm_client, payload, project_key, repo_slug, commit_id, is_manual
+                )
+
+        results = await asyncio.gather(*(review_change(commit_id) for commit_id in commit_ids), return_exceptions=True)
+
+        # Retry only the changes that failed for a reason that may pass, so the others are not reviewed twice
+        failed = [
+            commit_id
+            for commit_id, result in zip(commit_ids, results, strict=True)
+            if isinstance(result, RetryableReviewError)
+        ]
+        if failed:
+            retry_payload = dict(payload, changes=[change for change in changes if change.get("toHash") in failed])
+            raise RetryableReviewError(
+                f"{len(failed)} of {len(commit_ids)} commit(s) could not be reviewed: {', '.join(failed)}",
+                retry_payload=retry_payload,
+            )
+
+    except RetryableReviewError:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing commit review: {str(e)}")
+        await log_review_failure(
+            event_type=event_type,
+            event_key=event_key,
+            failure_stage="unknown",
+            error=e,
+            request_payload=payload,
+            project_key=project_key,
+            repo_slug=repo_slug,
+        )
 
-            logger.info(f"Processing commit review for {project_key}/{repo_slug}/commits/{commit_id}")
 
+async def _process_commit_change(
+    bitbucket_client: BitbucketClient,
+    llm_client: LLMClient,
+    payload: dict[str, Any],
+    project_key: str,
+    repo_slug: str,
+    commit_id: str,
+    is_manual: bool = False,
+) -> None:
+    """Review a single pushed commit: fetch diff, LLM review, email and save"""
+    author_name = None
+    author_email = None
+    event_type = "manual" if is_manual else "webhook"
+    event_key = "manual_review" if is_manual else payload.get("eventKey")
+
+    logger.info(f"Processing commit review for {project_key}/{repo_slug}/commits/{commit_id}")
+    begin_retry_tracking()
+
+    try:
+        # Resolve email recipients while the diff is fetched and reviewed
+        recipients_task = _prefetch_recipients(bitbucket_client, project_key, repo_slug, commit_id=commit_id)
+        try:
             # Get commit diff
             try:
                 diff = await bitbucket_client.get_commit_diff(project_key, repo_slug, commit_id)
@@ -416,15 +802,18 @@ async def process_commit_review(
                     repo_slug=repo_slug,
                     commit_id=commit_id,
                 )
-                continue
+                if is_retryable(e):
+                    raise RetryableReviewError(f"Error fetching diff of commit {commit_id}: {str(e)}") from e
+                return
 
             if not diff or len(diff.strip()) == 0:
                 logger.info(f"No diff found for commit {commit_id}, skipping review")
-                continue
+                return
 
             # Get AI review
             try:
-                review = await llm_client.get_code_review(diff)
+                metrics = ReviewMetrics()
+                review = await llm_client.get_code_review(diff, metrics=metrics, project_key=project_key)
             except Exception as e:
                 logger.error(f"Error getting LLM review: {str(e)}")
                 await log_review_failure(
@@ -437,7 +826,25 @@ async def process_commit_review(
                     repo_slug=repo_slug,
                     commit_id=commit_id,
                 )
-                continue
+                if is_retryable(e):
+                    raise RetryableReviewError(f"Error getting LLM review of commit {commit_id}: {str(e)}") from e
+                return
+
+            if review is None:
+                # The LLM client raises transient errors, so no review means a failure retrying will not fix
+                no_review = RuntimeError(f"No review returned by the LLM for commit {commit_id}")
+                logger.error(str(no_review))
+                await log_review_failure(
+                    event_type=event_type,
+                    event_key=event_key,
+                    failure_stage="llm_review",
+                    error=no_review,
+                    request_payload=payload,
+                    project_key=project_key,
+                    repo_slug=repo_slug,
+                    commit_id=commit_id,
+                )
+                return
 
             if review and review.strip() != "No issues found.":
                 # Comment out post_commit_comment for now
@@ -445,68 +852,35 @@ async def process_commit_review(
                 #     project_key, repo_slug, commit_id, f"🤖 **AI Code Review**\n\n{review}"
                 # )
 
-                # Send review email
-                review_type = "AI Code Review (Manual)" if is_manual else "AI Code Review"
-                try:
-                    email_sent, recipient_emails, author_name = await send_review_email(
-                        bitbucket_client, project_key, repo_slug, review, review_type, commit_id=commit_id
-                    )
-                    # Get author email (first and only in recipient list for commits)
-                    author_email = recipient_emails[0] if recipient_emails else None
-                except Exception as e:
-                    logger.error(f"Error sending review email: {str(e)}")
-                    await log_review_failure(
-                        event_type=event_type,
-                        event_key=event_key,
-                        failure_stage="email_send",
-                        error=e,
-                        request_payload=payload,
-                        project_key=project_key,
-                        repo_slug=repo_slug,
-                        commit_id=commit_id,
-                        author_name=author_name,
-                        author_email=author_email,
-                    )
-                    # Continue to save review even if email fails
-                    email_sent = False
-                    recipient_emails = []
-
-                # Save to database
-                try:
-                    await save_review_to_database(
-                        review_type="manual" if is_manual else "auto",
-                        trigger_type="commit",
-                        project_key=project_key,
-                        repo_slug=repo_slug,
-                        diff_content=diff,
-                        review_feedback=review,
-                        commit_id=commit_id,
-                        author_name=author_name,
-                        author_email=author_email,
-                        email_recipients=recipient_emails if recipient_emails else None,
-                        email_sent=email_sent,
-                    )
-                except Exception as e:
-                    logger.error(f"Error saving review to database: {str(e)}")
-                    await log_review_failure(
-                        event_type=event_type,
-                        event_key=event_key,
-                        failure_stage="database_save",
-                        error=e,
-                        request_payload=payload,
-                        project_key=project_key,
-                        repo_slug=repo_slug,
-                        commit_id=commit_id,
-                        author_name=author_name,
-                        author_email=author_email,
-                    )
+                # Email and save the review in parallel
+                recipients = await _await_recipients(
+                    recipients_task, bitbucket_client, project_key, repo_slug, commit_id=commit_id
+                )
+                author_name = recipients.author_name
+                author_email = recipients.emails[0] if recipients.emails else None
+                await _email_and_save_review(
+                    bitbucket_client,
+                    payload,
+                    project_key,
+                    repo_slug,
+                    diff,
+                    review,
+                    metrics,
+                    recipients,
+                    is_manual=is_manual,
+                    commit_id=commit_id,
+                )
 
                 logger.info(f"Processed AI review for commit {commit_id}")
             else:
                 logger.info(f"No issues found in commit {commit_id}, no email sent")
+        finally:
+            _discard_task(recipients_task)
 
+    except RetryableReviewError:
+        raise
     except Exception as e:
-        logger.error(f"Error processing commit review: {str(e)}")
+        logger.error(f"Error processing commit {commit_id}: {str(e)}")
         await log_review_failure(
             event_type=event_type,
             event_key=event_key,
@@ -0,0 +1,51 @@
+"""Per-review measurements collected while a review is produced and persisted with the review record."""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class LLMRequestStats:
+    """Timing of a single LLM request, filled in by the provider call."""
+
+    streamed: bool = False
+    first_token_seconds: float | None = None  # Only known for streamed requests
+    # Time spent generating: from the first token to the end when streamed, the whole request otherwise
+    generation_seconds: float = 0.0
+    completed: bool = True  # False when a stream stalled or dropped before the end of the response
+
+
+@dataclass
+class ReviewMetrics:
+    """Mutable record of how a single review was produced.
+
+    Callers create one per review, pass it to LLMClient.get_code_review(), which fills it in,
+    and then hand it to save_review_to_database() so the values are stored on the ReviewRecord.
+    """
+
+    cache_hit: bool = False
+    # Tokens sent to and received from the LLM, summed over all requests (chunks and merge) for the review
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Earliest time to first token across the review's streamed requests
+    time_to_first_token_ms: int | None = None
+    # Completion tokens per second of generation time (per-stream rate when chunks run concurrently)
+    tokens_per_second: float | None = None
+    partial_output: bool = False  # Some of the review text came from a stream that did not finish
+    generation_seconds: float = field(default=0.0, repr=False)
+
+    def record_request(self, stats: LLMRequestStats, prompt_tokens: int, completion_tokens: int) -> None:
+        """Add one LLM request's token counts and timings to the review totals."""
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+        if stats.first_token_seconds is not None:
+            ttft_ms = round(stats.first_token_seconds * 1000)
+            if self.time_to_first_token_ms is None or ttft_ms < self.time_to_first_token_ms:
+                self.time_to_first_token_ms = ttft_ms
+
+        if not stats.completed:
+            self.partial_output = True
+
+        self.generation_seconds += stats.generation_seconds
+        if self.generation_seconds > 0 and self.completion_tokens > 0:
+            self.tokens_per_second = round(self.completion_tokens / self.generation_seconds, 2)
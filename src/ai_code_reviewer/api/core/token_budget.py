@@ -0,0 +1,237 @@
+"""Token counting and prompt budgeting for LLM review requests."""
+
+import logging
+import math
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from ai_code_reviewer.api.core.config import Config
+
+
+logger = logging.getLogger(__name__)
+
+# Context window sizes by model name prefix; the longest matching prefix wins
+MODEL_CONTEXT_WINDOWS: dict[str, int] = {
+    "gpt-4.1": 1047576,
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "o1": 200000,
+    "o3": 200000,
+    "o4": 200000,
+    "llama3.1": 131072,
+    "llama3.2": 131072,
+    "llama3": 8192,
+    "qwen2.5-coder": 32768,
+    "qwen-coder": 32768,
+    "codellama": 16384,
+    "mistral": 32768,
+    "deepseek-coder": 16384,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Tokens for chat framing (roles, system message) that are not part of the prompt text
+PROMPT_OVERHEAD_TOKENS = 50
+
+# Guidelines may use at most this share of the prompt when the diff does not fit alongside them
+GUIDELINES_MAX_SHARE = 0.3
+
+_ESTIMATE_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\x00-\x7f]|\s+|[^\sA-Za-z\d]")
+
+# Only texts up to this length (templates, guidelines sections) are cached; diffs and prompts are counted each time
+ESTIMATE_CACHE_MAX_CHARS = 16384
+
+
+class TokenCounter(ABC):
+    """Counts and truncates text in tokens for one model family."""
+
+    name = "base"
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Return the number of tokens in text."""
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Return the longest prefix of text that fits in max_tokens."""
+        if max_tokens <= 0:
+            return ""
+        tokens = self.count(text)
+        while tokens > max_tokens:
+            text = text[: max(int(len(text) * max_tokens / tokens * 0.95), 0)]
+            tokens = self.count(text)
+        return text
+
+
+class EstimatingTokenCounter(TokenCounter):
+    """
+    Fast tokenizer-free estimate that errs on the high side.
+
+    Words count as one token per four letters, while digits, punctuation and non-ASCII characters
+    (CJK, emoji) count individually, so minified and non-Latin content is not underestimated.
+    """
+
+    name = "estimate"
+
+    def count(self, text: str) -> int:
+        if len(text) <= ESTIMATE_CACHE_MAX_CHARS:
+            return _cached_estimate_tokens(text)
+        return _estimate_tokens(text)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Estimate the token count of text."""
+    tokens = 0
+    for match in _ESTIMATE_PATTERN.finditer(text):
+        piece = match.group()
+        if piece[0].isalpha() and piece.isascii():
+            tokens += math.ceil(len(piece) / 4)
+        elif piece.isspace():
+            # A single space merges into the following word; longer runs (indentation) cost a token
+            tokens += 0 if piece == " " else 1
+        else:
+            tokens += 1
+    return tokens
+
+
+# Templates and guidelines are counted for every review; the size limit keeps whole diffs out of the cache
+_cached_estimate_tokens = lru_cache(maxsize=512)(_estimate_tokens)
+
+
+class TiktokenCounter(TokenCounter):
+    """Exact token counts for OpenAI models using the optional 'tiktoken' package."""
+
+    name = "tiktoken"
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        tokens = self.encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return str(self.encoding.decode(tokens[:max_tokens]))
+
+
+def _tiktoken_counter(model: str) -> TokenCounter | None:
+    """Build a tiktoken counter for model, or None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use; fall back to the estimate when offline
+        logger.warning(f"Unable to load tiktoken encoding for {model}: {e}")
+        return None
+    return TiktokenCounter(encoding)
+
+
+# Tokenizer factories by model name prefix; a factory returns None to fall back to the estimate
+TOKENIZER_FACTORIES: dict[str, Callable[[str], TokenCounter | None]] = {
+    "gpt-": _tiktoken_counter,
+    "o1": _tiktoken_counter,
+    "o3": _tiktoken_counter,
+    "o4": _tiktoken_counter,
+}
+
+
+def _match_prefix(model: str, prefixes) -> str | None:
+    """Return the longest prefix matching the model name (Ollama tags such as ':8b' are ignored)."""
+    name = model.lower().split(":", 1)[0]
+    matches = [prefix for prefix in prefixes if name.startswith(prefix)]
+    return max(matches, key=len) if matches else None
+
+
+def register_tokenizer(model_prefix: str, factory: Callable[[str], TokenCounter | None]) -> None:
+    """Register a tokenizer factory for models whose name starts with model_prefix."""
+    TOKENIZER_FACTORIES[model_prefix.lower()] = factory
+    get_token_counter.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def get_token_counter(model: str) -> TokenCounter:
+    """Return the token counter for a model, falling back to the estimate."""
+    prefix = _match_prefix(model, TOKENIZER_FACTORIES)
+    counter = TOKENIZER_FACTORIES[prefix](model) if prefix else None
+    if counter is None:
+        counter = EstimatingTokenCounter()
+    logger.info(f"Using '{counter.name}' token counter for model {model}")
+    return counter
+
+
+def get_context_window(model: str) -> int:
+    """Return the context window in tokens for a model (LLM_CONTEXT_TOKENS overrides the table)."""
+    if Config.LLM_CONTEXT_TOKENS > 0:
+        return Config.LLM_CONTEXT_TOKENS
+    prefix = _match_prefix(model, MODEL_CONTEXT_WINDOWS)
+    return MODEL_CONTEXT_WINDOWS[prefix] if prefix else DEFAULT_CONTEXT_WINDOW
+
+
+@dataclass(frozen=True)
+class PromptBudget:
+    """Token budget for a single LLM request."""
+
+    context_tokens: int
+    output_tokens: int
+    max_prompt_tokens: int = 0  # Optional cap below the context window (0 = no cap)
+
+    @classmethod
+    def for_model(cls, model: str) -> "PromptBudget":
+        """Build the budget for a model from configuration."""
+        return cls(
+            context_tokens=get_context_window(model),
+            output_tokens=Config.LLM_MAX_OUTPUT_TOKENS,
+            max_prompt_tokens=Config.REVIEW_MAX_PROMPT_TOKENS,
+        )
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Tokens available for the prompt after reserving room for the response."""
+        available = self.context_tokens - self.output_tokens - PROMPT_OVERHEAD_TOKENS
+        if self.max_prompt_tokens > 0:
+            available = min(available, self.max_prompt_tokens)
+        return available
+
+    def fits(self, prompt_tokens: int) -> bool:
+        """Whether a prompt of this many tokens can be sent in one request."""
+        return prompt_tokens <= self.prompt_tokens
+
+    def allocate(self, template_tokens: int, guidelines_tokens: int, diff_tokens: int) -> tuple[int, int]:
+        """
+        Split the prompt budget between guidelines and diff.
+
+        Guidelines are kept whole when everything fits; otherwise they are capped at
+        GUIDELINES_MAX_SHARE of the space left after the template so the diff gets the rest.
+
+        Returns:
+            Tuple of (guidelines tokens allowed, diff tokens allowed)
+
+        Raises:
+            ValueError: If the template alone does not fit in the budget
+        """
+        available = self.prompt_tokens - template_tokens
+        if available <= 0:
+            raise ValueError(
+                f"Prompt template ({template_tokens} tokens) does not fit in the prompt budget "
+                f"({self.prompt_tokens} tokens)"
+            )
+
+        if guidelines_tokens + diff_tokens <= available:
+            return guidelines_tokens, available - guidelines_tokens
+
+        guidelines_allowed = min(guidelines_tokens, int(available * GUIDELINES_MAX_SHARE))
+        return guidelines_allowed, available - guidelines_allowed
@@ -1,7 +1,22 @@
 """Database package for review records persistence."""
 
 from ai_code_reviewer.api.db.database import close_db, get_db_session, init_db
-from ai_code_reviewer.api.db.models import ReviewRecord
+from ai_code_reviewer.api.db.models import (
+    ContentBlob,
+    PullRequestReviewState,
+    ReviewCacheEntry,
+    ReviewJob,
+    ReviewRecord,
+)
 
 
-__all__ = ["ReviewRecord", "init_db", "close_db", "get_db_session"]
+__all__ = [
+    "ContentBlob",
+    "ReviewRecord",
+    "ReviewJob",
+    "ReviewCacheEntry",
+    "PullRequestReviewState",
+    "init_db",
+    "close_db",
+    "get_db_session",
+]
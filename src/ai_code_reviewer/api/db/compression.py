@@ -0,0 +1,60 @@
+"""Compress the large text bodies stored as content blobs (zlib, or zstd with the optional 'zstandard' package)."""
+
+import functools
+import hashlib
+import logging
+import zlib
+
+
+logger = logging.getLogger(__name__)
+
+CODECS = ("zstd", "zlib", "none")
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 of the uncompressed bytes; equal bodies share one blob"""
+    return hashlib.sha256(data).hexdigest()
+
+
+@functools.cache
+def available_codec(codec: str) -> str:
+    """
+    Get the codec to compress with: the configured one, or zlib if it is unknown or zstandard is not installed.
+    """
+    if codec == "zstd" and zstandard is None:
+        logger.warning("CONTENT_BLOB_COMPRESSION=zstd needs the 'zstandard' package; using zlib")
+        return "zlib"
+    if codec not in CODECS:
+        logger.warning(f"Unknown CONTENT_BLOB_COMPRESSION {codec!r}; using zlib")
+        return "zlib"
+    return codec
+
+
+def compress(data: bytes, codec: str, level: int) -> bytes:
+    """Compress data with a codec from available_codec"""
+    if codec == "zstd":
+        return bytes(zstandard.ZstdCompressor(level=level).compress(data))
+    if codec == "zlib":
+        return zlib.compress(data, level)
+    return data
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """
+    Decompress a blob written with the given codec.
+
+    Raises:
+        RuntimeError: If the blob was written with zstd and zstandard is not installed
+    """
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Reading zstd-compressed content needs the 'zstandard' package")
+        return bytes(zstandard.ZstdDecompressor().decompress(data))
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return data
@@ -1,9 +1,33 @@
 """Database models for storing review records."""
 
+import json
 from datetime import datetime
 
-from sqlalchemy import JSON, DateTime, Integer, String, Text, func
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+from ai_code_reviewer.api.db.compression import decompress
+
+
+# SQLite stores CURRENT_TIMESTAMP as "YYYY-MM-DD HH:MM:SS" text; bind datetimes in the same format so that
+# created_at values read back from the database compare equal (keyset pagination relies on this)
+CreatedAt = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
 
 
 class Base(DeclarativeBase):
@@ -12,13 +36,39 @@ class Base(DeclarativeBase):
     pass
 
 
+class ContentBlob(Base):
+    """Model for large text bodies, compressed and stored once per distinct content (keyed by its SHA-256)."""
+
+    __tablename__ = "content_blobs"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)  # SHA-256 of the uncompressed bytes
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    codec: Mapped[str] = mapped_column(String(10), nullable=False)  # "zstd", "zlib" or "none"
+    size: Mapped[int] = mapped_column(Integer, nullable=False)  # Uncompressed size in bytes
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    @property
+    def text(self) -> str:
+        """The decompressed content"""
+        return decompress(self.data, self.codec).decode("utf-8")
+
+    def __repr__(self) -> str:
+        """String representation of the content blob."""
+        return f"<ContentBlob(hash={self.content_hash[:12]}, codec={self.codec}, size={self.size})>"
+
+
 class ReviewRecord(Base):
     """Model for storing code review records."""
 
     __tablename__ = "review_records"
+    __table_args__ = (
+        # Keyset pagination, newest first, with and without project/repository filters
+        Index("ix_review_records_created_at_id", "created_at", "id"),
+        Index("ix_review_records_project_repo_created_at_id", "project_key", "repo_slug", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(CreatedAt, server_default=func.now(), nullable=False)
 
     # Review metadata
     review_type: Mapped[str] = mapped_column(String(50), nullable=False)  # "auto" or "manual"
@@ -36,9 +86,19 @@ class ReviewRecord(Base):
     author_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     author_email: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
 
-    # Review content
-    diff_content: Mapped[str] = mapped_column(Text, nullable=False)
-    review_feedback: Mapped[str] = mapped_column(Text, nullable=False)
+    # Review content: stored inline, or in a shared content blob once larger than CONTENT_BLOB_MIN_BYTES
+    # (read both through the diff_content and review_feedback properties)
+    diff_inline: Mapped[str | None] = mapped_column("diff_content", Text, nullable=True)
+    review_inline: Mapped[str | None] = mapped_column("review_feedback", Text, nullable=True)
+    diff_blob_hash: Mapped[str | None] = mapped_column(
+        String(64), ForeignKey("content_blobs.content_hash", name="fk_review_records_diff_blob"), nullable=True
+    )
+    review_blob_hash: Mapped[str | None] = mapped_column(
+        String(64), ForeignKey("content_blobs.content_hash", name="fk_review_records_review_blob"), nullable=True
+    )
+    # Loaded by the repository queries that return full records; never lazily, one query per row
+    diff_blob: Mapped[ContentBlob | None] = relationship(foreign_keys=[diff_blob_hash], lazy="raise")
+    review_blob: Mapped[ContentBlob | None] = relationship(foreign_keys=[review_blob_hash], lazy="raise")
 
     # Email information (stored as JSON array of email addresses)
     email_recipients: Mapped[dict | None] = mapped_column(JSON, nullable=True)
@@ -47,6 +107,36 @@ class ReviewRecord(Base):
     # Additional metadata
     llm_provider: Mapped[str | None] = mapped_column(String(50), nullable=True)
     llm_model: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    cache_hit: Mapped[bool | None] = mapped_column(nullable=True)  # Review served from the review cache
+    prompt_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)  # Summed over all LLM requests
+    completion_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    time_to_first_token_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)  # Streamed responses only
+    tokens_per_second: Mapped[float | None] = mapped_column(Float, nullable=True)
+    partial_output: Mapped[bool | None] = mapped_column(nullable=True)  # LLM stream stalled before the end
+
+    @property
+    def diff_content(self) -> str:
+        """The reviewed diff, from its content blob or inline"""
+        if self.diff_blob_hash is not None and self.diff_blob is not None:
+            return self.diff_blob.text
+        return self.diff_inline or ""
+
+    @diff_content.setter
+    def diff_content(self, value: str) -> None:
+        self.diff_inline = value
+        self.diff_blob_hash = None
+
+    @property
+    def review_feedback(self) -> str:
+        """The review text, from its content blob or inline"""
+        if self.review_blob_hash is not None and self.review_blob is not None:
+            return self.review_blob.text
+        return self.review_inline or ""
+
+    @review_feedback.setter
+    def review_feedback(self, value: str) -> None:
+        self.review_inline = value
+        self.review_blob_hash = None
 
     def __repr__(self) -> str:
         """String representation of the review record."""
@@ -60,16 +150,23 @@ class ReviewFailureLog(Base):
     """Model for logging failed review attempts for audit and troubleshooting."""
 
     __tablename__ = "review_failure_logs"
+    __table_args__ = (Index("ix_review_failure_logs_created_at_id", "created_at", "id"),)  # Keyset pagination
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(CreatedAt, server_default=func.now(), nullable=False)
 
     # Request context - how the review was triggered
     event_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # "webhook" or "manual"
     event_key: Mapped[str | None] = mapped_column(
         String(100), nullable=True
     )  # e.g., "pr:opened", "repo:refs_changed", "manual_review"
-    request_payload: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # Full request payload for debugging
+    # Full request payload for debugging: stored inline, or in a shared content blob once larger than
+    # CONTENT_BLOB_MIN_BYTES (read both through the request_payload property)
+    payload_inline: Mapped[dict | None] = mapped_column("request_payload", JSON, nullable=True)
+    payload_blob_hash: Mapped[str | None] = mapped_column(
+        String(64), ForeignKey("content_blobs.content_hash", name="fk_review_failure_logs_payload_blob"), nullable=True
+    )
+    payload_blob: Mapped[ContentBlob | None] = relationship(lazy="raise")
 
     # Repository and target information
     project_key: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
@@ -94,9 +191,117 @@ class ReviewFailureLog(Base):
     resolved: Mapped[bool] = mapped_column(default=False, nullable=False, index=True)  # Whether issue was resolved
     resolution_notes: Mapped[str | None] = mapped_column(Text, nullable=True)  # Admin notes on resolution
 
+    @property
+    def request_payload(self) -> dict | None:
+        """The request payload, from its content blob or inline"""
+        if self.payload_blob_hash is not None and self.payload_blob is not None:
+            payload: dict = json.loads(self.payload_blob.text)
+            return payload
+        return self.payload_inline
+
+    @request_payload.setter
+    def request_payload(self, value: dict | None) -> None:
+        self.payload_inline = value
+        self.payload_blob_hash = None
+
     def __repr__(self) -> str:
         """String representation of the failure log."""
         return (
             f"<ReviewFailureLog(id={self.id}, stage={self.failure_stage}, "
             f"error={self.error_type}, resolved={self.resolved})>"
         )
+
+
+class ReviewJob(Base):
+    """Model for durable review jobs queued by webhooks and drained by background workers."""
+
+    __tablename__ = "review_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Job definition
+    job_type: Mapped[str] = mapped_column(String(50), nullable=False)  # "pull_request" or "commit"
+    event_key: Mapped[str | None] = mapped_column(String(100), nullable=True)  # e.g., "pr:opened"
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)  # Webhook payload passed to the review engine
+    coalesce_key: Mapped[str | None] = mapped_column(
+        String(255), nullable=True, index=True
+    )  # e.g., "PROJ/repo/pull-requests/12"; a newer job with the same key supersedes older ones
+
+    # Queue state
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="queued", index=True
+    )  # "queued", "running", "completed", "failed" or "superseded"
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )  # Earliest time a worker may pick up the job
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+
+    # Worker lease
+    locked_by: Mapped[str | None] = mapped_column(String(255), nullable=True)  # Worker identifier
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        """String representation of the review job."""
+        return (
+            f"<ReviewJob(id={self.id}, type={self.job_type}, status={self.status}, "
+            f"attempts={self.attempts}/{self.max_attempts})>"
+        )
+
+
+class ReviewCacheEntry(Base):
+    """Model for cached LLM reviews keyed by a hash of the normalized diff and review inputs."""
+
+    __tablename__ = "review_cache_entries"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
+
+    # SHA-256 of (normalized diff, guidelines, provider, model, prompt template)
+    cache_key: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    review_feedback: Mapped[str] = mapped_column(Text, nullable=False)
+    llm_provider: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    llm_model: Mapped[str | None] = mapped_column(String(100), nullable=True)
+
+    # LRU bookkeeping
+    last_accessed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation of the cache entry."""
+        return f"<ReviewCacheEntry(id={self.id}, key={self.cache_key[:12]}, hits={self.hit_count})>"
+
+
+class PullRequestReviewState(Base):
+    """Model tracking the last reviewed source commit of each pull request for incremental reviews."""
+
+    __tablename__ = "pull_request_review_states"
+    __table_args__ = (UniqueConstraint("project_key", "repo_slug", "pr_id", name="uq_pull_request_review_states_pr"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    # Pull request identity
+    project_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    repo_slug: Mapped[str] = mapped_column(String(255), nullable=False)
+    pr_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Last review
+    last_reviewed_commit: Mapped[str] = mapped_column(String(255), nullable=False)  # fromRef latestCommit
+    last_review_feedback: Mapped[str | None] = mapped_column(Text, nullable=True)  # Findings given as context
+
+    def __repr__(self) -> str:
+        """String representation of the pull request review state."""
+        return (
+            f"<PullRequestReviewState({self.project_key}/{self.repo_slug}#{self.pr_id}, "
+            f"commit={self.last_reviewed_commit[:12]})>"
+        )
@@ -1,15 +1,186 @@
 """Repository for managing review records in the database."""
 
+import base64
+import json
 import logging
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any, cast
 
-from sqlalchemy import desc, select
+from sqlalchemy import CursorResult, Result, delete, desc, exists, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, selectinload
 
-from ai_code_reviewer.api.db.models import ReviewFailureLog, ReviewRecord
+from ai_code_reviewer.api.core.config import Config
+from ai_code_reviewer.api.db.compression import available_codec, compress, content_hash
+from ai_code_reviewer.api.db.models import (
+    ContentBlob,
+    PullRequestReviewState,
+    ReviewCacheEntry,
+    ReviewFailureLog,
+    ReviewJob,
+    ReviewRecord,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Large columns left out of summary list queries; they are only loaded for a single record
+REVIEW_BODY_COLUMNS = (ReviewRecord.diff_inline, ReviewRecord.review_inline)
+FAILURE_DETAIL_COLUMNS = (ReviewFailureLog.payload_inline, ReviewFailureLog.error_stacktrace)
+
+# Content blobs holding the bodies of full records, loaded with one extra query per list
+REVIEW_BODY_BLOBS = (ReviewRecord.diff_blob, ReviewRecord.review_blob)
+FAILURE_DETAIL_BLOBS = (ReviewFailureLog.payload_blob,)
+
+# Keyset pagination position: (created_at, id) of the last record on the previous page
+PageCursor = tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, record_id: int) -> str:
+    """Build the opaque cursor for the page after a record"""
+    raw = f"{created_at.isoformat()}|{record_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageCursor:
+    """
+    Read a cursor built by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        created_at, record_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(record_id)
+    except ValueError as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+
+
+def next_page_cursor(records: list, limit: int) -> str | None:
+    """Get the cursor for the next page from a page fetched with limit + 1, or None if it was the last page"""
+    if limit < 1 or len(records) <= limit:
+        return None
+    return encode_cursor(records[limit - 1].created_at, records[limit - 1].id)
+
+
+def _summary(query, columns: tuple):
+    """Leave large columns out of a query; reading one afterwards raises instead of issuing a query per row"""
+    return query.options(*(defer(column, raiseload=True) for column in columns))
+
+
+def _with_blobs(query, relationships: tuple):
+    """Load the content blobs of the returned records together, so their bodies read without further queries"""
+    return query.options(*(selectinload(relationship) for relationship in relationships))
+
+
+def _rowcount(result: Result[Any]) -> int:
+    """Rows matched by an UPDATE or DELETE (session.execute returns a CursorResult for these)"""
+    return cast(CursorResult[Any], result).rowcount
+
+
+def _page(query, model, after: PageCursor | None, offset: int, limit: int):
+    """Order a query newest first and select one page, after a cursor or at an offset"""
+    if after is not None:
+        bound = tuple_(*after, types=[model.created_at.type, model.id.type])
+        query = query.where(tuple_(model.created_at, model.id) < bound)
+    query = query.order_by(desc(model.created_at), desc(model.id))
+    if offset:
+        query = query.offset(offset)
+    return query.limit(limit)
+
+
+class ContentBlobRepository:
+    """Repository for compressed, content-addressed bodies shared by review records and failure logs."""
+
+    # Dialects with INSERT ... ON CONFLICT DO NOTHING, so concurrent writers of the same content do not collide
+    CONFLICT_FREE_INSERTS: dict[str, Callable[[Any], sqlite.Insert | postgresql.Insert]] = {
+        "sqlite": sqlite.insert,
+        "postgresql": postgresql.insert,
+    }
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def store(self, text: str) -> ContentBlob | None:
+        """
+        Store a body as a compressed content blob, or reuse the blob that already holds the same content.
+
+        Returns:
+            The blob, or None if content blobs are disabled or the body is small enough to stay inline
+        """
+        data = text.encode("utf-8")
+        if not Config.CONTENT_BLOBS_ENABLED or len(data) < Config.CONTENT_BLOB_MIN_BYTES:
+            return None
+        try:
+            digest = content_hash(data)
+            blob: ContentBlob | None = await self.session.get(ContentBlob, digest)
+            if blob is not None:
+                return blob
+
+            codec = available_codec(Config.CONTENT_BLOB_COMPRESSION)
+            compressed = compress(data, codec, Config.CONTENT_BLOB_COMPRESSION_LEVEL)
+            if len(compressed) >= len(data):
+                codec, compressed = "none", data
+            values = {"content_hash": digest, "codec": codec, "size": len(data), "data": compressed}
+
+            insert = self.CONFLICT_FREE_INSERTS.get(self.session.get_bind().dialect.name)
+            if insert is None:
+                blob = ContentBlob(**values)
+                self.session.add(blob)
+                await self.session.flush()
+                return blob
+            await self.session.execute(
+                insert(ContentBlob).values(**values).on_conflict_do_nothing(index_elements=["content_hash"])
+            )
+            return await self.session.get(ContentBlob, digest)
+        except Exception as e:
+            logger.error(f"Error storing content blob: {str(e)}")
+            raise
+
+    async def delete_unreferenced(self) -> int:
+        """
+        Delete blobs that no review record or failure log refers to any more. Returns the count.
+
+        Blobs are shared, so deleting a row never deletes its blobs; run this after removing old rows.
+        """
+        try:
+            result = await self.session.execute(
+                delete(ContentBlob)
+                .where(
+                    ~exists().where(ReviewRecord.diff_blob_hash == ContentBlob.content_hash),
+                    ~exists().where(ReviewRecord.review_blob_hash == ContentBlob.content_hash),
+                    ~exists().where(ReviewFailureLog.payload_blob_hash == ContentBlob.content_hash),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            count = _rowcount(result)
+            if count:
+                logger.info(f"Deleted {count} unreferenced content blob(s)")
+            return count
+        except Exception as e:
+            logger.error(f"Error deleting unreferenced content blobs: {str(e)}")
+            raise
+
+    async def get_stats(self) -> dict[str, int]:
+        """Get the number of blobs and their total uncompressed and stored sizes."""
+        try:
+            result = await self.session.execute(
+                select(
+                    func.count(ContentBlob.content_hash),
+                    func.coalesce(func.sum(ContentBlob.size), 0),
+                    func.coalesce(func.sum(func.length(ContentBlob.data)), 0),
+                )
+            )
+            blobs, content_bytes, stored_bytes = result.one()
+            return {"blobs": blobs, "content_bytes": int(content_bytes), "stored_bytes": int(stored_bytes)}
+        except Exception as e:
+            logger.error(f"Error fetching content blob stats: {str(e)}")
+            raise
+
 
 class ReviewRepository:
     """Repository for review record operations."""
@@ -34,12 +205,23 @@ class ReviewRepository:
         email_sent: bool = False,
         llm_provider: str | None = None,
         llm_model: str | None = None,
+        cache_hit: bool | None = None,
+        prompt_tokens: int | None = None,
+        completion_tokens: int | None = None,
+        time_to_first_token_ms: int | None = None,
+        tokens_per_second: float | None = None,
+        partial_output: bool | None = None,
     ) -> ReviewRecord:
         """Create a new review record in the database."""
         try:
             # Convert email_recipients list to JSON-serializable format
             recipients_data = {"to": email_recipients or []} if email_recipients else None
 
+            # Large bodies go to shared content blobs; the same diff reviewed twice is stored once
+            blobs = ContentBlobRepository(self.session)
+            diff_blob = await blobs.store(diff_content)
+            review_blob = await blobs.store(review_feedback)
+
             review_record = ReviewRecord(
                 review_type=review_type,
                 trigger_type=trigger_type,
@@ -49,17 +231,26 @@ class ReviewRepository:
                 pr_id=pr_id,
                 author_name=author_name,
                 author_email=author_email,
-                diff_content=diff_content,
-                review_feedback=review_feedback,
+                diff_inline=diff_content if diff_blob is None else None,
+                review_inline=review_feedback if review_blob is None else None,
+                diff_blob=diff_blob,
+                review_blob=review_blob,
                 email_recipients=recipients_data,
                 email_sent=email_sent,
                 llm_provider=llm_provider,
                 llm_model=llm_model,
+                cache_hit=cache_hit,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                time_to_first_token_ms=time_to_first_token_ms,
+                tokens_per_second=tokens_per_second,
+                partial_output=partial_output,
             )
 
             self.session.add(review_record)
             await self.session.flush()
-            await self.session.refresh(review_record)
+            # Only created_at is set by the database; a full refresh would unload the content blobs
+            await self.session.refresh(review_record, ["created_at"])
 
             logger.info(f"Created review record with ID: {review_record.id}")
             return review_record
@@ -71,30 +262,44 @@ class ReviewRepository:
     async def get_review_by_id(self, review_id: int) -> ReviewRecord | None:
         """Get a review record by ID."""
         try:
-            result = await self.session.execute(select(ReviewRecord).where(ReviewRecord.id == review_id))
+            result = await self.session.execute(
+                _with_blobs(select(ReviewRecord).where(ReviewRecord.id == review_id), REVIEW_BODY_BLOBS)
+            )
             record: ReviewRecord | None = result.scalar_one_or_none()
             return record
         except Exception as e:
             logger.error(f"Error fetching review record {review_id}: {str(e)}")
             raise
 
-    async def get_latest_reviews(self, limit: int = 10) -> list[ReviewRecord]:
-        """Get the latest N review records ordered by creation date."""
+    async def set_email_sent(self, review_id: int, email_sent: bool) -> None:
+        """Record whether the review email went out, for reviews saved while the email was being sent."""
         try:
-            result = await self.session.execute(
-                select(ReviewRecord).order_by(desc(ReviewRecord.created_at)).limit(limit)
+            await self.session.execute(
+                update(ReviewRecord).where(ReviewRecord.id == review_id).values(email_sent=email_sent)
             )
+            logger.info(f"Set email_sent={email_sent} on review record {review_id}")
+        except Exception as e:
+            logger.error(f"Error updating email status of review record {review_id}: {str(e)}")
+            raise
+
+    async def get_latest_reviews(self, limit: int = 10, summary: bool = False) -> list[ReviewRecord]:
+        """Get the latest N review records ordered by creation date (without diff and feedback if summary)."""
+        try:
+            query = select(ReviewRecord).order_by(desc(ReviewRecord.created_at), desc(ReviewRecord.id)).limit(limit)
+            query = _summary(query, REVIEW_BODY_COLUMNS) if summary else _with_blobs(query, REVIEW_BODY_BLOBS)
+            result = await self.session.execute(query)
             return list(result.scalars().all())
         except Exception as e:
             logger.error(f"Error fetching latest reviews: {str(e)}")
             raise
 
-    async def get_reviews_paginated(self, offset: int = 0, limit: int = 10) -> list[ReviewRecord]:
-        """Get review records with pagination (offset and limit)."""
+    async def get_reviews_paginated(
+        self, offset: int = 0, limit: int = 10, after: PageCursor | None = None
+    ) -> list[ReviewRecord]:
+        """Get review records with pagination (offset and limit, or limit after a decoded cursor)."""
         try:
-            result = await self.session.execute(
-                select(ReviewRecord).order_by(desc(ReviewRecord.created_at)).offset(offset).limit(limit)
-            )
+            query = _with_blobs(select(ReviewRecord), REVIEW_BODY_BLOBS)
+            result = await self.session.execute(_page(query, ReviewRecord, after, offset, limit))
             return list(result.scalars().all())
         except Exception as e:
             logger.error(f"Error fetching paginated reviews: {str(e)}")
@@ -105,7 +310,7 @@ class ReviewRepository:
     ) -> list[ReviewRecord]:
         """Get review records for a specific project/repository."""
         try:
-            query = select(ReviewRecord).where(ReviewRecord.project_key == project_key)
+            query = _with_blobs(select(ReviewRecord), REVIEW_BODY_BLOBS).where(ReviewRecord.project_key == project_key)
 
             if repo_slug:
                 query = query.where(ReviewRecord.repo_slug == repo_slug)
@@ -126,10 +331,17 @@ class ReviewRepository:
         repo_slug: str | None = None,
         commit_id: str | None = None,
         pr_id: int | None = None,
+        after: PageCursor | None = None,
+        summary: bool = False,
     ) -> list[ReviewRecord]:
-        """Get review records with dynamic filtering and pagination."""
+        """
+        Get review records with dynamic filtering and pagination (offset, or after a decoded cursor).
+
+        With summary, diff_content and review_feedback are not loaded.
+        """
         try:
             query = select(ReviewRecord)
+            query = _summary(query, REVIEW_BODY_COLUMNS) if summary else _with_blobs(query, REVIEW_BODY_BLOBS)
 
             # Apply filters if provided
             if project_key:
@@ -142,7 +354,7 @@ class ReviewRepository:
                 query = query.where(ReviewRecord.pr_id == pr_id)
 
             # Apply ordering and pagination
-            query = query.order_by(desc(ReviewRecord.created_at)).offset(offset).limit(limit)
+            query = _page(query, ReviewRecord, after, offset, limit)
 
             result = await self.session.execute(query)
             return list(result.scalars().all())
@@ -222,12 +434,30 @@ class ReviewRepository:
             )
             by_llm_provider = {row[0]: row[1] for row in llm_provider_result.all()}
 
+            # Review cache hits
+            cache_hit_result = await self.session.execute(
+                select(func.count(ReviewRecord.id)).where(ReviewRecord.cache_hit == True)  # noqa: E712
+            )
+            cache_hits: int = cache_hit_result.scalar_one()
+
+            # LLM token usage
+            token_result = await self.session.execute(
+                select(
+                    func.coalesce(func.sum(ReviewRecord.prompt_tokens), 0),
+                    func.coalesce(func.sum(ReviewRecord.completion_tokens), 0),
+                )
+            )
+            prompt_tokens, completion_tokens = token_result.one()
+
             return {
                 "total_reviews": total,
                 "by_review_type": by_review_type,
                 "by_trigger_type": by_trigger_type,
                 "email_success_rate": email_success_rate,
                 "by_llm_provider": by_llm_provider,
+                "cache_hits": cache_hits,
+                "total_prompt_tokens": int(prompt_tokens or 0),
+                "total_completion_tokens": int(completion_tokens or 0),
             }
         except Exception as e:
             logger.error(f"Error fetching review stats: {str(e)}")
@@ -260,10 +490,15 @@ class FailureLogRepository:
     ) -> ReviewFailureLog:
         """Create a new failure log record in the database."""
         try:
+            payload_blob = None
+            if request_payload is not None:
+                payload_blob = await ContentBlobRepository(self.session).store(json.dumps(request_payload))
+
             failure_log = ReviewFailureLog(
                 event_type=event_type,
                 event_key=event_key,
-                request_payload=request_payload,
+                payload_inline=request_payload if payload_blob is None else None,
+                payload_blob=payload_blob,
                 project_key=project_key,
                 repo_slug=repo_slug,
                 commit_id=commit_id,
@@ -280,7 +515,8 @@ class FailureLogRepository:
 
             self.session.add(failure_log)
             await self.session.flush()
-            await self.session.refresh(failure_log)
+            # Only created_at is set by the database; a full refresh would unload the payload blob
+            await self.session.refresh(failure_log, ["created_at"])
 
             logger.info(f"Created failure log with ID: {failure_log.id}")
             return failure_log
@@ -292,7 +528,9 @@ class FailureLogRepository:
     async def get_failure_by_id(self, failure_id: int) -> ReviewFailureLog | None:
         """Get a failure log by ID."""
         try:
-            result = await self.session.execute(select(ReviewFailureLog).where(ReviewFailureLog.id == failure_id))
+            result = await self.session.execute(
+                _with_blobs(select(ReviewFailureLog).where(ReviewFailureLog.id == failure_id), FAILURE_DETAIL_BLOBS)
+            )
             record: ReviewFailureLog | None = result.scalar_one_or_none()
             return record
         except Exception as e:
@@ -303,7 +541,7 @@ class FailureLogRepository:
         """Get unresolved failure logs ordered by creation date."""
         try:
             result = await self.session.execute(
-                select(ReviewFailureLog)
+                _with_blobs(select(ReviewFailureLog), FAILURE_DETAIL_BLOBS)
                 .where(ReviewFailureLog.resolved == False)  # noqa: E712
                 .order_by(desc(ReviewFailureLog.created_at))
                 .limit(limit)
@@ -317,7 +555,7 @@ class FailureLogRepository:
         """Get failure logs for a specific failure stage."""
         try:
             result = await self.session.execute(
-                select(ReviewFailureLog)
+                _with_blobs(select(ReviewFailureLog), FAILURE_DETAIL_BLOBS)
                 .where(ReviewFailureLog.failure_stage == failure_stage)
                 .order_by(desc(ReviewFailureLog.created_at))
                 .limit(limit)
@@ -332,7 +570,9 @@ class FailureLogRepository:
     ) -> list[ReviewFailureLog]:
         """Get failure logs for a specific project/repository."""
         try:
-            query = select(ReviewFailureLog).where(ReviewFailureLog.project_key == project_key)
+            query = _with_blobs(select(ReviewFailureLog), FAILURE_DETAIL_BLOBS).where(
+                ReviewFailureLog.project_key == project_key
+            )
 
             if repo_slug:
                 query = query.where(ReviewFailureLog.repo_slug == repo_slug)
@@ -345,23 +585,29 @@ class FailureLogRepository:
             logger.error(f"Error fetching failures for project {project_key}: {str(e)}")
             raise
 
-    async def get_latest_failures(self, limit: int = 50) -> list[ReviewFailureLog]:
-        """Get the latest N failure logs ordered by creation date."""
+    async def get_latest_failures(self, limit: int = 50, summary: bool = False) -> list[ReviewFailureLog]:
+        """Get the latest N failure logs ordered by creation date (without payload and stacktrace if summary)."""
         try:
-            result = await self.session.execute(
-                select(ReviewFailureLog).order_by(desc(ReviewFailureLog.created_at)).limit(limit)
-            )
+            query = select(ReviewFailureLog).order_by(desc(ReviewFailureLog.created_at)).limit(limit)
+            query = _summary(query, FAILURE_DETAIL_COLUMNS) if summary else _with_blobs(query, FAILURE_DETAIL_BLOBS)
+            result = await self.session.execute(query)
             return list(result.scalars().all())
         except Exception as e:
             logger.error(f"Error fetching latest failures: {str(e)}")
             raise
 
-    async def get_failures_paginated(self, offset: int = 0, limit: int = 10) -> list[ReviewFailureLog]:
-        """Get failure logs with pagination (offset and limit)."""
+    async def get_failures_paginated(
+        self, offset: int = 0, limit: int = 10, after: PageCursor | None = None, summary: bool = False
+    ) -> list[ReviewFailureLog]:
+        """
+        Get failure logs with pagination (offset and limit, or limit after a decoded cursor).
+
+        With summary, request_payload and error_stacktrace are not loaded.
+        """
         try:
-            result = await self.session.execute(
-                select(ReviewFailureLog).order_by(desc(ReviewFailureLog.created_at)).offset(offset).limit(limit)
-            )
+            query = select(ReviewFailureLog)
+            query = _summary(query, FAILURE_DETAIL_COLUMNS) if summary else _with_blobs(query, FAILURE_DETAIL_BLOBS)
+            result = await self.session.execute(_page(query, ReviewFailureLog, after, offset, limit))
             return list(result.scalars().all())
         except Exception as e:
             logger.error(f"Error fetching paginated failures: {str(e)}")
@@ -370,14 +616,16 @@ class FailureLogRepository:
     async def mark_failure_resolved(self, failure_id: int, resolution_notes: str | None = None) -> ReviewFailureLog:
         """Mark a failure log as resolved with optional notes."""
         try:
-            result = await self.session.execute(select(ReviewFailureLog).where(ReviewFailureLog.id == failure_id))
+            result = await self.session.execute(
+                _with_blobs(select(ReviewFailureLog).where(ReviewFailureLog.id == failure_id), FAILURE_DETAIL_BLOBS)
+            )
             failure_log: ReviewFailureLog = result.scalar_one()
 
             failure_log.resolved = True
             failure_log.resolution_notes = resolution_notes
 
             await self.session.flush()
-            await self.session.refresh(failure_log)
+            await self.session.refresh(failure_log, ["resolved", "resolution_notes"])
 
             logger.info(f"Marked failure log {failure_id} as resolved")
             return failure_log
@@ -414,5 +662,360 @@ class FailureLogRepository:
             raise
 
 
+class ReviewJobRepository:
+    """Repository for durable review job queue operations."""
+
+    # Dialects that support SELECT ... FOR UPDATE SKIP LOCKED
+    SKIP_LOCKED_DIALECTS = {"postgresql", "mysql", "mariadb", "oracle"}
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def enqueue_job(
+        self,
+        job_type: str,
+        payload: dict,
+        event_key: str | None = None,
+        max_attempts: int = 3,
+        run_after: datetime | None = None,
+        coalesce_key: str | None = None,
+    ) -> ReviewJob:
+        """Add a new job to the queue, superseding queued jobs that share its coalesce key."""
+        try:
+            if coalesce_key:
+                await self.supersede_queued_jobs(coalesce_key)
+
+            job = ReviewJob(
+                job_type=job_type,
+                event_key=event_key,
+                payload=payload,
+                coalesce_key=coalesce_key,
+                status="queued",
+                run_after=run_after or datetime.now(UTC),
+                attempts=0,
+                max_attempts=max_attempts,
+            )
+
+            self.session.add(job)
+            await self.session.flush()
+            await self.session.refresh(job)
+
+            logger.info(f"Enqueued {job_type} review job with ID: {job.id}")
+            return job
+
+        except Exception as e:
+            logger.error(f"Error enqueuing review job: {str(e)}")
+            raise
+
+    async def supersede_queued_jobs(self, coalesce_key: str) -> int:
+        """Mark queued jobs with the given coalesce key as superseded. Returns the count."""
+        try:
+            result = await self.session.execute(
+                update(ReviewJob)
+                .where(ReviewJob.coalesce_key == coalesce_key, ReviewJob.status == "queued")
+                .values(status="superseded", finished_at=datetime.now(UTC))
+            )
+            count = _rowcount(result)
+            if count:
+                logger.info(f"Superseded {count} queued review job(s) for {coalesce_key}")
+            return count
+        except Exception as e:
+            logger.error(f"Error superseding review jobs for {coalesce_key}: {str(e)}")
+            raise
+
+    async def mark_job_superseded(self, job_id: int) -> None:
+        """Mark a running job as superseded after it was cancelled in favour of a newer one."""
+        try:
+            await self.session.execute(
+                update(ReviewJob)
+                .where(ReviewJob.id == job_id)
+                .values(status="superseded", finished_at=datetime.now(UTC), locked_by=None)
+            )
+            logger.info(f"Marked review job {job_id} as superseded")
+        except Exception as e:
+            logger.error(f"Error marking review job {job_id} as superseded: {str(e)}")
+            raise
+
+    async def claim_next_job(self, worker_id: str) -> ReviewJob | None:
+        """
+        Atomically claim the next runnable job for a worker.
+
+        Uses SELECT ... FOR UPDATE SKIP LOCKED where the database supports it so concurrent
+        workers never block on each other. SQLite has no row locks, so there the candidate
+        row is claimed with a conditional UPDATE and the claim is retried if another worker won.
+        """
+        try:
+            now = datetime.now(UTC)
+            query = (
+                select(ReviewJob)
+                .where(ReviewJob.status == "queued", ReviewJob.run_after <= now)
+                .order_by(ReviewJob.run_after, ReviewJob.id)
+                .limit(1)
+            )
+
+            if self.session.get_bind().dialect.name in self.SKIP_LOCKED_DIALECTS:
+                result = await self.session.execute(query.with_for_update(skip_locked=True))
+                job: ReviewJob | None = result.scalar_one_or_none()
+                if job is None:
+                    return None
+                job.status = "running"
+                job.attempts += 1
+                job.locked_by = worker_id
+                job.locked_at = now
+                await self.session.flush()
+                return job
+
+            # SQLite fallback: optimistic claim guarded by the status column
+            for _ in range(5):
+                result = await self.session.execute(query.with_only_columns(ReviewJob.id))
+                candidate_id = result.scalar_one_or_none()
+                if candidate_id is None:
+                    return None
+
+                claim = await self.session.execute(
+                    update(ReviewJob)
+                    .where(ReviewJob.id == candidate_id, ReviewJob.status == "queued")
+                    .values(
+                        status="running",
+                        attempts=ReviewJob.attempts + 1,
+                        locked_by=worker_id,
+                        locked_at=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if _rowcount(claim) == 1:
+                    claimed = await self.session.execute(select(ReviewJob).where(ReviewJob.id == candidate_id))
+                    claimed_job: ReviewJob = claimed.scalar_one()
+                    await self.session.refresh(claimed_job)
+                    return claimed_job
+
+            return None
+
+        except Exception as e:
+            logger.error(f"Error claiming review job for worker {worker_id}: {str(e)}")
+            raise
+
+    async def mark_job_completed(self, job_id: int) -> None:
+        """Mark a job as successfully completed."""
+        try:
+            await self.session.execute(
+                update(ReviewJob)
+                .where(ReviewJob.id == job_id)
+                .values(status="completed", finished_at=datetime.now(UTC), locked_by=None, last_error=None)
+            )
+            logger.info(f"Marked review job {job_id} as completed")
+        except Exception as e:
+            logger.error(f"Error marking review job {job_id} as completed: {str(e)}")
+            raise
+
+    async def mark_job_failed(
+        self, job_id: int, error_message: str, retry_delay_seconds: float = 0, payload: dict | None = None
+    ) -> str:
+        """
+        Record a job failure, re-queuing it if attempts remain. Returns the new job status.
+
+        payload, if given, replaces the job payload for the next attempt.
+        """
+        try:
+            result = await self.session.execute(select(ReviewJob).where(ReviewJob.id == job_id))
+            job: ReviewJob = result.scalar_one()
+
+            now = datetime.now(UTC)
+            job.last_error = error_message
+            job.locked_by = None
+            if payload is not None:
+                job.payload = payload
+            if job.attempts < job.max_attempts:
+                job.status = "queued"
+                job.run_after = now + timedelta(seconds=retry_delay_seconds)
+            else:
+                job.status = "failed"
+                job.finished_at = now
+
+            await self.session.flush()
+            logger.info(f"Review job {job_id} failed (attempt {job.attempts}/{job.max_attempts}), now {job.status}")
+            return job.status
+
+        except Exception as e:
+            logger.error(f"Error marking review job {job_id} as failed: {str(e)}")
+            raise
+
+    async def release_job(self, job_id: int) -> None:
+        """Return a running job to the queue without counting the attempt (e.g., on shutdown)."""
+        try:
+            await self.session.execute(
+                update(ReviewJob)
+                .where(ReviewJob.id == job_id, ReviewJob.status == "running")
+                .values(status="queued", attempts=ReviewJob.attempts - 1, locked_by=None, locked_at=None)
+            )
+            logger.info(f"Released review job {job_id} back to the queue")
+        except Exception as e:
+            logger.error(f"Error releasing review job {job_id}: {str(e)}")
+            raise
+
+    async def requeue_stale_jobs(self, stale_after_seconds: int) -> int:
+        """Re-queue running jobs whose worker lease is older than the given age. Returns the count."""
+        try:
+            cutoff = datetime.now(UTC) - timedelta(seconds=stale_after_seconds)
+            result = await self.session.execute(
+                update(ReviewJob)
+                .where(ReviewJob.status == "running", ReviewJob.locked_at < cutoff)
+                .values(status="queued", locked_by=None, locked_at=None)
+            )
+            count = _rowcount(result)
+            if count:
+                logger.warning(f"Re-queued {count} stale review job(s)")
+            return count
+        except Exception as e:
+            logger.error(f"Error re-queuing stale review jobs: {str(e)}")
+            raise
+
+    async def count_jobs_by_status(self) -> dict[str, int]:
+        """Get count of jobs grouped by status."""
+        try:
+            result = await self.session.execute(
+                select(ReviewJob.status, func.count(ReviewJob.id)).group_by(ReviewJob.status)
+            )
+            return {row[0]: row[1] for row in result.all()}
+        except Exception as e:
+            logger.error(f"Error counting review jobs: {str(e)}")
+            raise
+
+
+class ReviewCacheRepository:
+    """Repository for review cache entry operations."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def get_entry(self, cache_key: str, created_after: datetime) -> ReviewCacheEntry | None:
+        """Get a non-expired cache entry by key and record the access for LRU eviction."""
+        try:
+            result = await self.session.execute(
+                select(ReviewCacheEntry).where(
+                    ReviewCacheEntry.cache_key == cache_key, ReviewCacheEntry.created_at >= created_after
+                )
+            )
+            entry: ReviewCacheEntry | None = result.scalar_one_or_none()
+            if entry is not None:
+                entry.last_accessed_at = datetime.now(UTC)
+                entry.hit_count += 1
+                await self.session.flush()
+            return entry
+        except Exception as e:
+            logger.error(f"Error fetching review cache entry: {str(e)}")
+            raise
+
+    async def upsert_entry(
+        self, cache_key: str, review_feedback: str, llm_provider: str | None = None, llm_model: str | None = None
+    ) -> ReviewCacheEntry:
+        """Create or refresh the cache entry for a key."""
+        try:
+            now = datetime.now(UTC)
+            result = await self.session.execute(select(ReviewCacheEntry).where(ReviewCacheEntry.cache_key == cache_key))
+            entry: ReviewCacheEntry | None = result.scalar_one_or_none()
+
+            if entry is None:
+                entry = ReviewCacheEntry(
+                    cache_key=cache_key,
+                    review_feedback=review_feedback,
+                    llm_provider=llm_provider,
+                    llm_model=llm_model,
+                    created_at=now,
+                    last_accessed_at=now,
+                    hit_count=0,
+                )
+                self.session.add(entry)
+            else:
+                entry.review_feedback = review_feedback
+                entry.llm_provider = llm_provider
+                entry.llm_model = llm_model
+                entry.created_at = now
+                entry.last_accessed_at = now
+
+            await self.session.flush()
+            return entry
+        except Exception as e:
+            logger.error(f"Error storing review cache entry: {str(e)}")
+            raise
+
+    async def evict_entries(self, created_before: datetime, max_entries: int) -> int:
+        """Delete expired entries, then the least recently used ones above max_entries. Returns the count."""
+        try:
+            expired = await self.session.execute(
+                delete(ReviewCacheEntry).where(ReviewCacheEntry.created_at < created_before)
+            )
+            evicted = _rowcount(expired)
+
+            count_result = await self.session.execute(select(func.count(ReviewCacheEntry.id)))
+            overflow = count_result.scalar_one() - max_entries
+            if overflow > 0:
+                lru_ids = (
+                    select(ReviewCacheEntry.id)
+                    .order_by(ReviewCacheEntry.last_accessed_at, ReviewCacheEntry.id)
+                    .limit(overflow)
+                )
+                lru = await self.session.execute(delete(ReviewCacheEntry).where(ReviewCacheEntry.id.in_(lru_ids)))
+                evicted += _rowcount(lru)
+
+            if evicted:
+                logger.info(f"Evicted {evicted} review cache entries")
+            return evicted
+        except Exception as e:
+            logger.error(f"Error evicting review cache entries: {str(e)}")
+            raise
+
+
+class PullRequestReviewStateRepository:
+    """Repository for tracking the last reviewed commit of each pull request."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def get_state(self, project_key: str, repo_slug: str, pr_id: int) -> PullRequestReviewState | None:
+        """Get the review state of a pull request, if it has been reviewed before."""
+        try:
+            result = await self.session.execute(
+                select(PullRequestReviewState).where(
+                    PullRequestReviewState.project_key == project_key,
+                    PullRequestReviewState.repo_slug == repo_slug,
+                    PullRequestReviewState.pr_id == pr_id,
+                )
+            )
+            state: PullRequestReviewState | None = result.scalar_one_or_none()
+            return state
+        except Exception as e:
+            logger.error(f"Error fetching pull request review state: {str(e)}")
+            raise
+
+    async def upsert_state(
+        self, project_key: str, repo_slug: str, pr_id: int, commit_id: str, review_feedback: str | None
+    ) -> PullRequestReviewState:
+        """Record the commit a pull request was last reviewed at, with the findings of that review."""
+        try:
+            state = await self.get_state(project_key, repo_slug, pr_id)
+            if state is None:
+                state = PullRequestReviewState(
+                    project_key=project_key,
+                    repo_slug=repo_slug,
+                    pr_id=pr_id,
+                    last_reviewed_commit=commit_id,
+                    last_review_feedback=review_feedback,
+                )
+                self.session.add(state)
+            else:
+                state.last_reviewed_commit = commit_id
+                state.last_review_feedback = review_feedback
+
+            await self.session.flush()
+            return state
+        except Exception as e:
+            logger.error(f"Error storing pull request review state: {str(e)}")
+            raise
+
+
 # Import func for count query
 from sqlalchemy import func  # noqa: E402
@@ -1,12 +1,17 @@
 """FastAPI dependency injection."""
 
+from fastapi import HTTPException
+
 from ai_code_reviewer.api.clients.bitbucket_client import BitbucketClient
 from ai_code_reviewer.api.clients.llm_client import LLMClient
+from ai_code_reviewer.api.core.job_queue import ReviewJobQueue
+from ai_code_reviewer.api.db.repository import PageCursor, decode_cursor
 
 
 # Global client instances (initialized once)
 _bitbucket_client: BitbucketClient | None = None
 _llm_client: LLMClient | None = None
+_job_queue: ReviewJobQueue | None = None
 
 
 def get_bitbucket_client() -> BitbucketClient:
@@ -23,3 +28,23 @@ def get_llm_client() -> LLMClient:
     if _llm_client is None:
         _llm_client = LLMClient()
     return _llm_client
+
+
+def get_job_queue() -> ReviewJobQueue:
+    """Get or create the review job queue instance"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = ReviewJobQueue(get_bitbucket_client(), get_llm_client())
+    return _job_queue
+
+
+def parse_page_cursor(cursor: str | None, offset: int) -> PageCursor | None:
+    """Decode a list endpoint's pagination cursor; 400 if it is invalid or combined with an offset"""
+    if cursor is None:
+        return None
+    if offset:
+        raise HTTPException(status_code=400, detail="Use either offset or cursor, not both")
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
@@ -16,20 +16,21 @@ import {
 } from '@mui/material';
 import VisibilityIcon from '@mui/icons-material/Visibility';
 import api from '../../services/api';
-import type { ReviewRecord } from '../../types/types';
+import type { ReviewRecord, ReviewSummary } from '../../types/types';
 import Pagination from './Pagination';
 import ReviewDetails from './ReviewDetails';
 
 const ITEMS_PER_PAGE = 25;
 
 export default function ReviewsTable() {
-  const [reviews, setReviews] = useState<ReviewRecord[]>([]);
+  const [reviews, setReviews] = useState<ReviewSummary[]>([]);
   const [total, setTotal] = useState(0);
   const [page, setPage] = useState(0);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [selectedReview, setSelectedReview] = useState<ReviewRecord | null>(null);
   const [detailsOpen, setDetailsOpen] = useState(false);
+  const [loadingDetailsId, setLoadingDetailsId] = useState<number | null>(null);
 
   const fetchReviews = async (pageNum: number) => {
     setLoading(true);
@@ -50,9 +51,17 @@ export default function ReviewsTable() {
     fetchReviews(page);
   }, [page]);
 
-  const handleViewDetails = async (review: ReviewRecord) => {
-    setSelectedReview(review);
-    setDetailsOpen(true);
+  const handleViewDetails = async (review: ReviewSummary) => {
+    setLoadingDetailsId(review.id);
+    setError(null);
+    try {
+      setSelectedReview(await api.getReviewById(review.id));
+      setDetailsOpen(true);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to fetch review details');
+    } finally {
+      setLoadingDetailsId(null);
+    }
   };
 
   const handleCloseDetails = () => {
@@ -143,9 +152,10 @@ export default function ReviewsTable() {
                         size="small"
                         color="primary"
                         onClick={() => handleViewDetails(review)}
+                        disabled={loadingDetailsId !== null}
                         title="View details"
                       >
-                        <VisibilityIcon />
+                        {loadingDetailsId === review.id ? <CircularProgress size={20} /> : <VisibilityIcon />}
                       </IconButton>
                     </TableCell>
                   </TableRow>
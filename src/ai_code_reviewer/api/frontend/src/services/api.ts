@@ -1,6 +1,6 @@
 import axios, { AxiosInstance } from 'axios';
 import type {
-  ReviewListResponse,
+  ReviewSummaryListResponse,
   FailureListResponse,
   DiffReviewResponse,
   ManualReviewResponse,
@@ -72,9 +72,9 @@ export const api = {
     return response.data;
   },
 
-  // Reviews endpoints
-  async getReviews(offset: number = 0, limit: number = 25): Promise<ReviewListResponse> {
-    const response = await apiClient.get<ReviewListResponse>('/reviews', {
+  // Reviews endpoints; the list has no diff or review text, load those with getReviewById
+  async getReviews(offset: number = 0, limit: number = 25): Promise<ReviewSummaryListResponse> {
+    const response = await apiClient.get<ReviewSummaryListResponse>('/reviews/summary', {
       params: { offset, limit },
     });
     return response.data;
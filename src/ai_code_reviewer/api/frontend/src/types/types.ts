@@ -1,6 +1,6 @@
 // API Response Types
 
-export interface ReviewRecord {
+export interface ReviewSummary {
   id: number;
   created_at: string;
   review_type: string;
@@ -11,19 +11,22 @@ export interface ReviewRecord {
   pr_id?: number;
   author_name?: string;
   author_email?: string;
-  diff_content: string;
-  review_feedback: string;
   email_recipients?: Record<string, unknown>;
   email_sent: boolean;
   llm_provider?: string;
   llm_model?: string;
 }
 
-export interface ReviewListResponse {
+export interface ReviewRecord extends ReviewSummary {
+  diff_content: string;
+  review_feedback: string;
+}
+
+export interface ReviewSummaryListResponse {
   total: number;
   offset: number;
   limit: number;
-  records: ReviewRecord[];
+  records: ReviewSummary[];
 }
 
 export interface FailureRecord {
@@ -5,7 +5,8 @@ import logging
 from fastapi import APIRouter, HTTPException
 
 from ai_code_reviewer.api.db.database import get_db_session
-from ai_code_reviewer.api.db.repository import FailureLogRepository
+from ai_code_reviewer.api.db.repository import FailureLogRepository, next_page_cursor
+from ai_code_reviewer.api.dependencies import parse_page_cursor
 
 
 logger = logging.getLogger(__name__)
@@ -28,7 +29,7 @@ async def get_latest_failures(limit: int = 50):
 
         async with get_db_session() as session:
             repo = FailureLogRepository(session)
-            failures = await repo.get_latest_failures(limit=limit)
+            failures = await repo.get_latest_failures(limit=limit, summary=True)
 
             return {
                 "count": len(failures),
@@ -85,23 +86,28 @@ async def get_failure_stats():
 
 
 @router.get("/failures")
-async def get_failures_paginated(offset: int = 0, limit: int = 10):
+async def get_failures_paginated(offset: int = 0, limit: int = 10, cursor: str | None = None):
     """Get failure logs with pagination.
 
     Args:
         offset: Number of records to skip (default: 0)
         limit: Maximum number of failures to return (default: 10, max: 100)
+        cursor: next_cursor of the previous page, instead of an offset (faster for deep pages)
 
     Returns:
-        Paginated list of failure log records
+        Paginated list of failure log records, with the cursor for the next page
     """
+    after = parse_page_cursor(cursor, offset)
     try:
         if limit > 100:
             limit = 100
 
         async with get_db_session() as session:
             repo = FailureLogRepository(session)
-            failures = await repo.get_failures_paginated(offset=offset, limit=limit)
+            # Fetch one extra record to know whether there is a next page
+            failures = await repo.get_failures_paginated(offset=offset, limit=limit + 1, after=after, summary=True)
+            next_cursor = next_page_cursor(failures, limit)
+            failures = failures[:limit]
             total = await repo.count_total_failures(unresolved_only=False)
 
             return {
@@ -109,6 +115,7 @@ async def get_failures_paginated(offset: int = 0, limit: int = 10):
                 "offset": offset,
                 "limit": limit,
                 "count": len(failures),
+                "next_cursor": next_cursor,
                 "failures": [
                     {
                         "id": f.id,
@@ -5,7 +5,9 @@ from typing import Any
 
 from fastapi import APIRouter
 
+from ai_code_reviewer.api.clients.email_client import get_email_client
 from ai_code_reviewer.api.core.config import Config
+from ai_code_reviewer.api.core.email_digest import get_email_digest
 from ai_code_reviewer.api.dependencies import get_bitbucket_client, get_llm_client
 
 
@@ -104,6 +106,29 @@ async def detailed_health_check():
             "error": str(e),
         }
 
+    # Connection pool statistics (informational, does not affect overall status)
+    try:
+        health_status["connection_pools"] = {
+            "bitbucket": get_bitbucket_client().pool_stats(),
+            "llm": get_llm_client().pool_stats(),
+        }
+    except Exception as e:
+        health_status["connection_pools"] = {"error": str(e)}
+
+    # LLM request scheduling (informational, does not affect overall status)
+    try:
+        health_status["llm_rate_limiter"] = get_llm_client().rate_limiter.stats()
+    except Exception as e:
+        health_status["llm_rate_limiter"] = {"error": str(e)}
+
+    # Outbound email queue (informational, does not affect overall status)
+    try:
+        health_status["email_queue"] = get_email_client().stats()
+        if Config.EMAIL_DIGEST_ENABLED:
+            health_status["email_queue"]["digest"] = get_email_digest().stats()
+    except Exception as e:
+        health_status["email_queue"] = {"error": str(e)}
+
     # Update overall status if any service is unhealthy
     if (
         health_status.get("bitbucket", {}).get("status") == "unhealthy"
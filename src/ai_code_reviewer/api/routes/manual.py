@@ -5,7 +5,10 @@ from datetime import UTC, datetime
 
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
 
+from ai_code_reviewer.api.clients.retry import begin_retry_tracking
+from ai_code_reviewer.api.core.diff_parser import parse_diff
 from ai_code_reviewer.api.core.review_engine import log_review_failure, save_review_to_database, send_review_email
+from ai_code_reviewer.api.core.review_metrics import ReviewMetrics
 from ai_code_reviewer.api.dependencies import get_bitbucket_client, get_llm_client
 
 
@@ -18,6 +21,7 @@ async def manual_review(project_key: str, repo_slug: str, pr_id: int | None = No
     """Manually trigger a code review"""
     author_name = None
     author_email = None
+    begin_retry_tracking()
 
     try:
         # Validate parameters
@@ -70,7 +74,8 @@ async def manual_review(project_key: str, repo_slug: str, pr_id: int | None = No
 
             if diff:
                 try:
-                    review = await llm_client.get_code_review(diff)
+                    metrics = ReviewMetrics()
+                    review = await llm_client.get_code_review(diff, metrics=metrics, project_key=project_key)
                 except Exception as e:
                     logger.error(f"Error getting LLM review: {str(e)}")
                     await log_review_failure(
@@ -123,6 +128,7 @@ async def manual_review(project_key: str, repo_slug: str, pr_id: int | None = No
                             author_email=author_email,
                             email_recipients=recipient_emails if recipient_emails else None,
                             email_sent=email_sent,
+                            review_metrics=metrics,
                         )
                     except Exception as e:
                         logger.error(f"Error saving review to database: {str(e)}")
@@ -162,7 +168,8 @@ async def manual_review(project_key: str, repo_slug: str, pr_id: int | None = No
 
             if diff:
                 try:
-                    review = await llm_client.get_code_review(diff)
+                    metrics = ReviewMetrics()
+                    review = await llm_client.get_code_review(diff, metrics=metrics, project_key=project_key)
                 except Exception as e:
                     logger.error(f"Error getting LLM review: {str(e)}")
                     await log_review_failure(
@@ -220,6 +227,7 @@ async def manual_review(project_key: str, repo_slug: str, pr_id: int | None = No
                             author_email=author_email,
                             email_recipients=recipient_emails if recipient_emails else None,
                             email_sent=email_sent,
+                            review_metrics=metrics,
                         )
                     except Exception as e:
                         logger.error(f"Error saving review to database: {str(e)}")
@@ -291,6 +299,7 @@ async def review_diff_file(
 
     # Maximum file size: 10MB
     max_file_size = 10 * 1024 * 1024
+    begin_retry_tracking()
 
     try:
         # Step 1: Validate file extension
@@ -388,10 +397,12 @@ async def review_diff_file(
         # Add description as metadata prefix if provided
         diff_with_metadata = f"# Description: {description}\n\n{diff_text}" if description else diff_text
 
-        # Step 4: Get LLM review
+        # Step 4: Get LLM review (the diff is parsed once, for the review and the line counts)
+        parsed_diff = parse_diff(diff_text)
         try:
             llm_client = get_llm_client()
-            review = await llm_client.get_code_review(diff_text)
+            metrics = ReviewMetrics()
+            review = await llm_client.get_code_review(diff_text, metrics=metrics, parsed_diff=parsed_diff)
 
             if not review:
                 error = ValueError("LLM returned empty review")
@@ -441,6 +452,7 @@ async def review_diff_file(
                 author_email=author_email,
                 email_recipients=None,
                 email_sent=False,
+                review_metrics=metrics,
             )
 
             if not record_id:
@@ -467,13 +479,13 @@ async def review_diff_file(
         processing_time = (end_time - start_time).total_seconds()
 
         # Count lines in diff
-        lines_total = len(diff_text.splitlines())
-        lines_added = sum(1 for line in diff_text.splitlines() if line.startswith("+") and not line.startswith("+++"))
-        lines_removed = sum(1 for line in diff_text.splitlines() if line.startswith("-") and not line.startswith("---"))
+        lines_total = parsed_diff.line_count
+        lines_added = parsed_diff.added
+        lines_removed = parsed_diff.removed
 
         logger.info(
             f"Completed diff review: {filename} "
-            f"({lines_total} lines, +{lines_added}/-{lines_removed}) "
+            f"({len(parsed_diff.files)} files, {lines_total} lines, +{lines_added}/-{lines_removed}) "
             f"in {processing_time:.2f}s, record_id={record_id}"
         )
 
@@ -487,6 +499,7 @@ async def review_diff_file(
                 "lines_total": lines_total,
                 "lines_added": lines_added,
                 "lines_removed": lines_removed,
+                "files_changed": len(parsed_diff.files),
                 "project_key": project_key,
                 "repo_slug": repo_slug,
                 "author_name": author_name,
@@ -496,6 +509,12 @@ async def review_diff_file(
                 "review_timestamp": end_time.isoformat(),
                 "llm_provider": llm_client.provider,
                 "llm_model": llm_client.model,
+                "cache_hit": metrics.cache_hit,
+                "prompt_tokens": metrics.prompt_tokens,
+                "completion_tokens": metrics.completion_tokens,
+                "time_to_first_token_ms": metrics.time_to_first_token_ms,
+                "tokens_per_second": metrics.tokens_per_second,
+                "partial_output": metrics.partial_output,
             },
         }
 
@@ -7,15 +7,16 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from ai_code_reviewer.api.db.database import get_db_session
-from ai_code_reviewer.api.db.repository import ReviewRepository
+from ai_code_reviewer.api.db.repository import ReviewRepository, next_page_cursor
+from ai_code_reviewer.api.dependencies import parse_page_cursor
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-class ReviewRecordResponse(BaseModel):
-    """Response model for review records."""
+class ReviewSummaryResponse(BaseModel):
+    """Response model for review records in summary lists (no diff or review text)."""
 
     id: int
     created_at: datetime
@@ -27,70 +28,107 @@ class ReviewRecordResponse(BaseModel):
     pr_id: int | None = None
     author_name: str | None = None
     author_email: str | None = None
-    diff_content: str
-    review_feedback: str
     email_recipients: dict | None = None
     email_sent: bool
     llm_provider: str | None = None
     llm_model: str | None = None
+    cache_hit: bool | None = None
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    time_to_first_token_ms: int | None = None
+    tokens_per_second: float | None = None
+    partial_output: bool | None = None
 
     class Config:
         from_attributes = True
 
 
-class ReviewListResponse(BaseModel):
-    """Response model for list of reviews."""
+class ReviewRecordResponse(ReviewSummaryResponse):
+    """Response model for review records."""
+
+    diff_content: str
+    review_feedback: str
+
+
+class ReviewPage[RecordT: ReviewSummaryResponse](BaseModel):
+    """One page of review records."""
 
     total: int
     offset: int
     limit: int
-    records: list[ReviewRecordResponse]
+    records: list[RecordT]
+    next_cursor: str | None = None  # Pass as ?cursor= to get the next page; None on the last page
 
 
-@router.get("/reviews/latest", response_model=list[ReviewRecordResponse])
-async def get_latest_reviews(
-    limit: int = Query(default=10, ge=1, le=100, description="Number of latest reviews to retrieve"),
-):
-    """Get the latest N review records ordered by creation date."""
+class ReviewListResponse(ReviewPage[ReviewRecordResponse]):
+    """Response model for list of reviews."""
+
+
+class ReviewSummaryListResponse(ReviewPage[ReviewSummaryResponse]):
+    """Response model for list of review summaries."""
+
+
+async def _latest_reviews(limit: int, summary: bool) -> list:
+    """Load the latest reviews, as summaries or full records"""
+    model = ReviewSummaryResponse if summary else ReviewRecordResponse
     try:
         async with get_db_session() as session:
             repo = ReviewRepository(session)
-            records = await repo.get_latest_reviews(limit=limit)
+            records = await repo.get_latest_reviews(limit=limit, summary=summary)
 
-            return [ReviewRecordResponse.model_validate(record) for record in records]
+            return [model.model_validate(record) for record in records]
 
     except Exception as e:
         logger.error(f"Error retrieving latest reviews: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving reviews: {str(e)}")
 
 
-@router.get("/reviews", response_model=ReviewListResponse)
-async def get_reviews_filtered(
-    offset: int = Query(default=0, ge=0, description="Starting record number (0-indexed)"),
-    limit: int = Query(default=10, ge=1, le=100, description="Number of records to retrieve"),
-    project_key: str | None = Query(default=None, description="Filter by project key"),
-    repo_slug: str | None = Query(default=None, description="Filter by repository slug"),
-    commit_id: str | None = Query(default=None, description="Filter by commit ID"),
-    pr_id: int | None = Query(default=None, description="Filter by pull request ID"),
+@router.get("/reviews/latest", response_model=list[ReviewRecordResponse])
+async def get_latest_reviews(
+    limit: int = Query(default=10, ge=1, le=100, description="Number of latest reviews to retrieve"),
 ):
-    """Get review records with optional filtering and pagination.
+    """Get the latest N review records ordered by creation date."""
+    return await _latest_reviews(limit, summary=False)
 
-    Returns paginated reviews with optional filters for project, repository, commit, or pull request.
-    Filters can be combined for more specific queries.
-    """
+
+@router.get("/reviews/latest/summary", response_model=list[ReviewSummaryResponse])
+async def get_latest_review_summaries(
+    limit: int = Query(default=10, ge=1, le=100, description="Number of latest reviews to retrieve"),
+):
+    """Get the latest N reviews without their diff and review text (fetch those from /reviews/{id})."""
+    return await _latest_reviews(limit, summary=True)
+
+
+async def _filtered_reviews(
+    offset: int,
+    limit: int,
+    project_key: str | None,
+    repo_slug: str | None,
+    commit_id: str | None,
+    pr_id: int | None,
+    cursor: str | None,
+    summary: bool,
+) -> dict:
+    """Load one page of filtered reviews, as summaries or full records"""
+    after = parse_page_cursor(cursor, offset)
+    model = ReviewSummaryResponse if summary else ReviewRecordResponse
     try:
         async with get_db_session() as session:
             repo = ReviewRepository(session)
 
-            # Get filtered records
+            # Get filtered records, plus one to know whether there is a next page
             records = await repo.get_reviews_filtered(
                 offset=offset,
-                limit=limit,
+                limit=limit + 1,
                 project_key=project_key,
                 repo_slug=repo_slug,
                 commit_id=commit_id,
                 pr_id=pr_id,
+                after=after,
+                summary=summary,
             )
+            next_cursor = next_page_cursor(records, limit)
+            records = records[:limit]
 
             # Get count with same filters
             total = await repo.count_reviews_filtered(
@@ -100,18 +138,60 @@ async def get_reviews_filtered(
                 pr_id=pr_id,
             )
 
-            return ReviewListResponse(
-                total=total,
-                offset=offset,
-                limit=limit,
-                records=[ReviewRecordResponse.model_validate(record) for record in records],
-            )
+            return {
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+                "records": [model.model_validate(record) for record in records],
+                "next_cursor": next_cursor,
+            }
 
     except Exception as e:
         logger.error(f"Error retrieving filtered reviews: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving reviews: {str(e)}")
 
 
+@router.get("/reviews", response_model=ReviewListResponse)
+async def get_reviews_filtered(
+    offset: int = Query(default=0, ge=0, description="Starting record number (0-indexed)"),
+    limit: int = Query(default=10, ge=1, le=100, description="Number of records to retrieve"),
+    project_key: str | None = Query(default=None, description="Filter by project key"),
+    repo_slug: str | None = Query(default=None, description="Filter by repository slug"),
+    commit_id: str | None = Query(default=None, description="Filter by commit ID"),
+    pr_id: int | None = Query(default=None, description="Filter by pull request ID"),
+    cursor: str | None = Query(default=None, description="Opaque cursor from next_cursor of the previous page"),
+):
+    """Get review records with optional filtering and pagination.
+
+    Returns paginated reviews with optional filters for project, repository, commit, or pull request.
+    Filters can be combined for more specific queries. Pages are either addressed by offset or, for
+    deep pages, by passing the previous page's next_cursor as cursor (keyset pagination).
+    """
+    return ReviewListResponse(
+        **await _filtered_reviews(offset, limit, project_key, repo_slug, commit_id, pr_id, cursor, summary=False)
+    )
+
+
+@router.get("/reviews/summary", response_model=ReviewSummaryListResponse)
+async def get_review_summaries(
+    offset: int = Query(default=0, ge=0, description="Starting record number (0-indexed)"),
+    limit: int = Query(default=10, ge=1, le=100, description="Number of records to retrieve"),
+    project_key: str | None = Query(default=None, description="Filter by project key"),
+    repo_slug: str | None = Query(default=None, description="Filter by repository slug"),
+    commit_id: str | None = Query(default=None, description="Filter by commit ID"),
+    pr_id: int | None = Query(default=None, description="Filter by pull request ID"),
+    cursor: str | None = Query(default=None, description="Opaque cursor from next_cursor of the previous page"),
+):
+    """Get review records like /reviews, but without their diff and review text.
+
+    Only metadata columns are read from the database; fetch the diff and review of a record from
+    /reviews/{review_id}.
+    """
+    return ReviewSummaryListResponse(
+        **await _filtered_reviews(offset, limit, project_key, repo_slug, commit_id, pr_id, cursor, summary=True)
+    )
+
+
 @router.get("/reviews/stats")
 async def get_review_stats():
     """Get comprehensive review statistics.
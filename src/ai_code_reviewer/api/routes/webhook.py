@@ -6,16 +6,12 @@ import json
 import logging
 from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
 from ai_code_reviewer.api.core.config import Config
-from ai_code_reviewer.api.core.review_engine import (
-    log_review_failure,
-    process_commit_review,
-    process_pull_request_review,
-)
-from ai_code_reviewer.api.dependencies import get_bitbucket_client, get_llm_client
+from ai_code_reviewer.api.core.review_engine import log_review_failure
+from ai_code_reviewer.api.dependencies import get_job_queue
 
 
 logger = logging.getLogger(__name__)
@@ -42,7 +38,7 @@ def verify_webhook_signature(payload: bytes, signature: str) -> bool:
 
 
 @router.post("/webhook/code-review")
-async def webhook_handler(request: Request, background_tasks: BackgroundTasks):
+async def webhook_handler(request: Request):
     """Handle Bitbucket webhooks for code review"""
     payload = None
     payload_bytes = None
@@ -80,33 +76,30 @@ async def webhook_handler(request: Request, background_tasks: BackgroundTasks):
         event_key = payload.get("eventKey", "")
         logger.info(f"Received webhook event: {event_key}")
 
-        # Get clients
+        # Determine the review job type for this event
+        if event_key in ["pr:opened", "pr:modified", "pr:from_ref_updated"]:
+            job_type = "pull_request"
+        elif event_key == "repo:refs_changed":
+            job_type = "commit"
+        else:
+            logger.info(f"Ignoring event: {event_key}")
+            return {"status": "accepted", "event": event_key}
+
+        # Enqueue the review; workers pick it up from the durable job queue
         try:
-            bitbucket_client = get_bitbucket_client()
-            llm_client = get_llm_client()
+            job_id = await get_job_queue().enqueue(job_type, payload, event_key=event_key)
         except Exception as e:
-            logger.error(f"Error initializing clients: {str(e)}")
+            logger.error(f"Error enqueuing review job: {str(e)}")
             await log_review_failure(
                 event_type="webhook",
                 event_key=event_key,
-                failure_stage="client_initialization",
+                failure_stage="job_enqueue",
                 error=e,
                 request_payload=payload,
             )
-            raise HTTPException(status_code=500, detail="Failed to initialize clients")
-
-        # Handle pull request events
-        if event_key in ["pr:opened", "pr:modified", "pr:from_ref_updated"]:
-            background_tasks.add_task(process_pull_request_review, bitbucket_client, llm_client, payload)
-
-        # Handle push events (commits)
-        elif event_key == "repo:refs_changed":
-            background_tasks.add_task(process_commit_review, bitbucket_client, llm_client, payload)
-
-        else:
-            logger.info(f"Ignoring event: {event_key}")
+            raise HTTPException(status_code=500, detail="Failed to enqueue review job")
 
-        return {"status": "accepted", "event": event_key}
+        return {"status": "accepted", "event": event_key, "job_id": job_id}
     except HTTPException:
         # Re-raise HTTP exceptions without logging (already logged above)
         raise
@@ -1,12 +1,14 @@
 import hashlib
 import hmac
 import json
-from unittest.mock import AsyncMock, patch
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from ai_code_reviewer.api.app import app
+from ai_code_reviewer.api.db.repository import encode_cursor
 
 
 class TestMainApp:
@@ -57,8 +59,11 @@ class TestMainApp:
         ):
             mock_bb = AsyncMock()
             mock_bb.test_connection = AsyncMock(return_value={"status": "connected"})
+            mock_bb.pool_stats = Mock(return_value={"status": "open", "connections": 1})
             mock_llm = AsyncMock()
             mock_llm.test_connection = AsyncMock(return_value={"status": "connected"})
+            mock_llm.pool_stats = Mock(return_value={"status": "closed"})
+            mock_llm.rate_limiter.stats = Mock(return_value={"in_flight": 0, "waiting": 0})
 
             mock_get_bb.return_value = mock_bb
             mock_get_llm.return_value = mock_llm
@@ -72,10 +77,14 @@ class TestMainApp:
             assert "bitbucket" in data
             assert "llm" in data
             assert "config" in data
+            assert data["connection_pools"]["bitbucket"]["connections"] == 1
+            assert data["connection_pools"]["llm"]["status"] == "closed"
 
     def test_webhook_pr_opened(self, client, sample_pr_webhook):
         """Test webhook handling for PR opened event"""
-        with patch("ai_code_reviewer.api.core.review_engine.process_pull_request_review", new_callable=AsyncMock):
+        with patch("ai_code_reviewer.api.routes.webhook.get_job_queue") as mock_get_queue:
+            mock_get_queue.return_value.enqueue = AsyncMock(return_value=1)
+
             response = client.post(
                 "/webhook/code-review", json=sample_pr_webhook, headers={"Content-Type": "application/json"}
             )
@@ -84,10 +93,16 @@ class TestMainApp:
             data = response.json()
             assert data["status"] == "accepted"
             assert data["event"] == "pr:opened"
+            assert data["job_id"] == 1
+            mock_get_queue.return_value.enqueue.assert_awaited_once_with(
+                "pull_request", sample_pr_webhook, event_key="pr:opened"
+            )
 
     def test_webhook_commit_push(self, client, sample_commit_webhook):
         """Test webhook handling for commit push event"""
-        with patch("ai_code_reviewer.api.core.review_engine.process_commit_review", new_callable=AsyncMock):
+        with patch("ai_code_reviewer.api.routes.webhook.get_job_queue") as mock_get_queue:
+            mock_get_queue.return_value.enqueue = AsyncMock(return_value=2)
+
             response = client.post(
                 "/webhook/code-review", json=sample_commit_webhook, headers={"Content-Type": "application/json"}
             )
@@ -96,6 +111,24 @@ class TestMainApp:
             data = response.json()
             assert data["status"] == "accepted"
             assert data["event"] == "repo:refs_changed"
+            mock_get_queue.return_value.enqueue.assert_awaited_once_with(
+                "commit", sample_commit_webhook, event_key="repo:refs_changed"
+            )
+
+    def test_webhook_enqueue_failure(self, client, sample_pr_webhook):
+        """Test webhook returns 500 when the review job cannot be enqueued"""
+        with (
+            patch("ai_code_reviewer.api.routes.webhook.get_job_queue") as mock_get_queue,
+            patch("ai_code_reviewer.api.routes.webhook.log_review_failure", new_callable=AsyncMock) as mock_log,
+        ):
+            mock_get_queue.return_value.enqueue = AsyncMock(side_effect=RuntimeError("database unavailable"))
+
+            response = client.post(
+                "/webhook/code-review", json=sample_pr_webhook, headers={"Content-Type": "application/json"}
+            )
+
+            assert response.status_code == 500
+            assert mock_log.call_args.kwargs["failure_stage"] == "job_enqueue"
 
     def test_webhook_ignored_event(self, client):
         """Test webhook handling for ignored event"""
@@ -235,6 +268,13 @@ class TestMainApp:
             data = response.json()
             assert data["status"] == "no_diff"
 
+    @pytest.mark.parametrize("path", ["/reviews", "/failures"])
+    def test_list_rejects_bad_cursor(self, client, path):
+        """Test that list endpoints reject malformed cursors and cursors combined with an offset"""
+        assert client.get(path, params={"cursor": "not-a-cursor"}).status_code == 400
+        cursor = encode_cursor(datetime(2026, 10, 16), 10)
+        assert client.get(path, params={"cursor": cursor, "offset": 5}).status_code == 400
+
     def test_manual_review_missing_params(self, client):
         """Test manual review with missing parameters"""
         # Reset the global client cache before this test
@@ -1,8 +1,10 @@
 from unittest.mock import AsyncMock, Mock, patch
 
+import httpx
 import pytest
 
 from ai_code_reviewer.api.clients.bitbucket_client import BitbucketClient
+from ai_code_reviewer.api.clients.retry import RetryPolicy
 
 
 class TestBitbucketClient:
@@ -11,7 +13,9 @@ class TestBitbucketClient:
     @pytest.fixture
     def client(self):
         """Create Bitbucket client instance"""
-        return BitbucketClient()
+        bitbucket_client = BitbucketClient()
+        bitbucket_client.retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+        return bitbucket_client
 
     @pytest.mark.asyncio
     async def test_test_connection_success(self, client):
@@ -37,7 +41,7 @@ class TestBitbucketClient:
     @pytest.mark.asyncio
     async def test_get_pull_request_diff_success(self, client, sample_diff):
         """Test successful PR diff retrieval"""
-        with patch.object(client, "_make_request_text", new_callable=AsyncMock, return_value=sample_diff):
+        with patch.object(client, "_stream_diff_text", new_callable=AsyncMock, return_value=sample_diff):
             result = await client.get_pull_request_diff("TEST", "test-repo", 123)
 
             assert result == sample_diff
@@ -45,7 +49,7 @@ class TestBitbucketClient:
     @pytest.mark.asyncio
     async def test_get_pull_request_diff_not_found(self, client):
         """Test PR diff not found"""
-        with patch.object(client, "_make_request_text", new_callable=AsyncMock, return_value=None):
+        with patch.object(client, "_stream_diff_text", new_callable=AsyncMock, return_value=None):
             result = await client.get_pull_request_diff("TEST", "test-repo", 123)
 
             assert result is None
@@ -53,11 +57,85 @@ class TestBitbucketClient:
     @pytest.mark.asyncio
     async def test_get_commit_diff_success(self, client, sample_diff):
         """Test successful commit diff retrieval"""
-        with patch.object(client, "_make_request_text", new_callable=AsyncMock, return_value=sample_diff):
+        with patch.object(client, "_stream_diff_text", new_callable=AsyncMock, return_value=sample_diff):
             result = await client.get_commit_diff("TEST", "test-repo", "abc123")
 
             assert result == sample_diff
 
+    @pytest.mark.asyncio
+    async def test_get_compare_diff(self, client, sample_diff):
+        """Test that the diff between two commits is requested from the compare endpoint"""
+        with patch.object(client, "_stream_diff_text", new_callable=AsyncMock, return_value=sample_diff) as mock_req:
+            result = await client.get_compare_diff("TEST", "test-repo", "def456", "abc123")
+
+            assert result == sample_diff
+            assert mock_req.call_args.args[0] == "/projects/TEST/repos/test-repo/compare/diff"
+            assert mock_req.call_args.kwargs["params"]["from"] == "def456"
+            assert mock_req.call_args.kwargs["params"]["to"] == "abc123"
+
+    @pytest.mark.asyncio
+    async def test_stream_diff_text(self, client, sample_diff):
+        """Test that a diff is streamed and rebuilt from the response"""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, content=sample_diff.encode())
+
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = await client._stream_diff_text("/projects/TEST/repos/test-repo/commits/abc123/diff")
+        await client.aclose()
+
+        assert result == sample_diff.rstrip("\n")
+        assert requests[0].url.path == "/rest/api/1.0/projects/TEST/repos/test-repo/commits/abc123/diff"
+
+    @pytest.mark.asyncio
+    async def test_stream_diff_text_aborts_at_byte_limit(self, client):
+        """Test that an oversized diff download is stopped and marked as truncated"""
+        body = "".join(f"diff --git a/f{i}.py b/f{i}.py\n+line\n" for i in range(1000))
+        client._http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body.encode()))
+        )
+
+        with patch("ai_code_reviewer.api.clients.bitbucket_client.Config.BITBUCKET_DIFF_MAX_BYTES", 1000):
+            result = await client._stream_diff_text("/diff")
+        await client.aclose()
+
+        assert len(result) < 1100
+        assert result.endswith("bytes ...]")
+
+    @pytest.mark.asyncio
+    async def test_stream_diff_text_not_found(self, client):
+        """Test that a non-200 diff response returns None without retrying"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(404, text="Not Found")
+
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = await client._stream_diff_text("/diff")
+        await client.aclose()
+
+        assert result is None
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_get_commit_diff_raises_when_unreachable(self, client):
+        """Test that a connection failure is raised after retrying instead of being reported as no diff"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with pytest.raises(httpx.ConnectError):
+            await client.get_commit_diff("TEST", "test-repo", "abc123")
+        await client.aclose()
+
+        assert len(calls) == 3
+
     @pytest.mark.asyncio
     async def test_post_pull_request_comment_success(self, client):
         """Test successful PR comment posting"""
@@ -94,12 +172,13 @@ class TestBitbucketClient:
         mock_response.json.return_value = {"test": "data"}
         mock_response.content = b'{"test": "data"}'
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.request.return_value = mock_response
+        mock_http_client = AsyncMock()
+        mock_http_client.request.return_value = mock_response
+        client._http_client = mock_http_client
 
-            result = await client._make_request("GET", "/test")
+        result = await client._make_request("GET", "/test")
 
-            assert result == {"test": "data"}
+        assert result == {"test": "data"}
 
     @pytest.mark.asyncio
     async def test_make_request_error(self, client):
@@ -108,22 +187,52 @@ class TestBitbucketClient:
         mock_response.status_code = 404
         mock_response.text = "Not Found"
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.request.return_value = mock_response
+        mock_http_client = AsyncMock()
+        mock_http_client.request.return_value = mock_response
+        client._http_client = mock_http_client
 
-            result = await client._make_request("GET", "/test")
+        result = await client._make_request("GET", "/test")
 
-            assert result is None
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_make_request_retries_transient_error(self, client):
+        """Test that a 503 response is retried"""
+        unavailable = Mock(status_code=503, text="Service Unavailable", headers={})
+        success = Mock(status_code=200, content=b'{"test": "data"}')
+        success.json.return_value = {"test": "data"}
+
+        mock_http_client = AsyncMock()
+        mock_http_client.request.side_effect = [unavailable, success]
+        client._http_client = mock_http_client
+
+        result = await client._make_request("GET", "/test")
+
+        assert result == {"test": "data"}
+        assert mock_http_client.request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_make_request_does_not_retry_failed_post(self, client):
+        """Test that a POST that may have been processed is not resent"""
+        mock_http_client = AsyncMock()
+        mock_http_client.request.return_value = Mock(status_code=500, text="Server Error", headers={})
+        client._http_client = mock_http_client
+
+        result = await client._make_request("POST", "/test", json={})
+
+        assert result is None
+        assert mock_http_client.request.call_count == 1
 
     @pytest.mark.asyncio
     async def test_make_request_exception(self, client):
         """Test HTTP request exception"""
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.request.side_effect = Exception("Connection error")
+        mock_http_client = AsyncMock()
+        mock_http_client.request.side_effect = Exception("Connection error")
+        client._http_client = mock_http_client
 
-            result = await client._make_request("GET", "/test")
+        result = await client._make_request("GET", "/test")
 
-            assert result is None
+        assert result is None
 
     @pytest.mark.asyncio
     async def test_get_pull_request_info(self, client):
@@ -144,3 +253,27 @@ class TestBitbucketClient:
             result = await client.get_commit_info("TEST", "test-repo", "abc123")
 
             assert result == mock_commit_info
+
+    @pytest.mark.asyncio
+    async def test_make_request_reuses_pooled_client(self, client):
+        """Test that consecutive requests share one pooled HTTP client"""
+        mock_response = Mock()
+        mock_response.status_code = 204
+
+        mock_http_client = AsyncMock()
+        mock_http_client.request.return_value = mock_response
+        client._http_client = mock_http_client
+
+        await client._make_request("GET", "/first")
+        await client._make_request("GET", "/second")
+
+        assert mock_http_client.request.await_count == 2
+        assert client._http_client is mock_http_client
+
+    @pytest.mark.asyncio
+    async def test_pool_stats_before_start(self, client):
+        """Test pool statistics report a closed pool before the lifespan opens it"""
+        stats = client.pool_stats()
+
+        assert stats["status"] == "closed"
+        assert stats["max_connections"] > 0
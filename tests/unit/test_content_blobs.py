@@ -0,0 +1,158 @@
+"""Unit tests for compressed, deduplicated storage of review and failure bodies"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ai_code_reviewer.api.db import compression
+from ai_code_reviewer.api.db.models import Base, ContentBlob, ReviewRecord
+from ai_code_reviewer.api.db.repository import ContentBlobRepository, FailureLogRepository, ReviewRepository
+
+
+LARGE_DIFF = "diff --git a/app.py b/app.py\n" + "".join(f"+value_{i} = compute({i})\n" for i in range(200))
+LARGE_REVIEW = "Consider validating the input before computing each value.\n" * 20
+
+
+@asynccontextmanager
+async def database_session():
+    """Open a session on an in-memory SQLite database with the application schema"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db_session:
+        yield db_session
+    await engine.dispose()
+
+
+async def create_review(repo: ReviewRepository, diff_content: str, review_feedback: str) -> ReviewRecord:
+    return await repo.create_review_record(
+        review_type="auto",
+        trigger_type="commit",
+        project_key="TEST",
+        repo_slug="repo",
+        diff_content=diff_content,
+        review_feedback=review_feedback,
+    )
+
+
+async def count_blobs(session) -> int:
+    result = await session.execute(select(func.count(ContentBlob.content_hash)))
+    count: int = result.scalar_one()
+    return count
+
+
+class TestContentBlobs:
+    """Test storing large bodies as shared compressed blobs"""
+
+    @pytest.mark.asyncio
+    async def test_same_diff_is_stored_once(self):
+        """Test that two reviews of the same diff share one compressed blob and read back unchanged"""
+        async with database_session() as session:
+            repo = ReviewRepository(session)
+            first = await create_review(repo, LARGE_DIFF, LARGE_REVIEW)
+            second = await create_review(repo, LARGE_DIFF, "Looks good.")
+            await session.commit()
+            session.expunge_all()
+
+            blob_count = await count_blobs(session)
+            stats = await ContentBlobRepository(session).get_stats()
+            records = await repo.get_reviews_paginated(limit=10)
+
+        assert first.diff_blob_hash == second.diff_blob_hash
+        assert first.diff_content == LARGE_DIFF
+        assert blob_count == 2  # The shared diff and the long review
+        assert stats["stored_bytes"] < stats["content_bytes"]
+        assert [record.diff_content for record in records] == [LARGE_DIFF, LARGE_DIFF]
+        assert [record.review_feedback for record in records] == ["Looks good.", LARGE_REVIEW]
+        assert records[0].review_blob_hash is None
+
+    @pytest.mark.asyncio
+    async def test_small_bodies_stay_inline(self):
+        """Test that bodies below CONTENT_BLOB_MIN_BYTES, or all bodies with blobs disabled, are stored inline"""
+        async with database_session() as session:
+            repo = ReviewRepository(session)
+            small = await create_review(repo, "diff", "review")
+            with patch("ai_code_reviewer.api.db.repository.Config.CONTENT_BLOBS_ENABLED", False):
+                large = await create_review(repo, LARGE_DIFF, LARGE_REVIEW)
+            blob_count = await count_blobs(session)
+
+        assert (small.diff_inline, small.diff_blob_hash) == ("diff", None)
+        assert large.diff_inline == LARGE_DIFF
+        assert blob_count == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_payload_round_trip(self):
+        """Test that a large request payload is stored as a blob and read back as the same dict"""
+        payload = {"eventKey": "pr:opened", "changes": [{"path": f"src/file_{i}.py"} for i in range(50)]}
+        async with database_session() as session:
+            repo = FailureLogRepository(session)
+            failure = await repo.create_failure_log(
+                event_type="webhook",
+                failure_stage="llm_review",
+                error_type="TimeoutError",
+                error_message="timed out",
+                request_payload=payload,
+            )
+            await session.commit()
+            session.expunge_all()
+            loaded = await repo.get_failure_by_id(failure.id)
+
+        assert failure.payload_blob_hash is not None
+        assert failure.payload_inline is None
+        assert loaded.request_payload == payload
+
+    @pytest.mark.asyncio
+    async def test_unreferenced_blobs_are_deleted(self):
+        """Test that pruning keeps blobs still shared by another record and deletes the rest"""
+        async with database_session() as session:
+            repo = ReviewRepository(session)
+            first = await create_review(repo, LARGE_DIFF, LARGE_REVIEW)
+            await create_review(repo, LARGE_DIFF, "Looks good.")
+            await session.commit()
+            await session.execute(delete(ReviewRecord).where(ReviewRecord.id == first.id))
+
+            deleted = await ContentBlobRepository(session).delete_unreferenced()
+            remaining = (await session.execute(select(ContentBlob.content_hash))).scalars().all()
+
+        assert deleted == 1  # The long review; the diff is still used by the second record
+        assert remaining == [first.diff_blob_hash]
+
+    @pytest.mark.asyncio
+    async def test_summary_lists_do_not_load_blobs(self):
+        """Test that summary lists leave blob bodies unloaded instead of querying once per row"""
+        async with database_session() as session:
+            repo = ReviewRepository(session)
+            await create_review(repo, LARGE_DIFF, LARGE_REVIEW)
+            await session.commit()
+            session.expunge_all()
+
+            summaries = await repo.get_reviews_filtered(limit=10, summary=True)
+            with pytest.raises(InvalidRequestError):
+                _ = summaries[0].diff_content
+
+        assert summaries[0].project_key == "TEST"
+
+
+class TestCompression:
+    """Test the blob codecs"""
+
+    @pytest.mark.parametrize("codec", ["zlib", "none"])
+    def test_round_trip(self, codec):
+        """Test that compressed data decompresses to the original bytes"""
+        data = LARGE_DIFF.encode()
+
+        assert compression.decompress(compression.compress(data, codec, 6), codec) == data
+
+    def test_zstd_falls_back_to_zlib_without_zstandard(self):
+        """Test that zstd is only used when the optional zstandard package is installed"""
+        compression.available_codec.cache_clear()
+        try:
+            with patch.object(compression, "zstandard", None):
+                assert compression.available_codec("zstd") == "zlib"
+            assert compression.available_codec("brotli") == "zlib"
+        finally:
+            compression.available_codec.cache_clear()
@@ -0,0 +1,63 @@
+"""Unit tests for splitting large diffs into review chunks"""
+
+from ai_code_reviewer.api.core.diff_chunker import split_diff_by_file, split_diff_into_chunks
+
+
+def make_file_diff(name: str, hunk_count: int, lines_per_hunk: int) -> str:
+    """Build a diff for one file with the given number of hunks"""
+    hunks = "\n".join(
+        f"@@ -{h * 10},3 +{h * 10},3 @@\n" + "\n".join(f"+{name} hunk {h} line {i}" for i in range(lines_per_hunk))
+        for h in range(hunk_count)
+    )
+    return f"diff --git a/{name} b/{name}\nindex 1111111..2222222 100644\n--- a/{name}\n+++ b/{name}\n{hunks}"
+
+
+class TestDiffChunker:
+    """Test file and hunk boundary splitting"""
+
+    def test_small_diff_is_single_chunk(self, sample_diff):
+        """Test that a diff within the budget is returned unchanged"""
+        assert split_diff_into_chunks(sample_diff, 100000) == [sample_diff]
+
+    def test_split_diff_by_file(self):
+        """Test splitting a multi-file diff into per-file sections"""
+        diff = "\n".join([make_file_diff("a.py", 1, 3), make_file_diff("b.py", 1, 3)])
+
+        sections = split_diff_by_file(diff)
+
+        assert len(sections) == 2
+        assert sections[0].startswith("diff --git a/a.py")
+        assert sections[1].startswith("diff --git a/b.py")
+
+    def test_files_are_kept_whole_when_they_fit(self):
+        """Test that chunks break between files rather than inside them"""
+        files = [make_file_diff(f"f{i}.py", 2, 20) for i in range(6)]
+        diff = "\n".join(files)
+
+        chunks = split_diff_into_chunks(diff, len(files[0]) * 2 + 10)
+
+        assert len(chunks) == 3
+        for chunk in chunks:
+            assert chunk.count("diff --git") == 2
+
+    def test_large_file_is_split_between_hunks_with_header(self):
+        """Test that an oversized file is split on hunk boundaries and keeps its header"""
+        diff = make_file_diff("big.py", 10, 50)
+
+        chunks = split_diff_into_chunks(diff, len(diff) // 3)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert chunk.startswith("diff --git a/big.py b/big.py")
+            assert "\n@@ " in chunk
+        # Every changed line appears exactly once
+        assert sum(chunk.count("+big.py hunk") for chunk in chunks) == diff.count("+big.py hunk")
+
+    def test_chunks_respect_budget(self):
+        """Test that no chunk exceeds the budget, even for an oversized single line"""
+        diff = "diff --git a/min.js b/min.js\n--- a/min.js\n+++ b/min.js\n@@ -1 +1 @@\n+" + "x" * 50000
+
+        chunks = split_diff_into_chunks(diff, 10000)
+
+        assert all(len(chunk) <= 10000 for chunk in chunks)
+        assert sum(chunk.count("x") for chunk in chunks) == 50000
@@ -0,0 +1,199 @@
+"""Unit tests for leaving non-reviewable files out of a diff"""
+
+import pytest
+
+from ai_code_reviewer.api.core.diff_filter import DiffFileFilter, load_attribute_patterns
+from ai_code_reviewer.api.core.diff_parser import parse_diff
+
+
+def file_diff(path: str, *added: str, new_start: int = 1) -> str:
+    """Build a one-hunk diff adding the given lines to a file"""
+    lines = "\n".join(f"+{line}" for line in added)
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -0,0 +{new_start},{len(added)} @@\n{lines}"
+
+
+def skip_reasons(diff: str, **kwargs) -> dict[str, str]:
+    """Map each skipped path to its reason"""
+    file_filter = DiffFileFilter(
+        skip_extensions=kwargs.get("skip_extensions", [".json"]),
+        skip_patterns=kwargs.get("skip_patterns", ["yarn.lock", "vendor/*", "*.min.js"]),
+        minified_line_length=kwargs.get("minified_line_length", 200),
+    )
+    return dict(file_filter.filter(diff, parse_diff(diff)).skipped)
+
+
+class TestDiffFileFilter:
+    """Test which files are left out before prompting"""
+
+    def test_skip_rules(self):
+        """Test extension, pattern, binary, generator-marker and minified-line rules"""
+        diff = "\n".join(
+            [
+                file_diff("src/app.py", "print('hi')"),
+                file_diff("config/settings.json", "{}"),
+                file_diff("web/yarn.lock", "lodash@4"),
+                file_diff("vendor/pkg/mod.go", "package mod"),
+                file_diff("static/app.min.js", "var a=1"),
+                "diff --git a/logo.png b/logo.png\nBinary files a/logo.png and b/logo.png differ",
+                file_diff("api/client.py", "# Code generated by openapi-generator. DO NOT EDIT.", "x = 1"),
+                file_diff("static/bundle.js", "x" * 300),
+            ]
+        )
+
+        assert skip_reasons(diff) == {
+            "config/settings.json": "non-source",
+            "web/yarn.lock": "generated/vendored",
+            "vendor/pkg/mod.go": "generated/vendored",
+            "static/app.min.js": "generated/vendored",
+            "logo.png": "binary",
+            "api/client.py": "generated",
+            "static/bundle.js": "minified",
+        }
+
+    def test_generator_marker_only_counts_at_file_start(self):
+        """Test that a marker added in the middle of a hand-written file is not treated as generated"""
+        diff = file_diff("src/docs.py", "# @generated files are skipped", new_start=40)
+
+        assert skip_reasons(diff) == {}
+
+    def test_long_line_in_source_file_is_reviewed(self):
+        """Test that one long line only marks assets and lockfiles as minified, not hand-written code"""
+        long_line = "x" * 300
+        source_edit = (
+            "diff --git a/src/data.py b/src/data.py\n--- a/src/data.py\n+++ b/src/data.py\n"
+            f"@@ -10,3 +10,4 @@\n import json\n+BLOB = '{long_line}'\n \n def load():"
+        )
+        diff = "\n".join(
+            [
+                source_edit,
+                file_diff("static/site.css", "body { color: red; }", long_line),
+                file_diff("static/app.js.map", long_line),
+                file_diff("pnpm-lock.yaml", "lockfileVersion: 9", long_line),
+            ]
+        )
+
+        assert skip_reasons(diff, skip_patterns=[]) == {
+            "static/site.css": "minified",
+            "static/app.js.map": "minified",
+            "pnpm-lock.yaml": "minified",
+        }
+
+    def test_filtered_diff_keeps_reviewable_files(self):
+        """Test that the filtered diff contains only the reviewable files"""
+        diff = "\n".join([file_diff("src/app.py", "x = 1"), file_diff("data.json", "{}")])
+        file_filter = DiffFileFilter(skip_extensions=[".json"], skip_patterns=[], minified_line_length=0)
+
+        filtered = file_filter.filter(diff, parse_diff(diff))
+
+        assert filtered.diff_content == file_diff("src/app.py", "x = 1")
+        assert [diff_file.path for diff_file in filtered.parsed.files] == ["src/app.py"]
+        assert not filtered.nothing_to_review
+
+    def test_nothing_to_review(self):
+        """Test that a diff of only skipped files is reported as having nothing to review"""
+        diff = file_diff("data.json", "{}")
+        file_filter = DiffFileFilter(skip_extensions=[".json"], skip_patterns=[], minified_line_length=0)
+
+        assert file_filter.filter(diff, parse_diff(diff)).nothing_to_review
+
+    def test_load_attribute_patterns(self, tmp_path):
+        """Test reading generated/vendored/binary patterns from a .gitattributes-style file"""
+        attributes = tmp_path / ".gitattributes"
+        attributes.write_text(
+            "# comment\n"
+            "src/generated/** linguist-generated=true\n"
+            "*.png binary\n"
+            "docs/** linguist-documentation\n"
+            "lib/** linguist-vendored=false\n"
+            "*.snap -diff\n"
+        )
+
+        assert load_attribute_patterns(str(attributes)) == ["src/generated/*", "*.png", "*.snap"]
+
+
+class TestFormattingChanges:
+    """Test detection of whitespace-only, rename-only and mode-only changes"""
+
+    @staticmethod
+    def make_filter() -> DiffFileFilter:
+        return DiffFileFilter(skip_extensions=[], skip_patterns=[], minified_line_length=0, skip_formatting=True)
+
+    def test_formatting_only_diff(self):
+        """Test that a diff of a move, a mode change and a reformat has nothing to review"""
+        diff = (
+            "diff --git a/old/util.cs b/new/util.cs\nsimilarity index 100%\nrename from old/util.cs\n"
+            "rename to new/util.cs\n"
+            "diff --git a/run.sh b/run.sh\nold mode 100644\nnew mode 100755\n"
+            "diff --git a/src/app.js b/src/app.js\n--- a/src/app.js\n+++ b/src/app.js\n@@ -1,2 +1,3 @@\n"
+            "-if (a) { go(a, b); }\n+if (a) {\n+    go(a, b);\n+}"
+        )
+
+        filtered = self.make_filter().filter(diff, parse_diff(diff))
+
+        assert dict(filtered.skipped) == {
+            "new/util.cs": "rename only",
+            "run.sh": "mode change only",
+            "src/app.js": "whitespace only",
+        }
+        assert filtered.formatting_only
+
+    def test_whitespace_hunks_are_removed(self):
+        """Test that whitespace-only hunks are dropped while real changes in the same file are kept"""
+        diff = (
+            "diff --git a/src/app.js b/src/app.js\n--- a/src/app.js\n+++ b/src/app.js\n"
+            "@@ -1 +1 @@\n-let  x =  1;\n+let x = 1;\n"
+            "@@ -10 +10 @@\n-return a;\n+return b;"
+        )
+
+        filtered = self.make_filter().filter(diff, parse_diff(diff))
+
+        assert filtered.skipped == []
+        assert "let x" not in filtered.diff_content
+        assert "+return b;" in filtered.diff_content
+        assert filtered.diff_content.startswith("diff --git a/src/app.js b/src/app.js")
+
+    def test_python_indentation_is_not_whitespace(self):
+        """Test that re-indenting Python code is reviewed, since it can change behaviour"""
+        diff = file_diff("src/app.py", "    x = 1").replace("@@ -0,0 +1,1 @@", "@@ -1 +1 @@\n-x = 1")
+
+        filtered = self.make_filter().filter(diff, parse_diff(diff))
+
+        assert filtered.skipped == []
+        assert filtered.diff_content == diff
+
+    @pytest.mark.parametrize("path", ["Makefile", "build/GNUmakefile", "rules/common.mk", "data/ids.tsv"])
+    def test_tab_sensitive_whitespace_is_reviewed(self, path):
+        """Test that replacing a tab with spaces in a Makefile or TSV is not formatting"""
+        diff = f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}\n@@ -2 +2 @@\n-\tcc -o app main.c\n+    cc -o app main.c"
+
+        filtered = self.make_filter().filter(diff, parse_diff(diff))
+
+        assert filtered.skipped == []
+        assert filtered.diff_content == diff
+
+    @pytest.mark.parametrize(
+        ("removed", "added"),
+        [
+            ("return x;", "returnx;"),
+            ("b - -c;", "b --c;"),
+            ('say("hello world");', 'say("helloworld");'),
+            ('say("hello  world");', 'say("hello world");'),
+        ],
+    )
+    def test_whitespace_that_changes_meaning_is_reviewed(self, removed, added):
+        """Test that joining tokens or changing whitespace inside a string literal is not formatting"""
+        diff = f"diff --git a/src/app.js b/src/app.js\n--- a/src/app.js\n+++ b/src/app.js\n@@ -1 +1 @@\n-{removed}\n+{added}"
+
+        filtered = self.make_filter().filter(diff, parse_diff(diff))
+
+        assert filtered.skipped == []
+        assert filtered.diff_content == diff
+
+    def test_renamed_file_with_changes_is_reviewed(self):
+        """Test that a move with content changes is not skipped"""
+        diff = (
+            "diff --git a/a.cs b/b.cs\nsimilarity index 90%\nrename from a.cs\nrename to b.cs\n"
+            "--- a/a.cs\n+++ b/b.cs\n@@ -1 +1 @@\n-int x = 1;\n+int x = 2;"
+        )
+
+        assert not self.make_filter().filter(diff, parse_diff(diff)).skipped
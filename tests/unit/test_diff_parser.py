@@ -0,0 +1,92 @@
+"""Unit tests for the single-pass unified diff parser"""
+
+from ai_code_reviewer.api.core.diff_parser import parse_diff
+
+
+GIT_DIFF = """diff --git a/src/app.py b/src/app.py
+index 1111111..2222222 100644
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,3 +1,4 @@
+ import os
+-import sys
++import sys, json
++import re
+ print("hi")
+@@ -10 +11 @@
+--- old comment
++--- new comment
+diff --git a/docs/Guide.MD b/docs/Guide.MD
+new file mode 100644
+--- /dev/null
++++ b/docs/Guide.MD
+@@ -0,0 +1,2 @@
++# Guide
++text
+diff --git a/logo.png b/logo.png
+Binary files a/logo.png and b/logo.png differ
+"""
+
+
+class TestParseDiff:
+    """Test the file/hunk model built from a diff"""
+
+    def test_files_and_paths(self):
+        """Test that every file is found with its path and extension"""
+        parsed = parse_diff(GIT_DIFF)
+
+        assert [diff_file.path for diff_file in parsed.files] == ["src/app.py", "docs/Guide.MD", "logo.png"]
+        assert parsed.extensions() == {".py", ".md", ".png"}
+        assert parsed.files[2].binary
+
+    def test_hunks_and_line_counts(self):
+        """Test hunk ranges and added/removed counts, including content that looks like a header"""
+        parsed = parse_diff(GIT_DIFF)
+        app = parsed.files[0]
+
+        assert [(hunk.old_start, hunk.old_count, hunk.new_start, hunk.new_count) for hunk in app.hunks] == [
+            (1, 3, 1, 4),
+            (10, 1, 11, 1),
+        ]
+        assert (app.added, app.removed) == (3, 2)
+        assert (parsed.added, parsed.removed) == (5, 2)
+        assert parsed.line_count == len(GIT_DIFF.splitlines())
+
+    def test_file_text_round_trips(self):
+        """Test that the preamble and per-file sections rebuild the original diff"""
+        diff = "Commit message\n\n" + GIT_DIFF
+        parsed = parse_diff(diff)
+
+        sections = [parsed.preamble()] + [parsed.file_text(diff_file) for diff_file in parsed.files]
+
+        assert "\n".join(sections) == diff
+        assert parsed.file_text(parsed.files[1]).startswith("diff --git a/docs/Guide.MD")
+
+    def test_plain_unified_diff(self):
+        """Test a diff without git headers"""
+        diff = "--- a/one.txt\n+++ b/one.txt\n@@ -1 +1 @@\n-a\n+b\n--- a/two.cs\n+++ b/two.cs\n@@ -1 +1,2 @@\n a\n+b"
+
+        parsed = parse_diff(diff)
+
+        assert [diff_file.path for diff_file in parsed.files] == ["one.txt", "two.cs"]
+        assert (parsed.added, parsed.removed) == (2, 1)
+
+    def test_rename_and_mode_change(self):
+        """Test that renames and mode changes without content changes are recorded"""
+        diff = (
+            "diff --git a/old/name.py b/new/name.py\nsimilarity index 100%\nrename from old/name.py\n"
+            "rename to new/name.py\ndiff --git a/run.sh b/run.sh\nold mode 100644\nnew mode 100755"
+        )
+
+        renamed, script = parse_diff(diff).files
+
+        assert (renamed.old_path, renamed.path, renamed.hunks) == ("old/name.py", "new/name.py", [])
+        assert script.mode_changed and script.old_path is None
+
+    def test_not_a_diff(self):
+        """Test that text without diff content parses as a preamble only"""
+        parsed = parse_diff("just some text")
+
+        assert parsed.files == []
+        assert parsed.preamble() == "just some text"
+        assert parsed.extensions() == set()
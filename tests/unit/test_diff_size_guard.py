@@ -0,0 +1,59 @@
+"""Unit tests for bounding streamed diffs"""
+
+from ai_code_reviewer.api.core.diff_size_guard import DiffSizeGuard
+
+
+def make_file_diff(name: str, hunk_count: int, lines_per_hunk: int) -> str:
+    """Build a diff for one file with the given number of hunks"""
+    hunks = "\n".join(
+        f"@@ -{h * 10},3 +{h * 10},3 @@\n" + "\n".join(f"+{name} hunk {h} line {i}" for i in range(lines_per_hunk))
+        for h in range(hunk_count)
+    )
+    return f"diff --git a/{name} b/{name}\nindex 1111111..2222222 100644\n--- a/{name}\n+++ b/{name}\n{hunks}"
+
+
+class TestDiffSizeGuard:
+    """Test bounding streamed diffs"""
+
+    @staticmethod
+    def feed(guard: DiffSizeGuard, diff: str) -> bool:
+        """Add every line of a diff, returning False if the guard stopped reading"""
+        return all(guard.add_line(line) for line in diff.split("\n"))
+
+    def test_small_diff_is_unchanged(self):
+        """Test that a diff within the limits is rebuilt exactly"""
+        diff = "\n".join([make_file_diff("a.py", 2, 3), make_file_diff("b.py", 1, 3)])
+        guard = DiffSizeGuard(max_bytes=100000, max_file_bytes=10000)
+
+        assert self.feed(guard, diff)
+        assert guard.build() == diff
+        assert [stats.skipped for stats in guard.files] == [False, False]
+
+    def test_oversized_file_keeps_header_only(self):
+        """Test that the changes of a file over the per-file limit are omitted"""
+        vendored = make_file_diff("vendor/lib.js", 20, 50)
+        diff = "\n".join([make_file_diff("a.py", 1, 3), vendored, make_file_diff("b.py", 1, 3)])
+        guard = DiffSizeGuard(max_bytes=0, max_file_bytes=1000)
+
+        assert self.feed(guard, diff)
+        result = guard.build()
+
+        assert "diff --git a/vendor/lib.js b/vendor/lib.js" in result
+        assert "+vendor/lib.js hunk" not in result
+        assert "+b.py hunk 0 line 2" in result
+        assert f"[... {len(vendored) + 1} bytes of changes omitted: file diff too large ...]" in result
+        assert [stats.skipped for stats in guard.files] == [False, True, False]
+
+    def test_total_limit_stops_reading(self):
+        """Test that reading stops at the byte limit and the diff is marked as truncated"""
+        diff = "\n".join(make_file_diff(f"f{i}.py", 1, 20) for i in range(10))
+        guard = DiffSizeGuard(max_bytes=len(diff) // 2)
+
+        assert not self.feed(guard, diff)
+        result = guard.build()
+
+        assert guard.truncated
+        assert guard.received_bytes <= len(diff) // 2
+        assert result.endswith(f"[... diff truncated after {guard.received_bytes} bytes ...]")
+        assert "f0.py" in result
+        assert "f9.py" not in result
@@ -0,0 +1,160 @@
+"""Unit tests for the async email client and outbound queue"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from ai_code_reviewer.api.clients.email_client import EmailClient
+from ai_code_reviewer.api.clients.retry import RetryableError, RetryPolicy
+
+
+LOGIC_APP_URL = "https://logic-app.example.com/trigger"
+
+
+def make_response(status_code):
+    """Build an httpx response for a Logic App POST"""
+    return httpx.Response(status_code, request=httpx.Request("POST", LOGIC_APP_URL))
+
+
+@pytest.fixture
+def email_config():
+    """Enable email delivery to a test Logic App URL"""
+    with (
+        patch("ai_code_reviewer.api.clients.email_client.Config.EMAIL_OPTOUT", False),
+        patch("ai_code_reviewer.api.clients.email_client.Config.LOGIC_APP_EMAIL_URL", LOGIC_APP_URL),
+    ):
+        yield
+
+
+@pytest.fixture
+def client():
+    """Create an email client whose retries do not sleep"""
+    email_client = EmailClient(worker_count=1, max_queue_size=2)
+    email_client.retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+    email_client._http_client = AsyncMock()
+    return email_client
+
+
+class TestEmailClient:
+    """Test email delivery"""
+
+    @pytest.mark.asyncio
+    async def test_optout_skips_delivery(self, client):
+        """Test that EMAIL_OPTOUT skips sending without queueing"""
+        with patch("ai_code_reviewer.api.clients.email_client.Config.EMAIL_OPTOUT", True):
+            assert await client.queue_mail("dev@example.com", "", "Subject", "<p>Body</p>") is True
+
+        assert not client.running
+        client._http_client.post.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_url_raises(self, client):
+        """Test that a missing Logic App URL is reported to the caller"""
+        with (
+            patch("ai_code_reviewer.api.clients.email_client.Config.EMAIL_OPTOUT", False),
+            patch("ai_code_reviewer.api.clients.email_client.Config.LOGIC_APP_EMAIL_URL", None),
+            pytest.raises(ValueError),
+        ):
+            await client.queue_mail("dev@example.com", "", "Subject", "<p>Body</p>")
+
+    @pytest.mark.asyncio
+    async def test_queued_email_is_delivered_in_background(self, client, email_config):
+        """Test that queue_mail returns immediately and a worker delivers the email"""
+        delivered = asyncio.Event()
+
+        async def post(url, json):
+            delivered.set()
+            return make_response(200)
+
+        http_client = client._http_client
+        http_client.post = AsyncMock(side_effect=post)
+
+        assert await client.queue_mail("dev@example.com", "", "Subject", "<p>Body</p>") is True
+        await asyncio.wait_for(delivered.wait(), timeout=1)
+        await client.aclose()
+
+        assert http_client.post.call_args.args[0] == LOGIC_APP_URL
+        assert http_client.post.call_args.kwargs["json"]["to"] == "dev@example.com"
+        assert client.sent_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_delivery_is_reported_to_sender(self, client, email_config):
+        """Test that the on_failure callback receives the error when a queued email cannot be delivered"""
+        client._http_client.post = AsyncMock(return_value=make_response(400))
+        on_failure = AsyncMock()
+
+        assert await client.queue_mail("dev@example.com", "", "Subject", "Body", on_failure=on_failure) is True
+        await client.aclose()
+
+        on_failure.assert_awaited_once()
+        assert isinstance(on_failure.call_args.args[0], httpx.HTTPStatusError)
+        assert client.failed_count == 1
+
+    @pytest.mark.asyncio
+    async def test_shutdown_reports_undelivered_emails(self, client, email_config):
+        """Test that emails still queued when the shutdown timeout expires are reported as failed"""
+
+        async def stuck(url, json):
+            await asyncio.sleep(3600)
+
+        client._http_client.post = AsyncMock(side_effect=stuck)
+        on_failure = AsyncMock()
+
+        await client.queue_mail("first@example.com", "", "Subject", "Body")
+        await client.queue_mail("second@example.com", "", "Subject", "Body", on_failure=on_failure)
+        with patch("ai_code_reviewer.api.clients.email_client.Config.EMAIL_SHUTDOWN_TIMEOUT", 0.01):
+            await client.aclose()
+
+        on_failure.assert_awaited_once()
+        assert "Shut down" in str(on_failure.call_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_email(self, client, email_config):
+        """Test that emails are dropped rather than blocking when the queue is full"""
+
+        async def stuck(url, json):
+            await asyncio.sleep(3600)
+
+        client._http_client.post = AsyncMock(side_effect=stuck)
+
+        results = [await client.queue_mail(f"dev{i}@example.com", "", "Subject", "Body") for i in range(4)]
+
+        assert results[-1] is False
+        assert client.stats()["failed"] >= 1
+        client._queue = None  # Skip flushing the stuck queue
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_delivery_retries_throttled_request(self, client, email_config):
+        """Test that a 429 from the Logic App is retried"""
+        http_client = client._http_client
+        http_client.post = AsyncMock(side_effect=[make_response(429), make_response(202)])
+
+        await client.queue_mail("dev@example.com", "", "Subject", "Body")
+        await client.aclose()
+
+        assert http_client.post.call_count == 2
+        assert client.sent_count == 1
+
+    @pytest.mark.asyncio
+    async def test_delivery_does_not_retry_server_error(self, client, email_config):
+        """Test that a 500 is not resent because the email may already have gone out"""
+        http_client = client._http_client
+        http_client.post = AsyncMock(return_value=make_response(500))
+        on_failure = AsyncMock()
+
+        await client.queue_mail("dev@example.com", "", "Subject", "Body", on_failure=on_failure)
+        await client.aclose()
+
+        assert http_client.post.call_count == 1
+        assert isinstance(on_failure.call_args.args[0], RetryableError)
+
+    def test_stats_before_start(self):
+        """Test that stats are available before the workers start"""
+        stats = EmailClient(worker_count=1).stats()
+
+        assert stats["queued"] == 0
+        assert stats["workers"] == 0
+        assert isinstance(stats["pool"], dict)
@@ -0,0 +1,88 @@
+"""Unit tests for batched review email digests"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from ai_code_reviewer.api.core.email_digest import DigestEntry, EmailDigest
+
+
+@pytest.fixture
+def email_client():
+    """Mock email client that accepts every email"""
+    client = Mock()
+    client.queue_mail = AsyncMock(return_value=True)
+    return client
+
+
+class TestEmailDigest:
+    """Test buffering and combining review emails"""
+
+    @pytest.mark.asyncio
+    async def test_reviews_for_same_recipients_are_combined(self, email_client):
+        """Test that reviews within the window are sent as one email"""
+        digest = EmailDigest(email_client, window_seconds=0.01, max_reviews=10)
+
+        await digest.add(["dev@example.com"], "AI Code Review", "Commit aaaaaaaa", "Issue in a.py")
+        await digest.add(["dev@example.com"], "AI Code Review", "Commit bbbbbbbb", "Issue in b.py")
+        await asyncio.sleep(0.05)
+
+        email_client.queue_mail.assert_called_once()
+        kwargs = email_client.queue_mail.call_args.kwargs
+        assert kwargs["to"] == "dev@example.com"
+        assert kwargs["subject"] == "AI Code Review Digest - 2 reviews"
+        assert "Issue in a.py" in kwargs["mailbody"]
+        assert "Issue in b.py" in kwargs["mailbody"]
+
+    @pytest.mark.asyncio
+    async def test_recipient_lists_are_buffered_separately(self, email_client):
+        """Test that each recipient list gets its own digest"""
+        digest = EmailDigest(email_client, window_seconds=3600)
+
+        await digest.add(["a@example.com"], "AI Code Review", "Commit 1", "Review 1")
+        await digest.add(["b@example.com", "a@example.com"], "AI Code Review", "Pull Request #2", "Review 2")
+        await digest.add(["a@example.com", "b@example.com"], "AI Code Review", "Pull Request #3", "Review 3")
+
+        assert digest.stats() == {"pending_digests": 2, "pending_reviews": 3, "window_seconds": 3600}
+
+        await digest.flush_all()
+
+        recipients = sorted(call.kwargs["to"] for call in email_client.queue_mail.call_args_list)
+        assert recipients == ["a@example.com", "a@example.com, b@example.com"]
+        assert digest.stats()["pending_reviews"] == 0
+
+    @pytest.mark.asyncio
+    async def test_full_digest_is_sent_early(self, email_client):
+        """Test that a digest is sent as soon as it reaches the review limit"""
+        digest = EmailDigest(email_client, window_seconds=3600, max_reviews=2)
+
+        await digest.add(["dev@example.com"], "AI Code Review", "Commit 1", "Review 1")
+        email_client.queue_mail.assert_not_called()
+        await digest.add(["dev@example.com"], "AI Code Review", "Commit 2", "Review 2")
+
+        email_client.queue_mail.assert_called_once()
+        assert digest.stats()["pending_digests"] == 0
+
+    @pytest.mark.asyncio
+    async def test_undelivered_digest_is_reported_for_each_review(self, email_client):
+        """Test that every review in a digest that cannot be delivered is reported to its sender"""
+        digest = EmailDigest(email_client, window_seconds=3600)
+        first_failed, second_failed = AsyncMock(), AsyncMock()
+
+        await digest.add(["dev@example.com"], "AI Code Review", "Commit 1", "Review 1", on_failure=first_failed)
+        await digest.add(["dev@example.com"], "AI Code Review", "Commit 2", "Review 2", on_failure=second_failed)
+        await digest.flush_all()
+
+        error = RuntimeError("Logic App rejected the email")
+        await email_client.queue_mail.call_args.kwargs["on_failure"](error)
+
+        first_failed.assert_awaited_once_with(error)
+        second_failed.assert_awaited_once_with(error)
+
+    def test_single_review_digest_matches_regular_email(self):
+        """Test that a digest of one review uses the regular subject"""
+        subject, body = EmailDigest.build_email([DigestEntry("AI Code Review", "Commit 1234abcd", "Looks risky")])
+
+        assert subject == "AI Code Review - Commit 1234abcd"
+        assert "Looks risky" in body
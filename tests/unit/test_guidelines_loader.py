@@ -2,9 +2,11 @@
 
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from ai_code_reviewer.api.core.diff_parser import parse_diff
 from ai_code_reviewer.api.core.guidelines_loader import GuidelinesLoader
 
 
@@ -82,8 +84,8 @@ def test_load_guidelines_caching(sample_guidelines_file):
     # Second load should use cache
     content2 = GuidelinesLoader.load_guidelines(sample_guidelines_file)
 
-    assert content1 == content2
-    assert GuidelinesLoader._cached_guidelines is not None
+    assert content1 is content2
+    assert Path(sample_guidelines_file) in GuidelinesLoader._files
 
 
 def test_load_guidelines_file_not_found():
@@ -96,12 +98,12 @@ def test_clear_cache(sample_guidelines_file):
     """Test clearing the cache."""
     # Load guidelines
     GuidelinesLoader.load_guidelines(sample_guidelines_file)
-    assert GuidelinesLoader._cached_guidelines is not None
+    assert GuidelinesLoader._files
 
     # Clear cache
     GuidelinesLoader.clear_cache()
-    assert GuidelinesLoader._cached_guidelines is None
-    assert GuidelinesLoader._cached_file_path is None
+    assert not GuidelinesLoader._files
+    assert not GuidelinesLoader._indexes
 
 
 def test_extract_general_principles(sample_guidelines_file):
@@ -163,3 +165,101 @@ def test_extract_language_case_insensitive(sample_guidelines_file):
 
     assert extracted1 == extracted2 == extracted3
     assert "Type Hints" in extracted1
+
+
+def test_section_extraction_is_exact(tmp_path):
+    """Test that sections end at the next "## " heading, not at a separator inside the section."""
+    guidelines = tmp_path / "guidelines.md"
+    guidelines.write_text(
+        "## General Principles\n\nBe safe.\n\n---\n\n"
+        "## Python\n\nPart one.\n\n---\n\nPart two.\n\n```markdown\n## Not a heading\n```\n\n---\n\n"
+        "## C# (.NET/WPF)\n\nUse async.\n",
+        encoding="utf-8",
+    )
+    content = GuidelinesLoader.load_guidelines(guidelines)
+
+    python = GuidelinesLoader.extract_language_guidelines(content, "Python")
+
+    assert python.startswith("## Python")
+    assert "Part two." in python
+    assert python.endswith("```")
+    assert GuidelinesLoader.extract_language_guidelines(content, "csharp") == "## C# (.NET/WPF)\n\nUse async."
+    assert GuidelinesLoader.extract_language_guidelines(content, None) == "## General Principles\n\nBe safe."
+    GuidelinesLoader.clear_cache()
+
+
+def test_index_and_rendered_section_are_cached(sample_guidelines_file):
+    """Test that the document is indexed once and each rendered section is reused."""
+    first = GuidelinesLoader.render_guidelines_section(sample_guidelines_file, "Python")
+    index = GuidelinesLoader.get_index(GuidelinesLoader.load_guidelines(sample_guidelines_file))
+    second = GuidelinesLoader.render_guidelines_section(sample_guidelines_file, "Python")
+    general = GuidelinesLoader.render_guidelines_section(sample_guidelines_file, None)
+
+    assert first is second
+    assert len(GuidelinesLoader._indexes) == 1
+    assert GuidelinesLoader.get_index(GuidelinesLoader.load_guidelines(sample_guidelines_file)) is index
+    assert first.startswith("### 📋 **Coding Guidelines**")
+    assert "Pay special attention" in first and "Type Hints" in first
+    assert "general coding principles" in general and "Security First" in general
+
+
+def test_select_guidelines_section_keeps_matching_rules(sample_guidelines_file):
+    """Test that only rules matching the diff are selected, with a fallback to the whole section."""
+    diff = parse_diff("diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -0,0 +1 @@\n+x = 1  # type: ignore\n")
+    selected = GuidelinesLoader.select_guidelines_section(sample_guidelines_file, "Python", diff, top_k=1)
+
+    assert selected.startswith("### 📋 **Coding Guidelines**")
+    assert "## Python" in selected and "Type Hints" in selected
+    assert "PEP 8" not in selected and "Security First" not in selected
+
+    unmatched = parse_diff("diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n@@ -0,0 +1 @@\n+zzz\n")
+    assert GuidelinesLoader.select_guidelines_section(
+        sample_guidelines_file, "Python", unmatched, top_k=1
+    ) == GuidelinesLoader.render_guidelines_section(sample_guidelines_file, "Python")
+
+
+def test_changed_file_is_reloaded(sample_guidelines_file):
+    """Test that an edited guidelines file is picked up without clearing the cache."""
+    with patch("ai_code_reviewer.api.core.guidelines_loader.Config.GUIDELINES_RELOAD_CHECK_SECONDS", 0):
+        first = GuidelinesLoader.render_guidelines_section(sample_guidelines_file, "Python")
+        first_hash = GuidelinesLoader.content_hash(sample_guidelines_file)
+
+        content = sample_guidelines_file.read_text(encoding="utf-8")
+        sample_guidelines_file.write_text(content.replace("Type Hints", "Type Annotations"), encoding="utf-8")
+        second = GuidelinesLoader.render_guidelines_section(sample_guidelines_file, "Python")
+
+        assert "Type Annotations" in second and "Type Hints" not in second
+        assert GuidelinesLoader.content_hash(sample_guidelines_file) != first_hash
+        assert first not in GuidelinesLoader._rendered_sections.values()
+        assert len(GuidelinesLoader._indexes) == 1
+
+        # A file that disappears after loading keeps being served from the cache
+        sample_guidelines_file.unlink()
+        assert GuidelinesLoader.render_guidelines_section(sample_guidelines_file, "Python") == second
+
+
+def test_unchanged_file_is_not_reread_within_check_interval(sample_guidelines_file):
+    """Test that the file is not checked again until the reload interval has passed."""
+    with patch("ai_code_reviewer.api.core.guidelines_loader.Config.GUIDELINES_RELOAD_CHECK_SECONDS", 3600):
+        content = GuidelinesLoader.load_guidelines(sample_guidelines_file)
+        sample_guidelines_file.write_text("## Python\n\nChanged.", encoding="utf-8")
+
+        assert GuidelinesLoader.load_guidelines(sample_guidelines_file) is content
+
+
+def test_guidelines_file_for_project(sample_guidelines_file, tmp_path):
+    """Test that a project's own guidelines file replaces the default one."""
+    (tmp_path / "PROJ.md").write_text("## Python\n\n1. **Project Rule**\n", encoding="utf-8")
+    with (
+        patch("ai_code_reviewer.api.core.guidelines_loader.Config.GUIDELINES_FILE", str(sample_guidelines_file)),
+        patch("ai_code_reviewer.api.core.guidelines_loader.Config.GUIDELINES_PROJECT_DIR", str(tmp_path)),
+    ):
+        assert GuidelinesLoader.guidelines_file_for("PROJ") == tmp_path / "PROJ.md"
+        assert GuidelinesLoader.guidelines_file_for("OTHER") == sample_guidelines_file
+        assert GuidelinesLoader.guidelines_file_for("../PROJ") == sample_guidelines_file
+        assert GuidelinesLoader.guidelines_file_for(None) == sample_guidelines_file
+
+        project = GuidelinesLoader.render_guidelines_section(GuidelinesLoader.guidelines_file_for("PROJ"), "Python")
+        default = GuidelinesLoader.render_guidelines_section(sample_guidelines_file, "Python")
+
+    assert "Project Rule" in project and "Project Rule" not in default
@@ -0,0 +1,115 @@
+"""Unit tests for BM25 guideline rule retrieval"""
+
+from ai_code_reviewer.api.core.diff_parser import parse_diff
+from ai_code_reviewer.api.core.guidelines_loader import GuidelinesIndex
+from ai_code_reviewer.api.core.guidelines_retrieval import (
+    GuidelinesRetriever,
+    diff_query_terms,
+    split_rules,
+    tokenize,
+)
+
+
+GUIDELINES = """# Guidelines
+
+## General Principles
+
+### Universal Rules (Apply to All Languages)
+
+1. **Security First**: Never expose secrets
+2. **Error Handling**: Catch specific exceptions
+
+---
+
+## Python
+
+### Rules (Must Comply)
+
+1. **Type Hints**
+   Use type annotations for all function parameters.
+
+2. **SQL Injection Prevention**
+   Use parameterized queries with cursor.execute.
+   ```python
+   # 1. not a new rule
+   cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+   ```
+
+### Things to Avoid
+
+- Using `eval()` with user input
+- Bare `except:` clauses
+
+---
+
+## C# (.NET/WPF)
+
+### Rules (Must Comply)
+
+1. **ConfigureAwait Policy**
+   Use ConfigureAwait(false) in library code.
+"""
+
+PYTHON_DIFF = """diff --git a/app/db.py b/app/db.py
+--- a/app/db.py
++++ b/app/db.py
+@@ -1,1 +1,2 @@
+ import sqlite3
++cursor.execute("SELECT * FROM users WHERE id = " + user_id)
+"""
+
+
+def make_retriever():
+    return GuidelinesRetriever(GuidelinesIndex(GUIDELINES).sections)
+
+
+def test_tokenize_splits_identifiers():
+    """Test that identifiers are kept whole and split into parts, and plurals are folded"""
+    assert tokenize("ConfigureAwait(false)") == ["configureawait", "configure", "await", "false"]
+    assert tokenize("user_id exceptions") == ["user", "id", "exception"]
+
+
+def test_split_rules_by_numbered_item_and_subsection():
+    """Test that each numbered item is a rule and bullet subsections are one rule each"""
+    rules = split_rules(GuidelinesIndex(GUIDELINES).sections)
+    python_rules = [rule for rule in rules if rule.section == "python"]
+
+    assert [rule.text.split("\n")[0] for rule in python_rules] == [
+        "1. **Type Hints**",
+        "2. **SQL Injection Prevention**",
+        "- Using `eval()` with user input",
+    ]
+    assert "cursor.execute" in python_rules[1].text and "# 1. not a new rule" in python_rules[1].text
+    assert python_rules[2].subsection_heading == "### Things to Avoid"
+    assert all("---" not in rule.text for rule in rules)
+
+
+def test_diff_query_terms_use_changed_lines_and_paths():
+    """Test that the query holds changed-line identifiers and file paths but not context lines"""
+    terms = diff_query_terms(parse_diff(PYTHON_DIFF))
+
+    assert {"cursor", "execute", "user", "app", "db", "py"} <= terms
+    assert "sqlite3" not in terms
+
+
+def test_search_ranks_relevant_rules_within_sections():
+    """Test that the best matching rules of the requested sections are returned in document order"""
+    retriever = make_retriever()
+    terms = diff_query_terms(parse_diff(PYTHON_DIFF))
+
+    rules = retriever.search(terms, {"generalprinciples", "python"}, top_k=1)
+    assert [rule.text.split("\n")[0] for rule in rules] == ["2. **SQL Injection Prevention**"]
+
+    assert retriever.search({"configureawait"}, {"python"}, top_k=5) == []
+    assert retriever.search({"configureawait"}, {"c#"}, top_k=5)[0].section == "c#"
+
+
+def test_render_groups_rules_under_headings():
+    """Test that rendered rules keep their section and subsection headings once each"""
+    retriever = make_retriever()
+    rules = retriever.search({"eval", "injection", "secret"}, {"generalprinciples", "python"}, top_k=5)
+    rendered = GuidelinesRetriever.render(rules)
+
+    assert rendered.count("## Python") == 1
+    assert rendered.index("## General Principles") < rendered.index("## Python")
+    assert "### Things to Avoid" in rendered and "Type Hints" not in rendered
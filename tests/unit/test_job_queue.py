@@ -0,0 +1,254 @@
+"""Unit tests for the durable review job queue"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ai_code_reviewer.api.clients.bitbucket_client import BitbucketClient
+from ai_code_reviewer.api.clients.retry import RetryPolicy
+from ai_code_reviewer.api.core.job_queue import ReviewJobQueue
+from ai_code_reviewer.api.db.models import Base, ReviewFailureLog
+from ai_code_reviewer.api.db.repository import ReviewJobRepository
+
+
+@asynccontextmanager
+async def fake_session():
+    """Stand-in for get_db_session that yields a dummy session"""
+    yield Mock()
+
+
+@asynccontextmanager
+async def memory_database():
+    """Create an in-memory SQLite database and yield a get_db_session replacement for it"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def database_session():
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    yield database_session
+    await engine.dispose()
+
+
+async def run_next_job(queue, database_session):
+    """Claim and run the next queued job, returning it as stored afterwards"""
+    async with database_session() as session:
+        job = await ReviewJobRepository(session).claim_next_job("worker-0")
+    await queue._run_job("worker-0", job.id, job.job_type, job.payload, job.attempts)
+    async with database_session() as session:
+        return await session.get(type(job), job.id)
+
+
+@pytest.fixture
+def queue():
+    """Create a job queue with mocked clients"""
+    return ReviewJobQueue(AsyncMock(), AsyncMock(), worker_count=1, poll_interval=0.01)
+
+
+class TestReviewJobQueue:
+    """Test job enqueueing and execution bookkeeping"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_unknown_job_type(self, queue):
+        """Test that unknown job types are rejected before touching the database"""
+        with pytest.raises(ValueError, match="Unknown review job type"):
+            await queue.enqueue("unknown", {})
+
+    @pytest.mark.asyncio
+    async def test_enqueue_persists_job_and_wakes_workers(self, queue):
+        """Test that enqueue stores the job and signals idle workers"""
+        mock_repo = Mock()
+        mock_repo.enqueue_job = AsyncMock(return_value=Mock(id=42))
+
+        with (
+            patch("ai_code_reviewer.api.core.job_queue.get_db_session", fake_session),
+            patch("ai_code_reviewer.api.core.job_queue.ReviewJobRepository", return_value=mock_repo),
+        ):
+            job_id = await queue.enqueue("pull_request", {"pullRequest": {}}, event_key="pr:opened")
+
+        assert job_id == 42
+        assert queue._wakeup.is_set()
+        assert mock_repo.enqueue_job.call_args.kwargs["job_type"] == "pull_request"
+
+    @pytest.mark.asyncio
+    async def test_run_job_marks_completed(self, queue):
+        """Test that a successful handler marks the job completed"""
+        handler = AsyncMock()
+        mock_repo = Mock()
+        mock_repo.mark_job_completed = AsyncMock()
+
+        with (
+            patch.dict(ReviewJobQueue.HANDLERS, {"pull_request": handler}),
+            patch("ai_code_reviewer.api.core.job_queue.get_db_session", fake_session),
+            patch("ai_code_reviewer.api.core.job_queue.ReviewJobRepository", return_value=mock_repo),
+        ):
+            await queue._run_job("worker-0", 7, "pull_request", {"eventKey": "pr:opened"}, 1)
+
+        handler.assert_awaited_once_with(queue.bitbucket_client, queue.llm_client, {"eventKey": "pr:opened"})
+        mock_repo.mark_job_completed.assert_awaited_once_with(7)
+
+    @pytest.mark.asyncio
+    async def test_run_job_records_failure_for_retry(self, queue):
+        """Test that a crashing handler records the failure so the job can be retried"""
+        handler = AsyncMock(side_effect=RuntimeError("boom"))
+        mock_repo = Mock()
+        mock_repo.mark_job_failed = AsyncMock(return_value="queued")
+        mock_repo.mark_job_completed = AsyncMock()
+
+        with (
+            patch.dict(ReviewJobQueue.HANDLERS, {"commit": handler}),
+            patch("ai_code_reviewer.api.core.job_queue.get_db_session", fake_session),
+            patch("ai_code_reviewer.api.core.job_queue.ReviewJobRepository", return_value=mock_repo),
+        ):
+            await queue._run_job("worker-0", 8, "commit", {}, 2)
+
+        mock_repo.mark_job_failed.assert_awaited_once()
+        assert mock_repo.mark_job_failed.call_args.args[:2] == (8, "boom")
+        mock_repo.mark_job_completed.assert_not_called()
+
+
+class TestReviewJobRetry:
+    """Test that reviews failing for a transient reason are run again"""
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_retries_only_failed_commits(self, queue, sample_commit_webhook):
+        """Test that a commit whose diff fetch fails is re-queued alone and reviewed on the next attempt"""
+        sample_commit_webhook["changes"] = [{"toHash": "commit1"}, {"toHash": "commit2"}]
+        fetches = {"commit1": 0}
+
+        async def get_commit_diff(project_key, repo_slug, commit_id):
+            if commit_id == "commit1":
+                fetches["commit1"] += 1
+                if fetches["commit1"] == 1:
+                    raise httpx.ConnectError("Bitbucket unavailable")
+            return f"diff of {commit_id}"
+
+        queue.bitbucket_client.get_commit_diff = AsyncMock(side_effect=get_commit_diff)
+        queue.llm_client.get_code_review = AsyncMock(return_value="No issues found.")
+
+        async with memory_database() as database_session:
+            with (
+                patch("ai_code_reviewer.api.core.job_queue.get_db_session", database_session),
+                patch("ai_code_reviewer.api.core.job_queue.Config.REVIEW_JOB_RETRY_DELAY", 0),
+                patch("ai_code_reviewer.api.core.review_engine.log_review_failure", new_callable=AsyncMock),
+            ):
+                async with database_session() as session:
+                    await ReviewJobRepository(session).enqueue_job("commit", sample_commit_webhook, max_attempts=3)
+
+                first = await run_next_job(queue, database_session)
+                second = await run_next_job(queue, database_session)
+
+        assert first.status == "queued"
+        assert "commit1" in first.last_error
+        assert [change["toHash"] for change in first.payload["changes"]] == ["commit1"]
+        assert second.status == "completed"
+        assert second.attempts == 2
+        reviewed = [call.args[0] for call in queue.llm_client.get_code_review.call_args_list]
+        assert reviewed == ["diff of commit2", "diff of commit1"]
+
+    @pytest.mark.asyncio
+    async def test_unreachable_bitbucket_requeues_job(self, sample_commit_webhook):
+        """Test that a real Bitbucket client failing to connect re-queues the job instead of completing it"""
+
+        def refuse(request):
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        bitbucket_client = BitbucketClient()
+        bitbucket_client.retry_policy = RetryPolicy(max_attempts=1)
+        bitbucket_client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(refuse))
+        queue = ReviewJobQueue(bitbucket_client, AsyncMock(), worker_count=1, poll_interval=0.01)
+
+        async with memory_database() as database_session:
+            with (
+                patch("ai_code_reviewer.api.core.job_queue.get_db_session", database_session),
+                patch("ai_code_reviewer.api.core.review_engine.get_db_session", database_session),
+                patch("ai_code_reviewer.api.core.job_queue.Config.REVIEW_JOB_RETRY_DELAY", 0),
+            ):
+                async with database_session() as session:
+                    await ReviewJobRepository(session).enqueue_job("commit", sample_commit_webhook, max_attempts=3)
+
+                job = await run_next_job(queue, database_session)
+                async with database_session() as session:
+                    failures = (await session.execute(select(ReviewFailureLog))).scalars().all()
+        await bitbucket_client.aclose()
+
+        assert job.status == "queued"
+        assert "def456" in job.last_error
+        assert [failure.failure_stage for failure in failures] == ["bitbucket_fetch_diff"]
+        queue.llm_client.get_code_review.assert_not_called()
+
+
+class TestReviewJobCoalescing:
+    """Test that newer pull request events supersede older reviews"""
+
+    def test_coalesce_key_for_pull_request(self, sample_pr_webhook):
+        """Test the coalesce key is derived from the target repository and PR ID"""
+        key = ReviewJobQueue.coalesce_key_for("pull_request", sample_pr_webhook)
+
+        assert key == "TEST/test-repo/pull-requests/123"
+
+    def test_coalesce_key_for_commit_is_none(self, sample_commit_webhook):
+        """Test commit jobs never coalesce"""
+        assert ReviewJobQueue.coalesce_key_for("commit", sample_commit_webhook) is None
+
+    def test_coalesce_key_for_invalid_payload(self):
+        """Test malformed PR payloads do not coalesce (the engine logs the validation failure)"""
+        assert ReviewJobQueue.coalesce_key_for("pull_request", {"pullRequest": {"id": 1}}) is None
+
+    @pytest.mark.asyncio
+    async def test_enqueue_applies_quiet_window(self, queue, sample_pr_webhook):
+        """Test PR jobs are delayed by the debounce window and carry their coalesce key"""
+        mock_repo = Mock()
+        mock_repo.enqueue_job = AsyncMock(return_value=Mock(id=1))
+
+        with (
+            patch("ai_code_reviewer.api.core.job_queue.Config.PR_REVIEW_DEBOUNCE_SECONDS", 60),
+            patch("ai_code_reviewer.api.core.job_queue.get_db_session", fake_session),
+            patch("ai_code_reviewer.api.core.job_queue.ReviewJobRepository", return_value=mock_repo),
+        ):
+            await queue.enqueue("pull_request", sample_pr_webhook, event_key="pr:from_ref_updated")
+
+        kwargs = mock_repo.enqueue_job.call_args.kwargs
+        assert kwargs["coalesce_key"] == "TEST/test-repo/pull-requests/123"
+        assert kwargs["run_after"] > datetime.now(UTC) + timedelta(seconds=30)
+
+    @pytest.mark.asyncio
+    async def test_newer_event_cancels_in_flight_review(self, queue, sample_pr_webhook):
+        """Test an in-flight review is cancelled and marked superseded when a newer event arrives"""
+        started = asyncio.Event()
+
+        async def slow_review(*args):
+            started.set()
+            await asyncio.sleep(10)
+
+        mock_repo = Mock()
+        mock_repo.enqueue_job = AsyncMock(return_value=Mock(id=2))
+        mock_repo.mark_job_superseded = AsyncMock()
+        mock_repo.mark_job_completed = AsyncMock()
+        key = ReviewJobQueue.coalesce_key_for("pull_request", sample_pr_webhook)
+
+        with (
+            patch.dict(ReviewJobQueue.HANDLERS, {"pull_request": slow_review}),
+            patch("ai_code_reviewer.api.core.job_queue.get_db_session", fake_session),
+            patch("ai_code_reviewer.api.core.job_queue.ReviewJobRepository", return_value=mock_repo),
+        ):
+            running = asyncio.create_task(queue._run_job("worker-0", 1, "pull_request", sample_pr_webhook, 1, key))
+            await started.wait()
+
+            await queue.enqueue("pull_request", sample_pr_webhook, event_key="pr:from_ref_updated")
+            await running
+
+        mock_repo.mark_job_superseded.assert_awaited_once_with(1)
+        mock_repo.mark_job_completed.assert_not_called()
+        assert key not in queue._in_flight
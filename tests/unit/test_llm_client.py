@@ -1,8 +1,38 @@
+import asyncio
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, Mock, patch
 
+import httpx
 import pytest
 
-from ai_code_reviewer.api.clients.llm_client import LLMClient
+from ai_code_reviewer.api.clients.llm_client import PARTIAL_REVIEW_NOTICE, LLMClient
+from ai_code_reviewer.api.clients.retry import RetryableError, RetryPolicy
+from ai_code_reviewer.api.core.review_metrics import LLMRequestStats, ReviewMetrics
+from ai_code_reviewer.api.core.token_budget import EstimatingTokenCounter, PromptBudget
+
+
+def make_streaming_http_client(lines, status_code=200, stall=False):
+    """Build a mock HTTP client whose stream() yields the given response lines"""
+
+    async def aiter_lines():
+        for line in lines:
+            yield line
+        if stall:
+            await asyncio.sleep(3600)
+
+    response = Mock()
+    response.status_code = status_code
+    response.text = "error"
+    response.aread = AsyncMock()
+    response.aiter_lines = aiter_lines
+
+    @asynccontextmanager
+    async def stream(*args, **kwargs):
+        yield response
+
+    http_client = Mock()
+    http_client.stream = Mock(side_effect=stream)
+    return http_client
 
 
 class TestLLMClient:
@@ -11,7 +41,10 @@ class TestLLMClient:
     @pytest.fixture
     def client(self):
         """Create LLM client instance"""
-        return LLMClient()
+        llm_client = LLMClient()
+        llm_client.review_cache = None
+        llm_client.retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+        return llm_client
 
     @pytest.mark.asyncio
     async def test_test_openai_connection_success(self, client):
@@ -20,16 +53,14 @@ class TestLLMClient:
         mock_response.status_code = 200
         mock_response.json.return_value = {"choices": [{"message": {"content": "Hello"}}]}
 
-        with patch("httpx.AsyncClient") as mock_client_cls:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client_cls.return_value.__aenter__.return_value = mock_client_instance
-            mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_http_client = AsyncMock()
+        mock_http_client.post = AsyncMock(return_value=mock_response)
+        client._http_client = mock_http_client
 
-            result = await client._test_openai_connection()
+        result = await client._test_openai_connection()
 
-            assert result["status"] == "connected"
-            assert result["provider"] == "openai"
+        assert result["status"] == "connected"
+        assert result["provider"] == "openai"
 
     @pytest.mark.asyncio
     async def test_test_openai_connection_failure(self, client):
@@ -38,16 +69,14 @@ class TestLLMClient:
         mock_response.status_code = 401
         mock_response.text = "Unauthorized"
 
-        with patch("httpx.AsyncClient") as mock_client_cls:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client_cls.return_value.__aenter__.return_value = mock_client_instance
-            mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_http_client = AsyncMock()
+        mock_http_client.post = AsyncMock(return_value=mock_response)
+        client._http_client = mock_http_client
 
-            result = await client._test_openai_connection()
+        result = await client._test_openai_connection()
 
-            assert result["status"] == "failed"
-            assert "401" in result["error"]
+        assert result["status"] == "failed"
+        assert "401" in result["error"]
 
     @pytest.mark.asyncio
     async def test_test_ollama_connection_success(self, client):
@@ -56,25 +85,17 @@ class TestLLMClient:
         mock_response.status_code = 200
         mock_response.json.return_value = {"models": [{"name": "llama3"}, {"name": "qwen-coder"}]}
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            # Create a mock context manager that returns a mock client
-            mock_client_instance = AsyncMock()
-            mock_client_instance.get.return_value = mock_response
-
-            # Set up the context manager to return our mock client instance
-            mock_context_manager = AsyncMock()
-            mock_context_manager.__aenter__.return_value = mock_client_instance
-            mock_context_manager.__aexit__.return_value = None
-
-            mock_client_class.return_value = mock_context_manager
+        mock_http_client = AsyncMock()
+        mock_http_client.get.return_value = mock_response
+        client._http_client = mock_http_client
 
-            # Test with model that exists
-            client.model = "llama3"
-            result = await client._test_ollama_connection()
+        # Test with model that exists
+        client.model = "llama3"
+        result = await client._test_ollama_connection()
 
-            assert result["status"] == "connected"
-            assert result["provider"] == "ollama"
-            assert "llama3" in result["available_models"]
+        assert result["status"] == "connected"
+        assert result["provider"] == "ollama"
+        assert "llama3" in result["available_models"]
 
     @pytest.mark.asyncio
     async def test_test_ollama_connection_model_not_found(self, client):
@@ -83,74 +104,198 @@ class TestLLMClient:
         mock_response.status_code = 200
         mock_response.json.return_value = {"models": [{"name": "llama3"}]}
 
-        with patch("httpx.AsyncClient") as mock_client_cls:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.get = AsyncMock(return_value=mock_response)
-            mock_client_cls.return_value.__aenter__.return_value = mock_client_instance
-            mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_http_client = AsyncMock()
+        mock_http_client.get = AsyncMock(return_value=mock_response)
+        client._http_client = mock_http_client
 
-            # Test with model that doesn't exist
-            client.model = "nonexistent-model"
-            result = await client._test_ollama_connection()
+        # Test with model that doesn't exist
+        client.model = "nonexistent-model"
+        result = await client._test_ollama_connection()
 
-            assert result["status"] == "model_not_found"
-            assert "nonexistent-model" in result["error"]
+        assert result["status"] == "model_not_found"
+        assert "nonexistent-model" in result["error"]
 
     @pytest.mark.asyncio
     async def test_get_openai_review_success(self, client, sample_diff):
-        """Test successful OpenAI code review"""
+        """Test successful OpenAI code review without streaming"""
+        client.streaming = False
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
             "choices": [{"message": {"content": "The code looks good. No issues found."}}]
         }
 
-        with patch("httpx.AsyncClient") as mock_client_cls:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client_cls.return_value.__aenter__.return_value = mock_client_instance
-            mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_http_client = AsyncMock()
+        mock_http_client.post = AsyncMock(return_value=mock_response)
+        client._http_client = mock_http_client
 
-            prompt = f"Review this code: {sample_diff}"
-            result = await client._get_openai_review(prompt)
+        prompt = f"Review this code: {sample_diff}"
+        result = await client._get_openai_review(prompt)
 
-            assert result == "The code looks good. No issues found."
+        assert result == "The code looks good. No issues found."
 
     @pytest.mark.asyncio
     async def test_get_openai_review_failure(self, client, sample_diff):
-        """Test failed OpenAI code review"""
+        """Test that an OpenAI server error is raised once retries are exhausted"""
+        client.streaming = False
         mock_response = Mock()
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
 
-        with patch("httpx.AsyncClient") as mock_client_cls:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client_cls.return_value.__aenter__.return_value = mock_client_instance
-            mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_http_client = AsyncMock()
+        mock_http_client.post = AsyncMock(return_value=mock_response)
+        client._http_client = mock_http_client
 
-            prompt = f"Review this code: {sample_diff}"
-            result = await client._get_openai_review(prompt)
+        prompt = f"Review this code: {sample_diff}"
+        with pytest.raises(RetryableError):
+            await client._get_openai_review(prompt)
 
-            assert result is None
+        assert mock_http_client.post.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_get_openai_review_retries_transient_error(self, client, sample_diff):
+        """Test that a transient OpenAI error is retried before giving up"""
+        client.streaming = False
+        unavailable = Mock(status_code=503, text="Service Unavailable", headers={})
+        success = Mock(status_code=200, headers={})
+        success.json.return_value = {"choices": [{"message": {"content": "Looks good."}}]}
+
+        mock_http_client = AsyncMock()
+        mock_http_client.post = AsyncMock(side_effect=[unavailable, success])
+        client._http_client = mock_http_client
+
+        with patch.object(client.rate_limiter, "acquire", wraps=client.rate_limiter.acquire) as acquire:
+            result = await client._get_openai_review(f"Review this code: {sample_diff}", reserved_tokens=100)
+
+        assert result == "Looks good."
+        assert mock_http_client.post.call_count == 2
+        # Each attempt takes its own slot, so the limiter is not held during the backoff
+        assert [c.args for c in acquire.call_args_list] == [(100,), (100,)]
+
+    @pytest.mark.asyncio
+    async def test_get_openai_review_does_not_retry_client_error(self, client):
+        """Test that a non-transient error fails on the first attempt"""
+        client.streaming = False
+        mock_http_client = AsyncMock()
+        mock_http_client.post = AsyncMock(return_value=Mock(status_code=400, text="Bad Request", headers={}))
+        client._http_client = mock_http_client
+
+        result = await client._get_openai_review("prompt")
+
+        assert result is None
+        assert mock_http_client.post.call_count == 1
 
     @pytest.mark.asyncio
     async def test_get_ollama_review_success(self, client, sample_diff):
-        """Test successful Ollama code review"""
+        """Test successful Ollama code review without streaming"""
+        client.streaming = False
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"response": "The code looks good. No issues found."}
 
-        with patch("httpx.AsyncClient") as mock_client_cls:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client_cls.return_value.__aenter__.return_value = mock_client_instance
-            mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_http_client = AsyncMock()
+        mock_http_client.post = AsyncMock(return_value=mock_response)
+        client._http_client = mock_http_client
+
+        prompt = f"Review this code: {sample_diff}"
+        result = await client._get_ollama_review(prompt)
+
+        assert result == "The code looks good. No issues found."
+
+    @pytest.mark.asyncio
+    async def test_stream_openai_review(self, client):
+        """Test streaming an OpenAI review from server-sent events"""
+        lines = [
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            "",
+            'data: {"choices": [{"delta": {"content": "No issues "}}]}',
+            'data: {"choices": [{"delta": {"content": "found."}}]}',
+            "data: [DONE]",
+        ]
+        client._http_client = make_streaming_http_client(lines)
+        stats = LLMRequestStats()
+
+        result = await client._get_openai_review("prompt", stats)
+
+        assert result == "No issues found."
+        assert stats.streamed is True
+        assert stats.completed is True
+        assert stats.first_token_seconds is not None
+        payload = client._http_client.stream.call_args.kwargs["json"]
+        assert payload["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_stream_ollama_review(self, client):
+        """Test streaming an Ollama review from newline-delimited JSON"""
+        lines = ['{"response": "No issues ", "done": false}', '{"response": "found.", "done": true}']
+        client._http_client = make_streaming_http_client(lines)
+
+        result = await client._get_ollama_review("prompt")
+
+        assert result == "No issues found."
+
+    @pytest.mark.asyncio
+    async def test_stream_idle_timeout_keeps_partial_output(self, client):
+        """Test that a stalled stream returns the text received so far, marked as partial"""
+        lines = ['{"response": "Partial review", "done": false}']
+        client._http_client = make_streaming_http_client(lines, stall=True)
+        stats = LLMRequestStats()
+
+        with patch("ai_code_reviewer.api.clients.llm_client.Config.LLM_STREAM_IDLE_TIMEOUT", 0.01):
+            result = await client._get_ollama_review("prompt", stats)
 
-            prompt = f"Review this code: {sample_diff}"
-            result = await client._get_ollama_review(prompt)
+        assert result.startswith("Partial review")
+        assert PARTIAL_REVIEW_NOTICE in result
+        assert stats.completed is False
 
-            assert result == "The code looks good. No issues found."
+    @pytest.mark.asyncio
+    async def test_stream_idle_timeout_without_partial_output(self, client):
+        """Test that a stalled stream fails when partial output is disabled"""
+        lines = ['{"response": "Partial review", "done": false}']
+        client._http_client = make_streaming_http_client(lines, stall=True)
+
+        with (
+            patch("ai_code_reviewer.api.clients.llm_client.Config.LLM_STREAM_IDLE_TIMEOUT", 0.01),
+            patch("ai_code_reviewer.api.clients.llm_client.Config.LLM_STREAM_KEEP_PARTIAL", False),
+        ):
+            result = await client._get_ollama_review("prompt")
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_stream_error_status(self, client):
+        """Test that a client error status on a streamed request returns None and a server error is raised"""
+        client._http_client = make_streaming_http_client([], status_code=400)
+
+        result = await client._get_openai_review("prompt")
+
+        assert result is None
+
+        client._http_client = make_streaming_http_client([], status_code=500)
+        with pytest.raises(RetryableError):
+            await client._get_openai_review("prompt")
+
+    @pytest.mark.asyncio
+    async def test_partial_review_is_not_cached(self, client, sample_diff):
+        """Test that partial output from a stalled stream is recorded and not cached"""
+        client.provider = "openai"
+        client.review_cache = Mock()
+        client.review_cache.get = AsyncMock(return_value=None)
+        client.review_cache.put = AsyncMock()
+        metrics = ReviewMetrics()
+
+        async def stalled_review(prompt, stats, reserved_tokens):
+            stats.completed = False
+            stats.first_token_seconds = 0.5
+            return "Partial review"
+
+        with patch.object(client, "_get_openai_review", side_effect=stalled_review):
+            result = await client.get_code_review(sample_diff, metrics=metrics)
+
+        assert result == "Partial review"
+        assert metrics.partial_output is True
+        assert metrics.time_to_first_token_ms == 500
+        client.review_cache.put.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_get_code_review_openai(self, client, sample_diff):
@@ -172,6 +317,82 @@ class TestLLMClient:
 
             assert result == "Mock review"
 
+    @pytest.mark.asyncio
+    async def test_get_code_review_cache_hit_skips_provider(self, client, sample_diff):
+        """Test that a cached review is returned without calling the LLM"""
+        client.provider = "openai"
+        client.review_cache = Mock()
+        client.review_cache.get = AsyncMock(return_value="Cached review")
+        client.review_cache.put = AsyncMock()
+        metrics = ReviewMetrics()
+
+        with patch.object(client, "_get_openai_review", new_callable=AsyncMock) as mock_review:
+            result = await client.get_code_review(sample_diff, metrics=metrics)
+
+            assert result == "Cached review"
+            assert metrics.cache_hit is True
+            mock_review.assert_not_called()
+            client.review_cache.put.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_code_review_cache_miss_stores_review(self, client, sample_diff):
+        """Test that a fresh review is stored in the cache"""
+        client.provider = "openai"
+        client.review_cache = Mock()
+        client.review_cache.get = AsyncMock(return_value=None)
+        client.review_cache.put = AsyncMock()
+        metrics = ReviewMetrics()
+
+        with patch.object(client, "_get_openai_review", new_callable=AsyncMock, return_value="Fresh review"):
+            result = await client.get_code_review(sample_diff, metrics=metrics)
+
+            assert result == "Fresh review"
+            assert metrics.cache_hit is False
+            client.review_cache.put.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_code_review_skips_non_source_only_diff(self, client):
+        """Test that a diff of only lockfile and config changes is answered without an LLM call"""
+        diff = (
+            "diff --git a/package-lock.json b/package-lock.json\n@@ -1 +1 @@\n-a\n+b\n"
+            "diff --git a/app.config.xml b/app.config.xml\n@@ -1 +1 @@\n-<a/>\n+<b/>"
+        )
+        client.provider = "openai"
+
+        with patch.object(client, "_get_openai_review", new_callable=AsyncMock) as mock_review:
+            result = await client.get_code_review(diff)
+
+        mock_review.assert_not_called()
+        assert result.startswith("Only changes in .json, .xml files were detected.")
+
+    @pytest.mark.asyncio
+    async def test_get_code_review_skips_formatting_only_diff(self, client):
+        """Test that a whitespace-only change is answered without an LLM call"""
+        diff = "diff --git a/src/app.cs b/src/app.cs\n@@ -1 +1 @@\n-int  x = 1;\n+int x = 1;"
+        client.provider = "openai"
+
+        with patch.object(client, "_get_openai_review", new_callable=AsyncMock) as mock_review:
+            result = await client.get_code_review(diff)
+
+        mock_review.assert_not_called()
+        assert result == "No issues found."
+
+    @pytest.mark.asyncio
+    async def test_get_code_review_drops_vendored_files_from_prompt(self, client):
+        """Test that skipped files are removed from the prompt while source files are reviewed"""
+        diff = (
+            "diff --git a/src/app.py b/src/app.py\n@@ -1 +1 @@\n-x = 1\n+x = 2\n"
+            "diff --git a/vendor/lib/util.py b/vendor/lib/util.py\n@@ -1 +1 @@\n-y = 1\n+y = 2"
+        )
+        client.provider = "openai"
+
+        with patch.object(client, "_get_openai_review", new_callable=AsyncMock, return_value="Review") as mock_review:
+            await client.get_code_review(diff)
+
+        prompt = mock_review.call_args.args[0]
+        assert "src/app.py" in prompt
+        assert "vendor/lib/util.py" not in prompt
+
     @pytest.mark.asyncio
     async def test_get_code_review_unknown_provider(self, client, sample_diff):
         """Test code review with unknown provider"""
@@ -182,28 +403,134 @@ class TestLLMClient:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_get_code_review_truncation(self, client):
-        """Test code review with long diff truncation"""
-        # Create a very long diff
-        long_diff = "a" * 100000  # Longer than max_chars (80000)
+    async def test_get_code_review_raises_transient_error(self, client, sample_diff):
+        """Test that a transient provider error is raised so the review can be retried later"""
+        client.provider = "openai"
+
+        with (
+            patch.object(
+                client, "_get_openai_review", new_callable=AsyncMock, side_effect=httpx.ConnectError("refused")
+            ),
+            pytest.raises(httpx.ConnectError),
+        ):
+            await client.get_code_review(sample_diff)
+
+    @pytest.mark.asyncio
+    async def test_chunked_review_raises_transient_error_when_no_chunk_succeeds(self, client):
+        """Test that a chunked review is only raised as transient when every chunk failed"""
+        client.provider = "openai"
+        client.prompt_budget = PromptBudget(context_tokens=20000, output_tokens=2000)
+        unavailable = RetryableError("OpenAI API error: 503", status_code=503)
+
+        with (
+            patch("ai_code_reviewer.api.core.config.Config.GUIDELINES_ENABLED", False),
+            patch("ai_code_reviewer.api.clients.llm_client.get_token_counter", return_value=EstimatingTokenCounter()),
+            patch.object(client, "_get_openai_review", new_callable=AsyncMock, side_effect=unavailable),
+            pytest.raises(RetryableError),
+        ):
+            await client.get_code_review("a" * 100000)
+
+        # One chunk reviewed, the merge request failing: the partial reviews are concatenated
+        with (
+            patch("ai_code_reviewer.api.core.config.Config.GUIDELINES_ENABLED", False),
+            patch("ai_code_reviewer.api.clients.llm_client.get_token_counter", return_value=EstimatingTokenCounter()),
+            patch.object(
+                client,
+                "_get_openai_review",
+                new_callable=AsyncMock,
+                side_effect=["Chunk review 1", unavailable, unavailable],
+            ),
+        ):
+            result = await client.get_code_review("a" * 100000)
+
+        assert "Chunk review 1" in result
+        assert "1 of 2 parts of this diff could not be reviewed" in result
+
+    @pytest.mark.asyncio
+    async def test_get_code_review_chunks_large_diff(self, client):
+        """Test that a diff too large for one prompt is reviewed in chunks and merged"""
+        # Create a diff larger than the prompt budget (25000 estimated tokens vs ~18000)
+        long_diff = "a" * 100000
         client.provider = "openai"
+        client.prompt_budget = PromptBudget(context_tokens=20000, output_tokens=2000)
+        counter = EstimatingTokenCounter()
+        metrics = ReviewMetrics()
 
         # Disable guidelines for this test to make it predictable
         with (
             patch("ai_code_reviewer.api.core.config.Config.GUIDELINES_ENABLED", False),
+            patch("ai_code_reviewer.api.clients.llm_client.get_token_counter", return_value=counter),
             patch.object(
-                client, "_get_openai_review", new_callable=AsyncMock, return_value="Mock review"
+                client,
+                "_get_openai_review",
+                new_callable=AsyncMock,
+                side_effect=["Chunk review 1", "Chunk review 2", "Merged review"],
             ) as mock_review,
         ):
-            await client.get_code_review(long_diff)
+            result = await client.get_code_review(long_diff, metrics=metrics)
+
+            assert result == "Merged review"
+            # Two chunk reviews plus one merge request
+            assert mock_review.call_count == 3
+            chunk_prompts = [call[0][0] for call in mock_review.call_args_list[:2]]
+            for prompt in chunk_prompts:
+                assert counter.count(prompt) <= client.prompt_budget.prompt_tokens
+            # No part of the diff is dropped
+            assert sum(prompt.count("a" * 100) for prompt in chunk_prompts) >= 999
+            merge_prompt = mock_review.call_args_list[2][0][0]
+            assert "Chunk review 1" in merge_prompt and "Chunk review 2" in merge_prompt
+            # Token counts cover every request
+            assert metrics.prompt_tokens == sum(counter.count(call[0][0]) for call in mock_review.call_args_list)
+            assert metrics.completion_tokens > 0
 
-            # Check that the prompt was truncated (should be close to max_chars 80000)
-            call_args = mock_review.call_args[0][0]
-            # Allow some overhead for the template itself (should be < 85000)
-            assert len(call_args) < 85000, f"Prompt too long: {len(call_args)} chars"
-            # Verify truncation happened (original diff was 100000 chars)
-            assert len(call_args) < len(long_diff), "Diff was not truncated"
-            assert "[... diff truncated ...]" in call_args
+    @pytest.mark.asyncio
+    async def test_get_code_review_chunked_merge_fallback(self, client):
+        """Test that chunk reviews are concatenated when the merge request fails"""
+        long_diff = "a" * 100000
+        client.provider = "openai"
+        client.prompt_budget = PromptBudget(context_tokens=20000, output_tokens=2000)
+
+        with (
+            patch("ai_code_reviewer.api.core.config.Config.GUIDELINES_ENABLED", False),
+            patch("ai_code_reviewer.api.clients.llm_client.get_token_counter", return_value=EstimatingTokenCounter()),
+            patch.object(
+                client,
+                "_get_openai_review",
+                new_callable=AsyncMock,
+                side_effect=["Chunk review 1", None, None],
+            ),
+        ):
+            result = await client.get_code_review(long_diff)
+
+            assert "Chunk review 1" in result
+            assert "1 of 2 parts of this diff could not be reviewed" in result
+
+    @pytest.mark.parametrize(
+        "responses,cached",
+        [
+            (["Chunk review 1", "Chunk review 2", "Merged review"], True),
+            (["Chunk review 1", None, "Merged review"], False),  # A chunk could not be reviewed
+            (["Chunk review 1", "Chunk review 2", None], False),  # Merge fell back to concatenation
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_incomplete_chunked_review_is_not_cached(self, client, responses, cached):
+        """Test that only a chunked review with every part reviewed and merged is stored in the review cache"""
+        client.provider = "openai"
+        client.prompt_budget = PromptBudget(context_tokens=20000, output_tokens=2000)
+        client.review_cache = Mock()
+        client.review_cache.get = AsyncMock(return_value=None)
+        client.review_cache.put = AsyncMock()
+
+        with (
+            patch("ai_code_reviewer.api.core.config.Config.GUIDELINES_ENABLED", False),
+            patch("ai_code_reviewer.api.clients.llm_client.get_token_counter", return_value=EstimatingTokenCounter()),
+            patch.object(client, "_get_openai_review", new_callable=AsyncMock, side_effect=responses),
+        ):
+            result = await client.get_code_review("a" * 100000)
+
+        assert result
+        assert client.review_cache.put.called is cached
 
     @pytest.mark.asyncio
     async def test_get_summary_review(self, client, sample_diff):
@@ -232,3 +559,27 @@ Another normal line"""
         assert "differ" not in cleaned
         assert "[line truncated]" in cleaned
         assert "Another normal line" in cleaned
+
+    @pytest.mark.asyncio
+    async def test_http_client_is_reused_across_requests(self, client):
+        """Test that the pooled HTTP client is created once and shared"""
+        try:
+            first = await client._get_http_client()
+            second = await client._get_http_client()
+
+            assert first is second
+        finally:
+            await client.aclose()
+
+        assert client._http_client is None
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_pool(self, client):
+        """Test that aclose() closes the shared HTTP client"""
+        mock_http_client = AsyncMock()
+        client._http_client = mock_http_client
+
+        await client.aclose()
+
+        mock_http_client.aclose.assert_awaited_once()
+        assert client._http_client is None
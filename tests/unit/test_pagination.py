@@ -0,0 +1,307 @@
+"""Unit tests for keyset (cursor) pagination and summary lists of reviews and failure logs"""
+
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ai_code_reviewer.api.db.models import Base, ReviewFailureLog, ReviewRecord
+from ai_code_reviewer.api.db.repository import (
+    FailureLogRepository,
+    ReviewRepository,
+    decode_cursor,
+    encode_cursor,
+    next_page_cursor,
+)
+from ai_code_reviewer.api.routes import failures as failure_routes
+from ai_code_reviewer.api.routes import reviews as review_routes
+from ai_code_reviewer.api.routes.reviews import get_review_summaries
+
+
+@asynccontextmanager
+async def database_session():
+    """Open a session on an in-memory SQLite database with the application schema"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db_session:
+        yield db_session
+    await engine.dispose()
+
+
+def make_review(project_key="TEST", repo_slug="repo", **kwargs):
+    return ReviewRecord(
+        review_type="auto",
+        trigger_type="commit",
+        project_key=project_key,
+        repo_slug=repo_slug,
+        diff_content="diff",
+        review_feedback="review",
+        **kwargs,
+    )
+
+
+def make_failure(failure_stage="llm_review", project_key=None, **kwargs):
+    return ReviewFailureLog(
+        event_type="webhook",
+        failure_stage=failure_stage,
+        error_type="E",
+        error_message="m",
+        project_key=project_key,
+        **kwargs,
+    )
+
+
+@contextmanager
+def serve_session(session):
+    """Make route handlers use the given session instead of opening their own"""
+
+    @asynccontextmanager
+    async def get_session():
+        yield session
+
+    with (
+        patch.object(review_routes, "get_db_session", get_session),
+        patch.object(failure_routes, "get_db_session", get_session),
+    ):
+        yield
+
+
+async def read_all_pages(fetch, limit):
+    """Follow next-page cursors until the last page, returning the ids of every page"""
+    pages, after = [], None
+    while True:
+        records = await fetch(limit=limit + 1, after=after)
+        pages.append([record.id for record in records[:limit]])
+        cursor = next_page_cursor(records, limit)
+        if cursor is None:
+            return pages
+        after = decode_cursor(cursor)
+
+
+class TestCursor:
+    """Test cursor encoding"""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the position it was built from"""
+        created_at = datetime(2026, 10, 16, 12, 30, 5)
+        cursor = encode_cursor(created_at, 42)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (created_at, 42)
+
+    @pytest.mark.parametrize("cursor", ["", "not a cursor", encode_cursor(datetime(2026, 1, 1), 1)[:-3]])
+    def test_malformed_cursor_raises(self, cursor):
+        """Test that malformed cursors raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    def test_next_page_cursor_only_when_more_records(self):
+        """Test that the last page has no next cursor"""
+        records = [ReviewRecord(id=i, created_at=datetime(2026, 1, 1)) for i in (3, 2, 1)]
+
+        assert next_page_cursor(records, 3) is None
+        assert decode_cursor(next_page_cursor(records, 2)) == (datetime(2026, 1, 1), 2)
+
+
+class TestKeysetPagination:
+    """Test paging through the database with cursors"""
+
+    @pytest.mark.asyncio
+    async def test_reviews_with_same_timestamp_are_paged_without_gaps(self):
+        """Test that records created in the same second are neither repeated nor skipped"""
+        async with database_session() as session:
+            session.add_all([make_review() for _ in range(5)] + [make_review(project_key="OTHER")])
+            await session.commit()
+            repo = ReviewRepository(session)
+
+            pages = await read_all_pages(repo.get_reviews_paginated, limit=2)
+            filtered = await read_all_pages(
+                lambda **kwargs: repo.get_reviews_filtered(project_key="TEST", **kwargs), limit=2
+            )
+            offset_page = await repo.get_reviews_filtered(offset=2, limit=2)
+
+        assert pages == [[6, 5], [4, 3], [2, 1]]
+        assert filtered == [[5, 4], [3, 2], [1]]
+        assert [record.id for record in offset_page] == [4, 3]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_paged_by_cursor(self):
+        """Test that failure logs page newest first"""
+        async with database_session() as session:
+            session.add_all(
+                [
+                    ReviewFailureLog(
+                        event_type="webhook", failure_stage="llm_review", error_type="E", error_message="m"
+                    )
+                    for _ in range(3)
+                ]
+            )
+            await session.commit()
+            pages = await read_all_pages(FailureLogRepository(session).get_failures_paginated, limit=2)
+
+        assert pages == [[3, 2], [1]]
+
+    @pytest.mark.asyncio
+    async def test_review_filters_and_counts(self):
+        """Test that each filter applies to both the page and the total"""
+        async with database_session() as session:
+            session.add_all(
+                [
+                    make_review(commit_id="abc"),
+                    make_review(repo_slug="other", pr_id=7),
+                    make_review(project_key="OTHER"),
+                    make_review(pr_id=7),
+                ]
+            )
+            await session.commit()
+            repo = ReviewRepository(session)
+
+            by_pr = await repo.get_reviews_filtered(pr_id=7, repo_slug="repo")
+            by_commit = await repo.get_reviews_filtered(commit_id="abc")
+            by_project = await repo.get_reviews_by_project("TEST", repo_slug="repo")
+            counts = [
+                await repo.count_reviews_filtered(),
+                await repo.count_reviews_filtered(project_key="TEST", repo_slug="repo"),
+                await repo.count_reviews_filtered(commit_id="abc"),
+                await repo.count_reviews_filtered(pr_id=7),
+            ]
+
+        assert [record.id for record in by_pr] == [4]
+        assert [record.id for record in by_commit] == [1]
+        assert sorted(record.id for record in by_project) == [1, 4]
+        assert counts == [4, 2, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_failure_queries(self):
+        """Test the failure log lists and counts"""
+        async with database_session() as session:
+            session.add_all(
+                [
+                    make_failure(project_key="TEST", repo_slug="repo"),
+                    make_failure(failure_stage="email_send", project_key="TEST", repo_slug="other"),
+                    make_failure(),
+                ]
+            )
+            await session.commit()
+            repo = FailureLogRepository(session)
+
+            resolved = await repo.mark_failure_resolved(1, "Fixed the endpoint")
+            unresolved = await repo.get_unresolved_failures()
+            by_stage = await repo.get_failures_by_stage("llm_review")
+            by_project = await repo.get_failures_by_project("TEST", repo_slug="other")
+            latest = await repo.get_latest_failures(limit=2)
+            stage_counts = await repo.count_failures_by_stage()
+            totals = (await repo.count_total_failures(), await repo.count_total_failures(unresolved_only=True))
+
+        assert (resolved.resolved, resolved.resolution_notes) == (True, "Fixed the endpoint")
+        assert sorted(f.id for f in unresolved) == [2, 3]
+        assert sorted(f.id for f in by_stage) == [1, 3]
+        assert [f.id for f in by_project] == [2]
+        assert len(latest) == 2
+        assert stage_counts == {"llm_review": 2, "email_send": 1}
+        assert totals == (3, 2)
+
+    @pytest.mark.asyncio
+    async def test_reviews_endpoint_follows_cursor(self):
+        """Test that /reviews pages by cursor, rejects bad cursors and serves single records and stats"""
+        async with database_session() as session:
+            session.add_all([make_review(email_sent=True, llm_provider="openai") for _ in range(3)])
+            await session.commit()
+            session.expunge_all()
+            page_args = {"project_key": None, "repo_slug": None, "commit_id": None, "pr_id": None}
+
+            with serve_session(session):
+                first = await review_routes.get_reviews_filtered(offset=0, limit=2, cursor=None, **page_args)
+                second = await review_routes.get_reviews_filtered(
+                    offset=0, limit=2, cursor=first.next_cursor, **page_args
+                )
+                with pytest.raises(HTTPException) as invalid:
+                    await review_routes.get_reviews_filtered(offset=1, limit=2, cursor=first.next_cursor, **page_args)
+                latest = await review_routes.get_latest_reviews(limit=1)
+                record = await review_routes.get_review_by_id(2)
+                with pytest.raises(HTTPException) as missing:
+                    await review_routes.get_review_by_id(99)
+                stats = await review_routes.get_review_stats()
+
+        assert [r.id for r in first.records] == [3, 2]
+        assert ([r.id for r in second.records], second.next_cursor, second.total) == ([1], None, 3)
+        assert invalid.value.status_code == 400
+        assert latest[0].diff_content == "diff"
+        assert record.review_feedback == "review"
+        assert missing.value.status_code == 404
+        assert stats["total_reviews"] == 3
+        assert stats["by_llm_provider"] == {"openai": 3}
+
+    @pytest.mark.asyncio
+    async def test_failures_endpoint_follows_cursor(self):
+        """Test that /failures pages by cursor and the other failure endpoints read the same logs"""
+        async with database_session() as session:
+            session.add_all([make_failure(request_payload={"eventKey": "pr:opened"}) for _ in range(3)])
+            await session.commit()
+            await FailureLogRepository(session).mark_failure_resolved(1)
+            await session.commit()
+            session.expunge_all()
+
+            with serve_session(session):
+                first = await failure_routes.get_failures_paginated(offset=0, limit=2)
+                second = await failure_routes.get_failures_paginated(limit=2, cursor=first["next_cursor"])
+                latest = await failure_routes.get_latest_failures(limit=500)
+                stats = await failure_routes.get_failure_stats()
+                failure = await failure_routes.get_failure_by_id(1)
+                with pytest.raises(HTTPException) as missing:
+                    await failure_routes.get_failure_by_id(99)
+
+        assert [f["id"] for f in first["failures"]] == [3, 2]
+        assert ([f["id"] for f in second["failures"]], second["next_cursor"]) == ([1], None)
+        assert latest["count"] == 3
+        assert (stats["total_failures"], stats["unresolved_failures"], stats["resolved_failures"]) == (3, 2, 1)
+        assert stats["by_stage"] == {"llm_review": 3}
+        assert failure["request_payload"] == {"eventKey": "pr:opened"}
+        assert missing.value.status_code == 404
+
+
+class TestSummaryLists:
+    """Test list queries that leave out large columns"""
+
+    @pytest.mark.asyncio
+    async def test_summary_queries_do_not_load_large_columns(self):
+        """Test that summary lists read metadata only, and the record endpoint still has everything"""
+        async with database_session() as session:
+            session.add_all([make_review() for _ in range(3)])
+            await session.commit()
+            session.expunge_all()
+            repo = ReviewRepository(session)
+
+            summaries = await repo.get_reviews_filtered(limit=2, summary=True)
+            latest = await repo.get_latest_reviews(limit=1, summary=True)
+            for record in summaries + latest:
+                with pytest.raises(InvalidRequestError):
+                    _ = record.diff_content
+            full = await repo.get_review_by_id(1)
+
+        assert [record.id for record in summaries] == [3, 2]
+        assert latest[0].project_key == "TEST"
+        assert full.diff_content == "diff"
+
+    @pytest.mark.asyncio
+    async def test_summary_endpoint_omits_diff_and_review(self):
+        """Test that /reviews/summary responds without the diff and review text"""
+        async with database_session() as session:
+            session.add_all([make_review() for _ in range(3)])
+            await session.commit()
+            session.expunge_all()
+
+            with serve_session(session):
+                response = await get_review_summaries(
+                    offset=0, limit=2, project_key=None, repo_slug=None, commit_id=None, pr_id=None, cursor=None
+                )
+
+        assert response.total == 3
+        assert [record.id for record in response.records] == [3, 2]
+        assert response.next_cursor is not None
+        assert "diff_content" not in response.model_dump()["records"][0]
@@ -0,0 +1,132 @@
+"""Unit tests for the LLM request rate limiter"""
+
+import asyncio
+import time
+
+import pytest
+
+from ai_code_reviewer.api.clients.rate_limiter import LLMRateLimiter, parse_retry_after
+
+
+class TestParseRetryAfter:
+    """Test extraction of provider back-off hints"""
+
+    def test_retry_after_seconds(self):
+        """Test a plain Retry-After value in seconds"""
+        assert parse_retry_after({"retry-after": "7"}) == 7.0
+
+    def test_retry_after_ms_takes_precedence(self):
+        """Test that retry-after-ms is preferred over Retry-After"""
+        assert parse_retry_after({"retry-after-ms": "250", "retry-after": "7"}) == 0.25
+
+    def test_retry_after_http_date(self):
+        """Test a Retry-After given as an HTTP date"""
+        future = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+
+        delay = parse_retry_after({"retry-after": future})
+
+        assert delay is not None
+        assert 25 <= delay <= 31
+
+    def test_exhausted_ratelimit_headers(self):
+        """Test that reset durations are used only when the remaining count is 0"""
+        headers = {
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "1m30s",
+            "x-ratelimit-remaining-tokens": "500",
+            "x-ratelimit-reset-tokens": "6m0s",
+        }
+
+        assert parse_retry_after(headers) == 90.0
+
+    def test_no_hint(self):
+        """Test that ordinary responses produce no delay"""
+        assert parse_retry_after({}) is None
+        assert parse_retry_after({"retry-after": "soon"}) is None
+
+
+class TestLLMRateLimiter:
+    """Test admission control for LLM requests"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """Test that no more than max_concurrent requests run at once"""
+        limiter = LLMRateLimiter(max_concurrent=2)
+        running = 0
+        peak = 0
+
+        async def request():
+            nonlocal running, peak
+            async with limiter.acquire():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(request() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_requests_admitted_in_arrival_order(self):
+        """Test that queued requests start in FIFO order"""
+        limiter = LLMRateLimiter(max_concurrent=1)
+        started = []
+
+        async def request(index):
+            async with limiter.acquire():
+                started.append(index)
+                await asyncio.sleep(0.001)
+
+        await asyncio.gather(*(request(i) for i in range(5)))
+
+        assert started == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_slot_released_on_error(self):
+        """Test that a failing request frees its slot"""
+        limiter = LLMRateLimiter(max_concurrent=1)
+
+        with pytest.raises(RuntimeError):
+            async with limiter.acquire():
+                raise RuntimeError("boom")
+
+        async with limiter.acquire():
+            assert limiter.stats()["in_flight"] == 1
+
+    @pytest.mark.asyncio
+    async def test_observe_response_pauses_new_requests(self):
+        """Test that a Retry-After hint delays the next request"""
+        limiter = LLMRateLimiter(max_concurrent=4)
+        limiter.observe_response(429, {"retry-after-ms": "50"})
+
+        assert limiter.stats()["paused_for_seconds"] >= 0
+
+        started = time.monotonic()
+        async with limiter.acquire():
+            pass
+
+        assert time.monotonic() - started >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_token_limit_delays_requests(self):
+        """Test that the tokens-per-minute budget throttles large requests"""
+        limiter = LLMRateLimiter(max_concurrent=4, tokens_per_minute=6000)
+
+        started = time.monotonic()
+        async with limiter.acquire(tokens=6000):
+            pass
+        async with limiter.acquire(tokens=10):
+            pass
+
+        # 10 tokens refill at 100 tokens/second
+        assert time.monotonic() - started >= 0.08
+
+    def test_observe_success_without_hints_does_not_pause(self):
+        """Test that normal responses leave the queue running"""
+        limiter = LLMRateLimiter(max_concurrent=1)
+
+        limiter.observe_response(200, {})
+
+        assert limiter.stats()["paused_for_seconds"] == 0
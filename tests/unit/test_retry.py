@@ -0,0 +1,123 @@
+"""Unit tests for the shared client retry policy"""
+
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+from ai_code_reviewer.api.clients.retry import (
+    RetryableError,
+    RetryPolicy,
+    begin_retry_tracking,
+    call_with_retry,
+    current_retry_count,
+    is_retryable,
+    raise_for_transient_status,
+)
+
+
+NO_DELAY = RetryPolicy(max_attempts=3, base_delay=0)
+
+
+class TestClassification:
+    """Test which failures are considered transient"""
+
+    def test_transient_status_raises(self):
+        """Test that 5xx and 429 responses raise RetryableError with the server hint"""
+        response = Mock(status_code=429, text="slow down", headers={"retry-after": "3"})
+
+        with pytest.raises(RetryableError) as exc_info:
+            raise_for_transient_status(response, "API error")
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after == 3.0
+
+    def test_client_error_status_passes(self):
+        """Test that non-transient statuses are left to the caller"""
+        response = Mock(status_code=404, text="Not Found", headers={})
+
+        raise_for_transient_status(response, "API error")
+
+    def test_network_errors(self):
+        """Test classification of httpx errors for idempotent and non-idempotent requests"""
+        assert is_retryable(httpx.ReadTimeout("timeout"))
+        assert is_retryable(httpx.ConnectError("refused"), idempotent=False)
+        assert not is_retryable(httpx.ReadTimeout("timeout"), idempotent=False)
+        assert not is_retryable(ValueError("bad payload"))
+
+    def test_status_errors_for_non_idempotent_requests(self):
+        """Test that POSTs are only retried when the server did not process them"""
+        assert is_retryable(RetryableError("busy", status_code=429), idempotent=False)
+        assert not is_retryable(RetryableError("failed", status_code=500), idempotent=False)
+
+
+class TestBackoff:
+    """Test backoff delay computation"""
+
+    def test_backoff_is_capped(self):
+        """Test that jittered delays stay within the exponential window and the cap"""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+
+        for attempt in range(1, 10):
+            assert 0 <= policy.backoff(attempt) <= min(5.0, 2 ** (attempt - 1))
+
+    def test_backoff_honors_retry_after(self):
+        """Test that a server hint is a lower bound, capped by max_delay"""
+        policy = RetryPolicy(base_delay=0.1, max_delay=5.0)
+
+        assert policy.backoff(1, retry_after=2.0) == 2.0
+        assert policy.backoff(1, retry_after=60.0) == 5.0
+
+
+class TestCallWithRetry:
+    """Test the retry loop"""
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_failures(self):
+        """Test that a transient failure is retried and counted"""
+        operation = AsyncMock(side_effect=[httpx.ConnectError("refused"), "ok"])
+        begin_retry_tracking()
+
+        result = await call_with_retry(operation, NO_DELAY, "test call")
+
+        assert result == "ok"
+        assert operation.call_count == 2
+        assert current_retry_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """Test that the last error is raised once attempts are exhausted"""
+        operation = AsyncMock(side_effect=RetryableError("unavailable", status_code=503))
+
+        with pytest.raises(RetryableError):
+            await call_with_retry(operation, NO_DELAY, "test call")
+
+        assert operation.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_permanent_errors(self):
+        """Test that non-transient errors are raised immediately"""
+        operation = AsyncMock(side_effect=ValueError("bad"))
+
+        with pytest.raises(ValueError):
+            await call_with_retry(operation, NO_DELAY, "test call")
+
+        assert operation.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stops_at_deadline(self):
+        """Test that no retry is attempted when the backoff would pass the deadline"""
+        policy = RetryPolicy(max_attempts=5, base_delay=0, deadline=0.5)
+        operation = AsyncMock(side_effect=RetryableError("busy", status_code=429, retry_after=10))
+
+        with pytest.raises(RetryableError):
+            await call_with_retry(operation, policy, "test call")
+
+        assert operation.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_tracking_starts_from_zero(self):
+        """Test that the retry count starts from zero for each tracked review"""
+        begin_retry_tracking()
+
+        assert current_retry_count() == 0
@@ -0,0 +1,88 @@
+"""Unit tests for the content-addressed review cache"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from ai_code_reviewer.api.core.review_cache import ReviewCache
+
+
+@asynccontextmanager
+async def fake_session():
+    """Stand-in for get_db_session that yields a dummy session"""
+    yield Mock()
+
+
+@asynccontextmanager
+async def failing_session():
+    """Stand-in for get_db_session when the database is unavailable"""
+    raise RuntimeError("database unavailable")
+    yield  # pragma: no cover
+
+
+class TestReviewCache:
+    """Test cache key construction and failure handling"""
+
+    def test_normalize_diff_drops_index_lines(self):
+        """Test that blob hashes and line endings do not affect the normalized diff"""
+        diff = "diff --git a/x.py b/x.py\r\nindex abc123..def456 100644\r\n+print('hi')   \r\n"
+
+        assert ReviewCache.normalize_diff(diff) == "diff --git a/x.py b/x.py\n+print('hi')"
+
+    def test_build_key_stable_across_equivalent_diffs(self):
+        """Test that the same change pushed twice produces the same key"""
+        first = "diff --git a/x.py b/x.py\nindex 1111111..2222222 100644\n+print('hi')\n"
+        second = "diff --git a/x.py b/x.py\nindex 3333333..4444444 100644\n+print('hi')\n"
+
+        assert ReviewCache.build_key(first, "g", "openai", "gpt-4o", "t") == ReviewCache.build_key(
+            second, "g", "openai", "gpt-4o", "t"
+        )
+
+    def test_build_key_varies_with_review_inputs(self):
+        """Test that guidelines, model and prompt changes invalidate the cache"""
+        diff = "+print('hi')"
+        base = ReviewCache.build_key(diff, "g", "openai", "gpt-4o", "t")
+
+        assert ReviewCache.build_key(diff, "g2", "openai", "gpt-4o", "t") != base
+        assert ReviewCache.build_key(diff, "g", "openai", "gpt-4o-mini", "t") != base
+        assert ReviewCache.build_key(diff, "g", "openai", "gpt-4o", "t2") != base
+        assert ReviewCache.build_key(diff, "g", "openai", "gpt-4o", "t", guidelines_hash="abc") != base
+
+    @pytest.mark.asyncio
+    async def test_get_returns_cached_review(self):
+        """Test that a stored entry is returned on a hit"""
+        mock_repo = Mock()
+        mock_repo.get_entry = AsyncMock(return_value=Mock(review_feedback="Cached review"))
+
+        with (
+            patch("ai_code_reviewer.api.core.review_cache.get_db_session", fake_session),
+            patch("ai_code_reviewer.api.core.review_cache.ReviewCacheRepository", return_value=mock_repo),
+        ):
+            result = await ReviewCache(ttl_seconds=60, max_entries=10).get("key")
+
+        assert result == "Cached review"
+
+    @pytest.mark.asyncio
+    async def test_get_treats_database_error_as_miss(self):
+        """Test that cache lookups never break the review pipeline"""
+        with patch("ai_code_reviewer.api.core.review_cache.get_db_session", failing_session):
+            result = await ReviewCache(ttl_seconds=60, max_entries=10).get("key")
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_put_stores_and_evicts(self):
+        """Test that storing a review also applies TTL and LRU eviction"""
+        mock_repo = Mock()
+        mock_repo.upsert_entry = AsyncMock()
+        mock_repo.evict_entries = AsyncMock(return_value=0)
+
+        with (
+            patch("ai_code_reviewer.api.core.review_cache.get_db_session", fake_session),
+            patch("ai_code_reviewer.api.core.review_cache.ReviewCacheRepository", return_value=mock_repo),
+        ):
+            await ReviewCache(ttl_seconds=60, max_entries=10).put("key", "Review", "openai", "gpt-4o")
+
+        mock_repo.upsert_entry.assert_called_once_with("key", "Review", llm_provider="openai", llm_model="gpt-4o")
+        assert mock_repo.evict_entries.call_args[0][1] == 10
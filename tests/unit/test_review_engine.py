@@ -1,10 +1,18 @@
 """Unit tests for review engine payload parsing and processing logic"""
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock, patch
 
+import httpx
 import pytest
 
-from ai_code_reviewer.api.core.review_engine import process_commit_review, process_pull_request_review
+from ai_code_reviewer.api.clients.retry import RetryPolicy, call_with_retry
+from ai_code_reviewer.api.core.review_engine import (
+    RetryableReviewError,
+    process_commit_review,
+    process_pull_request_review,
+)
 
 
 class TestPullRequestPayloadParsing:
@@ -162,6 +170,276 @@ class TestPullRequestPayloadParsing:
         # Should not call LLM if diff is empty
         mock_llm.get_code_review.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_pr_recipients_fetched_while_reviewing(self, sample_pr_webhook):
+        """Test that PR metadata is fetched during the LLM call and passed to the email stage"""
+        mock_bb = AsyncMock()
+        mock_bb.get_pull_request_diff = AsyncMock(return_value="mock diff")
+        mock_bb.get_pull_request_info = AsyncMock(
+            return_value={"author": {"user": {"emailAddress": "author@example.com", "displayName": "Author"}}}
+        )
+
+        async def review_after_metadata(diff, metrics, previous_review=None, project_key=None):
+            await asyncio.sleep(0)
+            # The metadata request was issued before the review finished
+            mock_bb.get_pull_request_info.assert_awaited_once()
+            return "Mock review with issues"
+
+        mock_llm = AsyncMock()
+        mock_llm.get_code_review = AsyncMock(side_effect=review_after_metadata)
+
+        with (
+            patch("ai_code_reviewer.api.core.review_engine.send_review_email", new_callable=AsyncMock) as mock_send,
+            patch("ai_code_reviewer.api.core.review_engine.save_review_to_database", new_callable=AsyncMock),
+        ):
+            mock_send.return_value = (True, ["author@example.com"], "Author")
+
+            await process_pull_request_review(mock_bb, mock_llm, sample_pr_webhook)
+
+        recipients = mock_send.call_args.kwargs["recipients"]
+        assert recipients.emails == ["author@example.com"]
+        assert recipients.subject_id == "Pull Request #123 authored by Author"
+        mock_bb.get_pull_request_info.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_pr_email_and_save_run_in_parallel(self, sample_pr_webhook):
+        """Test that the review is saved while the email is being sent, and a failed email is recorded"""
+        mock_bb = AsyncMock()
+        mock_bb.get_pull_request_diff = AsyncMock(return_value="mock diff")
+        mock_bb.get_pull_request_info = AsyncMock(
+            return_value={"author": {"user": {"emailAddress": "author@example.com", "displayName": "Author"}}}
+        )
+        mock_llm = AsyncMock()
+        mock_llm.get_code_review = AsyncMock(return_value="Mock review with issues")
+        saving = asyncio.Event()
+
+        async def send_while_saving(*args, **kwargs):
+            await asyncio.wait_for(saving.wait(), timeout=1)
+            raise RuntimeError("Logic App unreachable")
+
+        async def save(**kwargs):
+            saving.set()
+            return 42
+
+        with (
+            patch("ai_code_reviewer.api.core.review_engine.send_review_email", side_effect=send_while_saving),
+            patch("ai_code_reviewer.api.core.review_engine.save_review_to_database", side_effect=save) as mock_save,
+            patch(
+                "ai_code_reviewer.api.core.review_engine.update_review_email_sent", new_callable=AsyncMock
+            ) as mock_update,
+            patch("ai_code_reviewer.api.core.review_engine.log_review_failure", new_callable=AsyncMock) as mock_log,
+        ):
+            await process_pull_request_review(mock_bb, mock_llm, sample_pr_webhook)
+
+        assert mock_save.call_args.kwargs["author_email"] == "author@example.com"
+        assert mock_save.call_args.kwargs["email_sent"] is True
+        mock_update.assert_awaited_once_with(42, False)
+        assert [c.kwargs["failure_stage"] for c in mock_log.call_args_list] == ["email_send"]
+
+    @pytest.mark.asyncio
+    async def test_pr_undelivered_email_is_recorded(self, sample_pr_webhook):
+        """Test that a queued email failing to deliver later is logged and corrects the saved record"""
+        mock_bb = AsyncMock()
+        mock_bb.get_pull_request_diff = AsyncMock(return_value="mock diff")
+        mock_bb.get_pull_request_info = AsyncMock(
+            return_value={"author": {"user": {"emailAddress": "author@example.com", "displayName": "Author"}}}
+        )
+        mock_llm = AsyncMock()
+        mock_llm.get_code_review = AsyncMock(return_value="Mock review with issues")
+
+        with (
+            patch("ai_code_reviewer.api.core.review_engine.send_review_email", new_callable=AsyncMock) as mock_send,
+            patch("ai_code_reviewer.api.core.review_engine.save_review_to_database", return_value=42),
+            patch(
+                "ai_code_reviewer.api.core.review_engine.update_review_email_sent", new_callable=AsyncMock
+            ) as mock_update,
+            patch("ai_code_reviewer.api.core.review_engine.log_review_failure", new_callable=AsyncMock) as mock_log,
+        ):
+            mock_send.return_value = (True, ["author@example.com"], "Author")
+            await process_pull_request_review(mock_bb, mock_llm, sample_pr_webhook)
+
+            mock_update.assert_not_called()
+            mock_log.assert_not_called()
+
+            # The email worker reports the failed delivery after the review was processed
+            await mock_send.call_args.kwargs["on_failure"](RuntimeError("Logic App rejected the email"))
+
+        mock_update.assert_awaited_once_with(42, False)
+        assert mock_log.call_args.kwargs["failure_stage"] == "email_send"
+        assert mock_log.call_args.kwargs["pr_id"] == 123
+
+    @pytest.mark.asyncio
+    async def test_pr_failure_records_retry_count(self, sample_pr_webhook):
+        """Test that client retries made during a review are stored on its failure log"""
+        mock_bb = AsyncMock()
+        mock_bb.get_pull_request_diff = AsyncMock(return_value="mock diff")
+
+        async def flaky_review(diff, metrics, previous_review=None, project_key=None):
+            transient = AsyncMock(side_effect=[httpx.ConnectError("refused"), httpx.ConnectError("refused"), "ok"])
+            await call_with_retry(transient, RetryPolicy(base_delay=0), "LLM review")
+            raise RuntimeError("unparseable review")
+
+        mock_llm = AsyncMock()
+        mock_llm.get_code_review = AsyncMock(side_effect=flaky_review)
+
+        mock_repo = Mock()
+        mock_repo.create_failure_log = AsyncMock(return_value=Mock(id=1))
+
+        @asynccontextmanager
+        async def fake_session():
+            yield Mock()
+
+        with (
+            patch("ai_code_reviewer.api.core.review_engine.get_db_session", fake_session),
+            patch("ai_code_reviewer.api.core.review_engine.FailureLogRepository", return_value=mock_repo),
+        ):
+            await process_pull_request_review(mock_bb, mock_llm, sample_pr_webhook)
+
+        kwargs = mock_repo.create_failure_log.call_args.kwargs
+        assert kwargs["failure_stage"] == "llm_review"
+        assert kwargs["retry_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_pr_llm_unavailable_is_retryable(self, sample_pr_webhook):
+        """Test that a transient LLM error is logged and raised for the job queue to retry"""
+        mock_bb = AsyncMock()
+        mock_bb.get_pull_request_diff = AsyncMock(return_value="mock diff")
+        mock_llm = AsyncMock()
+        mock_llm.get_code_review = AsyncMock(side_effect=httpx.ConnectError("refused"))
+
+        with (
+            patch("ai_code_reviewer.api.core.review_engine.log_review_failure", new_callable=AsyncMock) as mock_log,
+            pytest.raises(RetryableReviewError),
+        ):
+            await process_pull_request_review(mock_bb, mock_llm, sample_pr_webhook)
+
+        assert mock_log.call_args.kwargs["failure_stage"] == "llm_review"
+
+    @pytest.mark.asyncio
+    async def test_pr_permanent_llm_failure_is_not_retried(self, sample_pr_webhook):
+        """Test that a review the LLM could not produce for a permanent reason is logged once and not retried"""
+        mock_bb = AsyncMock()
+        mock_bb.get_pull_request_diff = AsyncMock(return_value="mock diff")
+        mock_llm = AsyncMock()
+        mock_llm.get_code_review = AsyncMock(return_value=None)
+
+        with patch("ai_code_reviewer.api.core.review_engine.log_review_failure", new_callable=AsyncMock) as mock_log:
+            await process_pull_request_review(mock_bb, mock_llm, sample_pr_webhook)
+
+        mock_log.assert_awaited_once()
+        assert mock_log.call_args.kwargs["failure_stage"] == "llm_review"
+
+    @pytest.mark.asyncio
+    async def test_pr_invalid_diff_request_is_not_retried(self, sample_pr_webhook):
+        """Test that a diff fetch failing for a non-transient reason is only logged"""
+        mock_bb = AsyncMock()
+        mock_bb.get_pull_request_diff = AsyncMock(side_effect=ValueError("Pull request not found"))
+
+        with patch("ai_code_reviewer.api.core.review_engine.log_review_failure", new_callable=AsyncMock) as mock_log:
+            await process_pull_request_review(mock_bb, AsyncMock(), sample_pr_webhook)
+
+        assert mock_log.call_args.kwargs["failure_stage"] == "bitbucket_fetch_diff"
+
+
+class TestIncrementalPullRequestReview:
+    """Test reviewing only the commits pushed since the last pull request review"""
+
+    @staticmethod
+    def _patch_state(state):
+        """Patch the review state repository to return the given state"""
+        state_repo = Mock()
+        state_repo.get_state = AsyncMock(return_value=state)
+        state_repo.upsert_state = AsyncMock()
+
+        @asynccontextmanager
+        async def fake_session():
+            yield Mock()
+
+        patches = (
+            patch("ai_code_reviewer.api.core.review_engine.get_db_session", fake_session),
+            patch("ai_code_reviewer.api.core.review_engine.PullRequestReviewStateRepository", return_value=state_repo),
+            patch("ai_code_reviewer.api.core.review_engine.send_review_email", new_callable=AsyncMock),
+            patch("ai_code_reviewer.api.core.review_engine.save_review_to_database", new_callable=AsyncMock),
+        )
+        return state_repo, patches
+
+    @staticmethod
+    def _clients(full_diff, interdiff):
+        mock_bb = AsyncMock()
+        mock_bb.get_pull_request_diff = AsyncMock(return_value=full_diff)
+        mock_bb.get_compare_diff = AsyncMock(return_value=interdiff)
+        mock_llm = AsyncMock()
+        mock_llm.get_code_review = AsyncMock(return_value="Mock review with issues")
+        return mock_bb, mock_llm
+
+    @pytest.mark.asyncio
+    async def test_update_reviews_new_commits_only(self, sample_pr_webhook):
+        """Test that a source branch push is reviewed as the interdiff with the previous findings"""
+        payload = {**sample_pr_webhook, "eventKey": "pr:from_ref_updated"}
+        previous = Mock(last_reviewed_commit="old123", last_review_feedback="Old finding")
+        state_repo, patches = self._patch_state(previous)
+        mock_bb, mock_llm = self._clients("full diff " * 100, "new commits diff")
+
+        with patches[0], patches[1], patches[2] as mock_send, patches[3]:
+            mock_send.return_value = (True, ["author@example.com"], "Author")
+            await process_pull_request_review(mock_bb, mock_llm, payload)
+
+        mock_bb.get_compare_diff.assert_awaited_once_with("TEST", "test-repo", "abc123", "old123")
+        mock_bb.get_pull_request_diff.assert_not_called()
+        assert mock_llm.get_code_review.call_args.args[0] == "new commits diff"
+        assert mock_llm.get_code_review.call_args.kwargs["previous_review"] == "Old finding"
+        assert mock_llm.get_code_review.call_args.kwargs["project_key"] == "TEST"
+        state_repo.upsert_state.assert_awaited_once_with(
+            "TEST", "test-repo", 123, "abc123", "Old finding\n\n#### Commits old123..abc123\n\nMock review with issues"
+        )
+
+    @pytest.mark.asyncio
+    async def test_clean_update_keeps_previous_findings(self, sample_pr_webhook):
+        """Test that an update without new findings leaves the earlier findings in the stored state"""
+        payload = {**sample_pr_webhook, "eventKey": "pr:from_ref_updated"}
+        previous = Mock(last_reviewed_commit="old123", last_review_feedback="Old finding")
+        state_repo, patches = self._patch_state(previous)
+        mock_bb, mock_llm = self._clients("full diff", "new commits diff")
+        mock_llm.get_code_review = AsyncMock(return_value="No issues found.")
+
+        with patches[0], patches[1], patches[2], patches[3]:
+            await process_pull_request_review(mock_bb, mock_llm, payload)
+
+        state_repo.upsert_state.assert_awaited_once_with("TEST", "test-repo", 123, "abc123", "Old finding")
+
+    @pytest.mark.asyncio
+    async def test_first_review_uses_full_diff(self, sample_pr_webhook):
+        """Test that a pull request without an earlier review gets a full review and a stored state"""
+        payload = {**sample_pr_webhook, "eventKey": "pr:from_ref_updated"}
+        state_repo, patches = self._patch_state(None)
+        mock_bb, mock_llm = self._clients("full diff", "new commits diff")
+
+        with patches[0], patches[1], patches[2] as mock_send, patches[3]:
+            mock_send.return_value = (True, ["author@example.com"], "Author")
+            await process_pull_request_review(mock_bb, mock_llm, payload)
+
+        mock_bb.get_compare_diff.assert_not_called()
+        assert mock_llm.get_code_review.call_args.args[0] == "full diff"
+        assert mock_llm.get_code_review.call_args.kwargs["previous_review"] is None
+        state_repo.upsert_state.assert_awaited_once_with("TEST", "test-repo", 123, "abc123", "Mock review with issues")
+
+    @pytest.mark.asyncio
+    async def test_missing_interdiff_falls_back_to_full_diff(self, sample_pr_webhook):
+        """Test that the full diff is fetched when there is no interdiff (e.g. the old head was force-pushed away)"""
+        payload = {**sample_pr_webhook, "eventKey": "pr:from_ref_updated"}
+        previous = Mock(last_reviewed_commit="old123", last_review_feedback="Old finding")
+        state_repo, patches = self._patch_state(previous)
+        mock_bb, mock_llm = self._clients("full diff", None)
+
+        with patches[0], patches[1], patches[2] as mock_send, patches[3]:
+            mock_send.return_value = (True, ["author@example.com"], "Author")
+            await process_pull_request_review(mock_bb, mock_llm, payload)
+
+        mock_bb.get_pull_request_diff.assert_awaited_once_with("TEST", "test-repo", 123)
+        assert mock_llm.get_code_review.call_args.args[0] == "full diff"
+        assert mock_llm.get_code_review.call_args.kwargs["previous_review"] is None
+        state_repo.upsert_state.assert_awaited_once_with("TEST", "test-repo", 123, "abc123", "Mock review with issues")
+
 
 class TestCommitPayloadParsing:
     """Test commit webhook payload parsing"""
@@ -251,6 +529,65 @@ class TestCommitPayloadParsing:
             assert mock_bb.get_commit_diff.call_count == 2
             assert mock_llm.get_code_review.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_commit_changes_reviewed_concurrently(self, sample_commit_webhook):
+        """Test that the changes of one push are reviewed at the same time"""
+        sample_commit_webhook["changes"] = [{"toHash": f"commit{i}", "type": "UPDATE"} for i in range(3)]
+        running = 0
+        peak = 0
+
+        async def slow_review(diff, metrics, project_key=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "No issues found."
+
+        mock_bb = AsyncMock()
+        mock_bb.get_commit_diff = AsyncMock(return_value="mock diff")
+        mock_llm = AsyncMock()
+        mock_llm.get_code_review = AsyncMock(side_effect=slow_review)
+
+        with patch("ai_code_reviewer.api.core.review_engine.Config.COMMIT_REVIEW_CONCURRENCY", 2):
+            await process_commit_review(mock_bb, mock_llm, sample_commit_webhook)
+
+        assert mock_llm.get_code_review.call_count == 3
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_commit_change_failure_is_isolated(self, sample_commit_webhook):
+        """Test that an unexpected error in one change does not stop the others"""
+        sample_commit_webhook["changes"] = [
+            {"toHash": "commit1", "type": "UPDATE"},
+            {"toHash": "commit2", "type": "UPDATE"},
+        ]
+
+        async def get_commit_diff(project_key, repo_slug, commit_id):
+            # A malformed diff fails outside the per-stage error handling
+            return object() if commit_id == "commit1" else "mock diff"
+
+        mock_bb = AsyncMock()
+        mock_bb.get_commit_diff = AsyncMock(side_effect=get_commit_diff)
+        mock_llm = AsyncMock()
+        mock_llm.get_code_review = AsyncMock(return_value="Mock review")
+
+        with (
+            patch("ai_code_reviewer.api.core.review_engine.send_review_email", new_callable=AsyncMock) as mock_send,
+            patch(
+                "ai_code_reviewer.api.core.review_engine.save_review_to_database", new_callable=AsyncMock
+            ) as mock_save,
+            patch("ai_code_reviewer.api.core.review_engine.log_review_failure", new_callable=AsyncMock) as mock_log,
+        ):
+            mock_send.return_value = (True, ["test@example.com"], "Test User")
+
+            await process_commit_review(mock_bb, mock_llm, sample_commit_webhook)
+
+        mock_save.assert_called_once()
+        assert mock_save.call_args.kwargs["commit_id"] == "commit2"
+        mock_log.assert_called_once()
+        assert mock_log.call_args.kwargs["commit_id"] == "commit1"
+
     @pytest.mark.asyncio
     async def test_commit_no_diff_found(self, sample_commit_webhook):
         """Test commit processing when no diff is found"""
@@ -0,0 +1,123 @@
+"""Unit tests for token counting and prompt budgeting"""
+
+from unittest.mock import patch
+
+import pytest
+
+from ai_code_reviewer.api.core.token_budget import (
+    ESTIMATE_CACHE_MAX_CHARS,
+    TOKENIZER_FACTORIES,
+    EstimatingTokenCounter,
+    PromptBudget,
+    TokenCounter,
+    _cached_estimate_tokens,
+    get_context_window,
+    get_token_counter,
+    register_tokenizer,
+)
+
+
+class TestTokenCounting:
+    """Test the fallback estimator and tokenizer selection"""
+
+    def test_estimate_counts_words_and_symbols(self):
+        """Test that code is estimated per word piece and per symbol"""
+        counter = EstimatingTokenCounter()
+
+        assert counter.count("") == 0
+        assert counter.count("hello") == 2
+        assert counter.count("a + b;") == 4
+
+    def test_estimate_does_not_underestimate_cjk(self):
+        """Test that non-ASCII characters count as one token each"""
+        counter = EstimatingTokenCounter()
+
+        assert counter.count("你好世界") == 4
+
+    def test_truncate_fits_budget(self):
+        """Test that truncation returns a prefix within the token budget"""
+        counter = EstimatingTokenCounter()
+        text = "hello world " * 1000
+
+        truncated = counter.truncate(text, 100)
+
+        assert text.startswith(truncated)
+        assert counter.count(truncated) <= 100
+
+    def test_estimate_cache_skips_long_texts(self):
+        """Test that only short texts such as templates are kept in the estimate cache"""
+        counter = EstimatingTokenCounter()
+        _cached_estimate_tokens.cache_clear()
+
+        counter.count("template")
+        counter.count("+line\n" * ESTIMATE_CACHE_MAX_CHARS)
+
+        assert _cached_estimate_tokens.cache_info().currsize == 1
+
+    def test_token_counter_is_abstract(self):
+        """Test that a tokenizer must implement count"""
+        with pytest.raises(TypeError):
+            TokenCounter()  # type: ignore[abstract]
+
+    def test_unknown_model_uses_estimate(self):
+        """Test that models without a registered tokenizer fall back to the estimate"""
+        assert get_token_counter("llama3:8b").name == "estimate"
+
+    def test_register_tokenizer(self):
+        """Test that a tokenizer can be plugged in per model prefix"""
+
+        class WordCounter(TokenCounter):
+            name = "words"
+
+            def count(self, text: str) -> int:
+                return len(text.split())
+
+        with patch.dict(TOKENIZER_FACTORIES):
+            register_tokenizer("custom-model", lambda model: WordCounter())
+
+            assert get_token_counter("custom-model-v2").count("one two three") == 3
+        get_token_counter.cache_clear()
+
+
+class TestPromptBudget:
+    """Test context window lookup and token allocation"""
+
+    def test_context_window_uses_longest_prefix(self):
+        """Test that gpt-4o is not matched as gpt-4"""
+        with patch("ai_code_reviewer.api.core.token_budget.Config.LLM_CONTEXT_TOKENS", 0):
+            assert get_context_window("gpt-4o-mini") == 128000
+            assert get_context_window("gpt-4") == 8192
+            assert get_context_window("llama3:8b") == 8192
+
+    def test_context_window_override(self):
+        """Test that LLM_CONTEXT_TOKENS overrides the model table"""
+        with patch("ai_code_reviewer.api.core.token_budget.Config.LLM_CONTEXT_TOKENS", 32000):
+            assert get_context_window("gpt-4o") == 32000
+
+    def test_prompt_tokens_reserves_output(self):
+        """Test that the response allowance and optional cap are applied"""
+        assert PromptBudget(10000, 2000).prompt_tokens < 8000
+        assert PromptBudget(10000, 2000, max_prompt_tokens=4000).prompt_tokens == 4000
+
+    def test_allocate_keeps_guidelines_when_everything_fits(self):
+        """Test that guidelines are untouched when the diff fits alongside them"""
+        budget = PromptBudget(20000, 2000)
+
+        guidelines, diff = budget.allocate(1000, 3000, 5000)
+
+        assert guidelines == 3000
+        assert diff >= 5000
+
+    def test_allocate_caps_guidelines_for_large_diffs(self):
+        """Test that oversized guidelines are capped so the diff keeps most of the budget"""
+        budget = PromptBudget(20000, 2000)
+
+        guidelines, diff = budget.allocate(1000, 15000, 50000)
+
+        assert guidelines < 15000
+        assert guidelines + diff == budget.prompt_tokens - 1000
+
+    def test_allocate_rejects_oversized_template(self):
+        """Test that a template larger than the budget is reported"""
+        with pytest.raises(ValueError):
+            PromptBudget(1000, 500).allocate(1000, 0, 0)